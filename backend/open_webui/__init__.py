@@ -103,5 +103,24 @@ def dev(
     )
 
 
+@app.command()
+def backfill_chat_messages(
+    batch_size: Annotated[int | None, typer.Option(help='Chats per batch')] = None,
+    interval: Annotated[float | None, typer.Option(help='Seconds to pause between batches')] = None,
+    reset: Annotated[bool, typer.Option(help='Start over instead of resuming from the watermark')] = False,
+):
+    """Copy legacy chat histories into the chat_message table."""
+    import asyncio
+
+    import open_webui.config  # noqa: F401  (runs database migrations)
+    from open_webui.utils.chat_message_backfill import run_chat_message_backfill_with_lease
+
+    status = asyncio.run(run_chat_message_backfill_with_lease(batch_size=batch_size, interval=interval, reset=reset))
+    if status is None:
+        typer.echo('Another backfill is running; try again once it finishes', err=True)
+        raise typer.Exit(code=1)
+    typer.echo(f"Backfilled {status['messages']} messages across {status['chats']} chats ({status['failed']} failed)")
+
+
 if __name__ == '__main__':
     app()
@@ -492,9 +492,30 @@ CODE_INTERPRETER_PYODIDE_PROMPT = """
 
 VECTOR_DB = os.getenv('VECTOR_DB', 'chroma')
 
+# Compact vector storage (see retrieval/vector/compression.py). Changing either
+# setting requires re-indexing existing collections.
+# Truncate embeddings to this many dimensions (Matryoshka models); 0 keeps the model's size.
+RAG_VECTOR_DIMENSIONS = int(os.getenv('RAG_VECTOR_DIMENSIONS', '0') or 0)
+# none, float16, int8 or binary; applied through each backend's native support.
+RAG_VECTOR_QUANTIZATION = os.getenv('RAG_VECTOR_QUANTIZATION', 'none').strip().lower()
+if RAG_VECTOR_QUANTIZATION not in ('none', 'float16', 'int8', 'binary'):
+    RAG_VECTOR_QUANTIZATION = 'none'
+# Candidates fetched per result on the quantized index before rescoring at full precision.
+RAG_VECTOR_RESCORE_OVERSAMPLING = float(os.getenv('RAG_VECTOR_RESCORE_OVERSAMPLING', '4') or 4)
+
 # Chroma
 CHROMA_DATA_PATH = f'{DATA_DIR}/vector_db'
 
+# Embedded (file-backed HNSW, single process)
+EMBEDDED_VECTOR_DB_PATH = os.getenv('EMBEDDED_VECTOR_DB_PATH', f'{DATA_DIR}/vector_db/embedded')
+EMBEDDED_VECTOR_DB_HNSW_M = int(os.getenv('EMBEDDED_VECTOR_DB_HNSW_M', '16'))
+EMBEDDED_VECTOR_DB_HNSW_EF_CONSTRUCTION = int(os.getenv('EMBEDDED_VECTOR_DB_HNSW_EF_CONSTRUCTION', '200'))
+EMBEDDED_VECTOR_DB_HNSW_EF_SEARCH = int(os.getenv('EMBEDDED_VECTOR_DB_HNSW_EF_SEARCH', '64'))
+# Collections and filtered candidate sets up to this size are searched exactly instead of through the index.
+EMBEDDED_VECTOR_DB_EXACT_SEARCH_THRESHOLD = int(os.getenv('EMBEDDED_VECTOR_DB_EXACT_SEARCH_THRESHOLD', '20000'))
+EMBEDDED_VECTOR_DB_MAX_SEGMENTS = int(os.getenv('EMBEDDED_VECTOR_DB_MAX_SEGMENTS', '16'))
+EMBEDDED_VECTOR_DB_MAINTENANCE_INTERVAL = float(os.getenv('EMBEDDED_VECTOR_DB_MAINTENANCE_INTERVAL', '10'))
+
 if VECTOR_DB == 'chroma':
     import chromadb
 
@@ -587,7 +608,8 @@ if VECTOR_DB == 'mariadb-vector':
 MILVUS_URI = os.getenv('MILVUS_URI', f'{DATA_DIR}/vector_db/milvus.db')
 MILVUS_DB = os.getenv('MILVUS_DB', 'default')
 MILVUS_TOKEN = os.getenv('MILVUS_TOKEN', None)
-MILVUS_INDEX_TYPE = os.getenv('MILVUS_INDEX_TYPE', 'HNSW')
+# int8 quantization maps to Milvus' IVF_SQ8 index (8-bit scalar quantized IVF).
+MILVUS_INDEX_TYPE = os.getenv('MILVUS_INDEX_TYPE', 'IVF_SQ8' if RAG_VECTOR_QUANTIZATION == 'int8' else 'HNSW')
 MILVUS_METRIC_TYPE = os.getenv('MILVUS_METRIC_TYPE', 'COSINE')
 MILVUS_HNSW_M = int(os.getenv('MILVUS_HNSW_M', '16'))
 MILVUS_HNSW_EFCONSTRUCTION = int(os.getenv('MILVUS_HNSW_EFCONSTRUCTION', '100'))
@@ -640,9 +662,17 @@ if VECTOR_DB == 'pgvector' and not PGVECTOR_DB_URL.startswith('postgres'):
     raise ValueError(
         'Pgvector requires setting PGVECTOR_DB_URL or using Postgres with vector extension as the primary database.'
     )
-PGVECTOR_INITIALIZE_MAX_VECTOR_LENGTH = int(os.getenv('PGVECTOR_INITIALIZE_MAX_VECTOR_LENGTH', '1536'))
+PGVECTOR_INITIALIZE_MAX_VECTOR_LENGTH = int(
+    os.getenv('PGVECTOR_INITIALIZE_MAX_VECTOR_LENGTH', str(RAG_VECTOR_DIMENSIONS or 1536))
+)
 
-PGVECTOR_USE_HALFVEC = os.getenv('PGVECTOR_USE_HALFVEC', 'false').lower() == 'true'
+# pgvector has no int8 type; float16 and int8 quantization both store halfvec.
+PGVECTOR_USE_HALFVEC = (
+    os.getenv(
+        'PGVECTOR_USE_HALFVEC', 'true' if RAG_VECTOR_QUANTIZATION in ('float16', 'int8') else 'false'
+    ).lower()
+    == 'true'
+)
 
 if PGVECTOR_INITIALIZE_MAX_VECTOR_LENGTH > 2000 and not PGVECTOR_USE_HALFVEC:
     raise ValueError(
@@ -697,6 +727,9 @@ else:
     except Exception:
         PGVECTOR_POOL_RECYCLE = 3600
 
+# Native async client (psycopg 3): binary COPY ingest and single-connection searches.
+PGVECTOR_ASYNC_ENABLED = os.getenv('PGVECTOR_ASYNC_ENABLED', 'true').lower() == 'true'
+
 PGVECTOR_INDEX_METHOD = os.getenv('PGVECTOR_INDEX_METHOD', '').strip().lower()
 if PGVECTOR_INDEX_METHOD not in ('ivfflat', 'hnsw', ''):
     PGVECTOR_INDEX_METHOD = ''
@@ -941,6 +974,10 @@ PADDLEOCR_VL_TOKEN = os.getenv('PADDLEOCR_VL_TOKEN', '')
 
 BYPASS_EMBEDDING_AND_RETRIEVAL = os.getenv('BYPASS_EMBEDDING_AND_RETRIEVAL', 'False').lower() == 'true'
 
+# Parsed-document cache keyed by file hash and extraction settings (size in MB, 0 = unbounded)
+ENABLE_RAG_EXTRACTION_CACHE = os.getenv('ENABLE_RAG_EXTRACTION_CACHE', 'True').lower() == 'true'
+RAG_EXTRACTION_CACHE_MAX_SIZE = int(os.getenv('RAG_EXTRACTION_CACHE_MAX_SIZE', '1024'))
+
 
 RAG_TOP_K = int(os.getenv('RAG_TOP_K', '3'))
 RAG_TOP_K_RERANKER = int(os.getenv('RAG_TOP_K_RERANKER', '3'))
@@ -1137,6 +1174,11 @@ BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL = (
 
 BYPASS_WEB_SEARCH_WEB_LOADER = os.getenv('BYPASS_WEB_SEARCH_WEB_LOADER', 'False').lower() == 'true'
 
+# Keep web-search embeddings in an in-process index instead of the vector DB.
+# Only takes effect with a single worker and no Redis, as the index is per process.
+ENABLE_WEB_SEARCH_EPHEMERAL_INDEX = os.getenv('ENABLE_WEB_SEARCH_EPHEMERAL_INDEX', 'False').lower() == 'true'
+WEB_SEARCH_EPHEMERAL_INDEX_TTL = int(os.getenv('WEB_SEARCH_EPHEMERAL_INDEX_TTL', '3600'))
+
 WEB_SEARCH_RESULT_COUNT = int(os.getenv('WEB_SEARCH_RESULT_COUNT', '3'))
 
 
@@ -1167,6 +1209,15 @@ WEB_LOADER_CONCURRENT_REQUESTS = int(os.getenv('WEB_LOADER_CONCURRENT_REQUESTS',
 
 WEB_LOADER_TIMEOUT = os.getenv('WEB_LOADER_TIMEOUT', '')
 
+# Fetched-page cache shared by all web loads in this process (MB, 0 disables).
+WEB_LOADER_CACHE_MAX_SIZE = int(os.getenv('WEB_LOADER_CACHE_MAX_SIZE', '256'))
+
+# Freshness (seconds) for pages whose response carries no caching headers.
+WEB_LOADER_CACHE_DEFAULT_TTL = int(os.getenv('WEB_LOADER_CACHE_DEFAULT_TTL', '3600'))
+
+# How long search engine results are reused for an identical query (seconds, 0 disables).
+WEB_SEARCH_CACHE_TTL = int(os.getenv('WEB_SEARCH_CACHE_TTL', '900'))
+
 
 ENABLE_WEB_LOADER_SSL_VERIFICATION = os.getenv('ENABLE_WEB_LOADER_SSL_VERIFICATION', 'True').lower() == 'true'
 
@@ -2816,6 +2867,8 @@ DEFAULT_CONFIG = {
     'rag.paddleocr_vl_base_url': PADDLEOCR_VL_BASE_URL,
     'rag.paddleocr_vl_token': PADDLEOCR_VL_TOKEN,
     'rag.bypass_embedding_and_retrieval': BYPASS_EMBEDDING_AND_RETRIEVAL,
+    'rag.extraction_cache.enable': ENABLE_RAG_EXTRACTION_CACHE,
+    'rag.extraction_cache.max_size': RAG_EXTRACTION_CACHE_MAX_SIZE,
     'rag.top_k': RAG_TOP_K,
     'rag.top_k_reranker': RAG_TOP_K_RERANKER,
     'rag.relevance_threshold': RAG_RELEVANCE_THRESHOLD,
@@ -2864,6 +2917,8 @@ DEFAULT_CONFIG = {
     'web.search.engine': WEB_SEARCH_ENGINE,
     'web.search.bypass_embedding_and_retrieval': BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL,
     'web.search.bypass_web_loader': BYPASS_WEB_SEARCH_WEB_LOADER,
+    'web.search.ephemeral_index.enable': ENABLE_WEB_SEARCH_EPHEMERAL_INDEX,
+    'web.search.ephemeral_index.ttl': WEB_SEARCH_EPHEMERAL_INDEX_TTL,
     'web.search.result_count': WEB_SEARCH_RESULT_COUNT,
     'web.search.domain.filter_list': WEB_SEARCH_DOMAIN_FILTER_LIST,
     'web.search.concurrent_requests': WEB_SEARCH_CONCURRENT_REQUESTS,
@@ -1034,6 +1034,98 @@ SENTENCE_TRANSFORMERS_CROSS_ENCODER_SIGMOID_ACTIVATION_FUNCTION = (
     os.getenv('SENTENCE_TRANSFORMERS_CROSS_ENCODER_SIGMOID_ACTIVATION_FUNCTION', 'True').lower() == 'true'
 )
 
+####################################
+# DOCUMENT EXTRACTION
+####################################
+
+# Number of worker processes used to parse local documents (PDF, Office,
+# spreadsheets). 0 (default) keeps the previous behavior of parsing in a
+# thread of the web worker.
+RAG_EXTRACTION_WORKERS = os.getenv('RAG_EXTRACTION_WORKERS', '0')
+try:
+    RAG_EXTRACTION_WORKERS = max(int(RAG_EXTRACTION_WORKERS), 0)
+except ValueError:
+    RAG_EXTRACTION_WORKERS = 0
+
+# Address-space limit (in MB) applied to each extraction worker process.
+# A document that exceeds it fails with MemoryError instead of taking the
+# host down. Empty (default) means no limit.
+RAG_EXTRACTION_WORKER_MEMORY_LIMIT = os.getenv('RAG_EXTRACTION_WORKER_MEMORY_LIMIT', '')
+try:
+    RAG_EXTRACTION_WORKER_MEMORY_LIMIT = int(RAG_EXTRACTION_WORKER_MEMORY_LIMIT) or None
+except ValueError:
+    RAG_EXTRACTION_WORKER_MEMORY_LIMIT = None
+
+# Workers are recycled after this many tasks to return fragmented memory.
+RAG_EXTRACTION_WORKER_MAX_TASKS = os.getenv('RAG_EXTRACTION_WORKER_MAX_TASKS', '100')
+try:
+    RAG_EXTRACTION_WORKER_MAX_TASKS = int(RAG_EXTRACTION_WORKER_MAX_TASKS) or None
+except ValueError:
+    RAG_EXTRACTION_WORKER_MAX_TASKS = 100
+
+# PDFs with more pages than this are split into ranges of this many pages
+# and extracted in parallel.
+RAG_EXTRACTION_PAGES_PER_TASK = os.getenv('RAG_EXTRACTION_PAGES_PER_TASK', '50')
+try:
+    RAG_EXTRACTION_PAGES_PER_TASK = max(int(RAG_EXTRACTION_PAGES_PER_TASK), 1)
+except ValueError:
+    RAG_EXTRACTION_PAGES_PER_TASK = 50
+
+####################################
+# EVENT BUS
+####################################
+
+# Events published while this many are already waiting are dropped (and
+# counted) after a short wait, so a burst cannot exhaust memory.
+EVENT_BUS_QUEUE_SIZE = os.getenv('EVENT_BUS_QUEUE_SIZE', '10000')
+try:
+    EVENT_BUS_QUEUE_SIZE = max(int(EVENT_BUS_QUEUE_SIZE), 1)
+except ValueError:
+    EVENT_BUS_QUEUE_SIZE = 10000
+
+# Number of concurrent dispatch workers and events handled per batch.
+EVENT_BUS_WORKERS = os.getenv('EVENT_BUS_WORKERS', '4')
+try:
+    EVENT_BUS_WORKERS = max(int(EVENT_BUS_WORKERS), 1)
+except ValueError:
+    EVENT_BUS_WORKERS = 4
+
+EVENT_BUS_BATCH_SIZE = os.getenv('EVENT_BUS_BATCH_SIZE', '100')
+try:
+    EVENT_BUS_BATCH_SIZE = max(int(EVENT_BUS_BATCH_SIZE), 1)
+except ValueError:
+    EVENT_BUS_BATCH_SIZE = 100
+
+# Seconds one event function handler or webhook delivery may take before it is
+# abandoned (timed-out deliveries are retried from the outbox).
+EVENT_BUS_HANDLER_TIMEOUT = os.getenv('EVENT_BUS_HANDLER_TIMEOUT', '30')
+try:
+    EVENT_BUS_HANDLER_TIMEOUT = max(float(EVENT_BUS_HANDLER_TIMEOUT), 1)
+except ValueError:
+    EVENT_BUS_HANDLER_TIMEOUT = 30
+
+# Seconds that resolved event functions and webhook targets are reused
+# before being reloaded from the database.
+EVENT_BUS_CACHE_TTL = os.getenv('EVENT_BUS_CACHE_TTL', '10')
+try:
+    EVENT_BUS_CACHE_TTL = max(float(EVENT_BUS_CACHE_TTL), 0)
+except ValueError:
+    EVENT_BUS_CACHE_TTL = 10
+
+# Failed webhook deliveries are retried from the outbox with exponential
+# backoff, up to this many attempts.
+EVENT_OUTBOX_MAX_ATTEMPTS = os.getenv('EVENT_OUTBOX_MAX_ATTEMPTS', '8')
+try:
+    EVENT_OUTBOX_MAX_ATTEMPTS = max(int(EVENT_OUTBOX_MAX_ATTEMPTS), 1)
+except ValueError:
+    EVENT_OUTBOX_MAX_ATTEMPTS = 8
+
+EVENT_OUTBOX_POLL_INTERVAL = os.getenv('EVENT_OUTBOX_POLL_INTERVAL', '10')
+try:
+    EVENT_OUTBOX_POLL_INTERVAL = max(float(EVENT_OUTBOX_POLL_INTERVAL), 1)
+except ValueError:
+    EVENT_OUTBOX_POLL_INTERVAL = 10
+
 ####################################
 # TOOLS/FUNCTIONS PIP OPTIONS
 ####################################
@@ -1113,6 +1205,8 @@ ENABLE_OTEL = os.getenv('ENABLE_OTEL', 'False').lower() == 'true'
 ENABLE_OTEL_TRACES = os.getenv('ENABLE_OTEL_TRACES', 'False').lower() == 'true'
 ENABLE_OTEL_METRICS = os.getenv('ENABLE_OTEL_METRICS', 'False').lower() == 'true'
 ENABLE_OTEL_LOGS = os.getenv('ENABLE_OTEL_LOGS', 'False').lower() == 'true'
+# Send per-stage retrieval timings and candidate counts to the client as a `chat:retrieval_profile` event
+ENABLE_RETRIEVAL_PROFILE = os.getenv('ENABLE_RETRIEVAL_PROFILE', 'False').lower() == 'true'
 
 OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT', 'http://localhost:4317')
 OTEL_METRICS_EXPORTER_OTLP_ENDPOINT = os.getenv('OTEL_METRICS_EXPORTER_OTLP_ENDPOINT', OTEL_EXPORTER_OTLP_ENDPOINT)
@@ -8,10 +8,10 @@ import uuid
 from types import SimpleNamespace
 from typing import Any
 
-from open_webui.env import VERSION
+from open_webui.env import EVENT_BUS_CACHE_TTL, EVENT_BUS_HANDLER_TIMEOUT, EVENT_OUTBOX_MAX_ATTEMPTS, VERSION
 from open_webui.models.config import Config
 from pydantic import BaseModel, ConfigDict, Field, model_validator
-from open_webui.retrieval.web.utils import validate_url
+from open_webui.retrieval.web.utils import get_ssrf_safe_session, validate_url
 from open_webui.utils.webhook import post_webhook
 
 log = logging.getLogger(__name__)
@@ -861,6 +861,7 @@ async def upsert_event_webhook(webhook: dict[str, Any]) -> dict[str, Any]:
         next_webhooks.append(normalized)
 
     await Config.upsert({EVENT_WEBHOOKS_CONFIG_KEY: next_webhooks})
+    invalidate_event_sink_cache()
     return next(webhook for webhook in next_webhooks if webhook.get('id') == normalized['id'])
 
 
@@ -875,6 +876,7 @@ async def delete_event_webhook(webhook_id: str) -> bool:
         values[LEGACY_WEBHOOK_CONFIG_KEY] = ''
 
     await Config.upsert(values)
+    invalidate_event_sink_cache()
     return True
 
 
@@ -987,7 +989,69 @@ def build_event(
     )
 
 
-async def dispatch_webhook_event(app: Any, event: Event) -> None:
+####################
+# Sink resolution cache
+####################
+
+# Event functions and webhooks are resolved once per EVENT_BUS_CACHE_TTL
+# instead of once per event; a bulk operation emitting thousands of events
+# would otherwise reload them from the database for every single one.
+_event_webhooks_cache: dict[str, Any] = {'expires_at': 0.0, 'webhooks': None}
+_event_functions_cache: dict[str, Any] = {'expires_at': 0.0, 'functions': None}
+_event_handler_cache: dict[str, tuple[Any, Any, frozenset[str] | None]] = {}
+
+
+def invalidate_event_sink_cache() -> None:
+    _event_webhooks_cache['expires_at'] = 0.0
+    _event_functions_cache['expires_at'] = 0.0
+    _event_handler_cache.clear()
+
+
+async def get_cached_event_webhooks() -> list[dict[str, Any]]:
+    now = time.monotonic()
+    if _event_webhooks_cache['webhooks'] is None or now >= _event_webhooks_cache['expires_at']:
+        _event_webhooks_cache['webhooks'] = await get_event_webhooks()
+        _event_webhooks_cache['expires_at'] = now + EVENT_BUS_CACHE_TTL
+    return _event_webhooks_cache['webhooks']
+
+
+async def get_cached_event_functions() -> list[tuple[Any, dict | None]]:
+    """Active event functions paired with their decrypted valves."""
+    from open_webui.models.functions import Functions
+
+    now = time.monotonic()
+    if _event_functions_cache['functions'] is None or now >= _event_functions_cache['expires_at']:
+        functions = await Functions.get_functions_by_type('event', active_only=True)
+        _event_functions_cache['functions'] = [
+            (function, await Functions.get_function_valves_by_id(function.id)) for function in functions
+        ]
+        _event_functions_cache['expires_at'] = now + EVENT_BUS_CACHE_TTL
+    return _event_functions_cache['functions']
+
+
+def _resolve_event_handler(function_id: str, function_module: Any) -> tuple[Any, frozenset[str] | None]:
+    """Return the module's ``event`` handler and the parameters it accepts (None = **kwargs)."""
+    cached = _event_handler_cache.get(function_id)
+    if cached and cached[0] is function_module:
+        return cached[1], cached[2]
+
+    handler = getattr(function_module, 'event', None)
+    params = None
+    if handler:
+        sig = inspect.signature(handler)
+        if not any(param.kind == inspect.Parameter.VAR_KEYWORD for param in sig.parameters.values()):
+            params = frozenset(sig.parameters)
+
+    _event_handler_cache[function_id] = (function_module, handler, params)
+    return handler, params
+
+
+####################
+# Webhook sink
+####################
+
+
+def _webhook_message(app: Any, event: Event) -> tuple[str, str, str | None]:
     name = getattr(getattr(app, 'state', None), 'WEBUI_NAME', 'Open WebUI')
     subject = event.subject or {}
     subject_id = subject.get('id')
@@ -995,90 +1059,211 @@ async def dispatch_webhook_event(app: Any, event: Event) -> None:
     message = event.message or (definition.message if definition else event.event)
     if subject_id:
         message = f'{message} ({subject_id})'
+    return name, message, definition.description if definition else None
+
+
+async def deliver_webhook_event(app: Any, webhook: dict[str, Any], event: Event, session: Any = None) -> bool:
+    name, message, description = _webhook_message(app, event)
+    return await post_webhook(
+        name,
+        webhook['url'],
+        message,
+        event.model_dump(),
+        description=description,
+        session=session,
+    )
+
+
+async def dispatch_webhook_events(app: Any, events: list[Event]) -> None:
+    """Deliver a batch of events, grouped per webhook so each target gets one session and ordered delivery."""
+    from open_webui.models.event_outbox import EventOutboxes
+
+    webhooks = [webhook for webhook in await get_cached_event_webhooks() if webhook.get('url')]
+    if not webhooks or not events:
+        return
+
+    # Resolve group memberships for the whole batch at once instead of per event/webhook.
+    event_users = {event.id: event_user_ids(event) for event in events}
+    user_group_ids = None
+    if any(target.get('type') == 'group' for webhook in webhooks for target in webhook.get('targets') or []):
+        from open_webui.models.groups import Groups
 
-    for webhook in await get_event_webhooks():
-        if not webhook.get('url') or not await event_webhook_matches(webhook, event):
+        all_user_ids = set().union(*event_users.values())
+        groups_by_user = await Groups.get_groups_by_member_ids(list(all_user_ids)) if all_user_ids else {}
+        user_group_ids = {user_id: {group.id for group in groups} for user_id, groups in groups_by_user.items()}
+
+    deliveries: dict[str, list[Event]] = {}
+    for webhook in webhooks:
+        for event in events:
+            if not event_filter_matches(webhook, event.event):
+                continue
+            user_ids = event_users[event.id]
+            groups = (
+                {user_id: user_group_ids.get(user_id, set()) for user_id in user_ids}
+                if user_group_ids is not None
+                else None
+            )
+            if await event_target_matches(webhook.get('targets'), user_ids, groups):
+                deliveries.setdefault(webhook['id'], []).append(event)
+
+    async def deliver(webhook: dict[str, Any], webhook_events: list[Event]) -> None:
+        async with get_ssrf_safe_session() as session:
+            for event in webhook_events:
+                try:
+                    delivered = await asyncio.wait_for(
+                        deliver_webhook_event(app, webhook, event, session=session),
+                        timeout=EVENT_BUS_HANDLER_TIMEOUT,
+                    )
+                except asyncio.TimeoutError:
+                    log.warning('Event webhook %s timed out', webhook.get('id'))
+                    delivered = False
+                except Exception:
+                    log.exception('Event webhook failed for %s', webhook.get('id'))
+                    delivered = False
+
+                if not delivered:
+                    try:
+                        await EventOutboxes.insert(
+                            webhook['id'],
+                            event.model_dump(),
+                            next_attempt_at=int(time.time()) + event_outbox_backoff(1),
+                            last_error='delivery failed',
+                        )
+                    except Exception:
+                        log.exception('Event webhook retry could not be queued for %s', webhook.get('id'))
+
+    webhooks_by_id = {webhook['id']: webhook for webhook in webhooks}
+    await asyncio.gather(
+        *(deliver(webhooks_by_id[webhook_id], webhook_events) for webhook_id, webhook_events in deliveries.items())
+    )
+
+
+def event_outbox_backoff(attempts: int) -> int:
+    """Seconds before retry number ``attempts + 1``: 30s, 60s, 120s, ... capped at one hour."""
+    return min(30 * 2 ** (attempts - 1), 3600)
+
+
+async def retry_event_outbox(app: Any, limit: int = 100) -> int:
+    """Retry due outbox deliveries; returns how many were attempted."""
+    from open_webui.models.event_outbox import EventOutboxes
+
+    entries = await EventOutboxes.claim_due(limit, lease=300)
+    if not entries:
+        return 0
+
+    webhooks = {webhook['id']: webhook for webhook in await get_cached_event_webhooks()}
+    for entry in entries:
+        webhook = webhooks.get(entry.webhook_id)
+        if not webhook or not webhook.get('enabled', True) or not webhook.get('url'):
+            await EventOutboxes.delete_by_id(entry.id)
             continue
 
         try:
-            await post_webhook(
-                name,
-                webhook['url'],
-                message,
-                event.model_dump(),
-                description=definition.description if definition else None,
-            )
+            delivered = await deliver_webhook_event(app, webhook, Event.model_validate(entry.event))
         except Exception:
-            log.exception('Event webhook failed for %s', webhook.get('id'))
-
-
-def schedule_webhook_dispatch(app: Any, event: Event) -> None:
-    try:
-        asyncio.create_task(dispatch_webhook_event(app, event))
-    except RuntimeError:
-        log.exception('Event webhook delivery could not be scheduled for %s', event.event)
+            log.exception('Event webhook retry failed for %s', entry.webhook_id)
+            delivered = False
+
+        attempts = entry.attempts + 1
+        if delivered:
+            await EventOutboxes.delete_by_id(entry.id)
+        elif attempts >= EVENT_OUTBOX_MAX_ATTEMPTS:
+            log.error(
+                'Giving up on event %s for webhook %s after %d attempts',
+                entry.event.get('event'),
+                entry.webhook_id,
+                attempts,
+            )
+            await EventOutboxes.delete_by_id(entry.id)
+        else:
+            await EventOutboxes.reschedule(
+                entry.id,
+                attempts,
+                int(time.time()) + event_outbox_backoff(attempts),
+                last_error='delivery failed',
+            )
+    return len(entries)
 
 
 class WebhookEventSink:
+    async def handle_batch(self, app: Any, batch: list[tuple[Event, Any]]) -> None:
+        await dispatch_webhook_events(app, [event for event, _ in batch])
+
     async def handle_event(self, app: Any, event: Event, request: Any | None = None) -> None:
-        schedule_webhook_dispatch(app, event)
+        await self.handle_batch(app, [(event, request)])
 
 
-async def dispatch_event_functions(app: Any, event: Event, request: Any | None = None) -> None:
-    from open_webui.models.functions import Functions
-    from open_webui.utils.plugin import get_function_module_from_cache
+####################
+# Event function sink
+####################
 
-    context = request or SimpleNamespace(app=app)
-    event_payload = event.model_dump()
+
+async def dispatch_event_functions(app: Any, batch: list[tuple[Event, Any]]) -> None:
+    from open_webui.utils.plugin import get_function_module_from_cache
 
     try:
-        event_functions = await Functions.get_functions_by_type('event', active_only=True)
+        event_functions = await get_cached_event_functions()
     except Exception:
-        log.exception('Event functions could not be loaded for %s', event.event)
+        log.exception('Event functions could not be loaded')
         return
 
-    for function in event_functions:
+    if not event_functions:
+        return
+
+    # Resolve each function's module, valves and handler signature once per batch.
+    context = next((request for _, request in batch if request is not None), None) or SimpleNamespace(app=app)
+    handlers = []
+    for function, valves in event_functions:
         try:
             function_module, _, _ = await get_function_module_from_cache(context, function.id, function=function)
-            handler = getattr(function_module, 'event', None)
+            handler, params = _resolve_event_handler(function.id, function_module)
             if not handler:
                 continue
 
             if hasattr(function_module, 'valves') and hasattr(function_module, 'Valves'):
-                valves = await Functions.get_function_valves_by_id(function.id)
                 function_module.valves = function_module.Valves(**(valves if valves else {}))
 
-            sig = inspect.signature(handler)
-            accepts_kwargs = any(param.kind == inspect.Parameter.VAR_KEYWORD for param in sig.parameters.values())
-            extra_params = {
-                'event': event_payload,
-                '__id__': function.id,
-                '__event__': event,
-                '__event_id__': event.id,
-                '__event_name__': event.event,
-                '__app__': app,
-                '__request__': request,
-            }
-            params = {key: value for key, value in extra_params.items() if accepts_kwargs or key in sig.parameters}
-
-            if inspect.iscoroutinefunction(handler):
-                await handler(**params)
-            else:
-                handler(**params)
+            handlers.append((function.id, handler, params))
         except Exception:
             log.exception('Event function failed for %s', function.id)
 
+    payloads = [event.model_dump() for event, _ in batch]
+
+    # Functions run concurrently, each through the batch in order, so a slow
+    # one only delays its own events.
+    async def run(function_id: str, handler, params) -> None:
+        for (event, request), event_payload in zip(batch, payloads):
+            try:
+                extra_params = {
+                    'event': event_payload,
+                    '__id__': function_id,
+                    '__event__': event,
+                    '__event_id__': event.id,
+                    '__event_name__': event.event,
+                    '__app__': app,
+                    '__request__': request,
+                }
+                if params is not None:
+                    extra_params = {key: value for key, value in extra_params.items() if key in params}
 
-def schedule_event_function_dispatch(app: Any, event: Event, request: Any | None = None) -> None:
-    try:
-        asyncio.create_task(dispatch_event_functions(app, event, request))
-    except RuntimeError:
-        log.exception('Event functions could not be scheduled for %s', event.event)
+                if inspect.iscoroutinefunction(handler):
+                    await asyncio.wait_for(handler(**extra_params), timeout=EVENT_BUS_HANDLER_TIMEOUT)
+                else:
+                    handler(**extra_params)
+            except asyncio.TimeoutError:
+                log.warning('Event function %s timed out on %s', function_id, event.event)
+            except Exception:
+                log.exception('Event function failed for %s', function_id)
+
+    await asyncio.gather(*(run(function_id, handler, params) for function_id, handler, params in handlers))
 
 
 class EventFunctionSink:
+    async def handle_batch(self, app: Any, batch: list[tuple[Event, Any]]) -> None:
+        await dispatch_event_functions(app, batch)
+
     async def handle_event(self, app: Any, event: Event, request: Any | None = None) -> None:
-        schedule_event_function_dispatch(app, event, request)
+        await self.handle_batch(app, [(event, request)])
 
 
 EVENT_SINKS = [EventFunctionSink(), WebhookEventSink()]
@@ -1095,6 +1280,8 @@ async def publish_event(
     data: dict | None = None,
     message: str | None = None,
 ) -> None:
+    from open_webui.utils.event_bus import EVENT_BUS
+
     app = getattr(request_or_app, 'app', request_or_app)
     request = request_or_app if hasattr(request_or_app, 'app') else None
     event_payload = build_event(
@@ -1108,11 +1295,7 @@ async def publish_event(
         message=message,
     )
 
-    for sink in EVENT_SINKS:
-        try:
-            await sink.handle_event(app, event_payload, request=request)
-        except Exception:
-            log.exception('Event sink failed for %s', event_payload.event)
+    await EVENT_BUS.publish(app, event_payload, request=request)
 
 
 async def publish_model_provider_request_failed(
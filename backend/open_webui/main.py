@@ -352,6 +352,30 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(scheduler_worker_loop(app))
 
+    from open_webui.utils.file_jobs import file_job_worker_loop
+
+    app.state.file_job_worker_task = asyncio.create_task(file_job_worker_loop(app))
+
+    from open_webui.utils.file_status import file_status_listener
+
+    asyncio.create_task(file_status_listener(app))
+
+    from open_webui.utils.vector_deletions import vector_deletion_loop
+
+    asyncio.create_task(vector_deletion_loop(app))
+
+    from open_webui.routers.evaluations import leaderboard_recompute_loop
+
+    asyncio.create_task(leaderboard_recompute_loop())
+
+    from open_webui.utils.event_bus import event_outbox_loop
+
+    app.state.event_outbox_task = asyncio.create_task(event_outbox_loop(app))
+
+    from open_webui.utils.chat_message_backfill import chat_message_backfill_loop
+
+    asyncio.create_task(chat_message_backfill_loop(app))
+
     if await Config.get('models.base_models_cache'):
         try:
             await get_all_models(
@@ -415,11 +439,27 @@ async def lifespan(app: FastAPI):
 
     await publish_event(app, EVENTS.SYSTEM_SHUTDOWN_STARTED, source='system')
 
-    # Shutdown: clean up shared resources
+    # Shutdown: flush queued events, then clean up shared resources
+    from open_webui.utils.event_bus import EVENT_BUS
+
+    await EVENT_BUS.stop()
+    app.state.event_outbox_task.cancel()
+
+    from open_webui.utils.file_jobs import FILE_JOB_WORKER
+
+    # Stop claiming before handing the running jobs back.
+    app.state.file_job_worker_task.cancel()
+    await asyncio.gather(app.state.file_job_worker_task, return_exceptions=True)
+    await FILE_JOB_WORKER.stop()
+
     from open_webui.utils.session_pool import close_session
 
     await close_session()
 
+    from open_webui.retrieval.loaders.executor import EXTRACTION_EXECUTOR
+
+    await asyncio.to_thread(EXTRACTION_EXECUTOR.shutdown)
+
     if hasattr(app.state, 'redis_task_command_listener'):
         app.state.redis_task_command_listener.cancel()
 
@@ -566,6 +606,16 @@ async def initialize_runtime_config(app: FastAPI):
             migrate_access_control(model.get('meta', {}))
         await Config.upsert({'evaluation.arena.models': arena_models})
 
+    # With RAG_MODEL_SERVER, one worker starts the shared model process that get_ef / get_rf connect to.
+    from open_webui.retrieval.model_server import start_model_server_supervisor
+
+    start_model_server_supervisor()
+
+    await initialize_retrieval_functions(app)
+
+
+async def initialize_retrieval_functions(app: FastAPI):
+    """Load the embedding and reranking functions; also used by the dedicated file job worker."""
     app.state.EMBEDDING_FUNCTION = None
     app.state.RERANKING_FUNCTION = None
     app.state.ef = None
@@ -2068,6 +2118,17 @@ async def get_event_catalog(user=Depends(get_admin_user)):
     }
 
 
+@app.get('/api/events/metrics')
+async def get_event_metrics(user=Depends(get_admin_user)):
+    from open_webui.models.event_outbox import EventOutboxes
+    from open_webui.utils.event_bus import EVENT_BUS
+
+    return {
+        **EVENT_BUS.stats(),
+        'outbox_pending': await EventOutboxes.count(),
+    }
+
+
 @app.get('/api/events/webhooks')
 async def get_event_webhooks_api(user=Depends(get_admin_user)):
     return await get_event_webhooks()
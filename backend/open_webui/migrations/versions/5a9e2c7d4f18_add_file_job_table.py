@@ -0,0 +1,49 @@
+"""add file job table
+
+Revision ID: 5a9e2c7d4f18
+Revises: e3f1a8c5d742
+Create Date: 2026-10-19 18:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a9e2c7d4f18'
+down_revision: Union[str, None] = 'e3f1a8c5d742'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'file_job' not in inspector.get_table_names():
+        op.create_table(
+            'file_job',
+            sa.Column('id', sa.Text(), primary_key=True),
+            sa.Column('file_id', sa.Text(), nullable=False),
+            sa.Column('user_id', sa.Text(), nullable=False),
+            sa.Column('lane', sa.Text(), nullable=False),
+            sa.Column('payload', sa.JSON(), nullable=False),
+            sa.Column('status', sa.Text(), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('next_attempt_at', sa.BigInteger(), nullable=False),
+            sa.Column('lease_id', sa.Text(), nullable=True),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.BigInteger(), nullable=False),
+            sa.Column('updated_at', sa.BigInteger(), nullable=False),
+        )
+        op.create_index('ix_file_job_lane_next_attempt_at', 'file_job', ['lane', 'next_attempt_at'])
+        op.create_index('ix_file_job_file_id', 'file_job', ['file_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_file_job_file_id', table_name='file_job')
+    op.drop_index('ix_file_job_lane_next_attempt_at', table_name='file_job')
+    op.drop_table('file_job')
@@ -0,0 +1,49 @@
+"""add leaderboard tables
+
+Revision ID: 5b8e1f0c2a93
+Revises: 42e2978c7933
+Create Date: 2026-10-19 09:12:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '5b8e1f0c2a93'
+down_revision: Union[str, None] = '42e2978c7933'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+
+    if 'leaderboard_rating' not in tables:
+        op.create_table(
+            'leaderboard_rating',
+            sa.Column('model_id', sa.Text(), primary_key=True),
+            sa.Column('rating', sa.Float(), nullable=False),
+            sa.Column('won', sa.BigInteger(), nullable=False),
+            sa.Column('lost', sa.BigInteger(), nullable=False),
+            sa.Column('tags', sa.JSON(), nullable=True),
+            sa.Column('updated_at', sa.BigInteger(), nullable=False),
+        )
+
+    if 'leaderboard_tag_embedding' not in tables:
+        op.create_table(
+            'leaderboard_tag_embedding',
+            sa.Column('model', sa.Text(), primary_key=True),
+            sa.Column('tag', sa.Text(), primary_key=True),
+            sa.Column('embedding', sa.LargeBinary(), nullable=False),
+            sa.Column('created_at', sa.BigInteger(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('leaderboard_tag_embedding')
+    op.drop_table('leaderboard_rating')
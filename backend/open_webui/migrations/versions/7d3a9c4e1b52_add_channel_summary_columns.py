@@ -0,0 +1,67 @@
+"""add channel summary columns
+
+Revision ID: 7d3a9c4e1b52
+Revises: 5b8e1f0c2a93
+Create Date: 2026-10-19 11:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3a9c4e1b52'
+down_revision: Union[str, None] = '5b8e1f0c2a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    channel_cols = {c['name'] for c in inspector.get_columns('channel')}
+    if 'last_message_at' not in channel_cols:
+        op.add_column('channel', sa.Column('last_message_at', sa.BigInteger(), nullable=True))
+
+    cm_cols = {c['name'] for c in inspector.get_columns('channel_member')}
+    if 'unread_count' not in cm_cols:
+        op.add_column(
+            'channel_member',
+            sa.Column('unread_count', sa.BigInteger(), nullable=False, server_default='0'),
+        )
+
+    # Backfill from existing messages, mirroring get_unread_message_count:
+    # top-level messages from other users since the member last read the channel.
+    conn.execute(
+        sa.text(
+            'UPDATE channel SET last_message_at = '
+            '(SELECT MAX(message.created_at) FROM message WHERE message.channel_id = channel.id)'
+        )
+    )
+    conn.execute(
+        sa.text(
+            'UPDATE channel_member SET unread_count = ('
+            'SELECT COUNT(message.id) FROM message '
+            'WHERE message.channel_id = channel_member.channel_id '
+            'AND message.parent_id IS NULL '
+            'AND message.user_id != channel_member.user_id '
+            'AND message.created_at > COALESCE(channel_member.last_read_at, 0))'
+        )
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    cm_cols = {c['name'] for c in inspector.get_columns('channel_member')}
+    if 'unread_count' in cm_cols:
+        op.drop_column('channel_member', 'unread_count')
+
+    channel_cols = {c['name'] for c in inspector.get_columns('channel')}
+    if 'last_message_at' in channel_cols:
+        op.drop_column('channel', 'last_message_at')
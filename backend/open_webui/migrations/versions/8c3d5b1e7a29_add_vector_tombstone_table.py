@@ -0,0 +1,49 @@
+"""add vector tombstone table
+
+Revision ID: 8c3d5b1e7a29
+Revises: 5a9e2c7d4f18
+Create Date: 2026-10-19 20:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3d5b1e7a29'
+down_revision: Union[str, None] = '5a9e2c7d4f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'vector_tombstone' not in inspector.get_table_names():
+        op.create_table(
+            'vector_tombstone',
+            sa.Column('id', sa.Text(), primary_key=True),
+            sa.Column('collection_name', sa.Text(), nullable=False),
+            sa.Column('file_id', sa.Text(), nullable=True),
+            sa.Column('hash', sa.Text(), nullable=True),
+            sa.Column('drop_collection', sa.Boolean(), nullable=False, server_default=sa.sql.expression.false()),
+            sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('next_attempt_at', sa.BigInteger(), nullable=False),
+            sa.Column('lease_id', sa.Text(), nullable=True),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.BigInteger(), nullable=False),
+        )
+        op.create_index(
+            'ix_vector_tombstone_collection_name_file_id', 'vector_tombstone', ['collection_name', 'file_id']
+        )
+        op.create_index('ix_vector_tombstone_next_attempt_at', 'vector_tombstone', ['next_attempt_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_vector_tombstone_next_attempt_at', table_name='vector_tombstone')
+    op.drop_index('ix_vector_tombstone_collection_name_file_id', table_name='vector_tombstone')
+    op.drop_table('vector_tombstone')
@@ -0,0 +1,34 @@
+"""add chat_message token_counts
+
+Revision ID: a4b7d2e9f316
+Revises: c1e4f7a92d68
+Create Date: 2026-10-19 13:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4b7d2e9f316'
+down_revision: Union[str, None] = 'c1e4f7a92d68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    columns = {c['name'] for c in inspector.get_columns('chat_message')}
+    if 'token_counts' not in columns:
+        # {tokenizer: count}; filled lazily by utils/token_accounting.py
+        op.add_column('chat_message', sa.Column('token_counts', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    columns = {c['name'] for c in inspector.get_columns('chat_message')}
+    if 'token_counts' in columns:
+        op.drop_column('chat_message', 'token_counts')
@@ -0,0 +1,56 @@
+"""add job state table
+
+Revision ID: b7e4c2a9d153
+Revises: 8c3d5b1e7a29
+Create Date: 2026-10-19 22:40:00.000000
+
+"""
+
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4c2a9d153'
+down_revision: Union[str, None] = '8c3d5b1e7a29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Background job progress previously stored as a config key.
+MOVED_CONFIG_KEYS = ['chat_message.backfill']
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'job_state' not in inspector.get_table_names():
+        op.create_table(
+            'job_state',
+            sa.Column('name', sa.Text(), primary_key=True),
+            sa.Column('data', sa.JSON(), nullable=False),
+            sa.Column('updated_at', sa.BigInteger(), nullable=False),
+        )
+
+    if 'config' not in inspector.get_table_names():
+        return
+
+    config = sa.table('config', sa.column('key', sa.Text()), sa.column('value', sa.JSON()))
+    job_state = sa.table(
+        'job_state',
+        sa.column('name', sa.Text()),
+        sa.column('data', sa.JSON()),
+        sa.column('updated_at', sa.BigInteger()),
+    )
+    rows = conn.execute(sa.select(config.c.key, config.c.value).where(config.c.key.in_(MOVED_CONFIG_KEYS))).fetchall()
+    for key, value in rows:
+        if isinstance(value, dict):
+            conn.execute(sa.insert(job_state).values(name=key, data=value, updated_at=int(time.time())))
+        conn.execute(sa.delete(config).where(config.c.key == key))
+
+
+def downgrade() -> None:
+    op.drop_table('job_state')
@@ -0,0 +1,42 @@
+"""add event outbox table
+
+Revision ID: c1e4f7a92d68
+Revises: 7d3a9c4e1b52
+Create Date: 2026-10-19 13:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1e4f7a92d68'
+down_revision: Union[str, None] = '7d3a9c4e1b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'event_outbox' not in inspector.get_table_names():
+        op.create_table(
+            'event_outbox',
+            sa.Column('id', sa.Text(), primary_key=True),
+            sa.Column('webhook_id', sa.Text(), nullable=False),
+            sa.Column('event', sa.JSON(), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('next_attempt_at', sa.BigInteger(), nullable=False),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.BigInteger(), nullable=False),
+        )
+        op.create_index('ix_event_outbox_next_attempt_at', 'event_outbox', ['next_attempt_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_event_outbox_next_attempt_at', table_name='event_outbox')
+    op.drop_table('event_outbox')
@@ -0,0 +1,39 @@
+"""add lease and run request columns to job_state
+
+Revision ID: d2f8a61c5e37
+Revises: b7e4c2a9d153
+Create Date: 2026-10-19 23:55:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f8a61c5e37'
+down_revision: Union[str, None] = 'b7e4c2a9d153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name'] for column in inspector.get_columns('job_state')}
+
+    with op.batch_alter_table('job_state') as batch_op:
+        if 'lease_owner' not in columns:
+            batch_op.add_column(sa.Column('lease_owner', sa.Text(), nullable=True))
+        if 'lease_until' not in columns:
+            batch_op.add_column(sa.Column('lease_until', sa.BigInteger(), nullable=True))
+        if 'requested_at' not in columns:
+            batch_op.add_column(sa.Column('requested_at', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('job_state') as batch_op:
+        batch_op.drop_column('requested_at')
+        batch_op.drop_column('lease_until')
+        batch_op.drop_column('lease_owner')
@@ -0,0 +1,36 @@
+"""add chat keyset pagination index
+
+Revision ID: e3f1a8c5d742
+Revises: a4b7d2e9f316
+Create Date: 2026-10-19 14:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f1a8c5d742'
+down_revision: Union[str, None] = 'a4b7d2e9f316'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'chat_user_id_updated_at_id_idx'
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    indexes = {i['name'] for i in inspector.get_indexes('chat')}
+    if INDEX_NAME not in indexes:
+        # Serves the per-user chat lists ordered and paginated by (updated_at, id).
+        op.create_index(INDEX_NAME, 'chat', ['user_id', 'updated_at', 'id'])
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    indexes = {i['name'] for i in inspector.get_indexes('chat')}
+    if INDEX_NAME in indexes:
+        op.drop_index(INDEX_NAME, table_name='chat')
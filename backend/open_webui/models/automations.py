@@ -116,6 +116,16 @@ class AutomationListResponse(BaseModel):
 ####################
 
 
+async def _notify_scheduler() -> None:
+    """Wake the scheduler so a new or changed next_run_at is picked up promptly."""
+    try:
+        from open_webui.utils.automations import notify_scheduler
+
+        await notify_scheduler()
+    except Exception:
+        log.debug('Failed to notify automation scheduler', exc_info=True)
+
+
 class AutomationTable:
     async def insert(
         self,
@@ -140,6 +150,7 @@ class AutomationTable:
             db.add(row)
             await db.commit()
             await db.refresh(row)
+            await _notify_scheduler()
             return AutomationModel.model_validate(row)
 
     async def count_by_user(self, user_id: str, db: Optional[AsyncSession] = None) -> int:
@@ -225,6 +236,7 @@ class AutomationTable:
             row.updated_at = int(time.time_ns())
             await db.commit()
             await db.refresh(row)
+            await _notify_scheduler()
             return AutomationModel.model_validate(row)
 
     async def toggle(
@@ -242,6 +254,7 @@ class AutomationTable:
             row.updated_at = int(time.time_ns())
             await db.commit()
             await db.refresh(row)
+            await _notify_scheduler()
             return AutomationModel.model_validate(row)
 
     async def delete(self, id: str, db: Optional[AsyncSession] = None) -> bool:
@@ -253,6 +266,17 @@ class AutomationTable:
             await db.commit()
             return True
 
+    async def get_next_run_at(self, db: Optional[AsyncSession] = None) -> Optional[int]:
+        """Earliest next_run_at across active automations (epoch ns), if any."""
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                select(func.min(Automation.next_run_at)).where(
+                    Automation.is_active == True,
+                    Automation.next_run_at.isnot(None),
+                )
+            )
+            return result.scalar()
+
     async def claim_due(self, now_ns: int, limit: int = 10, db: Optional[AsyncSession] = None) -> list[AutomationModel]:
         """
         Atomically claim due automations for execution.
@@ -261,6 +285,12 @@ class AutomationTable:
         double-claimed. On PostgreSQL, uses FOR UPDATE SKIP LOCKED
         for zero-contention distributed work claiming.
         """
+        return [automation for automation, _ in await self.claim_due_with_schedule(now_ns, limit=limit, db=db)]
+
+    async def claim_due_with_schedule(
+        self, now_ns: int, limit: int = 10, db: Optional[AsyncSession] = None
+    ) -> list[tuple[AutomationModel, int]]:
+        """Like claim_due, but also returns the next_run_at each row was claimed for."""
         async with get_async_db_context(db) as db:
             stmt = (
                 select(Automation)
@@ -290,13 +320,14 @@ class AutomationTable:
                 tz_result = await db.execute(select(User.id, User.timezone).where(User.id.in_(user_ids)))
                 timezone_by_user_id = {uid: tz for uid, tz in tz_result.all()}
 
+            scheduled_at = {row.id: row.next_run_at for row in rows}
             for row in rows:
                 row.last_run_at = now_ns
                 row.next_run_at = next_run_ns(row.data.get('rrule', ''), tz=timezone_by_user_id.get(row.user_id))
 
             await db.commit()
 
-            return [AutomationModel.model_validate(r) for r in rows]
+            return [(AutomationModel.model_validate(r), scheduled_at[r.id]) for r in rows]
 
 
 ####################
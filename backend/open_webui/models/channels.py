@@ -58,6 +58,9 @@ class Channel(Base):
     updated_at = Column(BigInteger)
     updated_by = Column(Text, nullable=True)
 
+    # Denormalized; maintained by Messages on insert/delete.
+    last_message_at = Column(BigInteger, nullable=True)
+
     archived_at = Column(BigInteger, nullable=True)
     archived_by = Column(Text, nullable=True)
 
@@ -87,6 +90,8 @@ class ChannelModel(BaseModel):
     updated_at: int  # timestamp in epoch (time_ns)
     updated_by: Optional[str] = None
 
+    last_message_at: Optional[int] = None  # timestamp in epoch (time_ns)
+
     archived_at: Optional[int] = None  # timestamp in epoch (time_ns)
     archived_by: Optional[str] = None
 
@@ -120,6 +125,10 @@ class ChannelMember(Base):
 
     last_read_at = Column(BigInteger, nullable=True)
 
+    # Top-level messages from other users since last_read_at; maintained by
+    # Messages on insert/delete and reset by update_member_last_read_at.
+    unread_count = Column(BigInteger, nullable=False, default=0)
+
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
@@ -149,6 +158,7 @@ class ChannelMemberModel(BaseModel):
     left_at: Optional[int] = None  # timestamp in epoch (time_ns)
 
     last_read_at: Optional[int] = None  # timestamp in epoch (time_ns)
+    unread_count: int = 0
 
     created_at: Optional[int] = None  # timestamp in epoch (time_ns)
     updated_at: Optional[int] = None  # timestamp in epoch (time_ns)
@@ -294,17 +304,38 @@ class ChannelTable:
 
         return users
 
+    async def _count_unread_since(
+        self, db: AsyncSession, channel_id: str, user_ids: set[str], since: int
+    ) -> dict[str, int]:
+        """Unread counts for members joining with ``last_read_at=since``, as Messages maintains them afterwards."""
+        from open_webui.models.messages import Message
+
+        result = await db.execute(
+            select(Message.user_id, func.count(Message.id))
+            .filter(
+                Message.channel_id == channel_id,
+                Message.parent_id.is_(None),
+                Message.created_at > since,
+            )
+            .group_by(Message.user_id)
+        )
+        by_author = dict(result.all())
+        total = sum(by_author.values())
+        return {uid: total - by_author.get(uid, 0) for uid in user_ids}
+
     def _create_membership_models(
         self,
         channel_id: str,
         invited_by: str,
         user_ids: set[str],
+        now: Optional[int] = None,
+        unread_counts: Optional[dict[str, int]] = None,
     ) -> list[ChannelMember]:
         """
         Takes a set of NEW user IDs (already filtered to exclude existing members).
         Returns ORM ChannelMember objects to be added.
         """
-        now = int(time.time_ns())
+        now = now or int(time.time_ns())
         memberships = []
 
         for uid in user_ids:
@@ -322,6 +353,7 @@ class ChannelTable:
                     'joined_at': now,
                     'left_at': None,
                     'last_read_at': now,
+                    'unread_count': (unread_counts or {}).get(uid, 0),
                     'created_at': now,
                     'updated_at': now,
                 }
@@ -392,11 +424,21 @@ class ChannelTable:
             ]
 
     async def get_channels_by_user_id(self, user_id: str, db: Optional[AsyncSession] = None) -> list[ChannelModel]:
+        return [channel for channel, _ in await self.get_channels_with_unread_count_by_user_id(user_id, db=db)]
+
+    async def get_channels_with_unread_count_by_user_id(
+        self, user_id: str, db: Optional[AsyncSession] = None
+    ) -> list[tuple[ChannelModel, int]]:
+        """
+        The user's channels with their unread count, read from the user's
+        membership row in the same query as the channel.  Channels the user
+        only reads through access grants and never joined count 0.
+        """
         async with get_async_db_context(db) as db:
             user_group_ids = [group.id for group in await Groups.get_groups_by_member_id(user_id, db=db)]
 
             result = await db.execute(
-                select(Channel)
+                select(Channel, ChannelMember.unread_count)
                 .join(ChannelMember, Channel.id == ChannelMember.channel_id)
                 .filter(
                     Channel.deleted_at.is_(None),
@@ -406,27 +448,36 @@ class ChannelTable:
                     ChannelMember.is_active.is_(True),
                 )
             )
-            membership_channels = result.scalars().all()
-
-            stmt = select(Channel).filter(
-                Channel.deleted_at.is_(None),
-                Channel.archived_at.is_(None),
-                or_(
-                    Channel.type.is_(None),  # True NULL/None
-                    Channel.type == '',  # Empty string
-                    and_(Channel.type != 'group', Channel.type != 'dm'),
-                ),
+            membership_channels = result.all()
+
+            # Standard channels are visible through access grants, which filter their own query.
+            stmt = (
+                select(Channel, ChannelMember.unread_count)
+                .outerjoin(
+                    ChannelMember,
+                    and_(ChannelMember.channel_id == Channel.id, ChannelMember.user_id == user_id),
+                )
+                .filter(
+                    Channel.deleted_at.is_(None),
+                    Channel.archived_at.is_(None),
+                    or_(
+                        Channel.type.is_(None),  # True NULL/None
+                        Channel.type == '',  # Empty string
+                        and_(Channel.type != 'group', Channel.type != 'dm'),
+                    ),
+                )
             )
             stmt = self._has_permission(db, stmt, {'user_id': user_id, 'group_ids': user_group_ids})
 
             result = await db.execute(stmt)
-            standard_channels = result.scalars().all()
+            standard_channels = result.all()
 
             all_channels = list(membership_channels) + list(standard_channels)
-            channel_ids = [c.id for c in all_channels]
+            channel_ids = [c.id for c, _ in all_channels]
             grants_map = await AccessGrants.get_grants_by_resources('channel', channel_ids, db=db)
             return [
-                await self._to_channel_model(c, access_grants=grants_map.get(c.id, []), db=db) for c in all_channels
+                (await self._to_channel_model(c, access_grants=grants_map.get(c.id, []), db=db), unread_count or 0)
+                for c, unread_count in all_channels
             ]
 
     async def get_dm_channel_by_user_ids(
@@ -484,7 +535,9 @@ class ChannelTable:
             if not new_user_ids:
                 return []  # Nothing to add
 
-            new_memberships = self._create_membership_models(channel_id, invited_by, new_user_ids)
+            now = int(time.time_ns())
+            unread_counts = await self._count_unread_since(db, channel_id, new_user_ids, now)
+            new_memberships = self._create_membership_models(channel_id, invited_by, new_user_ids, now, unread_counts)
 
             db.add_all(new_memberships)
             await db.commit()
@@ -541,6 +594,8 @@ class ChannelTable:
                 return ChannelMemberModel.model_validate(existing_membership)
 
             # Create new membership
+            now = int(time.time_ns())
+            unread_counts = await self._count_unread_since(db, channel_id, {user_id}, now)
             channel_member = ChannelMemberModel(
                 **{
                     'id': str(uuid.uuid4()),
@@ -552,7 +607,8 @@ class ChannelTable:
                     'is_channel_pinned': False,
                     'joined_at': int(time.time_ns()),
                     'left_at': None,
-                    'last_read_at': int(time.time_ns()),
+                    'last_read_at': now,
+                    'unread_count': unread_counts[user_id],
                     'created_at': int(time.time_ns()),
                     'updated_at': int(time.time_ns()),
                 }
@@ -604,6 +660,18 @@ class ChannelTable:
             memberships = result.scalars().all()
             return [ChannelMemberModel.model_validate(membership) for membership in memberships]
 
+    async def get_members_by_channel_ids(
+        self, channel_ids: list[str], db: Optional[AsyncSession] = None
+    ) -> dict[str, list[ChannelMemberModel]]:
+        if not channel_ids:
+            return {}
+        async with get_async_db_context(db) as db:
+            result = await db.execute(select(ChannelMember).filter(ChannelMember.channel_id.in_(channel_ids)))
+            members = {}
+            for membership in result.scalars().all():
+                members.setdefault(membership.channel_id, []).append(ChannelMemberModel.model_validate(membership))
+            return members
+
     async def pin_channel(
         self,
         channel_id: str,
@@ -643,6 +711,7 @@ class ChannelTable:
                 return False
 
             membership.last_read_at = int(time.time_ns())
+            membership.unread_count = 0
             membership.updated_at = int(time.time_ns())
 
             await db.commit()
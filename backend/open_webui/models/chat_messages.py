@@ -20,6 +20,8 @@ from sqlalchemy import (
     cast,
     delete,
     func,
+    insert,
+    literal,
     select,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -112,6 +114,9 @@ class ChatMessage(Base):
     # Context compaction checkpoint
     context_summary = Column(Text, nullable=True)
 
+    # Cached token counts per tokenizer ({tokenizer: count}), reset on edit
+    token_counts = Column(JSON, nullable=True)
+
     # Timestamps
     created_at = Column(BigInteger, index=True)
     updated_at = Column(BigInteger)
@@ -147,6 +152,7 @@ class ChatMessageModel(BaseModel):
     error: Optional[dict | str] = None
     usage: Optional[dict] = None
     context_summary: Optional[str] = None
+    token_counts: Optional[dict] = None
     created_at: int
     updated_at: int
 
@@ -157,6 +163,26 @@ class ChatMessageModel(BaseModel):
 
 
 class ChatMessageTable:
+    # Longest parent chain followed by get_message_branch; bounds the
+    # recursive query if parent links ever form a cycle.
+    MAX_BRANCH_DEPTH = 10000
+
+    def __init__(self):
+        # Bumped on every write so request-scoped history views
+        # (utils/chat_history.py) can tell their cached messages are stale;
+        # bulk deletes without a single chat id bump the global generation.
+        self._generation = 0
+        self._versions: dict[str, int] = {}
+
+    def get_version(self, chat_id: str) -> tuple[int, int]:
+        return self._generation, self._versions.get(chat_id, 0)
+
+    def bump_version(self, chat_id: str | None = None) -> None:
+        if chat_id is None:
+            self._generation += 1
+        else:
+            self._versions[chat_id] = self._versions.get(chat_id, 0) + 1
+
     async def upsert_message(
         self,
         message_id: str,
@@ -168,7 +194,6 @@ class ChatMessageTable:
         """Insert or update a chat message."""
         async with get_async_db_context(db) as db:
             now = int(time.time())
-            timestamp = data.get('timestamp', now)
 
             # Use composite ID: {chat_id}-{message_id}
             composite_id = f'{chat_id}-{message_id}'
@@ -200,6 +225,8 @@ class ChatMessageTable:
                     existing.error = data.get('error')
                 if 'context_summary' in data or 'contextSummary' in data:
                     existing.context_summary = data.get('context_summary') or data.get('contextSummary')
+                if any(key in data for key in ('content', 'output', 'files')):
+                    existing.token_counts = None
                 # Extract and normalize usage
                 usage = get_usage(data)
                 if usage:
@@ -207,37 +234,72 @@ class ChatMessageTable:
                     existing.usage = existing_usage if usage == existing_usage else merge_usage(existing_usage, usage)
                 existing.updated_at = now
                 await db.commit()
+                self.bump_version(chat_id)
                 await db.refresh(existing)
                 return ChatMessageModel.model_validate(existing)
             else:
                 # Insert new
-                # Extract and normalize usage
-                usage = get_usage(data)
-                message = ChatMessage(
-                    id=composite_id,
-                    chat_id=chat_id,
-                    user_id=user_id,
-                    role=data.get('role', 'user'),
-                    parent_id=data.get('parent_id') or data.get('parentId'),
-                    content=data.get('content'),
-                    output=data.get('output'),
-                    model_id=data.get('model_id') or data.get('model'),
-                    files=data.get('files'),
-                    sources=data.get('sources'),
-                    embeds=data.get('embeds'),
-                    done=data.get('done', True),
-                    status_history=data.get('status_history') or data.get('statusHistory'),
-                    error=data.get('error'),
-                    usage=usage,
-                    context_summary=data.get('context_summary') or data.get('contextSummary'),
-                    created_at=timestamp,
-                    updated_at=now,
-                )
+                message = ChatMessage(**self._message_row(message_id, chat_id, user_id, data, now))
                 db.add(message)
                 await db.commit()
+                self.bump_version(chat_id)
                 await db.refresh(message)
                 return ChatMessageModel.model_validate(message)
 
+    @staticmethod
+    def _message_row(message_id: str, chat_id: str, user_id: str, data: dict, now: int) -> dict:
+        """Column values for a new row; ``data`` is a history message dict."""
+        return {
+            'id': f'{chat_id}-{message_id}',
+            'chat_id': chat_id,
+            'user_id': user_id,
+            'role': data.get('role', 'user'),
+            'parent_id': data.get('parent_id') or data.get('parentId'),
+            'content': data.get('content'),
+            'output': data.get('output'),
+            'model_id': data.get('model_id') or data.get('model'),
+            'files': data.get('files'),
+            'sources': data.get('sources'),
+            'embeds': data.get('embeds'),
+            'done': data.get('done', True),
+            'status_history': data.get('status_history') or data.get('statusHistory'),
+            'error': data.get('error'),
+            # Extract and normalize usage
+            'usage': get_usage(data),
+            'context_summary': data.get('context_summary') or data.get('contextSummary'),
+            'created_at': data.get('timestamp', now),
+            'updated_at': now,
+        }
+
+    async def insert_messages(
+        self,
+        messages_by_chat: dict[str, tuple[str, dict[str, dict]]],
+        db: Optional[AsyncSession] = None,
+    ) -> int:
+        """Bulk-insert history messages for new chats: ``{chat_id: (user_id, {message_id: message})}``.
+
+        One multi-row INSERT instead of an upsert (and commit) per message;
+        only for messages that have no rows yet, e.g. freshly imported chats
+        or the ones ``utils/chat_message_backfill.py`` found missing.
+        """
+        now = int(time.time())
+        rows = [
+            self._message_row(message_id, chat_id, user_id, message, now)
+            for chat_id, (user_id, messages) in messages_by_chat.items()
+            for message_id, message in messages.items()
+            if isinstance(message, dict) and message.get('role')
+        ]
+        if not rows:
+            return 0
+
+        async with get_async_db_context(db) as db:
+            await db.execute(insert(ChatMessage), rows)
+            await db.commit()
+
+        for chat_id in messages_by_chat:
+            self.bump_version(chat_id)
+        return len(rows)
+
     async def get_message_by_id(self, id: str, db: Optional[AsyncSession] = None) -> Optional[ChatMessageModel]:
         async with get_async_db_context(db) as db:
             message = await db.get(ChatMessage, id)
@@ -257,11 +319,36 @@ class ChatMessageTable:
         'model_id': 'model',
         'status_history': 'statusHistory',
         'context_summary': 'contextSummary',
+        'token_counts': 'tokenCounts',
         'created_at': 'timestamp',
     }
     # DB-internal columns excluded from the reconstructed message dict.
     EXCLUDED_COLUMNS = frozenset({'id', 'chat_id', 'user_id', 'updated_at'})
 
+    def _row_to_message(self, row: ChatMessage, chat_id: str) -> dict:
+        # Strip the composite-id prefix ("{chat_id}-") to recover the
+        # original message_id used as map key.
+        prefix = f'{chat_id}-'
+        msg_id = row.id[len(prefix) :] if row.id.startswith(prefix) else row.id
+
+        msg: dict = {'id': msg_id}
+        for column in ChatMessage.__table__.columns:
+            if column.key in self.EXCLUDED_COLUMNS:
+                continue
+            val = getattr(row, column.key)
+            if val is None:
+                continue
+            msg[self.DB_TO_JSON_KEY_MAP.get(column.key, column.key)] = val
+
+        # Ensure content always has a value
+        msg.setdefault('content', '')
+
+        # Mirror usage into info.usage for callers that read it there
+        if 'usage' in msg:
+            msg['info'] = {'usage': msg['usage']}
+
+        return msg
+
     async def get_messages_map_by_chat_id(self, chat_id: str, db: Optional[AsyncSession] = None) -> Optional[dict]:
         """Build a {message_id: message_dict} map from chat_message rows.
 
@@ -277,34 +364,10 @@ class ChatMessageTable:
         if not rows:
             return None
 
-        # Strip the composite-id prefix ("{chat_id}-") to recover the
-        # original message_id used as map key.
-        prefix = f'{chat_id}-'
-        prefix_len = len(prefix)
-        col_keys = [c.key for c in ChatMessage.__table__.columns]
-
         messages_map: dict[str, dict] = {}
         for row in rows:
-            msg_id = row.id[prefix_len:] if row.id.startswith(prefix) else row.id
-
-            msg: dict = {'id': msg_id}
-            for key in col_keys:
-                if key in self.EXCLUDED_COLUMNS:
-                    continue
-                val = getattr(row, key)
-                if val is None:
-                    continue
-                json_key = self.DB_TO_JSON_KEY_MAP.get(key, key)
-                msg[json_key] = val
-
-            # Ensure content always has a value
-            msg.setdefault('content', '')
-
-            # Mirror usage into info.usage for callers that read it there
-            if 'usage' in msg:
-                msg['info'] = {'usage': msg['usage']}
-
-            messages_map[msg_id] = msg
+            msg = self._row_to_message(row, chat_id)
+            messages_map[msg['id']] = msg
 
         # Reconstruct childrenIds from parentId links so that the map
         # is fully navigable (callers like the frontend rely on this).
@@ -325,6 +388,89 @@ class ChatMessageTable:
 
         return messages_map
 
+    async def get_message_branch(
+        self, chat_id: str, message_id: str, db: Optional[AsyncSession] = None
+    ) -> Optional[list[dict]]:
+        """Messages from the root to ``message_id``, as ``get_message_list`` would return them.
+
+        Follows ``parent_id`` with a recursive query so only the active branch
+        is loaded, not every sibling branch of the chat.  Messages have the
+        same shape as in ``get_messages_map_by_chat_id`` but no ``childrenIds``
+        (siblings are not loaded).  Returns None if ``message_id`` has no row.
+        If the first message still has a ``parentId``, the chain is broken
+        (missing rows) and callers should fall back to the full map.
+        """
+        prefix = f'{chat_id}-'
+        table = ChatMessage.__table__
+
+        branch = (
+            select(table.c.id, table.c.parent_id, literal(0).label('depth'))
+            .where(table.c.id == f'{prefix}{message_id}')
+            .cte('branch', recursive=True)
+        )
+        branch = branch.union_all(
+            select(table.c.id, table.c.parent_id, branch.c.depth + 1)
+            .where(table.c.chat_id == chat_id)
+            .where(table.c.id == literal(prefix) + branch.c.parent_id)
+            .where(branch.c.depth < self.MAX_BRANCH_DEPTH)
+        )
+
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                select(ChatMessage).join(branch, ChatMessage.id == branch.c.id).order_by(branch.c.depth.asc())
+            )
+            rows = result.scalars().all()
+
+        if not rows:
+            return None
+
+        # Leaf first; stop at a repeated message like get_message_list does on cycles.
+        message_list = []
+        visited_ids = set()
+        for row in rows:
+            if row.id in visited_ids:
+                break
+            visited_ids.add(row.id)
+            message_list.append(self._row_to_message(row, chat_id))
+
+        message_list.reverse()
+        return message_list
+
+    async def get_message_ids_by_chat_ids(
+        self, chat_ids: list[str], db: Optional[AsyncSession] = None
+    ) -> dict[str, set[str]]:
+        """Message ids (without the composite prefix) that already have rows, per chat."""
+        if not chat_ids:
+            return {}
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                select(ChatMessage.chat_id, ChatMessage.id).where(ChatMessage.chat_id.in_(chat_ids))
+            )
+            message_ids: dict[str, set[str]] = {}
+            for chat_id, row_id in result.all():
+                message_ids.setdefault(chat_id, set()).add(row_id[len(chat_id) + 1 :])
+            return message_ids
+
+    async def count_messages_by_chat_id(self, chat_id: str, db: Optional[AsyncSession] = None) -> int:
+        async with get_async_db_context(db) as db:
+            result = await db.execute(select(func.count(ChatMessage.id)).filter_by(chat_id=chat_id))
+            return result.scalar() or 0
+
+    async def update_token_counts(
+        self, chat_id: str, counts: dict[str, dict[str, int]], db: Optional[AsyncSession] = None
+    ) -> None:
+        """Merge {message_id: {tokenizer: count}} into the rows' cached token counts."""
+        if not counts:
+            return
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                select(ChatMessage).where(ChatMessage.id.in_([f'{chat_id}-{message_id}' for message_id in counts]))
+            )
+            prefix_len = len(chat_id) + 1
+            for row in result.scalars().all():
+                row.token_counts = {**(row.token_counts or {}), **counts.get(row.id[prefix_len:], {})}
+            await db.commit()
+
     async def get_messages_by_user_id(
         self,
         user_id: str,
@@ -400,6 +546,7 @@ class ChatMessageTable:
         async with get_async_db_context(db) as db:
             await db.execute(delete(ChatMessage).filter_by(chat_id=chat_id))
             await db.commit()
+            self.bump_version(chat_id)
             return True
 
     async def delete_message_ids_by_chat_id(
@@ -418,6 +565,7 @@ class ChatMessageTable:
                 .where(ChatMessage.id.in_({f'{chat_id}-{mid}' for mid in message_ids}))
             )
             await db.commit()
+            self.bump_version(chat_id)
             return True
 
     # Analytics methods
@@ -6,6 +6,7 @@ import json
 import logging
 import time
 import uuid
+from typing import AsyncIterator
 
 # local imports
 from open_webui.internal.db import Base, JSONField, get_async_db_context
@@ -13,7 +14,7 @@ from open_webui.models.automations import AutomationRun
 from open_webui.models.chat_messages import ChatMessage, ChatMessages
 from open_webui.models.folders import Folders
 from open_webui.models.tags import Tag, TagModel, Tags
-from open_webui.utils.misc import sanitize_data_for_db, sanitize_text_for_db
+from open_webui.utils.misc import get_message_list, sanitize_data_for_db, sanitize_text_for_db
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import (
     JSON,
@@ -26,6 +27,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     and_,
+    cast,
     delete,
     func,
     or_,
@@ -70,6 +72,7 @@ class Chat(Base):  # database table mapping for chat entity
         Index('user_id_pinned_idx', 'user_id', 'pinned'),
         Index('user_id_archived_idx', 'user_id', 'archived'),
         Index('updated_at_user_id_idx', 'updated_at', 'user_id'),
+        Index('chat_user_id_updated_at_id_idx', 'user_id', 'updated_at', 'id'),
         Index('folder_id_user_id_idx', 'folder_id', 'user_id'),
     )
 
@@ -268,7 +271,51 @@ class ChatStatsExport(BaseModel):
     chat: ChatBody
 
 
+####################
+# Keyset pagination
+####################
+
+# Columns of the lightweight chat list projection (no ``chat`` JSON blob).
+CHAT_LIST_COLUMNS = (Chat.id, Chat.title, Chat.updated_at, Chat.created_at, Chat.last_read_at)
+
+
+def encode_chat_cursor(updated_at: int, id: str) -> str:
+    """Cursor for the page after the chat with this ``(updated_at, id)``."""
+    return f'{updated_at}:{id}'
+
+
+def decode_chat_cursor(cursor: str) -> tuple[int, str]:
+    updated_at, sep, id = cursor.partition(':')
+    if not sep or not id:
+        raise ValueError('Invalid cursor')
+    return int(updated_at), id
+
+
 class ChatTable:
+    @staticmethod
+    def _apply_cursor(stmt, cursor: str | None, descending: bool = True):
+        """Keep rows after ``cursor`` in ``(updated_at, id)`` order (``id`` always ascending)."""
+        if not cursor:
+            return stmt
+        updated_at, id = decode_chat_cursor(cursor)
+        after = Chat.updated_at < updated_at if descending else Chat.updated_at > updated_at
+        return stmt.filter(or_(after, and_(Chat.updated_at == updated_at, Chat.id > id)))
+
+    @staticmethod
+    def _cursor_direction(filter: dict | None) -> bool:
+        """Whether a cursor walks ``updated_at`` descending for this filter's ordering."""
+        order_by = (filter or {}).get('order_by')
+        direction = (filter or {}).get('direction')
+        if not order_by or not direction:
+            return True
+        if order_by != 'updated_at':
+            raise ValueError('Cursor pagination requires ordering by updated_at')
+        return direction.lower() == 'desc'
+
+    @staticmethod
+    def _to_chat_title_id_response(row) -> ChatTitleIdResponse:
+        return ChatTitleIdResponse.model_validate(dict(row._mapping))
+
     def _clean_null_bytes(self, obj):
         """Recursively remove null bytes from strings in dict/list structures."""
         return sanitize_data_for_db(obj)
@@ -436,24 +483,25 @@ class ChatTable:
 
             session.add_all(chats)
             await session.commit()
+            # Validated now: a rollback below expires these (already committed) rows.
+            imported = [ChatModel.model_validate(chat) for chat in chats]
 
-            # Dual-write messages to chat_message table
-            for form_data, chat_obj in zip(chat_import_forms, chats):
-                history = form_data.chat.get('history', {})
-                messages = history.get('messages', {})
-                for message_id, message in messages.items():
-                    if isinstance(message, dict) and message.get('role'):
-                        try:
-                            await ChatMessages.upsert_message(
-                                message_id=message_id,
-                                chat_id=chat_obj.id,
-                                user_id=user_id,
-                                data=message,
-                            )
-                        except Exception as e:
-                            log.warning(f'Failed to write imported message {message_id} for chat {chat_obj.id}: {e}')
+            # Dual-write messages to chat_message table, one bulk insert per batch.
+            # A failure here is not fatal: get_messages_map_by_chat_id backfills
+            # from the embedded history on first read.
+            try:
+                await ChatMessages.insert_messages(
+                    {
+                        chat.id: (user_id, (form_data.chat.get('history') or {}).get('messages') or {})
+                        for form_data, chat in zip(chat_import_forms, imported)
+                    },
+                    db=session,
+                )
+            except Exception as e:
+                await session.rollback()
+                log.warning(f'Failed to write imported messages to chat_message table: {e}')
 
-            return [ChatModel.model_validate(chat) for chat in chats]
+            return imported
 
     async def update_chat_by_id(
         self,
@@ -694,6 +742,19 @@ class ChatTable:
 
         return history_messages
 
+    async def get_message_branch(self, id: str, message_id: str) -> list[dict]:
+        """Messages from the root to ``message_id`` (see ``get_message_list``).
+
+        Fetches only the active branch from ``chat_message`` rows; falls
+        back to the full message map (with its legacy enrichment and
+        backfill) when the message has no row or the chain is broken.
+        """
+        branch = await ChatMessages.get_message_branch(id, message_id)
+        if branch and not branch[0].get('parentId'):
+            return branch
+
+        return get_message_list(await self.get_messages_map_by_chat_id(id), message_id)
+
     async def get_message_by_id_and_message_id(self, id: str, message_id: str) -> dict | None:
         chat = await self.get_chat_by_id(id)
         if chat is None:
@@ -945,6 +1006,7 @@ class ChatTable:
         filter: dict | None = None,
         skip: int = 0,
         limit: int = 50,
+        cursor: str | None = None,
         db: AsyncSession | None = None,
     ) -> list[ChatTitleIdResponse]:
         async with get_async_db_context(db) as session:
@@ -970,10 +1032,14 @@ class ChatTable:
                         stmt = stmt.order_by(getattr(Chat, order_by).desc(), Chat.id)
                     else:
                         raise ValueError('Invalid direction for ordering')
+                else:
+                    stmt = stmt.order_by(Chat.updated_at.desc(), Chat.id)
             else:
                 stmt = stmt.order_by(Chat.updated_at.desc(), Chat.id)
 
-            if skip:
+            if cursor:
+                stmt = self._apply_cursor(stmt, cursor, self._cursor_direction(filter))
+            elif skip:
                 stmt = stmt.offset(skip)
             if limit:
                 stmt = stmt.limit(limit)
@@ -1021,6 +1087,7 @@ class ChatTable:
         filter: dict | None = None,
         skip: int = 0,
         limit: int = 50,
+        cursor: str | None = None,
         db: AsyncSession | None = None,
     ) -> list[ChatTitleIdResponse]:
         async with get_async_db_context(db) as session:
@@ -1045,10 +1112,14 @@ class ChatTable:
                         stmt = stmt.order_by(getattr(Chat, order_by).desc(), Chat.id)
                     else:
                         raise ValueError('Invalid direction for ordering')
+                else:
+                    stmt = stmt.order_by(Chat.updated_at.desc(), Chat.id)
             else:
                 stmt = stmt.order_by(Chat.updated_at.desc(), Chat.id)
 
-            if skip:
+            if cursor:
+                stmt = self._apply_cursor(stmt, cursor, self._cursor_direction(filter))
+            elif skip:
                 stmt = stmt.offset(skip)
             if limit:
                 stmt = stmt.limit(limit)
@@ -1076,6 +1147,7 @@ class ChatTable:
         include_pinned: bool = False,
         skip: int | None = None,
         limit: int | None = None,
+        cursor: str | None = None,
         db: AsyncSession | None = None,
     ) -> list[ChatTitleIdResponse]:
         async with get_async_db_context(db) as session:
@@ -1094,7 +1166,9 @@ class ChatTable:
 
             stmt = stmt.order_by(Chat.updated_at.desc(), Chat.id)
 
-            if skip:
+            if cursor:
+                stmt = self._apply_cursor(stmt, cursor)
+            elif skip:
                 stmt = stmt.offset(skip)
             if limit:
                 stmt = stmt.limit(limit)
@@ -1120,14 +1194,26 @@ class ChatTable:
         chat_ids: list[str],
         skip: int = 0,
         limit: int = 50,
+        cursor: str | None = None,
         db: AsyncSession | None = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         async with get_async_db_context(db) as session:
-            result = await session.execute(
-                select(Chat).filter(Chat.id.in_(chat_ids)).filter_by(archived=False).order_by(Chat.updated_at.desc())
+            stmt = (
+                select(*CHAT_LIST_COLUMNS)
+                .filter(Chat.id.in_(chat_ids))
+                .filter_by(archived=False)
+                .order_by(Chat.updated_at.desc(), Chat.id)
             )
-            all_chats = result.scalars().all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+
+            if cursor:
+                stmt = self._apply_cursor(stmt, cursor)
+            elif skip:
+                stmt = stmt.offset(skip)
+            if limit:
+                stmt = stmt.limit(limit)
+
+            result = await session.execute(stmt)
+            return [self._to_chat_title_id_response(row) for row in result.all()]
 
     async def get_chat_metas_by_chat_ids(
         self,
@@ -1299,9 +1385,90 @@ class ChatTable:
         except Exception:
             return None
 
-    async def get_chats(self, skip: int = 0, limit: int = 50, db: AsyncSession | None = None) -> list[ChatModel]:
+    async def iter_chats(
+        self,
+        user_id: str | None = None,
+        archived: bool | None = None,
+        folder_ids: list[str] | None = None,
+        batch_size: int = 100,
+    ) -> AsyncIterator[ChatModel]:
+        """Yield full chats (with history) in ``(updated_at desc, id)`` order with bounded memory.
+
+        Walks the table in keyset batches. Each batch is read through a
+        server-side cursor in its own short-lived session, so an export never
+        holds the whole result, or one transaction for its whole duration
+        (which would block SQLite writers).  ``folder_ids`` mirrors
+        ``get_chats_by_folder_ids_and_user_id`` and skips pinned chats.
+        """
+        cursor = None
+        while True:
+            stmt = select(Chat).order_by(Chat.updated_at.desc(), Chat.id)
+            if user_id is not None:
+                stmt = stmt.filter_by(user_id=user_id)
+            if archived is not None:
+                stmt = stmt.filter_by(archived=archived)
+            if folder_ids is not None:
+                stmt = stmt.filter(Chat.folder_id.in_(folder_ids), or_(Chat.pinned == False, Chat.pinned == None))
+            stmt = self._apply_cursor(stmt, cursor).limit(batch_size)
+
+            count = 0
+            async with get_async_db_context() as session:
+                result = await session.stream_scalars(stmt.execution_options(yield_per=min(batch_size, 50)))
+                async for chat_item in result:
+                    chat = ChatModel.model_validate(chat_item)
+                    session.expunge(chat_item)
+                    count += 1
+                    yield chat
+
+            if count < batch_size:
+                return
+            cursor = encode_chat_cursor(chat.updated_at, chat.id)
+
+    async def get_chat_histories_after_id(
+        self, after_id: str | None = None, limit: int = 100, db: AsyncSession | None = None
+    ) -> list[tuple[str, str, dict]]:
+        """``(id, user_id, history messages)`` for the next ``limit`` chats by ascending id.
+
+        Keyset batches for the ``chat_message`` backfill; ``after_id`` is the
+        last id of the previous batch.
+        """
+        async with get_async_db_context(db) as session:
+            stmt = select(Chat.id, Chat.user_id, Chat.chat).order_by(Chat.id).limit(limit)
+            if after_id is not None:
+                stmt = stmt.filter(Chat.id > after_id)
+            result = await session.execute(stmt)
+            return [
+                (chat_id, user_id, ((chat or {}).get('history') or {}).get('messages') or {})
+                for chat_id, user_id, chat in result.all()
+            ]
+
+    async def count_chats(self, after_id: str | None = None, db: AsyncSession | None = None) -> int:
         async with get_async_db_context(db) as session:
-            result = await session.execute(select(Chat).order_by(Chat.updated_at.desc()))
+            stmt = select(func.count(Chat.id))
+            if after_id is not None:
+                stmt = stmt.filter(Chat.id > after_id)
+            result = await session.execute(stmt)
+            return result.scalar() or 0
+
+    async def get_chats(
+        self,
+        skip: int = 0,
+        limit: int | None = 50,
+        cursor: str | None = None,
+        db: AsyncSession | None = None,
+    ) -> list[ChatModel]:
+        """Full chats (with history), for exports; page through with ``cursor``."""
+        async with get_async_db_context(db) as session:
+            stmt = select(Chat).order_by(Chat.updated_at.desc(), Chat.id)
+
+            if cursor:
+                stmt = self._apply_cursor(stmt, cursor)
+            elif skip:
+                stmt = stmt.offset(skip)
+            if limit:
+                stmt = stmt.limit(limit)
+
+            result = await session.execute(stmt)
             all_chats = result.scalars().all()
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
@@ -1312,8 +1479,10 @@ class ChatTable:
         filter: dict | None = None,
         skip: int | None = None,
         limit: int | None = None,
+        cursor: str | None = None,
         db: AsyncSession | None = None,
     ) -> ChatListResponse:
+        """Full chats (with history) for stats and exports; page through with ``cursor``."""
         async with get_async_db_context(db) as session:
             stmt = select(Chat).filter_by(user_id=user_id)
 
@@ -1336,10 +1505,12 @@ class ChatTable:
             else:
                 stmt = stmt.order_by(Chat.updated_at.desc(), Chat.id)
 
-            count_result = await session.execute(select(func.count()).select_from(stmt.subquery()))
+            count_result = await session.execute(stmt.with_only_columns(func.count(Chat.id)).order_by(None))
             total = count_result.scalar()
 
-            if skip is not None:
+            if cursor:
+                stmt = self._apply_cursor(stmt, cursor, self._cursor_direction(filter))
+            elif skip is not None:
                 stmt = stmt.offset(skip)
             if limit is not None:
                 stmt = stmt.limit(limit)
@@ -1378,11 +1549,21 @@ class ChatTable:
                 for chat in all_chats
             ]
 
-    async def get_archived_chats_by_user_id(self, user_id: str, db: AsyncSession | None = None) -> list[ChatModel]:
+    async def get_archived_chats_by_user_id(
+        self,
+        user_id: str,
+        limit: int | None = None,
+        cursor: str | None = None,
+        db: AsyncSession | None = None,
+    ) -> list[ChatModel]:
+        """Full archived chats (with history), for exports; page through with ``cursor``."""
         async with get_async_db_context(db) as session:
-            result = await session.execute(
-                select(Chat).filter_by(user_id=user_id, archived=True).order_by(Chat.updated_at.desc())
-            )
+            stmt = select(Chat).filter_by(user_id=user_id, archived=True).order_by(Chat.updated_at.desc(), Chat.id)
+            stmt = self._apply_cursor(stmt, cursor)
+            if limit:
+                stmt = stmt.limit(limit)
+
+            result = await session.execute(stmt)
             return [ChatModel.model_validate(chat) for chat in result.scalars().all()]
 
     # search user conversations
@@ -1393,16 +1574,20 @@ class ChatTable:
         include_archived: bool = False,
         skip: int = 0,
         limit: int = 60,
+        cursor: str | None = None,
         db: AsyncSession | None = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         """
-        Filters chats based on a search query using Python, allowing pagination using skip and limit.
+        Filters chats based on a search query, allowing pagination using skip and limit or cursor.
+
+        Returns the lightweight list projection; the message content is only
+        matched in the database (see ``get_search_snippet_messages`` for snippets).
         """
         search_text = sanitize_text_for_db(search_text).lower().strip()
 
         if not search_text:
             return await self.get_chat_list_by_user_id(
-                user_id, include_archived, filter={}, skip=skip, limit=limit, db=db
+                user_id, include_archived, filter={}, skip=skip, limit=limit, cursor=cursor, db=db
             )
 
         search_text_words = search_text.split(' ')
@@ -1452,7 +1637,7 @@ class ChatTable:
         search_text = ' '.join(search_text_words)
 
         async with get_async_db_context(db) as session:
-            stmt = select(Chat).filter(Chat.user_id == user_id)
+            stmt = select(*CHAT_LIST_COLUMNS).filter(Chat.user_id == user_id)
 
             if is_archived is not None:
                 stmt = stmt.filter(Chat.archived == is_archived)
@@ -1571,14 +1756,45 @@ class ChatTable:
                 raise NotImplementedError(f'Unsupported dialect: {dialect_name}')
 
             # Perform pagination at the SQL level
-            stmt = stmt.offset(skip).limit(limit)
-            result = await session.execute(stmt)
-            all_chats = result.scalars().all()
+            if cursor:
+                stmt = self._apply_cursor(stmt, cursor)
+            else:
+                stmt = stmt.offset(skip)
+            result = await session.execute(stmt.limit(limit))
+            all_chats = result.all()
 
             log.info(f'The number of chats: {len(all_chats)}')
 
-            # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [self._to_chat_title_id_response(chat) for chat in all_chats]
+
+    async def get_search_snippet_messages(
+        self, chat_ids: list[str], search_text: str, db: AsyncSession | None = None
+    ) -> dict[str, list[dict]]:
+        """Messages that may contain ``search_text``, per chat, for building result snippets.
+
+        Reads ``chat_message`` rows (content only) instead of the chat blobs.
+        Content is stored as ASCII-escaped JSON, so the database pre-filter
+        only applies to plain ASCII search text; callers still match exactly.
+        """
+        if not chat_ids or not search_text:
+            return {}
+
+        async with get_async_db_context(db) as session:
+            stmt = (
+                select(ChatMessage.chat_id, ChatMessage.content)
+                .filter(ChatMessage.chat_id.in_(chat_ids))
+                .order_by(ChatMessage.created_at)
+            )
+            if search_text.isascii() and '"' not in search_text and '\\' not in search_text:
+                stmt = stmt.filter(
+                    func.lower(cast(ChatMessage.content, Text)).contains(search_text.lower(), autoescape=True)
+                )
+
+            result = await session.execute(stmt)
+            messages: dict[str, list[dict]] = {}
+            for chat_id, content in result.all():
+                messages.setdefault(chat_id, []).append({'content': content})
+            return messages
 
     async def get_chats_by_folder_id_and_user_id(
         self,
@@ -1586,6 +1802,7 @@ class ChatTable:
         user_id: str,
         skip: int = 0,
         limit: int = 60,
+        cursor: str | None = None,
         db: AsyncSession | None = None,
     ) -> list[ChatTitleIdResponse]:
         async with get_async_db_context(db) as session:
@@ -1597,7 +1814,9 @@ class ChatTable:
                 .order_by(Chat.updated_at.desc(), Chat.id)
             )
 
-            if skip:
+            if cursor:
+                stmt = self._apply_cursor(stmt, cursor)
+            elif skip:
                 stmt = stmt.offset(skip)
             if limit:
                 stmt = stmt.limit(limit)
@@ -1654,16 +1873,25 @@ class ChatTable:
             ]
 
     async def get_chats_by_folder_ids_and_user_id(
-        self, folder_ids: list[str], user_id: str, db: AsyncSession | None = None
+        self,
+        folder_ids: list[str],
+        user_id: str,
+        limit: int | None = None,
+        cursor: str | None = None,
+        db: AsyncSession | None = None,
     ) -> list[ChatModel]:
+        """Full chats (with history) in the folders, for exports; page through with ``cursor``."""
         async with get_async_db_context(db) as session:
             stmt = (
                 select(Chat)
                 .filter(Chat.folder_id.in_(folder_ids), Chat.user_id == user_id)
                 .filter(or_(Chat.pinned == False, Chat.pinned == None))
                 .filter_by(archived=False)
-                .order_by(Chat.updated_at.desc())
+                .order_by(Chat.updated_at.desc(), Chat.id)
             )
+            stmt = self._apply_cursor(stmt, cursor)
+            if limit:
+                stmt = stmt.limit(limit)
 
             result = await session.execute(stmt)
             all_chats = result.scalars().all()
@@ -1863,6 +2091,7 @@ class ChatTable:
                 await session.execute(delete(ChatMessage).filter_by(chat_id=id))
                 await session.execute(delete(Chat).filter_by(id=id))
                 await session.commit()
+                ChatMessages.bump_version(id)
 
                 return True and await self.delete_shared_chat_by_chat_id(id, db=session)
         except Exception:
@@ -1875,6 +2104,7 @@ class ChatTable:
                 await session.execute(delete(ChatMessage).filter_by(chat_id=id))
                 await session.execute(delete(Chat).filter_by(id=id, user_id=user_id))
                 await session.commit()
+                ChatMessages.bump_version(id)
 
                 return True and await self.delete_shared_chat_by_chat_id(id, db=session)
         except Exception:
@@ -1896,6 +2126,7 @@ class ChatTable:
                 )
                 await session.execute(delete(Chat).filter_by(user_id=user_id))
                 await session.commit()
+                ChatMessages.bump_version()
 
                 return True
         except Exception:
@@ -1913,6 +2144,7 @@ class ChatTable:
                 await session.execute(delete(ChatMessage).filter(ChatMessage.chat_id.in_(chat_ids_stmt)))
                 await session.execute(delete(Chat).filter_by(user_id=user_id, folder_id=folder_id))
                 await session.commit()
+                ChatMessages.bump_version()
 
                 return True
         except Exception:
@@ -0,0 +1,129 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from open_webui.internal.db import Base, get_async_db_context
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import JSON, BigInteger, Column, Index, Integer, Text, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+log = logging.getLogger(__name__)
+
+####################
+# Event Outbox DB Schema
+####################
+
+
+class EventOutbox(Base):
+    """Webhook deliveries that failed and are waiting to be retried."""
+
+    __tablename__ = 'event_outbox'
+
+    id = Column(Text, primary_key=True)
+    webhook_id = Column(Text, nullable=False)
+    event = Column(JSON, nullable=False)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(BigInteger, nullable=False)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(BigInteger, nullable=False)
+
+    __table_args__ = (Index('ix_event_outbox_next_attempt_at', 'next_attempt_at'),)
+
+
+class EventOutboxModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    webhook_id: str
+    event: dict
+
+    attempts: int = 0
+    next_attempt_at: int
+    last_error: Optional[str] = None
+
+    created_at: int
+
+
+class EventOutboxTable:
+    async def insert(
+        self,
+        webhook_id: str,
+        event: dict,
+        next_attempt_at: int,
+        last_error: Optional[str] = None,
+        db: Optional[AsyncSession] = None,
+    ) -> None:
+        async with get_async_db_context(db) as db:
+            db.add(
+                EventOutbox(
+                    id=str(uuid.uuid4()),
+                    webhook_id=webhook_id,
+                    event=event,
+                    attempts=1,
+                    next_attempt_at=next_attempt_at,
+                    last_error=last_error,
+                    created_at=int(time.time()),
+                )
+            )
+            await db.commit()
+
+    async def claim_due(self, limit: int, lease: int, db: Optional[AsyncSession] = None) -> list[EventOutboxModel]:
+        """
+        Return up to ``limit`` entries that are due, pushing their next attempt
+        ``lease`` seconds out so other workers skip them while they are retried.
+        """
+        now = int(time.time())
+        claimed = []
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                select(EventOutbox)
+                .where(EventOutbox.next_attempt_at <= now)
+                .order_by(EventOutbox.next_attempt_at)
+                .limit(limit)
+            )
+            for entry in result.scalars().all():
+                # Optimistic claim: only one worker can move next_attempt_at forward.
+                claim = await db.execute(
+                    update(EventOutbox)
+                    .where(
+                        EventOutbox.id == entry.id,
+                        EventOutbox.next_attempt_at == entry.next_attempt_at,
+                    )
+                    .values(next_attempt_at=now + lease)
+                )
+                if claim.rowcount == 1:
+                    claimed.append(EventOutboxModel.model_validate(entry))
+            await db.commit()
+        return claimed
+
+    async def reschedule(
+        self,
+        id: str,
+        attempts: int,
+        next_attempt_at: int,
+        last_error: Optional[str] = None,
+        db: Optional[AsyncSession] = None,
+    ) -> None:
+        async with get_async_db_context(db) as db:
+            await db.execute(
+                update(EventOutbox)
+                .where(EventOutbox.id == id)
+                .values(attempts=attempts, next_attempt_at=next_attempt_at, last_error=last_error)
+            )
+            await db.commit()
+
+    async def delete_by_id(self, id: str, db: Optional[AsyncSession] = None) -> None:
+        async with get_async_db_context(db) as db:
+            await db.execute(delete(EventOutbox).where(EventOutbox.id == id))
+            await db.commit()
+
+    async def count(self, db: Optional[AsyncSession] = None) -> int:
+        async with get_async_db_context(db) as db:
+            result = await db.execute(select(func.count(EventOutbox.id)))
+            return result.scalar() or 0
+
+
+EventOutboxes = EventOutboxTable()
@@ -313,9 +313,9 @@ class FeedbackTable:
             return sorted([row[0] for row in rows if row[0]])
 
     async def get_feedbacks_for_leaderboard(self, db: Optional[AsyncSession] = None) -> list[LeaderboardFeedbackData]:
-        """Fetch only id and data for leaderboard computation (excludes snapshot/meta)."""
+        """Fetch only id and data for leaderboard computation (excludes snapshot/meta), oldest first."""
         async with get_async_db_context(db) as db:
-            result = await db.execute(select(Feedback.id, Feedback.data))
+            result = await db.execute(select(Feedback.id, Feedback.data).order_by(Feedback.created_at.asc()))
             return [LeaderboardFeedbackData(id=row.id, data=row.data) for row in result.all()]
 
     async def get_model_evaluation_history(
@@ -0,0 +1,217 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from open_webui.internal.db import Base, get_async_db_context
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import JSON, BigInteger, Column, Index, Integer, Text, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+log = logging.getLogger(__name__)
+
+####################
+# File Job DB Schema
+####################
+
+
+class FileJob(Base):
+    """Uploaded files waiting to be processed, or being processed under a lease."""
+
+    __tablename__ = 'file_job'
+
+    id = Column(Text, primary_key=True)
+    file_id = Column(Text, nullable=False)
+    user_id = Column(Text, nullable=False)
+    lane = Column(Text, nullable=False)
+    payload = Column(JSON, nullable=False)
+
+    # 'queued' or 'running'; finished jobs are deleted.
+    status = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    # Due time while queued, lease expiry while running.
+    next_attempt_at = Column(BigInteger, nullable=False)
+    lease_id = Column(Text, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(BigInteger, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index('ix_file_job_lane_next_attempt_at', 'lane', 'next_attempt_at'),
+        Index('ix_file_job_file_id', 'file_id'),
+    )
+
+
+class FileJobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    file_id: str
+    user_id: str
+    lane: str
+    payload: dict
+
+    status: str
+    attempts: int = 0
+    next_attempt_at: int
+    lease_id: Optional[str] = None
+    last_error: Optional[str] = None
+
+    created_at: int
+    updated_at: int
+
+
+class FileJobTable:
+    async def insert(
+        self,
+        file_id: str,
+        user_id: str,
+        lane: str,
+        payload: dict,
+        db: Optional[AsyncSession] = None,
+    ) -> FileJobModel:
+        now = int(time.time())
+        async with get_async_db_context(db) as db:
+            job = FileJob(
+                id=str(uuid.uuid4()),
+                file_id=file_id,
+                user_id=user_id,
+                lane=lane,
+                payload=payload,
+                status='queued',
+                attempts=0,
+                next_attempt_at=now,
+                created_at=now,
+                updated_at=now,
+            )
+            db.add(job)
+            await db.commit()
+            return FileJobModel.model_validate(job)
+
+    async def claim(self, lane: str, limit: int, lease: int, db: Optional[AsyncSession] = None) -> list[FileJobModel]:
+        """
+        Lease up to ``limit`` due jobs of ``lane``, oldest first, for ``lease``
+        seconds.  Running jobs whose lease has expired are due again, so jobs
+        of a worker that died are picked up by another.
+        """
+        now = int(time.time())
+        claimed = []
+        async with get_async_db_context(db) as db:
+            stmt = (
+                select(FileJob)
+                .where(FileJob.lane == lane, FileJob.next_attempt_at <= now)
+                .order_by(FileJob.created_at)
+                .limit(limit)
+            )
+            if db.bind.dialect.name == 'postgresql':
+                stmt = stmt.with_for_update(skip_locked=True)
+
+            result = await db.execute(stmt)
+            for job in result.scalars().all():
+                lease_id = str(uuid.uuid4())
+                # Optimistic claim: only one worker can move next_attempt_at forward.
+                claim = await db.execute(
+                    update(FileJob)
+                    .where(FileJob.id == job.id, FileJob.next_attempt_at == job.next_attempt_at)
+                    .values(
+                        status='running',
+                        attempts=job.attempts + 1,
+                        next_attempt_at=now + lease,
+                        lease_id=lease_id,
+                        updated_at=now,
+                    )
+                )
+                if claim.rowcount == 1:
+                    claimed.append(
+                        FileJobModel.model_validate(job).model_copy(
+                            update={
+                                'status': 'running',
+                                'attempts': job.attempts + 1,
+                                'next_attempt_at': now + lease,
+                                'lease_id': lease_id,
+                            }
+                        )
+                    )
+            await db.commit()
+        return claimed
+
+    async def renew(self, id: str, lease_id: str, lease: int, db: Optional[AsyncSession] = None) -> bool:
+        """Extend a running job's lease; False if it was lost to another worker."""
+        now = int(time.time())
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                update(FileJob)
+                .where(FileJob.id == id, FileJob.lease_id == lease_id)
+                .values(next_attempt_at=now + lease, updated_at=now)
+            )
+            await db.commit()
+            return result.rowcount == 1
+
+    async def reschedule(
+        self,
+        id: str,
+        lease_id: str,
+        next_attempt_at: int,
+        last_error: Optional[str] = None,
+        db: Optional[AsyncSession] = None,
+    ) -> None:
+        async with get_async_db_context(db) as db:
+            await db.execute(
+                update(FileJob)
+                .where(FileJob.id == id, FileJob.lease_id == lease_id)
+                .values(
+                    status='queued',
+                    next_attempt_at=next_attempt_at,
+                    lease_id=None,
+                    last_error=last_error,
+                    updated_at=int(time.time()),
+                )
+            )
+            await db.commit()
+
+    async def release(self, id: str, lease_id: str, db: Optional[AsyncSession] = None) -> None:
+        """Return an interrupted job to the queue, due now, without counting the attempt."""
+        now = int(time.time())
+        async with get_async_db_context(db) as db:
+            await db.execute(
+                update(FileJob)
+                .where(FileJob.id == id, FileJob.lease_id == lease_id)
+                .values(
+                    status='queued',
+                    attempts=FileJob.attempts - 1,
+                    next_attempt_at=now,
+                    lease_id=None,
+                    updated_at=now,
+                )
+            )
+            await db.commit()
+
+    async def delete_by_id(self, id: str, lease_id: Optional[str] = None, db: Optional[AsyncSession] = None) -> None:
+        async with get_async_db_context(db) as db:
+            stmt = delete(FileJob).where(FileJob.id == id)
+            if lease_id is not None:
+                stmt = stmt.where(FileJob.lease_id == lease_id)
+            await db.execute(stmt)
+            await db.commit()
+
+    async def get_by_file_id(self, file_id: str, db: Optional[AsyncSession] = None) -> Optional[FileJobModel]:
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                select(FileJob).where(FileJob.file_id == file_id).order_by(FileJob.created_at.desc()).limit(1)
+            )
+            job = result.scalars().first()
+            return FileJobModel.model_validate(job) if job else None
+
+    async def count_by_lane_and_status(self, db: Optional[AsyncSession] = None) -> dict[str, dict[str, int]]:
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                select(FileJob.lane, FileJob.status, func.count(FileJob.id)).group_by(FileJob.lane, FileJob.status)
+            )
+            counts: dict[str, dict[str, int]] = {}
+            for lane, status, count in result.all():
+                counts.setdefault(lane, {})[status] = count
+            return counts
+
+
+FileJobs = FileJobTable()
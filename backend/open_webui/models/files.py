@@ -117,6 +117,16 @@ class FileUpdateForm(BaseModel):
     meta: dict | None = None
 
 
+async def _notify_file_status(id: str, meta: dict | None) -> None:
+    """Wake the status streams watching this file and its knowledge base."""
+    try:
+        from open_webui.utils.file_status import notify_file_status
+
+        await notify_file_status(id, ((meta or {}).get('data') or {}).get('knowledge_id'))
+    except Exception:
+        log.debug('Failed to notify file status change', exc_info=True)
+
+
 class FilesTable:
     async def insert_new_file(
         self, user_id: str, form_data: FileForm, db: AsyncSession | None = None
@@ -144,6 +154,9 @@ class FilesTable:
                 await db.commit()
                 await db.refresh(result)
                 if result:
+                    # A new pending file shows up in its knowledge base's pending list.
+                    if ((result.meta or {}).get('data') or {}).get('knowledge_id'):
+                        await _notify_file_status(result.id, result.meta)
                     return FileModel.model_validate(result)
                 else:
                     return None
@@ -348,6 +361,8 @@ class FilesTable:
 
                 file.updated_at = int(time.time())
                 await db.commit()
+                if form_data.data is not None and 'status' in form_data.data:
+                    await _notify_file_status(file.id, file.meta)
                 return FileModel.model_validate(file)
             except Exception as e:
                 log.exception(f'Error updating file completely by id: {e}')
@@ -376,6 +391,8 @@ class FilesTable:
                 file.data = {**(file.data if file.data else {}), **data}
                 file.updated_at = int(time.time())
                 await db.commit()
+                if 'status' in data:
+                    await _notify_file_status(file.id, file.meta)
                 return FileModel.model_validate(file)
             except Exception as e:
                 return None
@@ -446,9 +463,11 @@ class FilesTable:
     async def delete_file_by_id(self, id: str, db: AsyncSession | None = None) -> bool:
         async with get_async_db_context(db) as db:
             try:
+                meta = (await db.execute(select(File.meta).filter_by(id=id))).scalar()
                 await db.execute(delete(File).filter_by(id=id))
                 await db.commit()
 
+                await _notify_file_status(id, meta)
                 return True
             except Exception:
                 return False
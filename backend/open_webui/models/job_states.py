@@ -0,0 +1,118 @@
+import logging
+import time
+from typing import Optional
+
+from open_webui.internal.db import Base, get_async_db_context
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import JSON, BigInteger, Column, Text, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+log = logging.getLogger(__name__)
+
+####################
+# Job State DB Schema
+####################
+
+
+class JobState(Base):
+    """
+    Progress of a long-running background job (e.g. the chat message
+    backfill), kept apart from ``config`` so it persists even when
+    persistent config is disabled and never shows up in config exports.
+    """
+
+    __tablename__ = 'job_state'
+
+    name = Column(Text, primary_key=True)
+    data = Column(JSON, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
+
+    # Which instance may run the job until when, for jobs only one instance should run at a time.
+    lease_owner = Column(Text, nullable=True)
+    lease_until = Column(BigInteger, nullable=True)
+    # Last time any instance asked for a run.
+    requested_at = Column(BigInteger, nullable=True)
+
+
+class JobStateModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    name: str
+    data: dict
+    updated_at: int
+
+    lease_owner: Optional[str] = None
+    lease_until: Optional[int] = None
+    requested_at: Optional[int] = None
+
+
+class JobStateTable:
+    async def get(self, name: str, db: Optional[AsyncSession] = None) -> Optional[JobStateModel]:
+        async with get_async_db_context(db) as db:
+            state = await db.get(JobState, name)
+            return JobStateModel.model_validate(state) if state else None
+
+    async def get_data(self, name: str, db: Optional[AsyncSession] = None) -> dict:
+        state = await self.get(name, db=db)
+        return dict(state.data) if state else {}
+
+    async def set_data(self, name: str, data: dict, db: Optional[AsyncSession] = None) -> None:
+        now = int(time.time())
+        async with get_async_db_context(db) as db:
+            state = await db.get(JobState, name)
+            if state is None:
+                db.add(JobState(name=name, data=data, updated_at=now))
+            else:
+                state.data = data
+                state.updated_at = now
+            await db.commit()
+
+    async def _ensure(self, name: str, db: AsyncSession) -> None:
+        if await db.get(JobState, name) is not None:
+            return
+        try:
+            db.add(JobState(name=name, data={}, updated_at=int(time.time())))
+            await db.commit()
+        except IntegrityError:
+            # Created concurrently by another instance.
+            await db.rollback()
+
+    async def acquire_lease(self, name: str, owner: str, ttl: int, db: Optional[AsyncSession] = None) -> bool:
+        """Take (or extend) the lease on ``name`` unless another owner holds an unexpired one."""
+        now = int(time.time())
+        async with get_async_db_context(db) as db:
+            await self._ensure(name, db)
+            result = await db.execute(
+                update(JobState)
+                .where(
+                    JobState.name == name,
+                    or_(
+                        JobState.lease_owner.is_(None),
+                        JobState.lease_owner == owner,
+                        JobState.lease_until <= now,
+                    ),
+                )
+                .values(lease_owner=owner, lease_until=now + ttl)
+            )
+            await db.commit()
+            return result.rowcount == 1
+
+    async def release_lease(self, name: str, owner: str, db: Optional[AsyncSession] = None) -> None:
+        async with get_async_db_context(db) as db:
+            await db.execute(
+                update(JobState)
+                .where(JobState.name == name, JobState.lease_owner == owner)
+                .values(lease_owner=None, lease_until=None)
+            )
+            await db.commit()
+
+    async def request_run(self, name: str, db: Optional[AsyncSession] = None) -> None:
+        """Record that ``name`` should run again, for whichever instance runs it next."""
+        async with get_async_db_context(db) as db:
+            await self._ensure(name, db)
+            await db.execute(update(JobState).where(JobState.name == name).values(requested_at=int(time.time())))
+            await db.commit()
+
+
+JobStates = JobStateTable()
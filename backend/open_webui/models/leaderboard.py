@@ -0,0 +1,161 @@
+import logging
+import time
+from typing import Callable, Optional
+
+from open_webui.internal.db import Base, get_async_db_context
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import JSON, BigInteger, Column, Float, LargeBinary, Text, delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+log = logging.getLogger(__name__)
+
+
+####################
+# Leaderboard DB Schema
+####################
+
+
+class LeaderboardRating(Base):
+    """Materialized Elo rating, win/loss counts and tag counts per model."""
+
+    __tablename__ = 'leaderboard_rating'
+
+    model_id = Column(Text, primary_key=True)
+    rating = Column(Float, nullable=False)
+    won = Column(BigInteger, nullable=False)
+    lost = Column(BigInteger, nullable=False)
+    tags = Column(JSON, nullable=True)  # {tag: count}
+    updated_at = Column(BigInteger, nullable=False)
+
+
+class LeaderboardTagEmbedding(Base):
+    """Persisted tag embeddings for query-weighted leaderboards (float32 bytes)."""
+
+    __tablename__ = 'leaderboard_tag_embedding'
+
+    model = Column(Text, primary_key=True)
+    tag = Column(Text, primary_key=True)
+    embedding = Column(LargeBinary, nullable=False)
+    created_at = Column(BigInteger, nullable=False)
+
+
+class LeaderboardRatingModel(BaseModel):
+    model_id: str
+    rating: float = 1000.0
+    won: int = 0
+    lost: int = 0
+    tags: Optional[dict] = None
+    updated_at: int = 0
+
+    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
+
+
+class LeaderboardTable:
+    async def get_ratings(self, db: Optional[AsyncSession] = None) -> list[LeaderboardRatingModel]:
+        async with get_async_db_context(db) as db:
+            result = await db.execute(select(LeaderboardRating))
+            return [LeaderboardRatingModel.model_validate(row) for row in result.scalars().all()]
+
+    async def update_ratings(
+        self,
+        model_ids: list[str],
+        update: Callable[[dict[str, dict]], None],
+        db: Optional[AsyncSession] = None,
+    ) -> None:
+        """
+        Read-modify-write the ratings of ``model_ids`` with their rows locked,
+        so concurrent feedback on the same models is applied one after the
+        other instead of overwriting each other.  ``update`` receives
+        ``{model_id: {'rating', 'won', 'lost', 'tags'}}`` and changes it in place.
+        """
+        model_ids = sorted(set(model_ids))
+        if not model_ids:
+            return
+        async with get_async_db_context(db) as db:
+            now = int(time.time())
+            result = await db.execute(
+                select(LeaderboardRating.model_id).where(LeaderboardRating.model_id.in_(model_ids))
+            )
+            missing = set(model_ids) - set(result.scalars().all())
+            if missing:
+                try:
+                    db.add_all(
+                        [
+                            LeaderboardRating(model_id=model_id, rating=1000.0, won=0, lost=0, updated_at=now)
+                            for model_id in missing
+                        ]
+                    )
+                    await db.commit()
+                except IntegrityError:
+                    # Another feedback created them first.
+                    await db.rollback()
+
+            # Locked in model_id order, so two updates over overlapping models cannot deadlock.
+            result = await db.execute(
+                select(LeaderboardRating)
+                .where(LeaderboardRating.model_id.in_(model_ids))
+                .order_by(LeaderboardRating.model_id)
+                .with_for_update()
+            )
+            rows = {row.model_id: row for row in result.scalars().all()}
+            stats = {
+                model_id: {'rating': row.rating, 'won': row.won, 'lost': row.lost, 'tags': dict(row.tags or {})}
+                for model_id, row in rows.items()
+            }
+            update(stats)
+            for model_id, row in rows.items():
+                row.rating = stats[model_id]['rating']
+                row.won = stats[model_id]['won']
+                row.lost = stats[model_id]['lost']
+                row.tags = stats[model_id]['tags'] or None
+                row.updated_at = now
+            await db.commit()
+
+    async def replace_ratings(self, ratings: list[LeaderboardRatingModel], db: Optional[AsyncSession] = None) -> None:
+        """Swap the whole materialized leaderboard in one transaction."""
+        async with get_async_db_context(db) as db:
+            now = int(time.time())
+            await db.execute(delete(LeaderboardRating))
+            db.add_all(
+                [LeaderboardRating(**rating.model_dump(exclude={'updated_at'}), updated_at=now) for rating in ratings]
+            )
+            await db.commit()
+
+    async def delete_all_ratings(self, db: Optional[AsyncSession] = None) -> None:
+        async with get_async_db_context(db) as db:
+            await db.execute(delete(LeaderboardRating))
+            await db.commit()
+
+    async def get_tag_embeddings(self, model: str, tags: list[str], db: Optional[AsyncSession] = None) -> dict:
+        if not tags:
+            return {}
+        embeddings = {}
+        async with get_async_db_context(db) as db:
+            for i in range(0, len(tags), 500):
+                result = await db.execute(
+                    select(LeaderboardTagEmbedding.tag, LeaderboardTagEmbedding.embedding).where(
+                        LeaderboardTagEmbedding.model == model,
+                        LeaderboardTagEmbedding.tag.in_(tags[i : i + 500]),
+                    )
+                )
+                embeddings.update({row.tag: row.embedding for row in result.all()})
+        return embeddings
+
+    async def insert_tag_embeddings(self, model: str, embeddings: dict, db: Optional[AsyncSession] = None) -> None:
+        if not embeddings:
+            return
+        async with get_async_db_context(db) as db:
+            now = int(time.time())
+            try:
+                for tag, embedding in embeddings.items():
+                    if not await db.get(LeaderboardTagEmbedding, (model, tag)):
+                        db.add(LeaderboardTagEmbedding(model=model, tag=tag, embedding=embedding, created_at=now))
+                await db.commit()
+            except Exception as e:
+                # Another worker may have cached the same tags concurrently.
+                await db.rollback()
+                log.debug(f'Skipping tag embedding cache write: {e}')
+
+
+Leaderboard = LeaderboardTable()
@@ -8,7 +8,7 @@ from typing import Literal
 
 from open_webui.internal.db import Base, get_async_db_context
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import JSON, BigInteger, Column, String, Text, delete, select
+from sqlalchemy import JSON, BigInteger, Column, String, Text, delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -42,6 +42,21 @@ class MemoryModel(BaseModel):
 
 
 class MemoriesTable:
+    def __init__(self):
+        # Bumped on every write so cached per-user indexes (utils/memory_index.py)
+        # can tell they are stale; deletes by id alone bump the global generation.
+        self._generation = 0
+        self._versions: dict[str, int] = {}
+
+    def get_version(self, user_id: str) -> tuple[int, int]:
+        return self._generation, self._versions.get(user_id, 0)
+
+    def bump_version(self, user_id: str | None = None) -> None:
+        if user_id is None:
+            self._generation += 1
+        else:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
     @staticmethod
     def normalize_memory_type(memory_type: str | None = None) -> str:
         return 'user' if memory_type == 'user' else 'context'
@@ -71,6 +86,7 @@ class MemoriesTable:
             db.add(record)
             await db.commit()
             await db.refresh(record)
+            self.bump_version(user_id)
             return MemoryModel.model_validate(record) if record else None
 
     async def update_memory_by_id_and_user_id(
@@ -102,6 +118,7 @@ class MemoriesTable:
 
                 await db.commit()
                 await db.refresh(memory)
+                self.bump_version(user_id)
                 return MemoryModel.model_validate(memory)
             except Exception:
                 return None
@@ -124,6 +141,15 @@ class MemoriesTable:
             except Exception:
                 return None
 
+    async def get_memory_fingerprint(self, user_id: str, db: AsyncSession | None = None) -> tuple[int, int]:
+        """(count, latest updated_at) of a user's memories, to detect writes from other workers."""
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                select(func.count(Memory.id), func.max(Memory.updated_at)).filter_by(user_id=user_id)
+            )
+            count, updated_at = result.one()
+            return count or 0, updated_at or 0
+
     async def get_memory_by_id(self, id: str, db: AsyncSession | None = None) -> MemoryModel | None:
         async with get_async_db_context(db) as db:
             try:
@@ -137,6 +163,7 @@ class MemoriesTable:
             try:
                 await db.execute(delete(Memory).filter_by(id=id))
                 await db.commit()
+                self.bump_version()
 
                 return True
 
@@ -148,6 +175,7 @@ class MemoriesTable:
             try:
                 await db.execute(delete(Memory).filter_by(user_id=user_id))
                 await db.commit()
+                self.bump_version(user_id)
 
                 return True
             except Exception:
@@ -162,6 +190,7 @@ class MemoriesTable:
 
                 await db.delete(memory)
                 await db.commit()
+                self.bump_version(user_id)
                 return True
             except Exception:
                 return False
@@ -262,6 +291,7 @@ class MemoriesTable:
                     raise ValueError(f'Unsupported memory operation: {action}')
 
             await db.commit()
+            self.bump_version(user_id)
 
         return results
 
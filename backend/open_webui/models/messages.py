@@ -4,11 +4,26 @@ import uuid
 from typing import Optional
 
 from open_webui.internal.db import Base, JSONField, get_async_db_context
-from open_webui.models.channels import ChannelMember, Channels
+from open_webui.models.channels import Channel, ChannelMember, Channels
 from open_webui.models.tags import Tag, TagModel, Tags
 from open_webui.models.users import User, UserNameResponse, Users
 from pydantic import BaseModel, ConfigDict, field_validator
-from sqlalchemy import JSON, BigInteger, Boolean, Column, String, Text, and_, delete, func, or_, select, text
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Column,
+    String,
+    Text,
+    and_,
+    case,
+    delete,
+    func,
+    or_,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import exists
 
@@ -134,6 +149,17 @@ class MessageResponse(MessageReplyToResponse):
 
 
 class MessageTable:
+    async def _update_channel_last_message_at(self, channel_id: str, db: AsyncSession) -> None:
+        await db.execute(
+            update(Channel)
+            .where(Channel.id == channel_id)
+            .values(
+                last_message_at=select(func.max(Message.created_at))
+                .where(Message.channel_id == channel_id)
+                .scalar_subquery()
+            )
+        )
+
     async def insert_new_message(
         self,
         form_data: MessageForm,
@@ -167,6 +193,27 @@ class MessageTable:
             result = Message(**message.model_dump())
 
             db.add(result)
+
+            # Keep the channel list summaries in step with the message table.
+            await db.execute(
+                update(Channel)
+                .where(
+                    Channel.id == channel_id,
+                    or_(Channel.last_message_at.is_(None), Channel.last_message_at < ts),
+                )
+                .values(last_message_at=ts)
+            )
+            if form_data.parent_id is None:
+                await db.execute(
+                    update(ChannelMember)
+                    .where(
+                        ChannelMember.channel_id == channel_id,
+                        ChannelMember.user_id != user_id,
+                        or_(ChannelMember.last_read_at.is_(None), ChannelMember.last_read_at < ts),
+                    )
+                    .values(unread_count=ChannelMember.unread_count + 1)
+                )
+
             await db.commit()
             await db.refresh(result)
             return MessageModel.model_validate(result) if result else None
@@ -582,17 +629,47 @@ class MessageTable:
 
     async def delete_replies_by_id(self, id: str, db: Optional[AsyncSession] = None) -> bool:
         async with get_async_db_context(db) as db:
+            result = await db.execute(select(Message.channel_id).filter_by(id=id))
+            channel_id = result.scalar()
+
             await db.execute(delete(Message).filter_by(parent_id=id))
+            if channel_id:
+                await self._update_channel_last_message_at(channel_id, db)
+
             await db.commit()
             return True
 
     async def delete_message_by_id(self, id: str, db: Optional[AsyncSession] = None) -> bool:
         async with get_async_db_context(db) as db:
+            message = await db.get(Message, id)
+
             await db.execute(delete(Message).filter_by(id=id))
 
             # Delete all reactions to this message
             await db.execute(delete(MessageReaction).filter_by(message_id=id))
 
+            if message and message.channel_id:
+                if message.parent_id is None:
+                    # Undo the unread increment for members who had not read it yet.
+                    await db.execute(
+                        update(ChannelMember)
+                        .where(
+                            ChannelMember.channel_id == message.channel_id,
+                            ChannelMember.user_id != message.user_id,
+                            or_(
+                                ChannelMember.last_read_at.is_(None),
+                                ChannelMember.last_read_at < message.created_at,
+                            ),
+                        )
+                        .values(
+                            unread_count=case(
+                                (ChannelMember.unread_count > 0, ChannelMember.unread_count - 1),
+                                else_=0,
+                            )
+                        )
+                    )
+                await self._update_channel_last_message_at(message.channel_id, db)
+
             await db.commit()
             return True
 
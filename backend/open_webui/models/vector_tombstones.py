@@ -0,0 +1,219 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from open_webui.internal.db import Base, get_async_db_context
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Boolean, Column, Index, Integer, Text, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+log = logging.getLogger(__name__)
+
+####################
+# Vector Tombstone DB Schema
+####################
+
+
+class VectorTombstone(Base):
+    """
+    Vectors that were removed but not yet deleted from the vector DB: a file's
+    chunks in a collection, or (``drop_collection``) a whole collection.
+    Retrieval hides them until the deletion worker has deleted them.
+    """
+
+    __tablename__ = 'vector_tombstone'
+
+    id = Column(Text, primary_key=True)
+    collection_name = Column(Text, nullable=False)
+    file_id = Column(Text, nullable=True)
+    hash = Column(Text, nullable=True)
+    drop_collection = Column(Boolean, nullable=False, default=False)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    # Due time, or lease expiry while a worker deletes it.
+    next_attempt_at = Column(BigInteger, nullable=False)
+    lease_id = Column(Text, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index('ix_vector_tombstone_collection_name_file_id', 'collection_name', 'file_id'),
+        Index('ix_vector_tombstone_next_attempt_at', 'next_attempt_at'),
+    )
+
+
+class VectorTombstoneModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    collection_name: str
+    file_id: Optional[str] = None
+    hash: Optional[str] = None
+    drop_collection: bool = False
+
+    attempts: int = 0
+    next_attempt_at: int
+    lease_id: Optional[str] = None
+    last_error: Optional[str] = None
+
+    created_at: int
+
+
+class VectorTombstoneTable:
+    async def insert_many(
+        self,
+        collection_name: str,
+        files: dict[str, Optional[str]],
+        db: Optional[AsyncSession] = None,
+    ) -> int:
+        """Tombstone the chunks of ``files`` (file id -> content hash) in a collection."""
+        now = int(time.time())
+        async with get_async_db_context(db) as db:
+            db.add_all(
+                [
+                    VectorTombstone(
+                        id=str(uuid.uuid4()),
+                        collection_name=collection_name,
+                        file_id=file_id,
+                        hash=hash,
+                        drop_collection=False,
+                        attempts=0,
+                        next_attempt_at=now,
+                        created_at=now,
+                    )
+                    for file_id, hash in files.items()
+                ]
+            )
+            await db.commit()
+            return len(files)
+
+    async def insert_drops(self, collection_names: list[str], db: Optional[AsyncSession] = None) -> int:
+        """Tombstone whole collections, which are dropped instead of filtered."""
+        now = int(time.time())
+        async with get_async_db_context(db) as db:
+            db.add_all(
+                [
+                    VectorTombstone(
+                        id=str(uuid.uuid4()),
+                        collection_name=collection_name,
+                        drop_collection=True,
+                        attempts=0,
+                        next_attempt_at=now,
+                        created_at=now,
+                    )
+                    for collection_name in collection_names
+                ]
+            )
+            await db.commit()
+            return len(collection_names)
+
+    async def claim(self, limit: int, lease: int, db: Optional[AsyncSession] = None) -> list[VectorTombstoneModel]:
+        """
+        Lease up to ``limit`` due tombstones, oldest first, for ``lease``
+        seconds.  Tombstones whose lease has expired are due again.
+        """
+        now = int(time.time())
+        lease_id = str(uuid.uuid4())
+        async with get_async_db_context(db) as db:
+            stmt = (
+                select(VectorTombstone.id)
+                .where(VectorTombstone.next_attempt_at <= now)
+                .order_by(VectorTombstone.created_at)
+                .limit(limit)
+            )
+            if db.bind.dialect.name == 'postgresql':
+                stmt = stmt.with_for_update(skip_locked=True)
+            ids = list((await db.execute(stmt)).scalars().all())
+            if not ids:
+                return []
+
+            # Optimistic claim: rows another worker leased meanwhile are no longer due.
+            await db.execute(
+                update(VectorTombstone)
+                .where(VectorTombstone.id.in_(ids), VectorTombstone.next_attempt_at <= now)
+                .values(next_attempt_at=now + lease, lease_id=lease_id)
+            )
+            await db.commit()
+
+            result = await db.execute(select(VectorTombstone).where(VectorTombstone.lease_id == lease_id))
+            return [VectorTombstoneModel.model_validate(row) for row in result.scalars().all()]
+
+    async def reschedule(
+        self,
+        ids: list[str],
+        lease_id: str,
+        next_attempt_at: int,
+        last_error: Optional[str] = None,
+        db: Optional[AsyncSession] = None,
+    ) -> None:
+        async with get_async_db_context(db) as db:
+            await db.execute(
+                update(VectorTombstone)
+                .where(VectorTombstone.id.in_(ids), VectorTombstone.lease_id == lease_id)
+                .values(
+                    attempts=VectorTombstone.attempts + 1,
+                    next_attempt_at=next_attempt_at,
+                    lease_id=None,
+                    last_error=last_error,
+                )
+            )
+            await db.commit()
+
+    async def delete_by_ids(self, ids: list[str], lease_id: Optional[str] = None, db: Optional[AsyncSession] = None):
+        async with get_async_db_context(db) as db:
+            stmt = delete(VectorTombstone).where(VectorTombstone.id.in_(ids))
+            if lease_id is not None:
+                stmt = stmt.where(VectorTombstone.lease_id == lease_id)
+            await db.execute(stmt)
+            await db.commit()
+
+    async def get_by_collection_names(
+        self, collection_names: list[str], db: Optional[AsyncSession] = None
+    ) -> list[VectorTombstoneModel]:
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                select(VectorTombstone).where(VectorTombstone.collection_name.in_(collection_names))
+            )
+            return [VectorTombstoneModel.model_validate(row) for row in result.scalars().all()]
+
+    async def get_by_collection_name_and_file(
+        self,
+        collection_name: str,
+        file_id: str,
+        hash: Optional[str] = None,
+        db: Optional[AsyncSession] = None,
+    ) -> list[VectorTombstoneModel]:
+        """Tombstones in a collection that hide the chunks of ``file_id`` or with content ``hash``."""
+        match = VectorTombstone.file_id == file_id
+        if hash:
+            match = or_(match, VectorTombstone.hash == hash)
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                select(VectorTombstone).where(VectorTombstone.collection_name == collection_name, match)
+            )
+            return [VectorTombstoneModel.model_validate(row) for row in result.scalars().all()]
+
+    async def delete_unleased_by_ids(self, ids: list[str], db: Optional[AsyncSession] = None) -> int:
+        """Delete the tombstones no worker currently holds a lease on; returns how many were deleted."""
+        now = int(time.time())
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                delete(VectorTombstone).where(
+                    VectorTombstone.id.in_(ids),
+                    or_(VectorTombstone.lease_id.is_(None), VectorTombstone.next_attempt_at <= now),
+                )
+            )
+            await db.commit()
+            return result.rowcount
+
+    async def count_by_collection_name(self, collection_name: str, db: Optional[AsyncSession] = None) -> int:
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                select(func.count(VectorTombstone.id)).where(VectorTombstone.collection_name == collection_name)
+            )
+            return result.scalar() or 0
+
+
+VectorTombstones = VectorTombstoneTable()
@@ -0,0 +1,282 @@
+"""Cross-request micro-batching for local embedding and reranking models.
+
+With a local SentenceTransformer (``RAG_EMBEDDING_ENGINE=''``) or CrossEncoder
+reranker, every request used to call ``encode`` / ``predict`` in its own
+``asyncio.to_thread`` call, so concurrent chats ran many small forward passes
+that contended for the same cores.  An ``InferenceBatcher`` queues requests
+from any coroutine or thread, waits up to ``RAG_LOCAL_INFERENCE_MAX_WAIT_MS``
+for more to arrive (or until ``RAG_LOCAL_INFERENCE_MAX_BATCH_SIZE`` inputs are
+queued), runs them as one model call on its own worker thread, and hands each
+caller its slice of the results.
+
+Requests are only merged when they share a key (e.g. the embedding prompt
+prefix), since a model call takes a single set of arguments.  Each loaded model
+has one batcher per kind (``get_model_batcher``), kept on the model object, so
+chat queries and uploads that build their own embedding or reranking function
+still share batches.  The worker thread is started on demand and exits after
+``IDLE_TIMEOUT`` seconds without work, so batchers of models replaced after a
+config change do not leave threads behind.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Optional, Sequence
+
+from opentelemetry import metrics
+
+log = logging.getLogger(__name__)
+
+RAG_LOCAL_INFERENCE_BATCHING = os.getenv('RAG_LOCAL_INFERENCE_BATCHING', 'True').lower() == 'true'
+RAG_LOCAL_INFERENCE_MAX_BATCH_SIZE = int(os.getenv('RAG_LOCAL_INFERENCE_MAX_BATCH_SIZE', '64'))
+RAG_LOCAL_INFERENCE_MAX_WAIT_MS = float(os.getenv('RAG_LOCAL_INFERENCE_MAX_WAIT_MS', '5'))
+
+IDLE_TIMEOUT = 30
+
+QUEUE_TIME_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+_meter = metrics.get_meter(__name__)
+_queue_time_histogram = _meter.create_histogram(
+    name='webui.inference.queue_time',
+    description='Time a local embedding or reranking request waited to be batched',
+    unit='ms',
+)
+_batch_size_histogram = _meter.create_histogram(
+    name='webui.inference.batch_size',
+    description='Inputs per local embedding or reranking model call',
+    unit='1',
+)
+
+
+class Histogram:
+    """Cumulative counts over fixed upper bounds, plus an overflow bucket."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def snapshot(self) -> dict:
+        count = sum(self.counts)
+        return {
+            'count': count,
+            'mean': round(self.total / count, 3) if count else 0.0,
+            'buckets': {
+                **{f'le_{bound}': self.counts[i] for i, bound in enumerate(self.bounds)},
+                'inf': self.counts[-1],
+            },
+        }
+
+
+class _Request:
+    __slots__ = ('key', 'inputs', 'future', 'enqueued_at')
+
+    def __init__(self, key: Hashable, inputs: list):
+        self.key = key
+        self.inputs = inputs
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class InferenceBatcher:
+    def __init__(
+        self,
+        name: str,
+        run_batch: Callable[[Hashable, list], Sequence],
+        max_batch_size: int = RAG_LOCAL_INFERENCE_MAX_BATCH_SIZE,
+        max_wait_ms: float = RAG_LOCAL_INFERENCE_MAX_WAIT_MS,
+    ):
+        """``run_batch(key, inputs)`` returns one result per input, in order."""
+        self.name = name
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._run_batch = run_batch
+        self._queue: queue.SimpleQueue[_Request] = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self.requests = 0
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        self.queue_time_ms = Histogram(QUEUE_TIME_BUCKETS_MS)
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+
+    def submit(self, inputs: list, key: Hashable = None) -> list[Future]:
+        """Queue ``inputs``, split into chunks of at most ``max_batch_size``; one future per chunk."""
+        futures = []
+        for start in range(0, len(inputs), self.max_batch_size):
+            request = _Request(key, inputs[start : start + self.max_batch_size])
+            self._queue.put(request)
+            futures.append(request.future)
+        self._ensure_worker()
+        return futures
+
+    def run(self, inputs: list, key: Hashable = None) -> list:
+        """Blocking call for worker threads (e.g. rerankers run through ``asyncio.to_thread``)."""
+        results = []
+        for future in self.submit(list(inputs), key):
+            results.extend(future.result())
+        return results
+
+    async def arun(self, inputs: list, key: Hashable = None) -> list:
+        futures = self.submit(list(inputs), key)
+        results = []
+        for chunk in await asyncio.gather(*(asyncio.wrap_future(future) for future in futures)):
+            results.extend(chunk)
+        return results
+
+    def stats(self) -> dict:
+        return {
+            'name': self.name,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'queue_depth': self._queue.qsize(),
+            'running': self._thread is not None,
+            'requests': self.requests,
+            'batches': self.batches,
+            'items': self.items,
+            'errors': self.errors,
+            'queue_time_ms': self.queue_time_ms.snapshot(),
+            'batch_size': self.batch_size.snapshot(),
+        }
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name=f'inference-{self.name}', daemon=True)
+                self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=IDLE_TIMEOUT)
+            except queue.Empty:
+                with self._lock:
+                    # submit() enqueues before taking the lock, so an empty
+                    # queue here means no caller is left waiting on this thread.
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+
+            pending = [first]
+            size = len(first.inputs)
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                pending.append(request)
+                size += len(request.inputs)
+
+            try:
+                self._dispatch(pending)
+            except Exception:
+                log.exception(f'Inference batcher {self.name} failed')
+
+    def _dispatch(self, pending: list[_Request]) -> None:
+        groups: dict[Hashable, list[_Request]] = {}
+        for request in pending:
+            # Skip callers that gave up (e.g. a cancelled request) before their batch ran.
+            if request.future.set_running_or_notify_cancel():
+                groups.setdefault(request.key, []).append(request)
+
+        for key, requests in groups.items():
+            batch: list[_Request] = []
+            size = 0
+            for request in requests:
+                if batch and size + len(request.inputs) > self.max_batch_size:
+                    self._run(key, batch)
+                    batch, size = [], 0
+                batch.append(request)
+                size += len(request.inputs)
+            if batch:
+                self._run(key, batch)
+
+    def _run(self, key: Hashable, batch: list[_Request]) -> None:
+        now = time.monotonic()
+        inputs = [item for request in batch for item in request.inputs]
+        attributes = {'batcher': self.name}
+        for request in batch:
+            queue_time_ms = (now - request.enqueued_at) * 1000
+            self.queue_time_ms.observe(queue_time_ms)
+            _queue_time_histogram.record(queue_time_ms, attributes)
+        self.batch_size.observe(len(inputs))
+        _batch_size_histogram.record(len(inputs), attributes)
+        self.requests += len(batch)
+        self.batches += 1
+        self.items += len(inputs)
+
+        try:
+            outputs = self._run_batch(key, inputs)
+            if len(outputs) != len(inputs):
+                raise ValueError(f'{self.name} returned {len(outputs)} results for {len(inputs)} inputs')
+        except Exception as e:
+            self.errors += 1
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        offset = 0
+        for request in batch:
+            request.future.set_result(outputs[offset : offset + len(request.inputs)])
+            offset += len(request.inputs)
+
+
+BATCHERS: dict[str, InferenceBatcher] = {}
+
+# Batchers of models that do not accept attributes, by id(model).
+_MODEL_BATCHERS: dict[int, dict[Hashable, InferenceBatcher]] = {}
+
+
+def register_batcher(batcher: InferenceBatcher) -> InferenceBatcher:
+    """Make ``batcher`` the one reported under its name (replacing the previous model's)."""
+    BATCHERS[batcher.name] = batcher
+    return batcher
+
+
+def get_model_batcher(
+    model: Any,
+    name: str,
+    run_batch: Callable[[Hashable, list], Sequence],
+    options: Hashable = None,
+) -> InferenceBatcher:
+    """
+    The ``name`` batcher of ``model`` for ``options`` (e.g. the encode batch
+    size), created on first use and reused by every caller of the same model.
+    """
+    batchers = getattr(model, '_inference_batchers', None)
+    if batchers is None:
+        batchers = {}
+        try:
+            model._inference_batchers = batchers
+        except AttributeError:
+            batchers = _MODEL_BATCHERS.setdefault(id(model), batchers)
+
+    key = (name, options)
+    batcher = batchers.get(key)
+    if batcher is None:
+        batcher = batchers[key] = InferenceBatcher(name, run_batch)
+    return register_batcher(batcher)
+
+
+def get_batcher_stats() -> dict[str, Any]:
+    return {
+        'enabled': RAG_LOCAL_INFERENCE_BATCHING,
+        'batchers': [batcher.stats() for batcher in BATCHERS.values()],
+    }
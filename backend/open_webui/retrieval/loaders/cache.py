@@ -0,0 +1,249 @@
+"""Persistent cache for parsed documents.
+
+Extraction engines (PyMuPDF, Docling, Tika, Mistral OCR, ...) are the most
+expensive part of file processing, yet the same file is routinely parsed
+again: re-adding it to another knowledge base, reindexing, or retrying after
+an embedding failure.  Parsed output is stored here keyed by the file's
+SHA-256 plus the extraction engine, the engine parameters that influence its
+output, and the file extension and content type (the loader picks its parser
+from them), so any of those changing is a cache miss rather than stale data.
+
+Entries live under ``CACHE_DIR/extraction`` as gzip-compressed JSON, one file
+per key.  Reads touch the entry's mtime so eviction is least-recently-used
+once the configured size budget is exceeded.  The cache size is tracked as
+entries are written and recounted from disk every ``RESCAN_INTERVAL`` seconds,
+since other workers write to the same directory.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from langchain_core.documents import Document
+from open_webui.config import CACHE_DIR
+from open_webui.utils.misc import calculate_sha256
+
+log = logging.getLogger(__name__)
+
+EXTRACTION_CACHE_DIR = CACHE_DIR / 'extraction'
+
+# Loader kwargs that influence each engine's output.  Credentials only count as
+# set or unset: rotating an API key must not invalidate every cached document,
+# but Loader falls back to the default parser while an engine's key is unset.
+ENGINE_PARAM_PREFIXES = {
+    'external': ('EXTERNAL_DOCUMENT_LOADER_',),
+    'tika': ('TIKA_', 'PDF_'),
+    'datalab_marker': ('DATALAB_MARKER_',),
+    'docling': ('DOCLING_',),
+    'document_intelligence': ('DOCUMENT_INTELLIGENCE_',),
+    'mineru': ('MINERU_',),
+    'mistral_ocr': ('MISTRAL_OCR_',),
+    'paddleocr_vl': ('PADDLEOCR_VL_',),
+}
+DEFAULT_PARAM_PREFIXES = ('PDF_',)
+SECRET_PARAM_SUFFIXES = ('_API_KEY', '_KEY', '_TOKEN', '_HEADERS')
+
+# Bump when the serialized format or loader post-processing changes.
+CACHE_FORMAT_VERSION = 1
+
+RESCAN_INTERVAL = 300
+# Eviction frees down to this fraction of the budget, so the next writes do not evict again.
+EVICT_TARGET_RATIO = 0.9
+
+
+def get_extraction_params(engine: str, kwargs: dict) -> dict:
+    """Return the subset of loader kwargs that affects the output of ``engine``; credentials become booleans."""
+    prefixes = ENGINE_PARAM_PREFIXES.get(engine, ()) + DEFAULT_PARAM_PREFIXES
+    return {
+        key: bool(value) if key.endswith(SECRET_PARAM_SUFFIXES) else value
+        for key, value in sorted(kwargs.items())
+        if key.isupper() and key.startswith(prefixes)
+    }
+
+
+class ExtractionCache:
+    def __init__(self, cache_dir: Path = EXTRACTION_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+        self._scanned_at = 0.0
+
+    def _path(self, file_hash: str, key: str) -> Path:
+        # Prefix with the file hash so all variants of one file can be dropped at once.
+        return self.cache_dir / f'{file_hash}-{key}.json.gz'
+
+    @staticmethod
+    def make_key(engine: str, params: dict, extension: str = '', content_type: str = '') -> str:
+        payload = json.dumps(
+            {
+                'v': CACHE_FORMAT_VERSION,
+                'engine': engine or '',
+                'params': params,
+                'extension': (extension or '').lower(),
+                'content_type': (content_type or '').lower(),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    def get(self, file_hash: str, key: str) -> Optional[list[Document]]:
+        path = self._path(file_hash, key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning(f'Discarding unreadable extraction cache entry {path.name}: {e}')
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return [Document(page_content=content, metadata=metadata) for content, metadata in entries]
+
+    def set(self, file_hash: str, key: str, docs: list[Document], max_size: int) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(file_hash, key)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+
+        entries = [[doc.page_content, doc.metadata] for doc in docs]
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            json.dump(entries, f, ensure_ascii=False, separators=(',', ':'), default=str)
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        written = tmp_path.stat().st_size
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._size is None or time.monotonic() - self._scanned_at > RESCAN_INTERVAL:
+                self._scan()
+            else:
+                self._size += written - replaced
+            over_budget = max_size and max_size > 0 and self._size > max_size
+
+        if over_budget:
+            self.evict(int(max_size * EVICT_TARGET_RATIO))
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.cache_dir.glob('*.json.gz'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        entries = self._entries()
+        self._size = sum(size for _, size, _ in entries)
+        self._scanned_at = time.monotonic()
+        return entries
+
+    def evict(self, max_size: int) -> int:
+        """Delete least-recently-used entries until the cache fits in ``max_size`` bytes."""
+        with self._lock:
+            entries = self._scan()
+            total = self._size
+
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= max_size:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            self._size = total
+
+            if removed:
+                log.info(f'Evicted {removed} extraction cache entries')
+            return removed
+
+    def invalidate(self, file_hash: str) -> int:
+        removed = 0
+        for path in self.cache_dir.glob(f'{file_hash}-*.json.gz'):
+            path.unlink(missing_ok=True)
+            removed += 1
+        with self._lock:
+            self._size = None
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for path in self.cache_dir.glob('*.json.gz'):
+            path.unlink(missing_ok=True)
+            removed += 1
+        with self._lock:
+            self._size = None
+        return removed
+
+    def stats(self) -> dict:
+        count = 0
+        size = 0
+        for path in self.cache_dir.glob('*.json.gz'):
+            try:
+                size += path.stat().st_size
+                count += 1
+            except FileNotFoundError:
+                continue
+        return {'entries': count, 'size': size}
+
+
+EXTRACTION_CACHE = ExtractionCache()
+
+
+async def aload_with_cache(
+    loader,
+    filename: str,
+    file_content_type: str,
+    file_path: str,
+    max_size: int = 0,
+) -> list[Document]:
+    """
+    Load ``file_path`` through ``loader`` unless an identical extraction is cached.
+
+    ``max_size`` is the cache budget in bytes; 0 disables eviction.
+    Cache failures never fail the extraction itself.
+    """
+    file_hash = None
+    key = None
+    try:
+        file_hash = await asyncio.to_thread(calculate_sha256, file_path, 1024 * 1024)
+        key = ExtractionCache.make_key(
+            loader.engine,
+            get_extraction_params(loader.engine, loader.kwargs),
+            # Same derivation as Loader._get_loader, which picks the parser from it.
+            extension=(filename or '').split('.')[-1],
+            content_type=file_content_type,
+        )
+        docs = await asyncio.to_thread(EXTRACTION_CACHE.get, file_hash, key)
+        if docs is not None:
+            log.debug(f'Extraction cache hit for {filename} ({file_hash})')
+            return docs
+    except Exception as e:
+        log.warning(f'Extraction cache lookup failed for {filename}: {e}')
+
+    docs = await loader.aload(filename, file_content_type, file_path)
+
+    # An empty result may be a transient engine failure; leave it for the next attempt.
+    if file_hash and key and any((doc.page_content or '').strip() for doc in docs):
+        try:
+            await asyncio.to_thread(EXTRACTION_CACHE.set, file_hash, key, docs, max_size)
+        except Exception as e:
+            log.warning(f'Failed to cache extraction for {filename}: {e}')
+
+    return docs
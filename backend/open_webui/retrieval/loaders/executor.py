@@ -0,0 +1,237 @@
+"""Process-pool executor for CPU-bound document extraction.
+
+Local parsers (pypdf, python-docx, python-pptx, pandas, unstructured) hold the
+GIL for the whole parse, so running them in a thread of the web worker
+serializes every extraction on one core and competes with request handling.
+When ``RAG_EXTRACTION_WORKERS`` is set, ``Loader.aload`` hands those parsers
+to a pool of worker processes instead.  Large PDFs are split into page ranges
+and spreadsheets into sheets, extracted in parallel and merged back in order.
+
+Workers are started with the ``spawn`` method so they never inherit the web
+worker's threads, DB connections or loaded models, and only import the loader
+modules they need.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import ftfy
+from langchain_core.documents import Document
+from open_webui.env import (
+    RAG_EXTRACTION_PAGES_PER_TASK,
+    RAG_EXTRACTION_WORKER_MAX_TASKS,
+    RAG_EXTRACTION_WORKER_MEMORY_LIMIT,
+    RAG_EXTRACTION_WORKERS,
+)
+
+log = logging.getLogger(__name__)
+
+# Loaders that parse the file locally and are worth moving off the web worker.
+# Remote engines (Tika, Docling, Mistral OCR, ...) are I/O-bound and stay on threads.
+LOCAL_LOADER_NAMES = {
+    'PyPDFLoader',
+    'CSVLoader',
+    'Docx2txtLoader',
+    'BSHTMLLoader',
+    'OutlookMessageLoader',
+    'ExcelLoader',
+    'PptxLoader',
+}
+
+
+####################
+# Worker functions (run in the child processes)
+####################
+
+
+def _init_worker(memory_limit: Optional[int]) -> None:
+    if not memory_limit:
+        return
+    try:
+        import resource
+
+        limit = memory_limit * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        log.warning(f'Could not apply extraction worker memory limit: {e}')
+
+
+def _fix_docs(docs: list[Document]) -> list[Document]:
+    return [Document(page_content=ftfy.fix_text(doc.page_content), metadata=doc.metadata) for doc in docs]
+
+
+def _load_document(engine: str, kwargs: dict, filename: str, file_content_type: str, file_path: str):
+    from open_webui.retrieval.loaders.main import Loader
+
+    return Loader(engine, **kwargs).load(filename, file_content_type, file_path)
+
+
+def _count_pdf_pages(file_path: str) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(file_path).pages)
+
+
+def _load_pdf_pages(file_path: str, start: int, end: int, extract_images: bool) -> list[Document]:
+    from langchain_community.document_loaders import PyPDFLoader
+    from pypdf import PdfReader, PdfWriter
+
+    reader = PdfReader(file_path)
+    total_pages = len(reader.pages)
+    try:
+        page_labels = reader.page_labels
+    except Exception:
+        page_labels = []
+
+    writer = PdfWriter()
+    for idx in range(start, end):
+        writer.add_page(reader.pages[idx])
+
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
+        writer.write(tmp)
+        tmp_path = tmp.name
+
+    try:
+        docs = PyPDFLoader(tmp_path, extract_images=extract_images, mode='page').load()
+    finally:
+        os.remove(tmp_path)
+
+    # Rebase per-page metadata onto the original document.
+    for doc in docs:
+        page = start + doc.metadata.get('page', 0)
+        doc.metadata['source'] = file_path
+        doc.metadata['page'] = page
+        doc.metadata['total_pages'] = total_pages
+        if page < len(page_labels):
+            doc.metadata['page_label'] = page_labels[page]
+
+    return _fix_docs(docs)
+
+
+def _list_excel_sheets(file_path: str) -> list[str]:
+    import pandas as pd
+
+    with pd.ExcelFile(file_path) as xls:
+        return list(xls.sheet_names)
+
+
+def _load_excel_sheets(file_path: str, sheet_names: list[str]) -> list[str]:
+    import pandas as pd
+
+    text_parts = []
+    with pd.ExcelFile(file_path) as xls:
+        for sheet_name in sheet_names:
+            df = pd.read_excel(xls, sheet_name=sheet_name)
+            text_parts.append(f'Sheet: {sheet_name}\n{df.to_string(index=False)}')
+    return text_parts
+
+
+####################
+# Executor
+####################
+
+
+class ExtractionExecutor:
+    def __init__(
+        self,
+        workers: int = RAG_EXTRACTION_WORKERS,
+        memory_limit: Optional[int] = RAG_EXTRACTION_WORKER_MEMORY_LIMIT,
+        max_tasks_per_child: Optional[int] = RAG_EXTRACTION_WORKER_MAX_TASKS,
+        pages_per_task: int = RAG_EXTRACTION_PAGES_PER_TASK,
+    ):
+        self.workers = workers
+        self.memory_limit = memory_limit
+        self.max_tasks_per_child = max_tasks_per_child
+        self.pages_per_task = pages_per_task
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def supports(self, loader) -> bool:
+        name = type(loader).__name__
+        return name in LOCAL_LOADER_NAMES or name.startswith('Unstructured')
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.memory_limit,),
+                    max_tasks_per_child=self.max_tasks_per_child,
+                )
+            return self._pool
+
+    def _reset_pool(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_pool(), fn, *args)
+        except BrokenProcessPool:
+            # A worker died (typically killed for exceeding its memory limit);
+            # drop the pool so the next extraction starts fresh workers.
+            self._reset_pool()
+            raise MemoryError('Document extraction worker terminated unexpectedly')
+
+    async def aload(
+        self,
+        loader,
+        inner_loader,
+        filename: str,
+        file_content_type: str,
+        file_path: str,
+    ) -> list[Document]:
+        name = type(inner_loader).__name__
+
+        if name == 'PyPDFLoader' and (loader.kwargs.get('PDF_LOADER_MODE') or 'page') == 'page':
+            total_pages = await self._run(_count_pdf_pages, file_path)
+            if total_pages > self.pages_per_task:
+                extract_images = bool(loader.kwargs.get('PDF_EXTRACT_IMAGES'))
+                ranges = [
+                    (start, min(start + self.pages_per_task, total_pages))
+                    for start in range(0, total_pages, self.pages_per_task)
+                ]
+                log.debug(f'Extracting {filename} ({total_pages} pages) in {len(ranges)} parallel ranges')
+                results = await asyncio.gather(
+                    *[self._run(_load_pdf_pages, file_path, start, end, extract_images) for start, end in ranges]
+                )
+                return [doc for docs in results for doc in docs]
+
+        if name == 'ExcelLoader':
+            sheet_names = await self._run(_list_excel_sheets, file_path)
+            if len(sheet_names) > 1:
+                results = await asyncio.gather(
+                    *[self._run(_load_excel_sheets, file_path, [sheet_name]) for sheet_name in sheet_names]
+                )
+                text = '\n\n'.join(part for parts in results for part in parts)
+                return _fix_docs([Document(page_content=text, metadata={'source': file_path})])
+
+        # The user object is only needed by remote loaders for forwarded headers.
+        kwargs = {key: value for key, value in loader.kwargs.items() if key != 'user'}
+        kwargs['metadata'] = loader.metadata
+        return await self._run(_load_document, loader.engine, kwargs, filename, file_content_type, file_path)
+
+
+EXTRACTION_EXECUTOR = ExtractionExecutor()
@@ -24,6 +24,7 @@ from open_webui.env import (
     REQUESTS_VERIFY,
 )
 from open_webui.retrieval.loaders.datalab_marker import DatalabMarkerLoader
+from open_webui.retrieval.loaders.executor import EXTRACTION_EXECUTOR
 from open_webui.retrieval.loaders.external_document import ExternalDocumentLoader
 from open_webui.retrieval.loaders.mineru import MinerULoader
 from open_webui.retrieval.loaders.mistral import MistralLoader
@@ -251,6 +252,9 @@ class Loader:
 
     def load(self, filename: str, file_content_type: str, file_path: str) -> list[Document]:
         loader = self._get_loader(filename, file_content_type, file_path)
+        return self._load(loader)
+
+    def _load(self, loader) -> list[Document]:
         docs = loader.load()
         return [Document(page_content=ftfy.fix_text(doc.page_content), metadata=doc.metadata) for doc in docs]
 
@@ -263,8 +267,14 @@ class Loader:
         Calling `load` directly from an async handler would block the event
         loop for the entire parse — minutes for large PDFs. This offloads
         the work to a worker thread so the loop stays responsive.
+
+        When the extraction process pool is enabled, local parsers run there
+        instead, with large PDFs and spreadsheets split across workers.
         """
-        return await asyncio.to_thread(self.load, filename, file_content_type, file_path)
+        loader = await asyncio.to_thread(self._get_loader, filename, file_content_type, file_path)
+        if EXTRACTION_EXECUTOR.enabled and EXTRACTION_EXECUTOR.supports(loader):
+            return await EXTRACTION_EXECUTOR.aload(self, loader, filename, file_content_type, file_path)
+        return await asyncio.to_thread(self._load, loader)
 
     def _is_text_file(self, file_ext: str, file_content_type: str) -> bool:
         return file_ext in known_source_ext or (
@@ -0,0 +1,381 @@
+"""Shared local model server for embeddings and reranking.
+
+Every uvicorn worker used to load its own SentenceTransformer and CrossEncoder
+(``get_ef`` / ``get_rf``), so ``UVICORN_WORKERS=8`` meant eight copies of a
+1-2 GB model and eight torch thread pools competing for the same cores.  With
+``RAG_MODEL_SERVER=true`` one sidecar process owns the models instead:
+
+  - each worker runs a supervisor thread; the one holding an ``flock`` on
+    ``<socket>.lock`` starts the sidecar (``python -m
+    open_webui.retrieval.model_server``) and restarts it if it exits.  If that
+    worker dies, the lock is released, the sidecar exits with its parent and
+    another worker's supervisor takes over.
+  - ``get_ef`` / ``get_rf`` return ``ModelServerSentenceTransformer`` /
+    ``ModelServerCrossEncoder``, which expose the ``encode`` / ``predict``
+    methods the embedding and reranking functions already call, so
+    ``get_embedding_function`` and ``get_reranking_function`` are unchanged.
+  - requests go over a Unix socket.  Inputs travel as a JSON header; results
+    come back as raw float32 bytes sent straight from the array's buffer and
+    wrapped with ``numpy.frombuffer`` on the worker, without serialization.
+  - the sidecar runs each model behind an ``InferenceBatcher``, so requests
+    from all workers are batched together.
+
+ColBERT rerankers are still loaded in each worker.
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+log = logging.getLogger(__name__)
+
+RAG_MODEL_SERVER = os.getenv('RAG_MODEL_SERVER', 'False').lower() == 'true' and sys.platform != 'win32'
+RAG_MODEL_SERVER_SOCKET = os.getenv(
+    'RAG_MODEL_SERVER_SOCKET', os.path.join(tempfile.gettempdir(), 'open-webui-model-server.sock')
+)
+RAG_MODEL_SERVER_CONNECT_TIMEOUT = float(os.getenv('RAG_MODEL_SERVER_CONNECT_TIMEOUT', '120'))
+# Models kept loaded at once; the least recently used one is dropped past this.
+RAG_MODEL_SERVER_MAX_MODELS = max(int(os.getenv('RAG_MODEL_SERVER_MAX_MODELS', '4')), 1)
+
+# Frame: header length, payload length, JSON header, raw payload.
+FRAME = struct.Struct('!IQ')
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytearray:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if not count:
+            raise ConnectionError('Model server connection closed')
+        received += count
+    return buffer
+
+
+def _send_frame(sock: socket.socket, header: dict, payload: Any = b'') -> None:
+    header_bytes = json.dumps(header).encode()
+    payload = memoryview(payload).cast('B')
+    sock.sendall(FRAME.pack(len(header_bytes), payload.nbytes) + header_bytes)
+    if payload.nbytes:
+        sock.sendall(payload)
+
+
+def _recv_frame(sock: socket.socket) -> tuple[dict, bytearray]:
+    header_size, payload_size = FRAME.unpack(_recv_exactly(sock, FRAME.size))
+    header = json.loads(_recv_exactly(sock, header_size))
+    return header, _recv_exactly(sock, payload_size)
+
+
+####################
+# Client
+####################
+
+
+class ModelServerClient:
+    """One connection per thread; embedding and reranking calls run in worker threads."""
+
+    def __init__(self, path: str = RAG_MODEL_SERVER_SOCKET):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> socket.socket:
+        deadline = time.monotonic() + RAG_MODEL_SERVER_CONNECT_TIMEOUT
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+                return sock
+            except OSError:
+                sock.close()
+                if time.monotonic() > deadline:
+                    raise ConnectionError(f'Model server is not available at {self.path}')
+                time.sleep(0.5)
+
+    def request(self, header: dict):
+        import numpy as np
+
+        for attempt in range(2):
+            sock = getattr(self._local, 'sock', None)
+            if sock is None:
+                sock = self._local.sock = self._connect()
+            try:
+                _send_frame(sock, header)
+                response, payload = _recv_frame(sock)
+                break
+            except (ConnectionError, OSError):
+                # The sidecar restarted; reconnect once.
+                sock.close()
+                self._local.sock = None
+                if attempt:
+                    raise
+
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error') or 'Model server request failed')
+        if 'shape' not in response:
+            return response
+        return np.frombuffer(payload, dtype=response['dtype']).reshape(response['shape'])
+
+
+_client: Optional[ModelServerClient] = None
+
+
+def get_model_server_client() -> ModelServerClient:
+    global _client
+    if _client is None:
+        _client = ModelServerClient()
+    return _client
+
+
+class ModelServerSentenceTransformer:
+    """Stands in for ``SentenceTransformer`` in ``app.state.ef``."""
+
+    def __init__(self, model: str, auto_update: bool = False):
+        self.model = model
+        self.auto_update = auto_update
+        self.client = get_model_server_client()
+        # Load eagerly so a bad model name fails in get_ef, as it did in-process.
+        self.client.request({'op': 'load', 'kind': 'embedding', 'model': model, 'auto_update': auto_update})
+
+    def encode(self, sentences, batch_size: int = 32, prompt: Optional[str] = None, **kwargs):
+        single = isinstance(sentences, str)
+        embeddings = self.client.request(
+            {
+                'op': 'encode',
+                'model': self.model,
+                'auto_update': self.auto_update,
+                'inputs': [sentences] if single else list(sentences),
+                'batch_size': batch_size,
+                'prompt': prompt,
+            }
+        )
+        return embeddings[0] if single else embeddings
+
+
+class ModelServerCrossEncoder:
+    """Stands in for ``CrossEncoder`` in ``app.state.rf``."""
+
+    def __init__(self, model: str, auto_update: bool = False):
+        self.model = model
+        self.auto_update = auto_update
+        self.client = get_model_server_client()
+        self.client.request({'op': 'load', 'kind': 'reranking', 'model': model, 'auto_update': auto_update})
+
+    def predict(self, sentences, batch_size: int = 32, **kwargs):
+        return self.client.request(
+            {
+                'op': 'predict',
+                'model': self.model,
+                'auto_update': self.auto_update,
+                'inputs': [list(pair) for pair in sentences],
+                'batch_size': batch_size,
+            }
+        )
+
+
+####################
+# Supervisor
+####################
+
+
+class ModelServerSupervisor:
+    def __init__(self, path: str = RAG_MODEL_SERVER_SOCKET):
+        self.path = path
+        self._process: Optional[subprocess.Popen] = None
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='model-server-supervisor', daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def stop(self) -> None:
+        self._stopping = True
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+
+    def _run(self) -> None:
+        import fcntl
+
+        lock_file = open(f'{self.path}.lock', 'w')
+        while not self._stopping:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # Another worker supervises the sidecar; take over if it dies.
+                time.sleep(5)
+                continue
+            self._supervise()
+
+    def _supervise(self) -> None:
+        backoff = 1
+        while not self._stopping:
+            started = time.monotonic()
+            log.info(f'Starting model server on {self.path}')
+            self._process = subprocess.Popen(
+                [sys.executable, '-m', 'open_webui.retrieval.model_server', '--socket', self.path],
+                # The sidecar's own get_ef / get_rf load the models in-process.
+                env={**os.environ, 'RAG_MODEL_SERVER': 'False'},
+            )
+            code = self._process.wait()
+            if self._stopping:
+                return
+            backoff = 1 if time.monotonic() - started > 60 else min(backoff * 2, 30)
+            log.warning(f'Model server exited with code {code}, restarting in {backoff}s')
+            time.sleep(backoff)
+
+
+_supervisor: Optional[ModelServerSupervisor] = None
+
+
+def start_model_server_supervisor() -> None:
+    global _supervisor
+    if RAG_MODEL_SERVER and _supervisor is None:
+        _supervisor = ModelServerSupervisor()
+        _supervisor.start()
+
+
+####################
+# Server
+####################
+
+
+class _ModelRegistry:
+    """Loaded models by (kind, model), keeping the ``max_models`` most recently used.
+
+    Workers configured with different models (e.g. during a settings change
+    that has not reached every worker yet) would otherwise reload on every
+    alternating request.
+    """
+
+    def __init__(self, max_models: int = RAG_MODEL_SERVER_MAX_MODELS):
+        self.max_models = max_models
+        self._lock = threading.Lock()
+        self._models: OrderedDict[tuple[str, str], Any] = OrderedDict()
+
+    def get(self, kind: str, model: str, auto_update: bool):
+        from open_webui.retrieval.batching import InferenceBatcher
+
+        with self._lock:
+            batcher = self._models.get((kind, model))
+            if batcher is not None:
+                self._models.move_to_end((kind, model))
+                return batcher
+
+            from open_webui.routers.retrieval import get_ef, get_rf
+
+            log.info(f'Model server: loading {kind} model {model}')
+            if kind == 'embedding':
+                instance = get_ef('', model, auto_update)
+                if instance is None:
+                    raise RuntimeError(f'Failed to load embedding model {model}')
+                batcher = InferenceBatcher(
+                    'embedding',
+                    lambda key, texts: instance.encode(
+                        texts, batch_size=key[0], **({'prompt': key[1]} if key[1] else {})
+                    ),
+                )
+            else:
+                instance = get_rf('', model, auto_update=auto_update)
+                batcher = InferenceBatcher(
+                    'reranking',
+                    lambda key, pairs: instance.predict([tuple(pair) for pair in pairs], batch_size=key[0]),
+                )
+            self._models[(kind, model)] = batcher
+            while len(self._models) > self.max_models:
+                # Requests already queued on the evicted batcher still finish.
+                (evicted_kind, evicted_model), _ = self._models.popitem(last=False)
+                log.info(f'Model server: unloading {evicted_kind} model {evicted_model}')
+            return batcher
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    registry = _ModelRegistry()
+
+    def handle(self) -> None:
+        import numpy as np
+
+        while True:
+            try:
+                request, _ = _recv_frame(self.request)
+            except (ConnectionError, OSError):
+                return
+
+            try:
+                op = request.get('op')
+                if op == 'ping':
+                    _send_frame(self.request, {'ok': True})
+                    continue
+                kind = request.get('kind') or ('embedding' if op == 'encode' else 'reranking')
+                batcher = self.registry.get(kind, request['model'], bool(request.get('auto_update')))
+                if op == 'load':
+                    _send_frame(self.request, {'ok': True})
+                    continue
+
+                key = (int(request.get('batch_size') or 32), request.get('prompt'))
+                inputs = request.get('inputs') or []
+                chunks = [np.asarray(future.result()) for future in batcher.submit(inputs, key)]
+                result = np.ascontiguousarray(
+                    np.concatenate(chunks) if chunks else np.empty((0,)), dtype=np.float32
+                )
+            except Exception as e:
+                log.exception('Model server request failed')
+                _send_frame(self.request, {'ok': False, 'error': str(e)})
+                continue
+
+            _send_frame(self.request, {'ok': True, 'shape': list(result.shape), 'dtype': 'float32'}, result)
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _exit_with_parent(parent_pid: int, server: _Server) -> None:
+    while os.getppid() == parent_pid:
+        time.sleep(2)
+    log.info('Model server: supervisor exited, shutting down')
+    server.shutdown()
+
+
+def main() -> None:
+    # Configures logging and fails fast on a broken install, before accepting requests.
+    import open_webui.routers.retrieval  # noqa: F401
+
+    parser = argparse.ArgumentParser(description='Open WebUI local model server')
+    parser.add_argument('--socket', default=RAG_MODEL_SERVER_SOCKET)
+    args = parser.parse_args()
+
+    if os.path.exists(args.socket):
+        os.unlink(args.socket)
+    # Create the socket owner-only, so no other user can connect before it is locked down.
+    umask = os.umask(0o077)
+    try:
+        server = _Server(args.socket, _Handler)
+    finally:
+        os.umask(umask)
+    threading.Thread(target=_exit_with_parent, args=(os.getppid(), server), daemon=True).start()
+    log.info(f'Model server listening on {args.socket}')
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""Reranker score cache.
+
+Regenerations, multi-model fan-out and follow-up questions rerank the same
+(query, chunk) pairs again and again, and external rerankers bill per call.
+Scores are cached per reranker (engine, model and endpoint), normalized
+query and chunk content hash, in a bounded in-process LRU and, when Redis is configured, a shared
+Redis tier with a TTL.  ``cached_rerank`` looks every pair up first and sends
+only the misses to the model, in a single call.
+
+Only rerankers that score each pair independently are cached; ColBERT
+normalizes scores across the candidate set, so its scores are not reusable.
+Multi-label outputs (a row of scores per pair) pass through uncached.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Optional, Sequence
+
+from open_webui.env import REDIS_KEY_PREFIX
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+RAG_RERANK_CACHE_ENABLED = os.getenv('RAG_RERANK_CACHE_ENABLED', 'True').lower() == 'true'
+RAG_RERANK_CACHE_SIZE = int(os.getenv('RAG_RERANK_CACHE_SIZE', '100000'))
+RAG_RERANK_CACHE_TTL = int(os.getenv('RAG_RERANK_CACHE_TTL', str(7 * 24 * 3600)))
+
+REDIS_PREFIX = f'{REDIS_KEY_PREFIX}:rerank'
+
+
+def normalize_query(query: str) -> str:
+    return ' '.join(unicodedata.normalize('NFKC', query or '').split())
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+class RerankScoreCache:
+    def __init__(self, max_size: int = RAG_RERANK_CACHE_SIZE, ttl: int = RAG_RERANK_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_checked = False
+
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def _get_redis(self):
+        # Sync client: reranking runs in worker threads (see RerankCompressor).
+        if not self._redis_checked:
+            self._redis_checked = True
+            self._redis = get_redis_client()
+        return self._redis
+
+    def keys(self, model: str, query: str, texts: Sequence[str]) -> list[str]:
+        prefix = _digest(f'{model}\0{normalize_query(query)}')
+        return [f'{prefix}:{_digest(text or "")}' for text in texts]
+
+    def get_many(self, keys: list[str]) -> list[Optional[float]]:
+        scores: list[Optional[float]] = [None] * len(keys)
+        with self._lock:
+            for i, key in enumerate(keys):
+                score = self._entries.get(key)
+                if score is not None:
+                    self._entries.move_to_end(key)
+                    scores[i] = score
+                    self.local_hits += 1
+
+        missing = [i for i, score in enumerate(scores) if score is None]
+        redis = self._get_redis() if missing else None
+        if redis is not None:
+            try:
+                pipeline = redis.pipeline()
+                for i in missing:
+                    pipeline.get(f'{REDIS_PREFIX}:{keys[i]}')
+                found = {}
+                for i, value in zip(missing, pipeline.execute()):
+                    if value is not None:
+                        scores[i] = found[keys[i]] = float(value)
+                if found:
+                    self.redis_hits += len(found)
+                    self._store_local(found)
+            except Exception as e:
+                log.debug(f'Rerank cache Redis lookup failed: {e}')
+
+        self.misses += sum(1 for score in scores if score is None)
+        return scores
+
+    def set_many(self, entries: dict[str, float]) -> None:
+        if not entries:
+            return
+        self._store_local(entries)
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                pipeline = redis.pipeline()
+                for key, score in entries.items():
+                    pipeline.set(f'{REDIS_PREFIX}:{key}', repr(score), ex=self.ttl)
+                pipeline.execute()
+            except Exception as e:
+                log.debug(f'Rerank cache Redis write failed: {e}')
+
+    def _store_local(self, entries: dict[str, float]) -> None:
+        with self._lock:
+            for key, score in entries.items():
+                self._entries[key] = score
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> int:
+        """Drop both tiers; returns the number of in-process entries removed."""
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                batch = []
+                for key in redis.scan_iter(match=f'{REDIS_PREFIX}:*', count=1000):
+                    batch.append(key)
+                    if len(batch) >= 1000:
+                        redis.delete(*batch)
+                        batch = []
+                if batch:
+                    redis.delete(*batch)
+            except Exception as e:
+                log.warning(f'Rerank cache Redis reset failed: {e}')
+        return removed
+
+    def stats(self) -> dict:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            'enabled': RAG_RERANK_CACHE_ENABLED,
+            'entries': len(self._entries),
+            'max_size': self.max_size,
+            'redis': self._redis is not None,
+            'local_hits': self.local_hits,
+            'redis_hits': self.redis_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.local_hits + self.redis_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+RERANK_SCORE_CACHE = RerankScoreCache()
+
+
+def cached_rerank(
+    model: str,
+    predict: Callable[[str, list[str], Optional[object]], Optional[Sequence]],
+) -> Callable[[str, list[str], Optional[object]], Optional[list]]:
+    """Wrap ``predict(query, texts, user)`` so only uncached texts reach the model."""
+
+    def rerank(query: str, texts: list[str], user=None) -> Optional[list[float]]:
+        keys = RERANK_SCORE_CACHE.keys(model, query, texts)
+        scores = RERANK_SCORE_CACHE.get_many(keys)
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if not missing:
+            return scores
+
+        predicted = predict(query, [texts[i] for i in missing], user)
+        if predicted is None:
+            return None
+        if hasattr(predicted, 'tolist'):
+            predicted = predicted.tolist()
+
+        entries = {}
+        for i, score in zip(missing, predicted):
+            if isinstance(score, (list, tuple)):
+                # Multi-label CrossEncoders score each pair with a row of label scores; those are not cached.
+                scores[i] = score
+            else:
+                scores[i] = entries[keys[i]] = float(score)
+        RERANK_SCORE_CACHE.set_many(entries)
+        return scores
+
+    return rerank
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextvars
 import hashlib
 import logging
 import os
@@ -13,10 +14,7 @@ from urllib.parse import quote
 import aiohttp
 import requests
 from huggingface_hub import snapshot_download
-from langchain_classic.retrievers import (
-    ContextualCompressionRetriever,
-    EnsembleRetriever,
-)
+from langchain_classic.retrievers import EnsembleRetriever
 from langchain_community.retrievers import BM25Retriever
 from langchain_core.documents import Document
 from open_webui.config import (
@@ -41,8 +39,17 @@ from open_webui.models.knowledge import Knowledges
 from open_webui.models.notes import Notes
 from open_webui.models.config import Config
 from open_webui.models.users import UserModel
+from open_webui.retrieval.batching import (
+    RAG_LOCAL_INFERENCE_BATCHING,
+    RAG_LOCAL_INFERENCE_MAX_BATCH_SIZE,
+    get_model_batcher,
+)
 from open_webui.retrieval.loaders.youtube import YoutubeLoader
+from open_webui.retrieval.models.base_reranker import BaseReranker
+from open_webui.retrieval.rerank_cache import RAG_RERANK_CACHE_ENABLED, cached_rerank
 from open_webui.retrieval.vector.async_client import ASYNC_VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.compression import truncating_embedding_function
+from open_webui.retrieval.vector.ephemeral import EPHEMERAL_VECTOR_DB, get_vector_db_client
 from open_webui.retrieval.external import retrieve_external_knowledge
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 from open_webui.retrieval.vector.main import GetResult, SearchResult
@@ -50,6 +57,8 @@ from open_webui.retrieval.web.utils import get_web_loader
 from open_webui.utils.access_control.files import has_access_to_file
 from open_webui.utils.headers import include_user_info_headers
 from open_webui.utils.misc import get_message_list
+from open_webui.utils.telemetry.retrieval import retrieval_stage
+from open_webui.utils.vector_deletions import apply_vector_tombstones, load_vector_tombstones
 
 log = logging.getLogger(__name__)
 
@@ -106,6 +115,8 @@ LOADER_CONFIG_KEYS = {
     'MINERU_API_TIMEOUT': 'rag.mineru_api_timeout',
     'MINERU_PARAMS': 'rag.mineru_params',
     'MINERU_FILE_EXTENSIONS': 'rag.mineru_file_extensions',
+    'extraction_cache_enabled': 'rag.extraction_cache.enable',
+    'extraction_cache_max_size': 'rag.extraction_cache.max_size',
 }
 
 
@@ -283,11 +294,18 @@ class VectorSearchRetriever(BaseRetriever):
         run_manager: CallbackManagerForRetrieverRun,
     ) -> list[Document]:
         embedding = await self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
-        result = await ASYNC_VECTOR_DB_CLIENT.search(
-            collection_name=self.collection_name,
-            vectors=[embedding],
-            limit=self.top_k,
-        )
+        if EPHEMERAL_VECTOR_DB.has_collection(self.collection_name):
+            result = EPHEMERAL_VECTOR_DB.search(
+                collection_name=self.collection_name,
+                vectors=[embedding],
+                limit=self.top_k,
+            )
+        else:
+            result = await ASYNC_VECTOR_DB_CLIENT.search(
+                collection_name=self.collection_name,
+                vectors=[embedding],
+                limit=self.top_k,
+            )
 
         return _search_result_to_documents(result)
 
@@ -295,7 +313,7 @@ class VectorSearchRetriever(BaseRetriever):
 def query_doc(collection_name: str, query_embedding: list[float], k: int, user: UserModel = None):
     try:
         log.debug(f'query_doc:doc {collection_name}')
-        result = VECTOR_DB_CLIENT.search(
+        result = get_vector_db_client(collection_name, VECTOR_DB_CLIENT).search(
             collection_name=collection_name,
             vectors=[query_embedding],
             limit=k,
@@ -313,7 +331,7 @@ def query_doc(collection_name: str, query_embedding: list[float], k: int, user:
 def get_doc(collection_name: str, user: UserModel = None):
     try:
         log.debug(f'get_doc:doc {collection_name}')
-        result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+        result = get_vector_db_client(collection_name, VECTOR_DB_CLIENT).get(collection_name=collection_name)
 
         if result:
             log.info(f'query_doc:result {result.ids} {result.metadatas}')
@@ -393,24 +411,27 @@ async def query_doc_with_native_hybrid_search(
     hybrid_bm25_weight: float,
 ) -> Optional[dict]:
     try:
-        if not _supports_native_hybrid_search():
+        if not _supports_native_hybrid_search() or EPHEMERAL_VECTOR_DB.has_collection(collection_name):
             return None
 
         query_vectors = []
         if hybrid_bm25_weight < 1:
-            query_vectors = [await embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)]
+            with retrieval_stage('embedding', query=query, collection=collection_name):
+                query_vectors = [await embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)]
 
-        result = await ASYNC_VECTOR_DB_CLIENT.hybrid_search(
-            collection_name=collection_name,
-            query=query,
-            vectors=query_vectors,
-            limit=k,
-            hybrid_bm25_weight=hybrid_bm25_weight,
-        )
-        if result is None:
-            return None
+        with retrieval_stage('hybrid_search', query=query, collection=collection_name) as stage:
+            result = await ASYNC_VECTOR_DB_CLIENT.hybrid_search(
+                collection_name=collection_name,
+                query=query,
+                vectors=query_vectors,
+                limit=k,
+                hybrid_bm25_weight=hybrid_bm25_weight,
+            )
+            if result is None:
+                return None
 
-        documents = _search_result_to_documents(result)
+            documents = _search_result_to_documents(result)
+            stage.set_candidates(len(documents))
         if not documents:
             return {'distances': [[]], 'documents': [[]], 'metadatas': [[]]}
 
@@ -420,7 +441,9 @@ async def query_doc_with_native_hybrid_search(
             reranking_function=reranking_function,
             r_score=r,
         )
-        compressed = await compressor.acompress_documents(documents, query)
+        with retrieval_stage('rerank', query=query, collection=collection_name) as stage:
+            compressed = await compressor.acompress_documents(documents, query)
+            stage.set_candidates(len(compressed))
 
         distances = [d.metadata.get('score') for d in compressed]
         documents = [d.page_content for d in compressed]
@@ -474,7 +497,10 @@ async def query_doc_with_hybrid_search(
                 return native_result
 
         if collection_result is None:
-            collection_result = await ASYNC_VECTOR_DB_CLIENT.get(collection_name=collection_name)
+            if EPHEMERAL_VECTOR_DB.has_collection(collection_name):
+                collection_result = EPHEMERAL_VECTOR_DB.get(collection_name=collection_name)
+            else:
+                collection_result = await ASYNC_VECTOR_DB_CLIENT.get(collection_name=collection_name)
 
         # First check if collection_result has the required attributes
         if (
@@ -504,10 +530,12 @@ async def query_doc_with_hybrid_search(
 
         bm25_texts = get_enriched_texts(collection_result) if enable_enriched_texts else original_texts
 
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=bm25_texts,
-            metadatas=bm25_metadatas,
-        )
+        with retrieval_stage('bm25_index', query=query, collection=collection_name) as stage:
+            bm25_retriever = BM25Retriever.from_texts(
+                texts=bm25_texts,
+                metadatas=bm25_metadatas,
+            )
+            stage.set_candidates(len(bm25_texts))
         bm25_retriever.k = k
 
         vector_search_retriever = VectorSearchRetriever(
@@ -543,11 +571,16 @@ async def query_doc_with_hybrid_search(
             r_score=r,
         )
 
-        compression_retriever = ContextualCompressionRetriever(
-            base_compressor=compressor, base_retriever=ensemble_retriever
-        )
+        # Retrieve and rerank as separate stages so each one is timed on its own.
+        with retrieval_stage('hybrid_search', query=query, collection=collection_name) as stage:
+            candidates = await ensemble_retriever.ainvoke(query)
+            stage.set_candidates(len(candidates))
 
-        result = await compression_retriever.ainvoke(query)
+        result = []
+        if candidates:
+            with retrieval_stage('rerank', query=query, collection=collection_name) as stage:
+                result = list(await compressor.acompress_documents(candidates, query))
+                stage.set_candidates(len(result))
 
         distances = [d.metadata.get('score') for d in result]
         documents = [d.page_content for d in result]
@@ -576,6 +609,11 @@ async def query_doc_with_hybrid_search(
         raise e
 
 
+def _count_documents(query_result: Optional[dict]) -> int:
+    documents = (query_result or {}).get('documents') or []
+    return len(documents[0] or []) if documents else 0
+
+
 def merge_get_results(get_results: list[dict]) -> dict:
     # Initialize lists to store combined data
     combined_documents = []
@@ -640,7 +678,7 @@ def merge_and_sort_query_results(query_results: list[dict], k: int) -> dict:
     }
 
 
-def get_all_items_from_collections(collection_names: list[str]) -> dict:
+def get_all_items_from_collections(collection_names: list[str], tombstones: Optional[dict] = None) -> dict:
     results = []
 
     for collection_name in collection_names:
@@ -648,6 +686,7 @@ def get_all_items_from_collections(collection_names: list[str]) -> dict:
             try:
                 result = get_doc(collection_name=collection_name)
                 if result is not None:
+                    result = apply_vector_tombstones(collection_name, result, tombstones or {})
                     results.append(result.model_dump())
             except Exception as e:
                 log.exception(f'Error when querying the collection: {e}')
@@ -695,15 +734,20 @@ async def query_collection(
 
     results = []
     error = False
+    tombstones = await load_vector_tombstones(collection_names)
 
-    def process_query_collection(collection_name, query_embedding):
+    def process_query_collection(collection_name, query, query_embedding):
         try:
             if collection_name:
-                result = query_doc(
-                    collection_name=collection_name,
-                    k=k,
-                    query_embedding=query_embedding,
-                )
+                with retrieval_stage('vector_search', query=query, collection=collection_name) as stage:
+                    result = query_doc(
+                        collection_name=collection_name,
+                        k=k,
+                        query_embedding=query_embedding,
+                    )
+                    if result is not None:
+                        result = apply_vector_tombstones(collection_name, result, tombstones)
+                        stage.set_candidates(len(result.ids[0]) if result.ids else 0)
                 if result is not None:
                     return result.model_dump(), None
             return None, None
@@ -719,14 +763,23 @@ async def query_collection(
         return {'distances': [[]], 'documents': [[]], 'metadatas': [[]]}
 
     # Generate all query embeddings (in one call)
-    query_embeddings = await embedding_function(queries, prefix=RAG_EMBEDDING_QUERY_PREFIX)
+    with retrieval_stage('embedding') as stage:
+        query_embeddings = await embedding_function(queries, prefix=RAG_EMBEDDING_QUERY_PREFIX)
+        stage.set_candidates(len(queries))
     log.debug(f'query_collection: processing {len(queries)} queries across {len(collection_names)} collections')
 
     with ThreadPoolExecutor() as executor:
         future_results = []
-        for query_embedding in query_embeddings:
+        for query, query_embedding in zip(queries, query_embeddings):
             for collection_name in collection_names:
-                result = executor.submit(process_query_collection, collection_name, query_embedding)
+                # Each thread runs in a copy of this context, so its stages join the current profile and trace.
+                result = executor.submit(
+                    contextvars.copy_context().run,
+                    process_query_collection,
+                    collection_name,
+                    query,
+                    query_embedding,
+                )
                 future_results.append(result)
         task_results = [future.result() for future in future_results]
 
@@ -755,6 +808,7 @@ async def query_collection_with_hybrid_search(
 ) -> dict:
     results = []
     error = False
+    tombstones = await load_vector_tombstones(collection_names)
 
     if not enable_enriched_texts:
 
@@ -769,7 +823,7 @@ async def query_collection_with_hybrid_search(
                 r=r,
                 hybrid_bm25_weight=hybrid_bm25_weight,
             )
-            return result
+            return apply_vector_tombstones(collection_name, result, tombstones)
 
         native_task_results = await asyncio.gather(
             *[process_native_query(collection_name, query) for collection_name in collection_names for query in queries]
@@ -789,7 +843,13 @@ async def query_collection_with_hybrid_search(
 
     async def _fetch_collection(name: str):
         try:
-            return name, await ASYNC_VECTOR_DB_CLIENT.get(collection_name=name)
+            with retrieval_stage('collection_fetch', collection=name) as stage:
+                if EPHEMERAL_VECTOR_DB.has_collection(name):
+                    result = EPHEMERAL_VECTOR_DB.get(collection_name=name)
+                else:
+                    result = await ASYNC_VECTOR_DB_CLIENT.get(collection_name=name)
+                stage.set_candidates(len(result.ids[0]) if result and result.ids else 0)
+            return name, result
         except Exception as e:
             log.exception(f'Failed to fetch collection {name}: {e}')
             return name, None
@@ -813,7 +873,7 @@ async def query_collection_with_hybrid_search(
                 enable_enriched_texts=enable_enriched_texts,
                 native_hybrid_search=False,
             )
-            return result, None
+            return apply_vector_tombstones(collection_name, result, tombstones), None
         except Exception as e:
             log.exception(f'Error when querying the collection with hybrid_search: {e}')
             return None, e
@@ -1082,6 +1142,21 @@ def get_embedding_function(
     concurrent_requests=0,
 ) -> Awaitable:
     if embedding_engine == '':
+        batcher = None
+        if embedding_function is not None and RAG_LOCAL_INFERENCE_BATCHING:
+            # Concurrent requests are merged into one encode call (see retrieval/batching.py).
+            encode_batch_size = max(int(embedding_batch_size), RAG_LOCAL_INFERENCE_MAX_BATCH_SIZE)
+            batcher = get_model_batcher(
+                embedding_function,
+                'embedding',
+                lambda prefix, texts: embedding_function.encode(
+                    texts,
+                    batch_size=encode_batch_size,
+                    **({'prompt': prefix} if prefix else {}),
+                ).tolist(),
+                options=encode_batch_size,
+            )
+
         # Sentence transformers: CPU-bound sync operation
         async def async_embedding_function(query, prefix=None, user=None):
             # Deferred so a missing local model degrades RAG instead of crashing boot.
@@ -1091,6 +1166,10 @@ def get_embedding_function(
                     'SentenceTransformer model name, or configure an external '
                     'RAG_EMBEDDING_ENGINE (ollama, openai, azure_openai).'
                 )
+            if batcher is not None:
+                if isinstance(query, str):
+                    return (await batcher.arun([query], key=prefix))[0]
+                return await batcher.arun(query, key=prefix)
             return await asyncio.to_thread(
                 (
                     lambda query, prefix=None: embedding_function.encode(
@@ -1103,7 +1182,7 @@ def get_embedding_function(
                 prefix,
             )
 
-        return async_embedding_function
+        return truncating_embedding_function(async_embedding_function)
     elif embedding_engine in ['ollama', 'openai', 'azure_openai']:
         embedding_function = lambda query, prefix=None, user=None: generate_embeddings(
             engine=embedding_engine,
@@ -1156,7 +1235,7 @@ def get_embedding_function(
             else:
                 return await embedding_function(query, prefix, user)
 
-        return async_embedding_function
+        return truncating_embedding_function(async_embedding_function)
     else:
         raise ValueError(f'Unknown embedding engine: {embedding_engine}')
 
@@ -1219,14 +1298,35 @@ def get_reranking_function(reranking_engine, reranking_model, reranking_function
     if reranking_function is None:
         return None
     if reranking_engine == 'external':
-        return lambda query, documents, user=None: reranking_function.predict(
-            [(query, doc.page_content) for doc in documents], user=user
+        predict = lambda query, texts, user=None: reranking_function.predict(
+            [(query, text) for text in texts], user=user
         )
+    elif RAG_LOCAL_INFERENCE_BATCHING and not isinstance(reranking_function, BaseReranker):
+        # CrossEncoder scores each pair independently, so pairs from concurrent
+        # requests can share one predict call.  ColBERT normalizes scores
+        # across a single query's documents and keeps a call per request.
+        # tolist() yields a float per pair, or a list of label scores from multi-label CrossEncoders.
+        batcher = get_model_batcher(
+            reranking_function,
+            'reranking',
+            lambda _, pairs: list(reranking_function.predict(pairs, batch_size=int(reranking_batch_size)).tolist()),
+            options=int(reranking_batch_size),
+        )
+        predict = lambda query, texts, user=None: batcher.run([(query, text) for text in texts])
     else:
-        return lambda query, documents, user=None: reranking_function.predict(
-            [(query, doc.page_content) for doc in documents], batch_size=int(reranking_batch_size)
+        predict = lambda query, texts, user=None: reranking_function.predict(
+            [(query, text) for text in texts], batch_size=int(reranking_batch_size)
         )
 
+    # ColBERT scores depend on the whole candidate set, so only pairwise rerankers are cached.
+    pairwise = reranking_engine == 'external' or not isinstance(reranking_function, BaseReranker)
+    if RAG_RERANK_CACHE_ENABLED and pairwise:
+        # The endpoint is part of the key: the same model name behind another URL may score differently.
+        endpoint = getattr(reranking_function, 'url', '') if reranking_engine == 'external' else ''
+        predict = cached_rerank(f'{reranking_engine or "local"}:{reranking_model}:{endpoint}', predict)
+
+    return lambda query, documents, user=None: predict(query, [doc.page_content for doc in documents], user)
+
 
 # UUIDs, SHA-256 digests, and prefixed variants thereof all fit [A-Za-z0-9_-].
 # Anything else cannot be a real Open WebUI collection and could break out of
@@ -1480,13 +1580,15 @@ async def get_sources_from_items(
                 )
             ):
                 if (knowledge_base.meta or {}).get('source') == 'external':
-                    query_result = await retrieve_external_knowledge(
-                        request,
-                        knowledge_base,
-                        queries=queries,
-                        count=k,
-                        user=user,
-                    )
+                    with retrieval_stage('external_search', collection=knowledge_base.id) as stage:
+                        query_result = await retrieve_external_knowledge(
+                            request,
+                            knowledge_base,
+                            queries=queries,
+                            count=k,
+                            user=user,
+                        )
+                        stage.set_candidates(_count_documents(query_result))
                     extracted_collections.append(knowledge_base.id)
 
                 else:
@@ -1580,7 +1682,13 @@ async def get_sources_from_items(
                 if full_context:
                     # Sync helper makes blocking VECTOR_DB_CLIENT calls;
                     # offload so the async caller's event loop stays free.
-                    query_result = await asyncio.to_thread(get_all_items_from_collections, collection_names)
+                    with retrieval_stage('collection_fetch') as stage:
+                        query_result = await asyncio.to_thread(
+                            get_all_items_from_collections,
+                            collection_names,
+                            await load_vector_tombstones(collection_names),
+                        )
+                        stage.set_candidates(_count_documents(query_result))
                 else:
                     query_result = await query_collection(
                         request,
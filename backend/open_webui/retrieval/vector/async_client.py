@@ -34,6 +34,13 @@ serialization lock here would defeat the responsiveness this facade
 exists to provide; any backend that genuinely cannot tolerate
 concurrent access should grow its own internal serialization.
 
+Native async backends
+---------------------
+A backend can expose an ``async_client`` attribute with coroutine versions
+of some of these methods (pgvector does: binary COPY ingest and
+single-connection searches on a psycopg 3 pool). Those are awaited
+directly; every other method still goes through ``asyncio.to_thread``.
+
 API surface
 -----------
 Method signatures mirror `VectorDBBase` exactly. This is deliberate:
@@ -75,6 +82,7 @@ class AsyncVectorDBClient:
 
     def __init__(self, sync_client: VectorDBBase) -> None:
         self._sync = sync_client
+        self._native = getattr(sync_client, 'async_client', None)
 
     @property
     def sync(self) -> VectorDBBase:
@@ -82,20 +90,43 @@ class AsyncVectorDBClient:
         (e.g. already inside a worker thread)."""
         return self._sync
 
+    @property
+    def has_native_async(self) -> bool:
+        return self._native is not None
+
+    def _native_method(self, name: str):
+        return getattr(self._native, name, None) if self._native is not None else None
+
+    @property
+    def supports_in_filter_delete(self) -> bool:
+        return self._sync.supports_in_filter_delete
+
     @property
     def supports_hybrid_search(self) -> bool:
         return type(self._sync).hybrid_search is not VectorDBBase.hybrid_search
 
     async def has_collection(self, collection_name: str) -> bool:
+        native = self._native_method('has_collection')
+        if native is not None:
+            return await native(collection_name)
         return await asyncio.to_thread(self._sync.has_collection, collection_name)
 
     async def delete_collection(self, collection_name: str) -> None:
+        native = self._native_method('delete_collection')
+        if native is not None:
+            return await native(collection_name)
         return await asyncio.to_thread(self._sync.delete_collection, collection_name)
 
     async def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        native = self._native_method('insert')
+        if native is not None:
+            return await native(collection_name, items)
         return await asyncio.to_thread(self._sync.insert, collection_name, items)
 
     async def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        native = self._native_method('upsert')
+        if native is not None:
+            return await native(collection_name, items)
         return await asyncio.to_thread(self._sync.upsert, collection_name, items)
 
     async def search(
@@ -105,6 +136,9 @@ class AsyncVectorDBClient:
         filter: Optional[Dict] = None,
         limit: int = 10,
     ) -> Optional[SearchResult]:
+        native = self._native_method('search')
+        if native is not None:
+            return await native(collection_name, vectors, filter, limit)
         return await asyncio.to_thread(self._sync.search, collection_name, vectors, filter, limit)
 
     async def hybrid_search(
@@ -116,6 +150,9 @@ class AsyncVectorDBClient:
         limit: int = 10,
         hybrid_bm25_weight: float = 0.5,
     ) -> Optional[SearchResult]:
+        native = self._native_method('hybrid_search')
+        if native is not None:
+            return await native(collection_name, query, vectors, filter, limit, hybrid_bm25_weight)
         return await asyncio.to_thread(
             self._sync.hybrid_search,
             collection_name,
@@ -143,6 +180,9 @@ class AsyncVectorDBClient:
         ids: Optional[List[str]] = None,
         filter: Optional[Dict] = None,
     ) -> None:
+        native = self._native_method('delete')
+        if native is not None:
+            return await native(collection_name, ids, filter)
         return await asyncio.to_thread(self._sync.delete, collection_name, ids, filter)
 
     async def reset(self) -> None:
@@ -0,0 +1,121 @@
+"""Compact vector storage: Matryoshka truncation and quantization.
+
+Two settings, both requiring a re-index when changed:
+
+  - ``RAG_VECTOR_DIMENSIONS`` truncates every embedding, documents and
+    queries alike, to its first N dimensions and re-normalizes it.  Matryoshka
+    models (nomic-embed, mxbai-embed, OpenAI text-embedding-3, ...) keep most
+    of their quality at a fraction of the size.  ``get_embedding_function``
+    applies it, so ingestion and search always agree.
+  - ``RAG_VECTOR_QUANTIZATION`` (``float16``, ``int8`` or ``binary``) is
+    applied by the vector DB where it has native support:
+
+      =======  ==========================  ===================  ===========
+      mode     pgvector                    Qdrant               Milvus
+      =======  ==========================  ===================  ===========
+      float16  halfvec column              float16 vectors      -
+      int8     halfvec column (no int8)    scalar quantization  IVF_SQ8
+      binary   bit(n) HNSW index, rescore  binary quantization  -
+      =======  ==========================  ===================  ===========
+
+    Binary (pgvector, Qdrant) and int8 (Qdrant) searches fetch
+    ``RAG_VECTOR_RESCORE_OVERSAMPLING`` times the requested results from the
+    quantized index and rank them by the full precision vectors.  Other
+    backends keep full precision vectors and log a warning at startup.
+
+The numpy quantizers below mirror those encodings for
+``scripts/benchmark_vector_compression.py``, which measures their recall.
+"""
+
+import logging
+import math
+
+import numpy as np
+from open_webui.config import RAG_VECTOR_DIMENSIONS, RAG_VECTOR_QUANTIZATION, RAG_VECTOR_RESCORE_OVERSAMPLING
+
+log = logging.getLogger(__name__)
+
+NATIVE_QUANTIZATION = {
+    'pgvector': ('float16', 'int8', 'binary'),
+    'qdrant': ('float16', 'int8', 'binary'),
+    'milvus': ('int8',),
+}
+
+
+def check_quantization_support(vector_db: str) -> None:
+    if RAG_VECTOR_QUANTIZATION != 'none' and RAG_VECTOR_QUANTIZATION not in NATIVE_QUANTIZATION.get(vector_db, ()):
+        log.warning(
+            f'RAG_VECTOR_QUANTIZATION={RAG_VECTOR_QUANTIZATION} is not supported by VECTOR_DB={vector_db}; '
+            'vectors are stored at full precision.'
+        )
+
+
+def rescore_limit(limit: int) -> int:
+    """Candidates to fetch from a quantized index for ``limit`` rescored results."""
+    return max(limit, math.ceil(limit * RAG_VECTOR_RESCORE_OVERSAMPLING))
+
+
+####################
+# Matryoshka truncation
+####################
+
+
+def truncate_embeddings(embeddings: list[list[float]], dimensions: int = RAG_VECTOR_DIMENSIONS) -> list[list[float]]:
+    """Keep the first ``dimensions`` components of each embedding, re-normalized to unit length."""
+    if not dimensions or len(embeddings) == 0 or len(embeddings[0]) <= dimensions:
+        return embeddings
+    vectors = np.asarray(embeddings, dtype=np.float32)[:, :dimensions]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.where(norms == 0, 1, norms)).tolist()
+
+
+def truncating_embedding_function(embedding_function, dimensions: int = RAG_VECTOR_DIMENSIONS):
+    """Wrap an async ``embedding_function(query, prefix, user)`` to return truncated embeddings."""
+    if not dimensions:
+        return embedding_function
+
+    async def async_embedding_function(query, prefix=None, user=None):
+        embeddings = await embedding_function(query, prefix=prefix, user=user)
+        if not embeddings:
+            return embeddings
+        if isinstance(query, str):
+            return truncate_embeddings([embeddings], dimensions)[0]
+        return truncate_embeddings(embeddings, dimensions)
+
+    return async_embedding_function
+
+
+####################
+# Quantizers
+####################
+
+
+def quantize_float16(vectors: np.ndarray) -> np.ndarray:
+    return np.asarray(vectors, dtype=np.float16)
+
+
+def quantize_int8(vectors: np.ndarray, calibration: np.ndarray = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-dimension min/max scalar quantization to int8; returns ``(codes, offset, scale)``."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    calibration = vectors if calibration is None else np.asarray(calibration, dtype=np.float32)
+    offset = calibration.min(axis=0)
+    scale = (calibration.max(axis=0) - offset) / 255
+    scale[scale == 0] = 1
+    codes = np.clip(np.round((vectors - offset) / scale) - 128, -128, 127).astype(np.int8)
+    return codes, offset, scale
+
+
+def dequantize_int8(codes: np.ndarray, offset: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    return (codes.astype(np.float32) + 128) * scale + offset
+
+
+def quantize_binary(vectors: np.ndarray) -> np.ndarray:
+    """One bit per dimension (positive or not), packed eight to a byte, as pgvector's ``binary_quantize``."""
+    return np.packbits(np.asarray(vectors) > 0, axis=-1)
+
+
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def hamming_distances(query_bits: np.ndarray, bits: np.ndarray) -> np.ndarray:
+    return _POPCOUNT[np.bitwise_xor(bits, query_bits)].sum(axis=-1, dtype=np.int32)
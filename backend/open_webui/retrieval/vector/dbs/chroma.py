@@ -27,6 +27,8 @@ log = logging.getLogger(__name__)
 
 
 class ChromaClient(VectorDBBase):
+    supports_in_filter_delete = True
+
     def __init__(self):
         settings_dict = {
             'allow_reset': True,
@@ -34,6 +34,8 @@ class ElasticsearchClient(VectorDBBase):
     baesd on the embedding length.
     """
 
+    supports_in_filter_delete = True
+
     def __init__(self):
         self.index_prefix = ELASTICSEARCH_INDEX_PREFIX
         self.client = Elasticsearch(
@@ -281,7 +283,10 @@ class ElasticsearchClient(VectorDBBase):
             query['query']['bool']['filter'].append({'terms': {'_id': ids}})
         elif filter:
             for field, value in filter.items():
-                query['query']['bool']['filter'].append({'term': {f'metadata.{field}': value}})
+                if isinstance(value, dict) and '$in' in value:
+                    query['query']['bool']['filter'].append({'terms': {f'metadata.{field}': value['$in']}})
+                else:
+                    query['query']['bool']['filter'].append({'term': {f'metadata.{field}': value}})
 
         self.client.delete_by_query(index=f'{self.index_prefix}*', body=query)
 
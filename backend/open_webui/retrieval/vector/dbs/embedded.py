@@ -0,0 +1,847 @@
+"""
+Embedded, file-backed vector DB for single-node deployments (``VECTOR_DB=embedded``).
+
+Runs inside the Open WebUI process: no server, no SQLite, and vectors are read
+through memory maps rather than held in the Python heap.  Each collection is a
+directory under ``EMBEDDED_VECTOR_DB_PATH``:
+
+  - ``manifest.json``: dimension, live segments, label counter and the HNSW
+    watermark.  It is replaced atomically, so it always names a consistent set
+    of files; anything it does not name is removed on open.
+  - append-only segments, one per write: ``<segment>.vectors.npy`` (unit-length
+    float32 rows, memory-mapped), ``<segment>.labels.npy``, and the metadata
+    sidecar ``<segment>.jsonl`` (``id``, ``text`` and ``metadata`` per row)
+    with its byte ``<segment>.offsets.npy``.
+  - ``tombstones.bin``: labels of deleted and replaced rows, appended as int64.
+  - ``index.bin``: hnswlib cosine index over the labels below the watermark.
+
+Every row gets an integer label that never changes, so the index survives
+compaction.  Writes only append a segment and tombstones; a background thread
+
+  - adds new rows to the index once a collection outgrows
+    ``EMBEDDED_VECTOR_DB_EXACT_SEARCH_THRESHOLD``, and saves it when idle,
+  - merges all segments into one without the deleted rows once there are more
+    than ``EMBEDDED_VECTOR_DB_MAX_SEGMENTS`` of them or a quarter of the rows
+    are deleted,
+  - rebuilds the index once a third of its entries are deleted.
+
+Search takes the whole batch of query vectors at once.  Rows above the
+watermark are scored exactly and merged with the index results, so writes are
+searchable immediately.  Metadata filters (equality and ``$in``, compared as
+text like pgvector) are pushed down: postings for a key are built on its first
+use and kept up to date on write; small candidate sets are scored exactly,
+larger ones are passed to hnswlib as a label filter.
+
+The data directory is locked by the first process that uses it, so run a
+single uvicorn worker or choose a server-based ``VECTOR_DB``.
+``scripts/benchmark_embedded_vector_db.py`` compares it with Chroma.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Union
+
+import hnswlib
+import numpy as np
+from open_webui.config import (
+    EMBEDDED_VECTOR_DB_EXACT_SEARCH_THRESHOLD,
+    EMBEDDED_VECTOR_DB_HNSW_EF_CONSTRUCTION,
+    EMBEDDED_VECTOR_DB_HNSW_EF_SEARCH,
+    EMBEDDED_VECTOR_DB_HNSW_M,
+    EMBEDDED_VECTOR_DB_MAINTENANCE_INTERVAL,
+    EMBEDDED_VECTOR_DB_MAX_SEGMENTS,
+    EMBEDDED_VECTOR_DB_PATH,
+)
+from open_webui.retrieval.vector.main import (
+    GetResult,
+    SearchResult,
+    VectorDBBase,
+    VectorItem,
+)
+from open_webui.retrieval.vector.utils import process_metadata
+
+log = logging.getLogger(__name__)
+
+MANIFEST = 'manifest.json'
+TOMBSTONES = 'tombstones.bin'
+INDEX = 'index.bin'
+
+COMPACT_DELETED_RATIO = 0.25
+REBUILD_DELETED_RATIO = 0.33
+# Rows per exact-scan block and per index insert, bounding memory and lock hold times.
+BLOCK_SIZE = 65536
+INDEX_BATCH_SIZE = 10000
+
+_SEGMENT_FILE = re.compile(r'(\d{8})\.(vectors\.npy|labels\.npy|offsets\.npy|jsonl)$')
+
+
+def _normalize(vectors) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _directory_name(collection_name: str) -> str:
+    if re.fullmatch(r'[A-Za-z0-9][A-Za-z0-9_.-]{0,127}', collection_name):
+        return collection_name
+    return hashlib.sha256(collection_name.encode()).hexdigest()
+
+
+def _fsync_write(path: str, write) -> None:
+    with open(path, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    _fsync_write(f'{path}.tmp', lambda f: f.write(data))
+    os.replace(f'{path}.tmp', path)
+
+
+def _top_k(scores: np.ndarray, labels: np.ndarray, limit: int) -> tuple[np.ndarray, np.ndarray]:
+    """Best ``limit`` columns of each row of ``scores`` (queries x candidates), best first."""
+    if scores.shape[1] > limit:
+        top = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+        scores = np.take_along_axis(scores, top, axis=1)
+        labels = np.take_along_axis(labels, top, axis=1)
+    order = np.argsort(-scores, axis=1)
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(labels, order, axis=1)
+
+
+def _lock_directory(path: str):
+    if sys.platform == 'win32':
+        return None
+    import fcntl
+
+    lock_file = open(os.path.join(path, '.lock'), 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        raise RuntimeError(
+            f'{path} is in use by another process. VECTOR_DB=embedded supports a single process; '
+            'set UVICORN_WORKERS=1 or use a server-based VECTOR_DB.'
+        )
+    return lock_file
+
+
+@dataclass
+class _Segment:
+    id: int
+    labels: np.ndarray
+    vectors: np.ndarray
+    offsets: np.ndarray
+    sidecar: str
+
+    @staticmethod
+    def prefix(directory: str, segment_id: int) -> str:
+        return os.path.join(directory, f'{segment_id:08d}')
+
+    @classmethod
+    def load(cls, directory: str, segment_id: int) -> '_Segment':
+        prefix = cls.prefix(directory, segment_id)
+        return cls(
+            id=segment_id,
+            labels=np.load(f'{prefix}.labels.npy'),
+            vectors=np.load(f'{prefix}.vectors.npy', mmap_mode='r'),
+            offsets=np.load(f'{prefix}.offsets.npy'),
+            sidecar=f'{prefix}.jsonl',
+        )
+
+    @classmethod
+    def write(cls, directory: str, segment_id: int, labels: np.ndarray, vectors, lines: list[bytes]) -> '_Segment':
+        prefix = cls.prefix(directory, segment_id)
+        offsets = np.zeros(len(lines) + 1, dtype=np.int64)
+        np.cumsum([len(line) for line in lines], out=offsets[1:])
+        _fsync_write(f'{prefix}.jsonl', lambda f: f.writelines(lines))
+        _fsync_write(f'{prefix}.labels.npy', lambda f: np.save(f, labels))
+        _fsync_write(f'{prefix}.offsets.npy', lambda f: np.save(f, offsets))
+        _fsync_write(f'{prefix}.vectors.npy', lambda f: np.save(f, vectors))
+        return cls.load(directory, segment_id)
+
+    def remove(self, directory: str) -> None:
+        prefix = self.prefix(directory, self.id)
+        for suffix in ('vectors.npy', 'labels.npy', 'offsets.npy', 'jsonl'):
+            try:
+                os.remove(f'{prefix}.{suffix}')
+            except OSError:
+                pass
+
+    def read(self, rows) -> list[dict]:
+        records = []
+        with open(self.sidecar, 'rb') as f:
+            for row in rows:
+                f.seek(self.offsets[row])
+                records.append(json.loads(f.read(int(self.offsets[row + 1] - self.offsets[row]))))
+        return records
+
+    def lines(self) -> Iterator[bytes]:
+        with open(self.sidecar, 'rb') as f:
+            yield from f
+
+
+class _Collection:
+    """One collection's segments and index.
+
+    ``lock`` guards the segments, label tables and postings; ``index_lock``
+    guards the hnswlib index and its watermark.  When both are needed,
+    ``lock`` is taken first.
+    """
+
+    def __init__(self, name: str, directory: str):
+        self.name = name
+        self.directory = directory
+        self.lock = threading.RLock()
+        self.index_lock = threading.Lock()
+        self.dropped = False
+
+        self.dim = 0
+        self.segments: dict[int, _Segment] = {}
+        self.next_segment = 0
+        self.next_label = 0
+        # Per label: its segment (-1 once compacted away), its row there, and whether it is live.
+        self.label_segment = np.empty(0, dtype=np.int32)
+        self.label_row = np.empty(0, dtype=np.int32)
+        self.alive = np.empty(0, dtype=bool)
+        self.label_ids: list[Optional[str]] = []
+        self.ids: dict[str, int] = {}
+        self.live = 0
+        # Filter pushdown: metadata key -> value (as text) -> labels; dead labels are dropped lazily.
+        self.postings: dict[str, dict[str, set[int]]] = {}
+        self.last_write = 0.0
+
+        self.index: Optional[hnswlib.Index] = None
+        self.indexed_upto = 0
+        self.saved_indexed_upto = 0
+        self.index_deleted = 0
+        self.index_saved = True
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    ####################
+    # Persistence
+    ####################
+
+    @classmethod
+    def open(cls, name: str, directory: str) -> '_Collection':
+        collection = cls(name, directory)
+        with open(collection.path(MANIFEST)) as f:
+            manifest = json.load(f)
+        collection.dim = manifest['dim']
+        collection.next_segment = manifest['next_segment']
+        collection.next_label = manifest['next_label']
+        collection._grow(0)
+        for segment_id in manifest['segments']:
+            collection._add_segment(_Segment.load(directory, segment_id))
+
+        if os.path.exists(collection.path(TOMBSTONES)):
+            dead = np.fromfile(collection.path(TOMBSTONES), dtype=np.int64)
+            collection.alive[dead[dead < collection.next_label]] = False
+
+        # Rebuild the id map; an upsert interrupted before its tombstones were written leaves
+        # the same id live twice, and the newer row wins.
+        collection.label_ids = [None] * collection.next_label
+        duplicates = []
+        for segment in collection.segments.values():
+            for label, line in zip(segment.labels.tolist(), segment.lines()):
+                if not collection.alive[label]:
+                    continue
+                id = json.loads(line)['id']
+                previous = collection.ids.get(id)
+                if previous is not None:
+                    duplicates.append(min(previous, label))
+                    label = max(previous, label)
+                collection.ids[id] = label
+                collection.label_ids[label] = id
+        collection.live = int(collection.alive.sum())
+        if duplicates:
+            collection._tombstone(duplicates)
+
+        for entry in os.listdir(directory):
+            match = _SEGMENT_FILE.match(entry)
+            if entry.endswith('.tmp') or (match and int(match.group(1)) not in collection.segments):
+                os.remove(os.path.join(directory, entry))
+
+        collection._load_index(manifest.get('indexed_upto', 0))
+        return collection
+
+    def _load_index(self, indexed_upto: int) -> None:
+        if not indexed_upto or not os.path.exists(self.path(INDEX)):
+            return
+        try:
+            index = hnswlib.Index(space='cosine', dim=self.dim)
+            index.load_index(self.path(INDEX), max_elements=max(2 * self.next_label, 1024))
+        except Exception as e:
+            log.warning(f'Embedded vector DB: rebuilding unreadable index of {self.name}: {e}')
+            return
+        # Deletes since the index was last saved are only in the tombstones.
+        for label in np.flatnonzero(~self.alive[:indexed_upto]).tolist():
+            try:
+                index.mark_deleted(label)
+            except RuntimeError:
+                pass  # already deleted, or never indexed
+        self.index = index
+        self.indexed_upto = self.saved_indexed_upto = indexed_upto
+        self.index_deleted = index.get_current_count() - int(self.alive[:indexed_upto].sum())
+
+    def _save_manifest(self) -> None:
+        manifest = {
+            'name': self.name,
+            'dim': self.dim,
+            'next_segment': self.next_segment,
+            'next_label': self.next_label,
+            'indexed_upto': self.saved_indexed_upto,
+            'segments': sorted(self.segments),
+        }
+        _write_atomic(self.path(MANIFEST), json.dumps(manifest).encode())
+
+    def _grow(self, count: int) -> None:
+        needed = self.next_label + count
+        if needed <= len(self.alive):
+            return
+        capacity = max(needed, 2 * len(self.alive), 1024)
+        for attr, fill in (('label_segment', -1), ('label_row', 0), ('alive', False)):
+            current = getattr(self, attr)
+            grown = np.full(capacity, fill, dtype=current.dtype)
+            grown[: len(current)] = current
+            setattr(self, attr, grown)
+
+    def _add_segment(self, segment: _Segment, alive: Union[bool, np.ndarray] = True) -> None:
+        self.segments[segment.id] = segment
+        self.label_segment[segment.labels] = segment.id
+        self.label_row[segment.labels] = np.arange(len(segment.labels), dtype=np.int32)
+        self.alive[segment.labels] = alive
+
+    ####################
+    # Writes
+    ####################
+
+    def append(self, items: list[dict]) -> None:
+        vectors = _normalize([item['vector'] for item in items])
+        records = [(item['id'], item['text'], process_metadata(item.get('metadata') or {})) for item in items]
+        lines = [json.dumps({'id': id, 'text': text, 'metadata': meta}).encode() + b'\n' for id, text, meta in records]
+
+        with self.lock:
+            if self.dim == 0:
+                self.dim = vectors.shape[1]
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f'Collection {self.name} has dimension {self.dim}, got {vectors.shape[1]}')
+
+            labels = np.arange(self.next_label, self.next_label + len(items), dtype=np.int64)
+            segment = _Segment.write(self.directory, self.next_segment, labels, vectors, lines)
+            self._grow(len(items))
+            self.next_segment += 1
+            self.next_label += len(items)
+            self._add_segment(segment)
+            self._save_manifest()
+
+            replaced = []
+            for label, (id, _, metadata) in zip(labels.tolist(), records):
+                previous = self.ids.get(id)
+                if previous is not None:
+                    replaced.append(previous)
+                self.ids[id] = label
+                self.label_ids.append(id)
+                for key, postings in self.postings.items():
+                    if metadata.get(key) is not None:
+                        postings.setdefault(str(metadata[key]), set()).add(label)
+            self.live += len(items)
+            self.last_write = time.monotonic()
+            if replaced:
+                self._tombstone(replaced)
+
+    def _tombstone(self, labels) -> None:
+        labels = np.unique(np.asarray(labels, dtype=np.int64))
+        labels = labels[self.alive[labels]]
+        if not len(labels):
+            return
+
+        with open(self.path(TOMBSTONES), 'ab') as f:
+            f.write(labels.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        self.alive[labels] = False
+        self.live -= len(labels)
+        for label in labels.tolist():
+            id = self.label_ids[label]
+            if self.ids.get(id) == label:
+                del self.ids[id]
+            self.label_ids[label] = None
+        self.last_write = time.monotonic()
+
+        with self.index_lock:
+            if self.index is not None:
+                self._mark_deleted(self.index, labels[labels < self.indexed_upto])
+
+    def _mark_deleted(self, index: hnswlib.Index, labels: np.ndarray) -> None:
+        for label in labels.tolist():
+            try:
+                index.mark_deleted(label)
+                self.index_deleted += 1
+                self.index_saved = False
+            except RuntimeError:
+                pass
+
+    def delete(self, ids: Optional[List[str]], filter: Optional[Dict]) -> None:
+        with self.lock:
+            if ids:
+                labels = [self.ids[id] for id in ids if id in self.ids]
+            elif filter:
+                labels = self._candidates(filter)
+            else:
+                return
+            self._tombstone(labels)
+
+    ####################
+    # Reads
+    ####################
+
+    def _postings(self, key: str) -> dict[str, set[int]]:
+        postings = self.postings.get(key)
+        if postings is None:
+            postings = {}
+            for segment in self.segments.values():
+                for label, line in zip(segment.labels.tolist(), segment.lines()):
+                    if self.alive[label]:
+                        value = json.loads(line)['metadata'].get(key)
+                        if value is not None:
+                            postings.setdefault(str(value), set()).add(label)
+            self.postings[key] = postings
+        return postings
+
+    def _candidates(self, filter: Dict) -> np.ndarray:
+        """Sorted live labels matching every condition of ``filter``."""
+        matched = None
+        for key, value in filter.items():
+            postings = self._postings(key)
+            if isinstance(value, dict) and '$in' in value:
+                labels = set().union(*(postings.get(str(v), ()) for v in value['$in']))
+            else:
+                labels = postings.get(str(value), set())
+            matched = labels if matched is None else matched & labels
+        labels = np.fromiter(matched or (), dtype=np.int64)
+        labels.sort()
+        return labels[self.alive[labels]]
+
+    def _vectors(self, labels: np.ndarray) -> np.ndarray:
+        """Vectors of live ``labels``, in the same order."""
+        vectors = np.empty((len(labels), self.dim), dtype=np.float32)
+        segment_ids = self.label_segment[labels]
+        for segment_id in np.unique(segment_ids).tolist():
+            positions = np.flatnonzero(segment_ids == segment_id)
+            vectors[positions] = self.segments[segment_id].vectors[self.label_row[labels[positions]]]
+        return vectors
+
+    def records(self, labels: list[int]) -> dict[int, dict]:
+        with self.lock:
+            labels = np.asarray(labels, dtype=np.int64)
+            labels = labels[self.alive[labels]]
+            records = {}
+            segment_ids = self.label_segment[labels]
+            for segment_id in np.unique(segment_ids).tolist():
+                selected = labels[segment_ids == segment_id]
+                rows = self.segments[segment_id].read(self.label_row[selected].tolist())
+                records.update(zip(selected.tolist(), rows))
+            return records
+
+    def _blocks(self, labels: Optional[np.ndarray], start: int = 0) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """``(labels, vectors)`` blocks of ``labels`` (all live rows if None) at or above ``start``."""
+        if labels is not None:
+            labels = labels[labels >= start]
+            for offset in range(0, len(labels), BLOCK_SIZE):
+                with self.lock:
+                    block = labels[offset : offset + BLOCK_SIZE]
+                    block = block[self.alive[block]]
+                    vectors = self._vectors(block)
+                yield block, vectors
+            return
+
+        with self.lock:
+            segments = list(self.segments.values())
+        for segment in segments:
+            if not len(segment.labels) or segment.labels[-1] < start:
+                continue
+            for offset in range(0, len(segment.labels), BLOCK_SIZE):
+                block = segment.labels[offset : offset + BLOCK_SIZE]
+                keep = (block >= start) & self.alive[block]
+                if keep.all():
+                    yield block, segment.vectors[offset : offset + BLOCK_SIZE]
+                elif keep.any():
+                    yield block[keep], segment.vectors[offset : offset + BLOCK_SIZE][keep]
+
+    def _exact(self, queries: np.ndarray, labels: Optional[np.ndarray], limit: int, start: int = 0):
+        scores = np.empty((len(queries), 0), dtype=np.float32)
+        found = np.empty((len(queries), 0), dtype=np.int64)
+        for block_labels, block_vectors in self._blocks(labels, start):
+            block_scores = queries @ np.asarray(block_vectors).T
+            scores, found = _top_k(
+                np.hstack([scores, block_scores]),
+                np.hstack([found, np.broadcast_to(block_labels, block_scores.shape)]),
+                limit,
+            )
+        return scores, found
+
+    def _approximate(self, queries: np.ndarray, candidates: Optional[np.ndarray], limit: int):
+        """Index search over the labels below the watermark; None if hnswlib cannot fill ``limit``."""
+        k = min(limit, self.index.get_current_count() - self.index_deleted)
+        if candidates is not None:
+            allowed = set(candidates[candidates < self.indexed_upto].tolist())
+            k = min(k, len(allowed))
+        if k <= 0:
+            return np.empty((len(queries), 0), dtype=np.float32), np.empty((len(queries), 0), dtype=np.int64)
+
+        self.index.set_ef(max(EMBEDDED_VECTOR_DB_HNSW_EF_SEARCH, k))
+        try:
+            labels, distances = self.index.knn_query(
+                queries, k=k, filter=allowed.__contains__ if candidates is not None else None
+            )
+        except RuntimeError:
+            return None
+        return 1.0 - distances, labels.astype(np.int64)
+
+    def search(self, queries: np.ndarray, filter: Optional[Dict], limit: int) -> tuple[np.ndarray, np.ndarray]:
+        with self.lock:
+            candidates = self._candidates(filter) if filter else None
+        if candidates is not None and (len(candidates) <= EMBEDDED_VECTOR_DB_EXACT_SEARCH_THRESHOLD):
+            return self._exact(queries, candidates, limit)
+
+        with self.index_lock:
+            indexed_upto = self.indexed_upto
+            found = self._approximate(queries, candidates, limit) if self.index is not None else None
+        if found is None:
+            return self._exact(queries, candidates, limit)
+
+        tail = self._exact(queries, candidates, limit, start=indexed_upto)
+        return _top_k(np.hstack([found[0], tail[0]]), np.hstack([found[1], tail[1]]), limit)
+
+    ####################
+    # Maintenance
+    ####################
+
+    def maintain(self, force_save: bool = False) -> None:
+        if self.dropped:
+            return
+        self._compact()
+        self._index_pending()
+        self._rebuild_index()
+        self.save_index(force_save)
+
+    def _compact(self) -> None:
+        with self.lock:
+            if self.dropped or not self.segments:
+                return
+            total = sum(len(segment.labels) for segment in self.segments.values())
+            deleted = total - self.live
+            if len(self.segments) <= EMBEDDED_VECTOR_DB_MAX_SEGMENTS and deleted <= COMPACT_DELETED_RATIO * total:
+                return
+            merged = list(self.segments.values())
+            segment_id = self.next_segment
+            self.next_segment += 1
+            keep = [self.alive[segment.labels].copy() for segment in merged]
+
+        # Source segments are immutable, so the merged one is written without holding the lock;
+        # rows deleted meanwhile are carried over and stay tombstoned.
+        count = int(sum(mask.sum() for mask in keep))
+        prefix = _Segment.prefix(self.directory, segment_id)
+        if count:
+            labels = np.concatenate([segment.labels[mask] for segment, mask in zip(merged, keep)])
+            vectors = np.lib.format.open_memmap(
+                f'{prefix}.vectors.npy', mode='w+', dtype=np.float32, shape=(count, self.dim)
+            )
+            offsets = np.zeros(count + 1, dtype=np.int64)
+            row = 0
+            with open(f'{prefix}.jsonl', 'wb') as sidecar:
+                for segment, mask in zip(merged, keep):
+                    for offset in range(0, len(mask), BLOCK_SIZE):
+                        block = mask[offset : offset + BLOCK_SIZE]
+                        vectors[row : row + block.sum()] = segment.vectors[offset : offset + BLOCK_SIZE][block]
+                        row += int(block.sum())
+                    position = row - int(mask.sum())
+                    for line, kept in zip(segment.lines(), mask.tolist()):
+                        if kept:
+                            sidecar.write(line)
+                            offsets[position + 1] = offsets[position] + len(line)
+                            position += 1
+                sidecar.flush()
+                os.fsync(sidecar.fileno())
+            vectors.flush()
+            del vectors
+            _fsync_write(f'{prefix}.labels.npy', lambda f: np.save(f, labels))
+            _fsync_write(f'{prefix}.offsets.npy', lambda f: np.save(f, offsets))
+
+        with self.lock:
+            if self.dropped:
+                return
+            for segment in merged:
+                del self.segments[segment.id]
+                self.label_segment[segment.labels] = -1
+            if count:
+                self._add_segment(_Segment.load(self.directory, segment_id), alive=self.alive[labels])
+            self._save_manifest()
+            dead = [segment.labels[~self.alive[segment.labels]] for segment in self.segments.values()]
+            _write_atomic(self.path(TOMBSTONES), np.concatenate(dead or [np.empty(0, np.int64)]).tobytes())
+            for postings in self.postings.values():
+                for value in list(postings):
+                    postings[value] = {label for label in postings[value] if self.alive[label]}
+                    if not postings[value]:
+                        del postings[value]
+            for segment in merged:
+                segment.remove(self.directory)
+        log.debug(f'Embedded vector DB: compacted {len(merged)} segments of {self.name} into {count} rows')
+
+    def _index_pending(self) -> None:
+        with self.lock:
+            if self.dropped or (self.index is None and self.live <= EMBEDDED_VECTOR_DB_EXACT_SEARCH_THRESHOLD):
+                return
+            start, upto = self.indexed_upto, self.next_label
+            if start >= upto:
+                return
+            labels = np.arange(start, upto, dtype=np.int64)
+            labels = labels[self.alive[labels]]
+
+        with self.index_lock:
+            if self.index is None:
+                self.index = hnswlib.Index(space='cosine', dim=self.dim)
+                self.index.init_index(
+                    max_elements=max(2 * upto, 1024),
+                    ef_construction=EMBEDDED_VECTOR_DB_HNSW_EF_CONSTRUCTION,
+                    M=EMBEDDED_VECTOR_DB_HNSW_M,
+                )
+        for offset in range(0, max(len(labels), 1), INDEX_BATCH_SIZE):
+            chunk = labels[offset : offset + INDEX_BATCH_SIZE]
+            with self.lock:
+                batch = chunk[self.alive[chunk]]
+                vectors = self._vectors(batch)
+            with self.index_lock:
+                if len(batch):
+                    needed = self.index.get_current_count() + len(batch)
+                    if needed > self.index.get_max_elements():
+                        self.index.resize_index(max(needed, 2 * self.index.get_max_elements()))
+                    self.index.add_items(vectors, batch)
+                # Advance the watermark, then catch rows deleted while they were being added:
+                # deletes after this point see them below the watermark and mark them themselves.
+                self.indexed_upto = int(chunk[-1]) + 1 if offset + INDEX_BATCH_SIZE < len(labels) else upto
+                self._mark_deleted(self.index, batch[~self.alive[batch]])
+                self.index_saved = False
+
+    def _rebuild_index(self) -> None:
+        with self.index_lock:
+            if self.index is None or self.index_deleted <= REBUILD_DELETED_RATIO * self.index.get_current_count():
+                return
+            indexed_upto = self.indexed_upto
+        with self.lock:
+            labels = np.flatnonzero(self.alive[:indexed_upto]).astype(np.int64)
+
+        # Only this thread moves the watermark, so it stays put while the new index is built.
+        index = hnswlib.Index(space='cosine', dim=self.dim)
+        index.init_index(
+            max_elements=max(2 * len(labels), 1024),
+            ef_construction=EMBEDDED_VECTOR_DB_HNSW_EF_CONSTRUCTION,
+            M=EMBEDDED_VECTOR_DB_HNSW_M,
+        )
+        for offset in range(0, len(labels), INDEX_BATCH_SIZE):
+            with self.lock:
+                batch = labels[offset : offset + INDEX_BATCH_SIZE]
+                batch = batch[self.alive[batch]]
+                vectors = self._vectors(batch)
+            if len(batch):
+                index.add_items(vectors, batch)
+
+        with self.lock:
+            with self.index_lock:
+                self.index = index
+                self.index_deleted = 0
+                self._mark_deleted(index, labels[~self.alive[labels]])
+                self.index_saved = False
+        log.debug(f'Embedded vector DB: rebuilt index of {self.name} with {len(labels)} rows')
+
+    def save_index(self, force: bool = False) -> None:
+        with self.index_lock:
+            if self.index is None or self.index_saved:
+                return
+            if not force and time.monotonic() - self.last_write < EMBEDDED_VECTOR_DB_MAINTENANCE_INTERVAL:
+                return
+            self.index.save_index(self.path(f'{INDEX}.tmp'))
+            os.replace(self.path(f'{INDEX}.tmp'), self.path(INDEX))
+            self.index_saved = True
+            indexed_upto = self.indexed_upto
+        with self.lock:
+            if not self.dropped:
+                self.saved_indexed_upto = indexed_upto
+                self._save_manifest()
+
+
+class EmbeddedClient(VectorDBBase):
+    supports_in_filter_delete = True
+
+    def __init__(self, path: str = EMBEDDED_VECTOR_DB_PATH):
+        self.path = path
+        self._collections: dict[str, _Collection] = {}
+        self._lock = threading.Lock()
+        self._lock_file = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _start(self) -> None:
+        # Deferred to first use so processes that import the client without using it
+        # (the model server, migrations) do not take the directory lock.
+        if self._thread is None:
+            os.makedirs(self.path, exist_ok=True)
+            self._lock_file = _lock_directory(self.path)
+            self._thread = threading.Thread(target=self._maintain, name='embedded-vector-maintenance', daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _maintain(self) -> None:
+        while not self._stopping.wait(EMBEDDED_VECTOR_DB_MAINTENANCE_INTERVAL):
+            with self._lock:
+                collections = list(self._collections.values())
+            for collection in collections:
+                try:
+                    collection.maintain()
+                except Exception:
+                    log.exception(f'Embedded vector DB maintenance failed for {collection.name}')
+
+    def close(self) -> None:
+        """Save unsaved indexes and release the directory; the client reopens it on next use."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join()
+        with self._lock:
+            collections = list(self._collections.values())
+            self._collections.clear()
+        for collection in collections:
+            try:
+                collection.save_index(force=True)
+            except Exception:
+                log.exception(f'Failed to save the index of {collection.name}')
+
+        atexit.unregister(self.close)
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def _get_collection(self, collection_name: str, create: bool = False) -> Optional[_Collection]:
+        with self._lock:
+            self._start()
+            collection = self._collections.get(collection_name)
+            if collection is None:
+                directory = os.path.join(self.path, _directory_name(collection_name))
+                if os.path.exists(os.path.join(directory, MANIFEST)):
+                    collection = _Collection.open(collection_name, directory)
+                elif create:
+                    os.makedirs(directory, exist_ok=True)
+                    collection = _Collection(collection_name, directory)
+                else:
+                    return None
+                self._collections[collection_name] = collection
+            return collection
+
+    def _result(self, collection: _Collection, labels: list[int]) -> GetResult:
+        records = collection.records(labels)
+        rows = [records[label] for label in labels if label in records]
+        return GetResult(
+            ids=[[row['id'] for row in rows]],
+            documents=[[row['text'] for row in rows]],
+            metadatas=[[row['metadata'] for row in rows]],
+        )
+
+    def has_collection(self, collection_name: str) -> bool:
+        collection = self._get_collection(collection_name)
+        return collection is not None and collection.dim > 0
+
+    def delete_collection(self, collection_name: str) -> None:
+        with self._lock:
+            self._start()
+            collection = self._collections.pop(collection_name, None)
+        if collection is not None:
+            with collection.lock, collection.index_lock:
+                collection.dropped = True
+        shutil.rmtree(os.path.join(self.path, _directory_name(collection_name)), ignore_errors=True)
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        # Ids already present are replaced, so insert and upsert are the same append.
+        if items:
+            items = [item if isinstance(item, dict) else item.model_dump() for item in items]
+            self._get_collection(collection_name, create=True).append(items)
+
+    def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        self.insert(collection_name, items)
+
+    def search(
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        collection = self._get_collection(collection_name)
+        if collection is None or not vectors:
+            return None
+
+        scores, labels = collection.search(_normalize(vectors), filter, limit)
+        records = collection.records(np.unique(labels).tolist())
+        result = {'ids': [], 'distances': [], 'documents': [], 'metadatas': []}
+        for row_scores, row_labels in zip(scores.tolist(), labels.tolist()):
+            hits = [(score, records[label]) for score, label in zip(row_scores, row_labels) if label in records]
+            result['ids'].append([record['id'] for _, record in hits])
+            result['documents'].append([record['text'] for _, record in hits])
+            result['metadatas'].append([record['metadata'] for _, record in hits])
+            # Cosine similarity mapped to [0, 1] to match the other backends.
+            result['distances'].append([(score + 1.0) / 2.0 for score, _ in hits])
+        return SearchResult(**result)
+
+    def query(self, collection_name: str, filter: Dict, limit: Optional[int] = None) -> Optional[GetResult]:
+        collection = self._get_collection(collection_name)
+        if collection is None:
+            return None
+        with collection.lock:
+            labels = collection._candidates(filter) if filter else np.flatnonzero(collection.alive)
+        return self._result(collection, labels[:limit].tolist())
+
+    def get(self, collection_name: str) -> Optional[GetResult]:
+        collection = self._get_collection(collection_name)
+        if collection is None:
+            return None
+        with collection.lock:
+            labels = np.flatnonzero(collection.alive)
+        return self._result(collection, labels.tolist())
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        collection = self._get_collection(collection_name)
+        if collection is not None:
+            collection.delete(ids, filter)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._start()
+            collections = list(self._collections.values())
+            self._collections.clear()
+        for collection in collections:
+            with collection.lock, collection.index_lock:
+                collection.dropped = True
+        for entry in os.listdir(self.path):
+            if os.path.isdir(os.path.join(self.path, entry)):
+                shutil.rmtree(os.path.join(self.path, entry), ignore_errors=True)
@@ -89,6 +89,8 @@ class MariaDBVectorClient(VectorDBBase):
       - Uses binary binding for BOTH inserts/updates and distance computations.
     """
 
+    supports_in_filter_delete = True
+
     def __init__(
         self,
         db_url: Optional[str] = None,
@@ -38,6 +38,8 @@ MILVUS_TEXT_MAX_LENGTH = 65535
 
 
 class MilvusClient(VectorDBBase):
+    supports_in_filter_delete = True
+
     def __init__(self):
         self.collection_prefix = 'open_webui'
         if MILVUS_TOKEN is None:
@@ -134,9 +136,9 @@ class MilvusClient(VectorDBBase):
                 'efConstruction': MILVUS_HNSW_EFCONSTRUCTION,
             }
             log.info(f'HNSW params: {index_creation_params}')
-        elif index_type == 'IVF_FLAT':
+        elif index_type in ['IVF_FLAT', 'IVF_SQ8']:
             index_creation_params = {'nlist': MILVUS_IVF_FLAT_NLIST}
-            log.info(f'IVF_FLAT params: {index_creation_params}')
+            log.info(f'{index_type} params: {index_creation_params}')
         elif index_type == 'DISKANN':
             index_creation_params = {
                 'max_degree': MILVUS_DISKANN_MAX_DEGREE,
@@ -148,7 +150,7 @@ class MilvusClient(VectorDBBase):
         else:
             log.warning(
                 f"Unsupported MILVUS_INDEX_TYPE: '{index_type}'. "
-                f'Supported types: HNSW, IVF_FLAT, DISKANN, FLAT, AUTOINDEX. '
+                f'Supported types: HNSW, IVF_FLAT, IVF_SQ8, DISKANN, FLAT, AUTOINDEX. '
                 f'Milvus will use its default for the collection if this type is not directly supported for index creation.'
             )
             # For unsupported types, pass the type directly to Milvus; it might handle it or use a default.
@@ -356,7 +358,16 @@ class MilvusClient(VectorDBBase):
                 ids=ids,
             )
         elif filter:
-            filter_string = ' && '.join([f'metadata["{key}"] == {json.dumps(value)}' for key, value in filter.items()])
+            filter_string = ' && '.join(
+                [
+                    (
+                        f'metadata["{key}"] in {json.dumps(value["$in"])}'
+                        if isinstance(value, dict) and '$in' in value
+                        else f'metadata["{key}"] == {json.dumps(value)}'
+                    )
+                    for key, value in filter.items()
+                ]
+            )
             log.info(
                 f'Deleting items by filter from {self.collection_prefix}_{collection_name}. Filter: {filter_string}'
             )
@@ -142,7 +142,7 @@ class MilvusClient(VectorDBBase):
                 'M': MILVUS_HNSW_M,
                 'efConstruction': MILVUS_HNSW_EFCONSTRUCTION,
             }
-        elif MILVUS_INDEX_TYPE == 'IVF_FLAT':
+        elif MILVUS_INDEX_TYPE in ('IVF_FLAT', 'IVF_SQ8'):
             index_params['params'] = {'nlist': MILVUS_IVF_FLAT_NLIST}
 
         collection.create_index('vector', index_params)
@@ -23,6 +23,8 @@ from opensearchpy.helpers import bulk
 
 
 class OpenSearchClient(VectorDBBase):
+    supports_in_filter_delete = True
+
     def __init__(self):
         self.index_prefix = 'open_webui'
         self.client = OpenSearch(
@@ -247,7 +249,11 @@ class OpenSearchClient(VectorDBBase):
                 'query': {'bool': {'filter': []}},
             }
             for field, value in filter.items():
-                query_body['query']['bool']['filter'].append({'term': {'metadata.' + str(field) + '.keyword': value}})
+                if isinstance(value, dict) and '$in' in value:
+                    condition = {'terms': {'metadata.' + str(field) + '.keyword': value['$in']}}
+                else:
+                    condition = {'term': {'metadata.' + str(field) + '.keyword': value}}
+                query_body['query']['bool']['filter'].append(condition)
             self.client.delete_by_query(index=self._get_index_name(collection_name), body=query_body)
         self.client.indices.refresh(index=self._get_index_name(collection_name))
 
@@ -3,6 +3,7 @@ import logging
 from typing import Any, Dict, List, Optional, Tuple
 
 from open_webui.config import (
+    PGVECTOR_ASYNC_ENABLED,
     PGVECTOR_CREATE_EXTENSION,
     PGVECTOR_DB_URL,
     PGVECTOR_HNSW_EF_CONSTRUCTION,
@@ -17,7 +18,9 @@ from open_webui.config import (
     PGVECTOR_POOL_SIZE,
     PGVECTOR_POOL_TIMEOUT,
     PGVECTOR_USE_HALFVEC,
+    RAG_VECTOR_QUANTIZATION,
 )
+from open_webui.retrieval.vector.compression import rescore_limit
 from open_webui.retrieval.vector.main import (
     GetResult,
     SearchResult,
@@ -43,8 +46,10 @@ from sqlalchemy import (
     text,
     values,
 )
-from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.dialects.postgresql import BIT, JSONB, array
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import NoSuchTableError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
 from sqlalchemy.pool import NullPool, QueuePool
@@ -55,6 +60,9 @@ USE_HALFVEC = PGVECTOR_USE_HALFVEC
 
 VECTOR_TYPE_FACTORY = HALFVEC if USE_HALFVEC else Vector
 VECTOR_OPCLASS = 'halfvec_cosine_ops' if USE_HALFVEC else 'vector_cosine_ops'
+VECTOR_TYPE_NAME = 'halfvec' if USE_HALFVEC else 'vector'
+# Search a bit(n) index of binary_quantize(vector), then rescore at full precision.
+BINARY_QUANTIZATION = RAG_VECTOR_QUANTIZATION == 'binary'
 Base = declarative_base()
 
 log = logging.getLogger(__name__)
@@ -83,7 +91,69 @@ class DocumentChunk(Base):
         vmetadata = Column(MutableDict.as_mutable(JSONB), nullable=True)
 
 
+FTS_SEARCH_SQL = text("""
+    WITH fts_query AS (
+        SELECT plainto_tsquery('simple', :query) AS query
+    )
+    SELECT
+        document_chunk.id AS id,
+        document_chunk.text AS text,
+        document_chunk.vmetadata AS vmetadata,
+        ts_rank_cd(
+            to_tsvector('simple', coalesce(document_chunk.text, '')),
+            fts_query.query
+        ) AS rank
+    FROM document_chunk, fts_query
+    WHERE document_chunk.collection_name = :collection_name
+      AND to_tsvector('simple', coalesce(document_chunk.text, '')) @@ fts_query.query
+    ORDER BY rank DESC
+    LIMIT :limit
+""")
+
+
+def _engine_options(pool_class) -> dict:
+    if isinstance(PGVECTOR_POOL_SIZE, int):
+        if PGVECTOR_POOL_SIZE > 0:
+            options = {
+                'pool_size': PGVECTOR_POOL_SIZE,
+                'max_overflow': PGVECTOR_POOL_MAX_OVERFLOW,
+                'pool_timeout': PGVECTOR_POOL_TIMEOUT,
+                'pool_recycle': PGVECTOR_POOL_RECYCLE,
+                'pool_pre_ping': True,
+            }
+            if pool_class is not None:
+                options['poolclass'] = pool_class
+            return options
+        return {'pool_pre_ping': True, 'poolclass': NullPool}
+    return {'pool_pre_ping': True}
+
+
+def _search_result(rows, num_queries: int) -> SearchResult:
+    ids = [[] for _ in range(num_queries)]
+    distances = [[] for _ in range(num_queries)]
+    documents = [[] for _ in range(num_queries)]
+    metadatas = [[] for _ in range(num_queries)]
+
+    for row in rows:
+        qid = int(row.qid)
+        ids[qid].append(row.id)
+        # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
+        # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
+        distances[qid].append((2.0 - row.distance) / 2.0)
+        documents[qid].append(row.text)
+        metadatas[qid].append(row.vmetadata)
+
+    return SearchResult(ids=ids, distances=distances, documents=documents, metadatas=metadatas)
+
+
+def _dedupe_items(items: List[VectorItem]) -> List[VectorItem]:
+    # One statement cannot update the same row twice; the last item for an id wins.
+    return list({item['id']: item for item in items}.values())
+
+
 class PgvectorClient(VectorDBBase):
+    supports_in_filter_delete = True
+
     def __init__(self) -> None:
         # if no pgvector uri, use the existing database connection
         if not PGVECTOR_DB_URL:
@@ -91,21 +161,7 @@ class PgvectorClient(VectorDBBase):
 
             self.session = ScopedSession
         else:
-            if isinstance(PGVECTOR_POOL_SIZE, int):
-                if PGVECTOR_POOL_SIZE > 0:
-                    engine = create_engine(
-                        PGVECTOR_DB_URL,
-                        pool_size=PGVECTOR_POOL_SIZE,
-                        max_overflow=PGVECTOR_POOL_MAX_OVERFLOW,
-                        pool_timeout=PGVECTOR_POOL_TIMEOUT,
-                        pool_recycle=PGVECTOR_POOL_RECYCLE,
-                        pool_pre_ping=True,
-                        poolclass=QueuePool,
-                    )
-                else:
-                    engine = create_engine(PGVECTOR_DB_URL, pool_pre_ping=True, poolclass=NullPool)
-            else:
-                engine = create_engine(PGVECTOR_DB_URL, pool_pre_ping=True)
+            engine = create_engine(PGVECTOR_DB_URL, **_engine_options(QueuePool))
 
             SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
             self.session = scoped_session(SessionLocal)
@@ -151,8 +207,12 @@ class PgvectorClient(VectorDBBase):
             connection = self.session.connection()
             Base.metadata.create_all(bind=connection)
 
-            index_method, index_options = self._vector_index_configuration()
-            self._ensure_vector_index(index_method, index_options)
+            if BINARY_QUANTIZATION:
+                # Only the bit index is kept in memory; full vectors are read to rescore.
+                self._ensure_binary_index()
+            else:
+                index_method, index_options = self._vector_index_configuration()
+                self._ensure_vector_index(index_method, index_options)
             self._ensure_text_search_index()
 
             self.session.execute(
@@ -167,6 +227,8 @@ class PgvectorClient(VectorDBBase):
             log.exception(f'Error during initialization: {e}')
             raise
 
+        self.async_client = AsyncPgvectorClient(self) if PGVECTOR_ASYNC_ENABLED else None
+
     @staticmethod
     def _extract_index_method(index_def: Optional[str]) -> Optional[str]:
         if not index_def:
@@ -237,6 +299,16 @@ class PgvectorClient(VectorDBBase):
                 f' {index_options}' if index_options else '',
             )
 
+    def _ensure_binary_index(self) -> None:
+        self.session.execute(
+            text(
+                'CREATE INDEX IF NOT EXISTS idx_document_chunk_vector_bit ON document_chunk '
+                f'USING hnsw ((binary_quantize(vector)::bit({VECTOR_LENGTH})) bit_hamming_ops) '
+                f'WITH (m = {PGVECTOR_HNSW_M}, ef_construction = {PGVECTOR_HNSW_EF_CONSTRUCTION})'
+            )
+        )
+        log.info("Ensured binary quantized vector index 'idx_document_chunk_vector_bit'.")
+
     def _ensure_text_search_index(self) -> None:
         if PGVECTOR_PGCRYPTO:
             return
@@ -295,54 +367,55 @@ class PgvectorClient(VectorDBBase):
             vector = vector[:VECTOR_LENGTH]
         return vector
 
+    def _chunk_row(self, collection_name: str, item: VectorItem) -> Dict[str, Any]:
+        return {
+            'id': item['id'],
+            'vector': self.adjust_vector_length(item['vector']),
+            'collection_name': collection_name,
+            'text': item['text'],
+            'vmetadata': process_metadata(item['metadata']),
+        }
+
+    def _encrypted_chunk_params(self, collection_name: str, item: VectorItem) -> Dict[str, Any]:
+        # Ensure metadata is converted to its JSON text representation
+        # Sanitize to strip null bytes / surrogates that PostgreSQL cannot store
+        return {
+            'id': item['id'],
+            'vector': self.adjust_vector_length(item['vector']),
+            'collection_name': collection_name,
+            'text': sanitize_text_for_db(item['text']),
+            'metadata_text': sanitize_text_for_db(json.dumps(item['metadata'])),
+            'key': PGVECTOR_PGCRYPTO_KEY,
+        }
+
     def insert(self, collection_name: str, items: List[VectorItem]) -> None:
         try:
             if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item['vector'])
-                    # Use raw SQL for BYTEA/pgcrypto
-                    # Ensure metadata is converted to its JSON text representation
-                    # Sanitize to strip null bytes / surrogates that PostgreSQL cannot store
-                    json_metadata = sanitize_text_for_db(json.dumps(item['metadata']))
-                    item_text = sanitize_text_for_db(item['text'])
-                    self.session.execute(
-                        text("""
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO NOTHING
-                        """),
-                        {
-                            'id': item['id'],
-                            'vector': vector,
-                            'collection_name': collection_name,
-                            'text': item_text,
-                            'metadata_text': json_metadata,
-                            'key': PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
+                # Use raw SQL for BYTEA/pgcrypto
+                self.session.execute(
+                    text("""
+                        INSERT INTO document_chunk
+                        (id, vector, collection_name, text, vmetadata)
+                        VALUES (
+                            :id, :vector, :collection_name,
+                            pgp_sym_encrypt(:text, :key),
+                            pgp_sym_encrypt(:metadata_text, :key)
+                        )
+                        ON CONFLICT (id) DO NOTHING
+                    """),
+                    [self._encrypted_chunk_params(collection_name, item) for item in items],
+                )
                 self.session.commit()
                 log.info(f"Encrypted & inserted {len(items)} into '{collection_name}'")
 
             else:
-                new_items = []
-                for item in items:
-                    vector = self.adjust_vector_length(item['vector'])
-                    new_chunk = DocumentChunk(
-                        id=item['id'],
-                        vector=vector,
-                        collection_name=collection_name,
-                        text=item['text'],
-                        vmetadata=process_metadata(item['metadata']),
-                    )
-                    new_items.append(new_chunk)
-                self.session.bulk_save_objects(new_items)
+                # executemany of a Core insert is sent as multi-row INSERTs by SQLAlchemy
+                self.session.execute(
+                    DocumentChunk.__table__.insert(),
+                    [self._chunk_row(collection_name, item) for item in items],
+                )
                 self.session.commit()
-                log.info(f"Inserted {len(new_items)} items into collection '{collection_name}'.")
+                log.info(f"Inserted {len(items)} items into collection '{collection_name}'.")
         except Exception as e:
             self.session.rollback()
             log.exception(f'Error during insert: {e}')
@@ -351,55 +424,39 @@ class PgvectorClient(VectorDBBase):
     def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
         try:
             if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item['vector'])
-                    # Sanitize to strip null bytes / surrogates that PostgreSQL cannot store
-                    json_metadata = sanitize_text_for_db(json.dumps(item['metadata']))
-                    item_text = sanitize_text_for_db(item['text'])
-                    self.session.execute(
-                        text("""
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO UPDATE SET
-                              vector = EXCLUDED.vector,
-                              collection_name = EXCLUDED.collection_name,
-                              text = EXCLUDED.text,
-                              vmetadata = EXCLUDED.vmetadata
-                        """),
-                        {
-                            'id': item['id'],
-                            'vector': vector,
-                            'collection_name': collection_name,
-                            'text': item_text,
-                            'metadata_text': json_metadata,
-                            'key': PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
+                self.session.execute(
+                    text("""
+                        INSERT INTO document_chunk
+                        (id, vector, collection_name, text, vmetadata)
+                        VALUES (
+                            :id, :vector, :collection_name,
+                            pgp_sym_encrypt(:text, :key),
+                            pgp_sym_encrypt(:metadata_text, :key)
+                        )
+                        ON CONFLICT (id) DO UPDATE SET
+                          vector = EXCLUDED.vector,
+                          collection_name = EXCLUDED.collection_name,
+                          text = EXCLUDED.text,
+                          vmetadata = EXCLUDED.vmetadata
+                    """),
+                    [self._encrypted_chunk_params(collection_name, item) for item in _dedupe_items(items)],
+                )
                 self.session.commit()
                 log.info(f"Encrypted & upserted {len(items)} into '{collection_name}'")
             else:
-                for item in items:
-                    vector = self.adjust_vector_length(item['vector'])
-                    existing = self.session.query(DocumentChunk).filter(DocumentChunk.id == item['id']).first()
-                    if existing:
-                        existing.vector = vector
-                        existing.text = item['text']
-                        existing.vmetadata = process_metadata(item['metadata'])
-                        existing.collection_name = collection_name  # Update collection_name if necessary
-                    else:
-                        new_chunk = DocumentChunk(
-                            id=item['id'],
-                            vector=vector,
-                            collection_name=collection_name,
-                            text=item['text'],
-                            vmetadata=process_metadata(item['metadata']),
-                        )
-                        self.session.add(new_chunk)
+                stmt = pg_insert(DocumentChunk.__table__)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[DocumentChunk.id],
+                    set_={
+                        'vector': stmt.excluded.vector,
+                        'collection_name': stmt.excluded.collection_name,
+                        'text': stmt.excluded.text,
+                        'vmetadata': stmt.excluded.vmetadata,
+                    },
+                )
+                self.session.execute(
+                    stmt, [self._chunk_row(collection_name, item) for item in _dedupe_items(items)]
+                )
                 self.session.commit()
                 log.info(f"Upserted {len(items)} items into collection '{collection_name}'.")
         except Exception as e:
@@ -407,129 +464,124 @@ class PgvectorClient(VectorDBBase):
             log.exception(f'Error during upsert: {e}')
             raise
 
-    def search(
+    def _search_statement(
         self,
         collection_name: str,
         vectors: List[List[float]],
-        filter: Optional[Dict[str, Any]] = None,
-        limit: int = 10,
-    ) -> Optional[SearchResult]:
-        try:
-            if not vectors:
-                return None
+        filter: Optional[Dict[str, Any]],
+        limit: Optional[int],
+    ):
+        """One statement for all query vectors: a VALUES list joined to a LATERAL top-k per vector."""
+
+        def vector_expr(vector):
+            return cast(array(vector), VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
+
+        # Create the values for query vectors
+        qid_col = column('qid', Integer)
+        q_vector_col = column('q_vector', VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
+        query_vectors = (
+            values(qid_col, q_vector_col)
+            .data([(idx, vector_expr(vector)) for idx, vector in enumerate(vectors)])
+            .alias('query_vectors')
+        )
 
-            # Adjust query vectors to VECTOR_LENGTH
-            vectors = [self.adjust_vector_length(vector) for vector in vectors]
-            num_queries = len(vectors)
-
-            def vector_expr(vector):
-                return cast(array(vector), VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
-
-            # Create the values for query vectors
-            qid_col = column('qid', Integer)
-            q_vector_col = column('q_vector', VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
-            query_vectors = (
-                values(qid_col, q_vector_col)
-                .data([(idx, vector_expr(vector)) for idx, vector in enumerate(vectors)])
-                .alias('query_vectors')
+        result_fields = [
+            DocumentChunk.id,
+        ]
+        if PGVECTOR_PGCRYPTO:
+            result_fields.append(pgcrypto_decrypt(DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text).label('text'))
+            result_fields.append(
+                pgcrypto_decrypt(DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB).label('vmetadata')
             )
-
-            result_fields = [
-                DocumentChunk.id,
-            ]
-            if PGVECTOR_PGCRYPTO:
-                result_fields.append(pgcrypto_decrypt(DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text).label('text'))
-                result_fields.append(
-                    pgcrypto_decrypt(DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB).label('vmetadata')
-                )
-            else:
-                result_fields.append(DocumentChunk.text)
-                result_fields.append(DocumentChunk.vmetadata)
-            result_fields.append((DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)).label('distance'))
-
-            # Build the lateral subquery for each query vector
-            where_clauses = [DocumentChunk.collection_name == collection_name]
-
-            # Apply metadata filter if provided
-            if filter:
-                for key, value in filter.items():
-                    if isinstance(value, dict) and '$in' in value:
-                        # Handle $in operator: {"field": {"$in": [values]}}
-                        in_values = value['$in']
-                        if PGVECTOR_PGCRYPTO:
-                            where_clauses.append(
-                                pgcrypto_decrypt(
-                                    DocumentChunk.vmetadata,
-                                    PGVECTOR_PGCRYPTO_KEY,
-                                    JSONB,
-                                )[key].astext.in_([str(v) for v in in_values])
-                            )
-                        else:
-                            where_clauses.append(DocumentChunk.vmetadata[key].astext.in_([str(v) for v in in_values]))
+        else:
+            result_fields.append(DocumentChunk.text)
+            result_fields.append(DocumentChunk.vmetadata)
+        distance = DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)
+        result_fields.append(distance.label('distance'))
+
+        # Build the lateral subquery for each query vector
+        where_clauses = [DocumentChunk.collection_name == collection_name]
+
+        # Apply metadata filter if provided
+        if filter:
+            for key, value in filter.items():
+                if isinstance(value, dict) and '$in' in value:
+                    # Handle $in operator: {"field": {"$in": [values]}}
+                    in_values = value['$in']
+                    if PGVECTOR_PGCRYPTO:
+                        where_clauses.append(
+                            pgcrypto_decrypt(
+                                DocumentChunk.vmetadata,
+                                PGVECTOR_PGCRYPTO_KEY,
+                                JSONB,
+                            )[key].astext.in_([str(v) for v in in_values])
+                        )
                     else:
-                        # Handle simple equality: {"field": "value"}
-                        if PGVECTOR_PGCRYPTO:
-                            where_clauses.append(
-                                pgcrypto_decrypt(
-                                    DocumentChunk.vmetadata,
-                                    PGVECTOR_PGCRYPTO_KEY,
-                                    JSONB,
-                                )[key].astext
-                                == str(value)
-                            )
-                        else:
-                            where_clauses.append(DocumentChunk.vmetadata[key].astext == str(value))
-
-            subq = (
-                select(*result_fields)
-                .where(*where_clauses)
-                .order_by((DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)))
+                        where_clauses.append(DocumentChunk.vmetadata[key].astext.in_([str(v) for v in in_values]))
+                else:
+                    # Handle simple equality: {"field": "value"}
+                    if PGVECTOR_PGCRYPTO:
+                        where_clauses.append(
+                            pgcrypto_decrypt(
+                                DocumentChunk.vmetadata,
+                                PGVECTOR_PGCRYPTO_KEY,
+                                JSONB,
+                            )[key].astext
+                            == str(value)
+                        )
+                    else:
+                        where_clauses.append(DocumentChunk.vmetadata[key].astext == str(value))
+
+        order, candidates = distance, limit
+        if BINARY_QUANTIZATION:
+            # Same expression as idx_document_chunk_vector_bit, so the bit index serves the candidates
+            bits = BIT(VECTOR_LENGTH)
+            order = cast(func.binary_quantize(DocumentChunk.vector), bits).op('<~>')(
+                cast(func.binary_quantize(query_vectors.c.q_vector), bits)
             )
-            if limit is not None:
-                subq = subq.limit(limit)
-            subq = subq.lateral('result')
-
-            # Build the main query by joining query_vectors and the lateral subquery
-            stmt = (
-                select(
-                    query_vectors.c.qid,
-                    subq.c.id,
-                    subq.c.text,
-                    subq.c.vmetadata,
-                    subq.c.distance,
-                )
+            candidates = rescore_limit(limit) if limit is not None else None
+
+        subq = select(*result_fields).where(*where_clauses).order_by(order)
+        if candidates is not None:
+            subq = subq.limit(candidates)
+        subq = subq.lateral('result')
+
+        # Build the main query by joining query_vectors and the lateral subquery
+        columns = [query_vectors.c.qid, subq.c.id, subq.c.text, subq.c.vmetadata, subq.c.distance]
+        if not BINARY_QUANTIZATION or limit is None:
+            return (
+                select(*columns)
                 .select_from(query_vectors)
                 .join(subq, true())
                 .order_by(query_vectors.c.qid, subq.c.distance)
             )
 
-            result_proxy = self.session.execute(stmt)
-            results = result_proxy.all()
-
-            ids = [[] for _ in range(num_queries)]
-            distances = [[] for _ in range(num_queries)]
-            documents = [[] for _ in range(num_queries)]
-            metadatas = [[] for _ in range(num_queries)]
+        # Rescore: keep the closest `limit` candidates per query by full precision distance
+        rank = func.row_number().over(partition_by=query_vectors.c.qid, order_by=subq.c.distance)
+        ranked = select(*columns, rank.label('rank')).select_from(query_vectors).join(subq, true()).subquery('ranked')
+        return (
+            select(ranked.c.qid, ranked.c.id, ranked.c.text, ranked.c.vmetadata, ranked.c.distance)
+            .where(ranked.c.rank <= limit)
+            .order_by(ranked.c.qid, ranked.c.distance)
+        )
 
-            if not results:
-                return SearchResult(
-                    ids=ids,
-                    distances=distances,
-                    documents=documents,
-                    metadatas=metadatas,
-                )
+    def search(
+        self,
+        collection_name: str,
+        vectors: List[List[float]],
+        filter: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        try:
+            if not vectors:
+                return None
 
-            for row in results:
-                qid = int(row.qid)
-                ids[qid].append(row.id)
-                # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
-                # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
-                distances[qid].append((2.0 - row.distance) / 2.0)
-                documents[qid].append(row.text)
-                metadatas[qid].append(row.vmetadata)
+            # Adjust query vectors to VECTOR_LENGTH
+            vectors = [self.adjust_vector_length(vector) for vector in vectors]
+            results = self.session.execute(self._search_statement(collection_name, vectors, filter, limit)).all()
 
             self.session.rollback()  # read-only transaction
-            return SearchResult(ids=ids, distances=distances, documents=documents, metadatas=metadatas)
+            return _search_result(results, len(vectors))
         except Exception as e:
             self.session.rollback()
             log.exception(f'Error during search: {e}')
@@ -561,24 +613,7 @@ class PgvectorClient(VectorDBBase):
             fts_results = []
             if bm25_weight > 0 and query and query.strip():
                 fts_rows = self.session.execute(
-                    text("""
-                        WITH fts_query AS (
-                            SELECT plainto_tsquery('simple', :query) AS query
-                        )
-                        SELECT
-                            document_chunk.id AS id,
-                            document_chunk.text AS text,
-                            document_chunk.vmetadata AS vmetadata,
-                            ts_rank_cd(
-                                to_tsvector('simple', coalesce(document_chunk.text, '')),
-                                fts_query.query
-                            ) AS rank
-                        FROM document_chunk, fts_query
-                        WHERE document_chunk.collection_name = :collection_name
-                          AND to_tsvector('simple', coalesce(document_chunk.text, '')) @@ fts_query.query
-                        ORDER BY rank DESC
-                        LIMIT :limit
-                    """),
+                    FTS_SEARCH_SQL,
                     {
                         'collection_name': collection_name,
                         'query': query,
@@ -683,6 +718,27 @@ class PgvectorClient(VectorDBBase):
             log.exception(f'Error during get: {e}')
             return None
 
+    def _delete_statement(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ):
+        wheres = [DocumentChunk.collection_name == collection_name]
+        if ids:
+            wheres.append(DocumentChunk.id.in_(ids))
+        if filter:
+            for key, value in filter.items():
+                if PGVECTOR_PGCRYPTO:
+                    field = pgcrypto_decrypt(DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB)[key].astext
+                else:
+                    field = DocumentChunk.vmetadata[key].astext
+                if isinstance(value, dict) and '$in' in value:
+                    wheres.append(field.in_([str(v) for v in value['$in']]))
+                else:
+                    wheres.append(field == str(value))
+        return DocumentChunk.__table__.delete().where(*wheres)
+
     def delete(
         self,
         collection_name: str,
@@ -690,27 +746,7 @@ class PgvectorClient(VectorDBBase):
         filter: Optional[Dict[str, Any]] = None,
     ) -> None:
         try:
-            if PGVECTOR_PGCRYPTO:
-                wheres = [DocumentChunk.collection_name == collection_name]
-                if ids:
-                    wheres.append(DocumentChunk.id.in_(ids))
-                if filter:
-                    for key, value in filter.items():
-                        wheres.append(
-                            pgcrypto_decrypt(DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB)[key].astext
-                            == str(value)
-                        )
-                stmt = DocumentChunk.__table__.delete().where(*wheres)
-                result = self.session.execute(stmt)
-                deleted = result.rowcount
-            else:
-                query = self.session.query(DocumentChunk).filter(DocumentChunk.collection_name == collection_name)
-                if ids:
-                    query = query.filter(DocumentChunk.id.in_(ids))
-                if filter:
-                    for key, value in filter.items():
-                        query = query.filter(DocumentChunk.vmetadata[key].astext == str(value))
-                deleted = query.delete(synchronize_session=False)
+            deleted = self.session.execute(self._delete_statement(collection_name, ids, filter)).rowcount
             self.session.commit()
             log.info(f"Deleted {deleted} items from collection '{collection_name}'.")
         except Exception as e:
@@ -747,3 +783,237 @@ class PgvectorClient(VectorDBBase):
     def delete_collection(self, collection_name: str) -> None:
         self.delete(collection_name)
         log.info(f"Collection '{collection_name}' deleted.")
+
+
+class AsyncPgvectorClient:
+    """Native async access to ``document_chunk`` over a psycopg 3 connection pool.
+
+    ``AsyncVectorDBClient`` awaits these methods directly instead of running
+    the ``PgvectorClient`` ones through ``asyncio.to_thread``:
+
+      - ``insert`` / ``upsert`` stream the chunks with binary ``COPY`` into a
+        per-connection temporary staging table and move them into
+        ``document_chunk`` with one ``INSERT ... SELECT ... ON CONFLICT``, so a
+        file costs two round trips instead of one per chunk.
+      - ``search`` sends every query vector in one statement, and
+        ``hybrid_search`` runs its vector and full-text queries on the same
+        connection.
+
+    Statements are shared with ``PgvectorClient``, so both return the same
+    results.
+    """
+
+    STAGING_TABLE = 'document_chunk_staging'
+
+    def __init__(self, client: PgvectorClient) -> None:
+        from open_webui.internal.db import _make_async_url
+
+        self.client = client
+        if PGVECTOR_DB_URL:
+            self.engine: AsyncEngine = create_async_engine(_make_async_url(PGVECTOR_DB_URL), **_engine_options(None))
+        else:
+            from open_webui.internal.db import async_engine
+
+            self.engine = async_engine
+
+    async def _driver_connection(self, conn):
+        """The psycopg connection behind ``conn``, with pgvector types and the staging table set up."""
+        from pgvector.psycopg import register_vector_async
+
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        if 'pgvector_staging' not in raw.info:
+            await register_vector_async(driver)
+            await driver.execute(
+                f"""
+                CREATE TEMPORARY TABLE IF NOT EXISTS {self.STAGING_TABLE} (
+                    seq bigint,
+                    id text,
+                    vector {VECTOR_TYPE_NAME}({VECTOR_LENGTH}),
+                    text text,
+                    vmetadata {'text' if PGVECTOR_PGCRYPTO else 'jsonb'}
+                ) ON COMMIT DELETE ROWS
+                """
+            )
+            await driver.commit()
+            raw.info['pgvector_staging'] = True
+        return driver
+
+    def _merge_sql(self, on_conflict: str, latest_first: bool) -> str:
+        if PGVECTOR_PGCRYPTO:
+            text_expr = 'pgp_sym_encrypt(text, %(key)s)'
+            metadata_expr = 'pgp_sym_encrypt(vmetadata, %(key)s)'
+        else:
+            text_expr, metadata_expr = 'text', 'vmetadata'
+        # Upserts keep the last item per id (one statement cannot update a row twice).
+        distinct = 'DISTINCT ON (id)' if latest_first else ''
+        order = 'id, seq DESC' if latest_first else 'seq'
+        return f"""
+            INSERT INTO document_chunk (id, vector, collection_name, text, vmetadata)
+            SELECT {distinct} id, vector, %(collection_name)s, {text_expr}, {metadata_expr}
+            FROM {self.STAGING_TABLE}
+            ORDER BY {order}
+            {on_conflict}
+        """
+
+    async def _write(self, collection_name: str, items: List[VectorItem], upsert: bool) -> None:
+        from pgvector import HalfVector
+        from pgvector import Vector as PgVector
+        from psycopg.types.json import Jsonb
+
+        vector_class = HalfVector if USE_HALFVEC else PgVector
+        if upsert:
+            on_conflict = """
+                ON CONFLICT (id) DO UPDATE SET
+                  vector = EXCLUDED.vector,
+                  collection_name = EXCLUDED.collection_name,
+                  text = EXCLUDED.text,
+                  vmetadata = EXCLUDED.vmetadata
+            """
+        else:
+            # Same conflict behavior as PgvectorClient.insert.
+            on_conflict = 'ON CONFLICT (id) DO NOTHING' if PGVECTOR_PGCRYPTO else ''
+
+        async with self.engine.connect() as conn:
+            driver = await self._driver_connection(conn)
+            try:
+                async with driver.cursor() as cursor:
+                    async with cursor.copy(
+                        f'COPY {self.STAGING_TABLE} (seq, id, vector, text, vmetadata) FROM STDIN (FORMAT BINARY)'
+                    ) as copy:
+                        copy.set_types(
+                            ['int8', 'text', VECTOR_TYPE_NAME, 'text', 'text' if PGVECTOR_PGCRYPTO else 'jsonb']
+                        )
+                        for seq, item in enumerate(items):
+                            if PGVECTOR_PGCRYPTO:
+                                metadata = sanitize_text_for_db(json.dumps(item['metadata']))
+                            else:
+                                metadata = Jsonb(process_metadata(item['metadata']))
+                            await copy.write_row(
+                                (
+                                    seq,
+                                    item['id'],
+                                    vector_class(self.client.adjust_vector_length(item['vector'])),
+                                    sanitize_text_for_db(item['text']),
+                                    metadata,
+                                )
+                            )
+                    await cursor.execute(
+                        self._merge_sql(on_conflict, latest_first=upsert),
+                        {'collection_name': collection_name, 'key': PGVECTOR_PGCRYPTO_KEY},
+                    )
+                await driver.commit()
+            except Exception:
+                await driver.rollback()
+                raise
+
+    async def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        if not items:
+            return
+        try:
+            await self._write(collection_name, items, upsert=False)
+            log.info(f"Inserted {len(items)} items into collection '{collection_name}'.")
+        except Exception as e:
+            log.exception(f'Error during insert: {e}')
+            raise
+
+    async def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        if not items:
+            return
+        try:
+            await self._write(collection_name, items, upsert=True)
+            log.info(f"Upserted {len(items)} items into collection '{collection_name}'.")
+        except Exception as e:
+            log.exception(f'Error during upsert: {e}')
+            raise
+
+    async def search(
+        self,
+        collection_name: str,
+        vectors: List[List[float]],
+        filter: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        if not vectors:
+            return None
+        try:
+            vectors = [self.client.adjust_vector_length(vector) for vector in vectors]
+            async with self.engine.connect() as conn:
+                result = await conn.execute(self.client._search_statement(collection_name, vectors, filter, limit))
+                return _search_result(result.all(), len(vectors))
+        except Exception as e:
+            log.exception(f'Error during search: {e}')
+            return None
+
+    async def hybrid_search(
+        self,
+        collection_name: str,
+        query: str,
+        vectors: List[List[float]],
+        filter: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+        hybrid_bm25_weight: float = 0.5,
+    ) -> Optional[SearchResult]:
+        if PGVECTOR_PGCRYPTO or filter:
+            return None
+
+        try:
+            limit = max(1, limit)
+            vectors = [self.client.adjust_vector_length(vector) for vector in vectors] if vectors else []
+            num_queries = len(vectors) if vectors else 1
+            bm25_weight = min(max(hybrid_bm25_weight, 0.0), 1.0)
+            vector_weight = 1.0 - bm25_weight
+
+            vector_result = None
+            fts_results = []
+            async with self.engine.connect() as conn:
+                if vector_weight > 0 and vectors:
+                    result = await conn.execute(self.client._search_statement(collection_name, vectors, None, limit))
+                    vector_result = _search_result(result.all(), len(vectors))
+
+                if bm25_weight > 0 and query and query.strip():
+                    result = await conn.execute(
+                        FTS_SEARCH_SQL,
+                        {'collection_name': collection_name, 'query': query, 'limit': limit},
+                    )
+                    fts_results = [dict(row) for row in result.mappings().all()]
+
+            return merge_hybrid_search_results(
+                vector_result=vector_result,
+                fts_results=fts_results,
+                num_queries=num_queries,
+                limit=limit,
+                hybrid_bm25_weight=hybrid_bm25_weight,
+            )
+        except Exception as e:
+            log.exception(f'Error during hybrid search: {e}')
+            return None
+
+    async def has_collection(self, collection_name: str) -> bool:
+        try:
+            async with self.engine.connect() as conn:
+                result = await conn.execute(
+                    select(DocumentChunk.id).where(DocumentChunk.collection_name == collection_name).limit(1)
+                )
+                return result.first() is not None
+        except Exception as e:
+            log.exception(f'Error checking collection existence: {e}')
+            return False
+
+    async def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        try:
+            async with self.engine.begin() as conn:
+                result = await conn.execute(self.client._delete_statement(collection_name, ids, filter))
+            log.info(f"Deleted {result.rowcount} items from collection '{collection_name}'.")
+        except Exception as e:
+            log.exception(f'Error during delete: {e}')
+            raise
+
+    async def delete_collection(self, collection_name: str) -> None:
+        await self.delete(collection_name)
+        log.info(f"Collection '{collection_name}' deleted.")
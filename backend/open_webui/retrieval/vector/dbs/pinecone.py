@@ -44,6 +44,8 @@ log = logging.getLogger(__name__)
 
 
 class PineconeClient(VectorDBBase):
+    supports_in_filter_delete = True
+
     def __init__(self):
         self.collection_prefix = 'open-webui'
 
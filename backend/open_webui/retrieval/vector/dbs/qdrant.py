@@ -15,6 +15,8 @@ from open_webui.config import (
     QDRANT_PREFER_GRPC,
     QDRANT_TIMEOUT,
     QDRANT_URI,
+    RAG_VECTOR_QUANTIZATION,
+    RAG_VECTOR_RESCORE_OVERSAMPLING,
 )
 from open_webui.retrieval.vector.main import (
     GetResult,
@@ -28,10 +30,35 @@ from qdrant_client.models import models
 
 NO_LIMIT = 999999999
 
+
+def vector_datatype():
+    return models.Datatype.FLOAT16 if RAG_VECTOR_QUANTIZATION == 'float16' else None
+
+
+def quantization_config():
+    # Quantized vectors are kept in RAM for the index; originals stay in storage for rescoring.
+    if RAG_VECTOR_QUANTIZATION == 'int8':
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    if RAG_VECTOR_QUANTIZATION == 'binary':
+        return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=True))
+    return None
+
+
+def search_params():
+    if RAG_VECTOR_QUANTIZATION in ('int8', 'binary'):
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(rescore=True, oversampling=RAG_VECTOR_RESCORE_OVERSAMPLING)
+        )
+    return None
+
 log = logging.getLogger(__name__)
 
 
 class QdrantClient(VectorDBBase):
+    supports_in_filter_delete = True
+
     def __init__(self):
         self.collection_prefix = QDRANT_COLLECTION_PREFIX
         self.QDRANT_URI = QDRANT_URI
@@ -94,10 +121,12 @@ class QdrantClient(VectorDBBase):
                 size=dimension,
                 distance=models.Distance.COSINE,
                 on_disk=self.QDRANT_ON_DISK,
+                datatype=vector_datatype(),
             ),
             hnsw_config=models.HnswConfigDiff(
                 m=self.QDRANT_HNSW_M,
             ),
+            quantization_config=quantization_config(),
         )
 
         # Create payload indexes for efficient filtering
@@ -156,6 +185,7 @@ class QdrantClient(VectorDBBase):
             collection_name=f'{self.collection_prefix}_{collection_name}',
             query=vectors[0],
             limit=limit,
+            search_params=search_params(),
         )
         get_result = self._result_to_get_result(query_response.points)
         return SearchResult(
@@ -231,7 +261,11 @@ class QdrantClient(VectorDBBase):
                 field_conditions.append(
                     models.FieldCondition(
                         key=f'metadata.{key}',
-                        match=models.MatchValue(value=value),
+                        match=(
+                            models.MatchAny(any=value['$in'])
+                            if isinstance(value, dict) and '$in' in value
+                            else models.MatchValue(value=value)
+                        ),
                     )
                 )
 
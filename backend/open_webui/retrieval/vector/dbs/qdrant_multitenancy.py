@@ -17,6 +17,7 @@ from open_webui.config import (
     QDRANT_TIMEOUT,
     QDRANT_URI,
 )
+from open_webui.retrieval.vector.dbs.qdrant import quantization_config, search_params, vector_datatype
 from open_webui.retrieval.vector.main import (
     GetResult,
     SearchResult,
@@ -140,6 +141,7 @@ class QdrantClient(VectorDBBase):
                 size=dimension,
                 distance=models.Distance.COSINE,
                 on_disk=self.QDRANT_ON_DISK,
+                datatype=vector_datatype(),
             ),
             # Disable global index building due to multitenancy
             # For more details https://qdrant.tech/documentation/guides/multiple-partitions/#calibrate-performance
@@ -147,6 +149,7 @@ class QdrantClient(VectorDBBase):
                 payload_m=self.QDRANT_HNSW_M,
                 m=0,
             ),
+            quantization_config=quantization_config(),
         )
         log.info(f'Multi-tenant collection {mt_collection_name} created with dimension {dimension}!')
 
@@ -264,6 +267,7 @@ class QdrantClient(VectorDBBase):
             query=vectors[0],
             limit=limit,
             query_filter=models.Filter(must=[tenant_filter]),
+            search_params=search_params(),
         )
         get_result = self._result_to_get_result(query_response.points)
         return SearchResult(
@@ -149,6 +149,8 @@ def _decode(value) -> str:
 
 
 class ValkeyClient(VectorDBBase):
+    supports_in_filter_delete = True
+
     def __init__(self):
         if not VALKEY_URL:
             raise ValueError(
@@ -0,0 +1,261 @@
+"""
+In-process vector index for transient collections.
+
+Web-search results are only relevant to the chat turn that fetched them, yet
+writing them to the configured vector DB costs an insert round trip per
+search, a query round trip per retrieval, and leaves a ``web-search-*``
+collection behind forever.  ``EphemeralVectorDB`` keeps such collections in a
+normalized NumPy matrix inside the worker process instead: search is a single
+matrix-vector product, and each collection expires after a TTL (refreshed on
+access) so follow-up turns in the same chat can still reuse it.
+
+Collections live only in the process that created them, so a follow-up turn
+or a ``/process/web/search`` caller served by another worker would search an
+empty index.  The index is therefore off by default and is ignored
+(``EPHEMERAL_INDEX_AVAILABLE``) when several uvicorn workers or replicas
+sharing Redis may serve the requests.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+from open_webui.env import REDIS_URL, UVICORN_WORKERS
+from open_webui.retrieval.vector.main import (
+    GetResult,
+    SearchResult,
+    VectorDBBase,
+    VectorItem,
+)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TTL = 3600
+MAX_COLLECTIONS = 256
+
+EPHEMERAL_INDEX_AVAILABLE = UVICORN_WORKERS == 1 and not REDIS_URL
+
+
+@dataclass
+class _Collection:
+    ids: list = field(default_factory=list)
+    documents: list = field(default_factory=list)
+    metadatas: list = field(default_factory=list)
+    vectors: Optional[np.ndarray] = None
+    ttl: float = DEFAULT_TTL
+    expires_at: float = 0.0
+
+
+def _normalize(vectors) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _matches(metadata: Any, filter: Optional[Dict]) -> bool:
+    if not filter:
+        return True
+    metadata = metadata or {}
+    return all(metadata.get(key) == value for key, value in filter.items())
+
+
+class EphemeralVectorDB(VectorDBBase):
+    def __init__(self, ttl: int = DEFAULT_TTL, max_collections: int = MAX_COLLECTIONS):
+        self.ttl = ttl
+        self.max_collections = max_collections
+        self._collections: 'OrderedDict[str, _Collection]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_collection(self, collection_name: str) -> Optional[_Collection]:
+        """Return a live collection and refresh its TTL, dropping it if expired."""
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            return None
+
+        now = time.time()
+        if collection.expires_at <= now:
+            self._collections.pop(collection_name, None)
+            return None
+
+        collection.expires_at = now + collection.ttl
+        self._collections.move_to_end(collection_name)
+        return collection
+
+    def _prune(self) -> None:
+        now = time.time()
+        for name in [name for name, c in self._collections.items() if c.expires_at <= now]:
+            self._collections.pop(name, None)
+        while len(self._collections) > self.max_collections:
+            name, _ = self._collections.popitem(last=False)
+            log.debug(f'Evicted ephemeral collection {name}')
+
+    def has_collection(self, collection_name: str) -> bool:
+        with self._lock:
+            return self._get_collection(collection_name) is not None
+
+    def delete_collection(self, collection_name: str) -> None:
+        with self._lock:
+            self._collections.pop(collection_name, None)
+
+    def insert(self, collection_name: str, items: List[VectorItem], ttl: Optional[int] = None) -> None:
+        """Add ``items``; ``ttl`` overrides the default TTL of the collection."""
+        if not items:
+            return
+
+        items = [item if isinstance(item, dict) else item.model_dump() for item in items]
+        vectors = _normalize([item['vector'] for item in items])
+
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            if collection is None:
+                collection = _Collection(ttl=ttl or self.ttl)
+                self._collections[collection_name] = collection
+            elif ttl:
+                collection.ttl = ttl
+            collection.expires_at = time.time() + collection.ttl
+
+            collection.ids.extend(item['id'] for item in items)
+            collection.documents.extend(item['text'] for item in items)
+            collection.metadatas.extend(item['metadata'] for item in items)
+            collection.vectors = vectors if collection.vectors is None else np.vstack([collection.vectors, vectors])
+            self._prune()
+
+    def upsert(self, collection_name: str, items: List[VectorItem], ttl: Optional[int] = None) -> None:
+        items = [item if isinstance(item, dict) else item.model_dump() for item in items]
+        self.delete(collection_name, ids=[item['id'] for item in items])
+        self.insert(collection_name, items, ttl=ttl)
+
+    def with_ttl(self, ttl: int) -> 'EphemeralTTLClient':
+        """This index as a client whose writes give their collections ``ttl``."""
+        return EphemeralTTLClient(self, ttl)
+
+    def search(
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            if collection is None or collection.vectors is None:
+                return None
+            ids, documents, metadatas = collection.ids, collection.documents, collection.metadatas
+            matrix = collection.vectors
+
+        candidates = None
+        if filter:
+            candidates = np.array([i for i, metadata in enumerate(metadatas) if _matches(metadata, filter)], dtype=int)
+            matrix = matrix[candidates]
+
+        result = {'ids': [], 'distances': [], 'documents': [], 'metadatas': []}
+        if matrix.shape[0] == 0 or limit is None or limit <= 0:
+            for key in result:
+                result[key] = [[] for _ in vectors]
+            return SearchResult(**result)
+
+        # Cosine similarity mapped to [0, 1] to match the bundled backends' scoring.
+        scores = (_normalize(vectors) @ matrix.T + 1.0) / 2.0
+        limit = min(limit, matrix.shape[0])
+
+        for row in scores:
+            top = np.argpartition(-row, limit - 1)[:limit]
+            top = top[np.argsort(-row[top])]
+            indices = candidates[top] if candidates is not None else top
+            result['ids'].append([ids[i] for i in indices])
+            result['documents'].append([documents[i] for i in indices])
+            result['metadatas'].append([metadatas[i] for i in indices])
+            result['distances'].append([float(score) for score in row[top]])
+
+        return SearchResult(**result)
+
+    def query(self, collection_name: str, filter: Dict, limit: Optional[int] = None) -> Optional[GetResult]:
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            if collection is None:
+                return None
+            rows = [
+                (id, document, metadata)
+                for id, document, metadata in zip(collection.ids, collection.documents, collection.metadatas)
+                if _matches(metadata, filter)
+            ]
+
+        if limit is not None:
+            rows = rows[:limit]
+        return GetResult(
+            ids=[[row[0] for row in rows]],
+            documents=[[row[1] for row in rows]],
+            metadatas=[[row[2] for row in rows]],
+        )
+
+    def get(self, collection_name: str) -> Optional[GetResult]:
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            if collection is None:
+                return None
+            return GetResult(
+                ids=[list(collection.ids)],
+                documents=[list(collection.documents)],
+                metadatas=[list(collection.metadatas)],
+            )
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            if collection is None:
+                return
+
+            id_set = set(ids) if ids else None
+            keep = [
+                i
+                for i, (id, metadata) in enumerate(zip(collection.ids, collection.metadatas))
+                if not ((id_set is None or id in id_set) and (filter is None or _matches(metadata, filter)))
+            ]
+            collection.ids = [collection.ids[i] for i in keep]
+            collection.documents = [collection.documents[i] for i in keep]
+            collection.metadatas = [collection.metadatas[i] for i in keep]
+            collection.vectors = collection.vectors[keep] if collection.vectors is not None and keep else None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._collections.clear()
+
+
+class EphemeralTTLClient:
+    """
+    An ``EphemeralVectorDB`` whose inserts use a fixed TTL, so each caller can
+    pass its own TTL without changing the shared index's default.
+    """
+
+    def __init__(self, db: EphemeralVectorDB, ttl: int):
+        self._db = db
+        self._ttl = ttl
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        self._db.insert(collection_name, items, ttl=self._ttl)
+
+    def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        self._db.upsert(collection_name, items, ttl=self._ttl)
+
+
+EPHEMERAL_VECTOR_DB = EphemeralVectorDB()
+
+
+def get_vector_db_client(collection_name: str, default: VectorDBBase) -> VectorDBBase:
+    """Route ``collection_name`` to the ephemeral index if it holds it, else to ``default``."""
+    return EPHEMERAL_VECTOR_DB if EPHEMERAL_VECTOR_DB.has_collection(collection_name) else default
@@ -3,6 +3,7 @@ from open_webui.config import (
     ENABLE_QDRANT_MULTITENANCY_MODE,
     VECTOR_DB,
 )
+from open_webui.retrieval.vector.compression import check_quantization_support
 from open_webui.retrieval.vector.main import VectorDBBase
 from open_webui.retrieval.vector.type import VectorType
 
@@ -72,6 +73,10 @@ class Vector:
                 from open_webui.retrieval.vector.dbs.chroma import ChromaClient
 
                 return ChromaClient()
+            case VectorType.EMBEDDED:
+                from open_webui.retrieval.vector.dbs.embedded import EmbeddedClient
+
+                return EmbeddedClient()
             case VectorType.ORACLE23AI:
                 from open_webui.retrieval.vector.dbs.oracle23ai import Oracle23aiClient
 
@@ -89,3 +94,4 @@ class Vector:
 
 
 VECTOR_DB_CLIENT = Vector.get_vector(VECTOR_DB)
+check_quantization_support(VECTOR_DB)
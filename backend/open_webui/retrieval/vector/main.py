@@ -32,6 +32,10 @@ class VectorDBBase(ABC):
     implement all abstract methods.
     """
 
+    # Whether ``delete(filter=...)`` accepts ``{key: {'$in': [...]}}``.  Batched
+    # deletes (see ``utils/vector_deletions.py``) otherwise delete one value at a time.
+    supports_in_filter_delete: bool = False
+
     @abstractmethod
     def has_collection(self, collection_name: str) -> bool:
         """Check if the collection exists in the vector DB."""
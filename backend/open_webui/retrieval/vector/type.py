@@ -6,6 +6,7 @@ class VectorType(StrEnum):
     MARIADB_VECTOR = 'mariadb-vector'
     QDRANT = 'qdrant'
     CHROMA = 'chroma'
+    EMBEDDED = 'embedded'
     PINECONE = 'pinecone'
     ELASTICSEARCH = 'elasticsearch'
     OPENSEARCH = 'opensearch'
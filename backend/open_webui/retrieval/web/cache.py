@@ -0,0 +1,256 @@
+"""
+Process-wide caches for web search and web page loading.
+
+Popular pages (documentation, Wikipedia, news front pages) are fetched and
+parsed again for every search that surfaces them.  ``WebPageCache`` keeps the
+extracted text and metadata of fetched pages keyed by normalized URL, honors
+``Cache-Control``/``Expires`` for freshness, and revalidates stale entries
+with conditional GETs (``ETag``/``Last-Modified``) so an unchanged page costs
+a 304 instead of a download and re-parse.  Memory is bounded by an LRU byte
+budget (``WEB_LOADER_CACHE_MAX_SIZE``).
+
+``SearchResultCache`` reuses engine results for identical queries for
+``WEB_SEARCH_CACHE_TTL`` seconds.
+"""
+
+import email.utils
+import json
+import logging
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+from langchain_core.documents import Document
+from open_webui.config import (
+    WEB_LOADER_CACHE_DEFAULT_TTL,
+    WEB_LOADER_CACHE_MAX_SIZE,
+    WEB_SEARCH_CACHE_TTL,
+)
+
+log = logging.getLogger(__name__)
+
+# Heuristic freshness for responses that only carry Last-Modified (RFC 9111 §4.2.2).
+LAST_MODIFIED_FRESHNESS_FRACTION = 0.1
+
+
+def normalize_url(url: str) -> str:
+    """Canonical cache key: lowercase scheme/host, no default port, sorted query, no fragment."""
+    try:
+        parts = urllib.parse.urlsplit(url.strip())
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or '').lower()
+    if parts.port and not ((scheme == 'http' and parts.port == 80) or (scheme == 'https' and parts.port == 443)):
+        netloc = f'{netloc}:{parts.port}'
+    if parts.username:
+        netloc = f'{parts.username}@{netloc}'
+
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+    return urllib.parse.urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+
+def parse_cache_control(value: Optional[str]) -> dict:
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, arg = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else True
+    return directives
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _get_header(headers: Optional[Mapping[str, str]], name: str) -> Optional[str]:
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.lower())
+    return value
+
+
+def is_cacheable(headers: Optional[Mapping[str, str]]) -> bool:
+    directives = parse_cache_control(_get_header(headers, 'Cache-Control'))
+    # This is a shared cache, so per-user ("private") responses are not stored either.
+    return 'no-store' not in directives and 'private' not in directives
+
+
+def get_freshness_lifetime(headers: Optional[Mapping[str, str]], default_ttl: int) -> float:
+    """Seconds a response stays fresh, following RFC 9111 precedence."""
+    directives = parse_cache_control(_get_header(headers, 'Cache-Control'))
+    if 'no-cache' in directives:
+        return 0
+
+    try:
+        age = float(_get_header(headers, 'Age') or 0)
+    except ValueError:
+        age = 0
+
+    for directive in ('s-maxage', 'max-age'):
+        if directive in directives:
+            try:
+                return max(0.0, float(directives[directive]) - age)
+            except (TypeError, ValueError):
+                return 0
+
+    date = _parse_http_date(_get_header(headers, 'Date')) or time.time()
+    expires = _get_header(headers, 'Expires')
+    if expires is not None:
+        expires_at = _parse_http_date(expires)
+        return max(0.0, expires_at - date - age) if expires_at else 0
+
+    last_modified = _parse_http_date(_get_header(headers, 'Last-Modified'))
+    if last_modified and last_modified < date:
+        return min(default_ttl, (date - last_modified) * LAST_MODIFIED_FRESHNESS_FRACTION)
+
+    return default_ttl
+
+
+@dataclass
+class CachedPage:
+    text: str
+    metadata: dict
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+    size: int
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_document(self, url: str) -> Document:
+        return Document(page_content=self.text, metadata={**self.metadata, 'source': url})
+
+
+class WebPageCache:
+    def __init__(self, max_size: int, default_ttl: int):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._entries: 'OrderedDict[str, CachedPage]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Return the entry for ``url`` (possibly stale, for revalidation) or None."""
+        if not self.enabled:
+            return None
+        key = normalize_url(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, url: str, document: Document, headers: Optional[Mapping[str, str]] = None) -> None:
+        if not self.enabled or not is_cacheable(headers):
+            return
+
+        metadata = {k: v for k, v in document.metadata.items() if k != 'source'}
+        size = len(document.page_content.encode('utf-8', 'ignore')) + len(json.dumps(metadata, default=str))
+        if size > self.max_size:
+            return
+
+        entry = CachedPage(
+            text=document.page_content,
+            metadata=metadata,
+            etag=_get_header(headers, 'ETag'),
+            last_modified=_get_header(headers, 'Last-Modified'),
+            expires_at=time.time() + get_freshness_lifetime(headers, self.default_ttl),
+            size=size,
+        )
+
+        key = normalize_url(url)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            self._entries[key] = entry
+            self._size += size
+            while self._size > self.max_size and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    def revalidate(self, url: str, headers: Optional[Mapping[str, str]] = None) -> Optional[Document]:
+        """Refresh a stale entry after a 304 Not Modified and return its document."""
+        key = normalize_url(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.expires_at = time.time() + get_freshness_lifetime(headers, self.default_ttl)
+            entry.etag = _get_header(headers, 'ETag') or entry.etag
+            entry.last_modified = _get_header(headers, 'Last-Modified') or entry.last_modified
+            self._entries.move_to_end(key)
+        return entry.to_document(url)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class SearchResultCache:
+    def __init__(self, ttl: int, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple[float, list]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def make_key(engine: str, query: str, *params: Any) -> str:
+        return json.dumps([engine, query.strip(), *params], sort_keys=True, default=str)
+
+    def get(self, key: str) -> Optional[list]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, results = item
+            if expires_at <= time.time():
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return results
+
+    def set(self, key: str, results: list) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+WEB_PAGE_CACHE = WebPageCache(WEB_LOADER_CACHE_MAX_SIZE * 1024 * 1024, WEB_LOADER_CACHE_DEFAULT_TTL)
+WEB_SEARCH_CACHE = SearchResultCache(WEB_SEARCH_CACHE_TTL)
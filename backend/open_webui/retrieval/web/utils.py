@@ -57,6 +57,7 @@ from open_webui.env import (
 from open_webui.retrieval.loaders.external_web import ExternalWebLoader
 from open_webui.retrieval.loaders.microsoft_web_iq import MicrosoftWebIQLoader
 from open_webui.retrieval.loaders.tavily import TavilyLoader
+from open_webui.retrieval.web.cache import WEB_PAGE_CACHE
 from open_webui.retrieval.web.firecrawl import scrape_firecrawl_url
 from open_webui.utils.misc import is_host_allowed
 
@@ -695,6 +696,11 @@ class SafePlaywrightURLLoader(PlaywrightURLLoader, RateLimitMixin, URLProcessing
                 browser = await p.chromium.launch(headless=self.headless, proxy=self.proxy)
 
             for url in self.urls:
+                cached = WEB_PAGE_CACHE.get(url)
+                if cached is not None and cached.is_fresh():
+                    yield cached.to_document(url)
+                    continue
+
                 try:
                     await self._safe_process_url(url)
                     page = await browser.new_page()
@@ -705,7 +711,10 @@ class SafePlaywrightURLLoader(PlaywrightURLLoader, RateLimitMixin, URLProcessing
 
                     text = await self.evaluator.evaluate_async(page, browser, response)
                     metadata = {'source': url}
-                    yield Document(page_content=text, metadata=metadata)
+                    document = Document(page_content=text, metadata=metadata)
+                    if response.ok:
+                        WEB_PAGE_CACHE.set(url, document, response.headers)
+                    yield document
                 except Exception as e:
                     if self.continue_on_failure:
                         log.exception(f'Error loading {url}: {e}')
@@ -749,6 +758,11 @@ class SafeWebBaseLoader(WebBaseLoader):
         self.session.mount('http://', _SSRFSafeAdapter())
         self.session.mount('https://', _SSRFSafeAdapter())
 
+        # Response headers of successful fetches and of 304 revalidations,
+        # consumed by alazy_load to update WEB_PAGE_CACHE.
+        self._response_headers: Dict[str, dict] = {}
+        self._not_modified: Dict[str, dict] = {}
+
     async def _fetch(self, url: str, retries: int = 3, cooldown: int = 2, backoff: float = 1.5) -> str:
         connector = aiohttp.TCPConnector(resolver=_SSRFSafeResolver())
         async with aiohttp.ClientSession(trust_env=self.trust_env, connector=connector) as session:
@@ -763,13 +777,25 @@ class SafeWebBaseLoader(WebBaseLoader):
                     else:
                         kwargs['ssl'] = AIOHTTP_CLIENT_SESSION_SSL
 
+                    # Revalidate a stale cached copy instead of downloading it again.
+                    cached = WEB_PAGE_CACHE.get(url)
+                    if cached is not None:
+                        kwargs['headers'] = {**self.session.headers, **cached.conditional_headers()}
+
                     async with session.get(
                         url,
                         **(self.requests_kwargs | kwargs),
                     ) as response:
+                        headers = {key.lower(): value for key, value in response.headers.items()}
+                        if response.status == 304 and cached is not None:
+                            self._not_modified[url] = headers
+                            return ''
                         if self.raise_for_status:
                             response.raise_for_status()
-                        return await response.text()
+                        text = await response.text()
+                        if response.ok:
+                            self._response_headers[url] = headers
+                        return text
                 except aiohttp.ClientConnectionError as e:
                     if i == retries - 1:
                         raise
@@ -815,9 +841,24 @@ class SafeWebBaseLoader(WebBaseLoader):
                 log.exception(f'Error loading {path}: {e}')
 
     async def alazy_load(self) -> AsyncIterator[Document]:
-        """Async lazy load text from the url(s) in web_path."""
-        results = await self.ascrape_all(self.web_paths)
-        for path, soup in zip(self.web_paths, results):
+        """Async lazy load text from the url(s) in web_path, reusing cached pages."""
+        documents = {}
+        paths = []
+        for path in self.web_paths:
+            cached = WEB_PAGE_CACHE.get(path)
+            if cached is not None and cached.is_fresh():
+                documents[path] = cached.to_document(path)
+            else:
+                paths.append(path)
+
+        results = await self.ascrape_all(paths) if paths else []
+        for path, soup in zip(paths, results):
+            if path in self._not_modified:
+                document = WEB_PAGE_CACHE.revalidate(path, self._not_modified.pop(path))
+                if document is not None:
+                    documents[path] = document
+                    continue
+
             text = soup.get_text(**self.bs_get_text_kwargs)
             metadata = {'source': path}
             if title := soup.find('title'):
@@ -826,7 +867,14 @@ class SafeWebBaseLoader(WebBaseLoader):
                 metadata['description'] = description.get('content', 'No description found.')
             if html := soup.find('html'):
                 metadata['language'] = html.get('lang', 'No language found.')
-            yield Document(page_content=text, metadata=metadata)
+            documents[path] = Document(page_content=text, metadata=metadata)
+
+            if path in self._response_headers:
+                WEB_PAGE_CACHE.set(path, documents[path], self._response_headers.pop(path))
+
+        for path in self.web_paths:
+            if path in documents:
+                yield documents[path]
 
     async def aload(self) -> list[Document]:
         """Load data into Document objects."""
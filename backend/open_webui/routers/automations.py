@@ -19,6 +19,7 @@ from open_webui.models.config import Config
 from open_webui.utils.access_control import has_permission
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.automations import (
+    AUTOMATION_SCHEDULER,
     execute_automation,
     next_n_runs_ns,
     next_run_ns,
@@ -151,6 +152,16 @@ async def get_automation_items(
     }
 
 
+############################
+# GetSchedulerMetrics
+############################
+
+
+@router.get('/scheduler/metrics')
+async def get_scheduler_metrics(user=Depends(get_admin_user)):
+    return AUTOMATION_SCHEDULER.stats()
+
+
 ############################
 # CreateNewAutomation
 ############################
@@ -162,40 +162,41 @@ async def get_channels(
 ):
     await check_channels_access(request, user)
 
-    channels = await Channels.get_channels_by_user_id(user.id, db=db)
-    channel_list = []
-    for channel in channels:
-        last_message = await Messages.get_last_message_by_channel_id(channel.id, db=db)
-        last_message_at = last_message.created_at if last_message else None
+    # last_message_at lives on the channel row and unread counts on the membership
+    # row, so the whole list is served by a fixed number of batched queries.
+    channels = await Channels.get_channels_with_unread_count_by_user_id(user.id, db=db)
 
-        channel_member = await Channels.get_member_by_channel_and_user_id(channel.id, user.id, db=db)
-        unread_count = (
-            await Messages.get_unread_message_count(channel.id, user.id, channel_member.last_read_at, db=db)
-            if channel_member
-            else 0
-        )
+    dm_members = await Channels.get_members_by_channel_ids(
+        [channel.id for channel, _ in channels if channel.type == 'dm'], db=db
+    )
+    dm_user_ids = {member.user_id for members in dm_members.values() for member in members}
+    dm_users = {u.id: u for u in await Users.get_users_by_user_ids(list(dm_user_ids), db=db)} if dm_user_ids else {}
 
+    channel_list = []
+    for channel, unread_count in channels:
         user_ids = None
         users = None
         if channel.type == 'dm':
-            user_ids = [member.user_id for member in await Channels.get_members_by_channel_id(channel.id, db=db)]
+            user_ids = [member.user_id for member in dm_members.get(channel.id, [])]
             users = [
                 UserIdNameStatusResponse(
                     **{
-                        **u.model_dump(),
-                        'is_active': Users.is_active(u),
+                        **dm_users[user_id].model_dump(),
+                        'is_active': Users.is_active(dm_users[user_id]),
                     }
                 )
-                for u in await Users.get_users_by_user_ids(user_ids, db=db)
+                for user_id in user_ids
+                if user_id in dm_users
             ]
 
         channel_list.append(
             ChannelListItemResponse(
-                **channel.model_dump(),
-                user_ids=user_ids,
-                users=users,
-                last_message_at=last_message_at,
-                unread_count=unread_count,
+                **{
+                    **channel.model_dump(),
+                    'user_ids': user_ids,
+                    'users': users,
+                    'unread_count': unread_count,
+                }
             )
         )
 
@@ -397,8 +398,10 @@ async def get_channel_by_id(
         ]
 
         channel_member = await Channels.get_member_by_channel_and_user_id(channel.id, user.id, db=db)
-        unread_count = await Messages.get_unread_message_count(
-            channel.id, user.id, channel_member.last_read_at if channel_member else None
+        unread_count = (
+            channel_member.unread_count
+            if channel_member
+            else await Messages.get_unread_message_count(channel.id, user.id, None, db=db)
         )
 
         return ChannelFullResponse(
@@ -428,8 +431,10 @@ async def get_channel_by_id(
         user_count = len(await get_channel_users_with_access(channel, 'read', db=db))
 
         channel_member = await Channels.get_member_by_channel_and_user_id(channel.id, user.id, db=db)
-        unread_count = await Messages.get_unread_message_count(
-            channel.id, user.id, channel_member.last_read_at if channel_member else None
+        unread_count = (
+            channel_member.unread_count
+            if channel_member
+            else await Messages.get_unread_message_count(channel.id, user.id, None, db=db)
         )
 
         return ChannelFullResponse(
@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import Optional
+from typing import AsyncIterator, Optional
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
@@ -20,6 +20,7 @@ from open_webui.models.chats import (
     ChatForm,
     ChatHistoryStats,
     ChatImportForm,
+    ChatModel,
     ChatResponse,
     Chats,
     ChatsImportForm,
@@ -27,19 +28,21 @@ from open_webui.models.chats import (
     ChatTitleIdResponse,
     ChatUsageStatsListResponse,
     MessageStats,
+    encode_chat_cursor,
 )
 from open_webui.models.folders import Folders
 from open_webui.models.shared_chats import SharedChatResponse, SharedChats
 from open_webui.models.tags import TagModel, Tags
-from open_webui.socket.main import get_event_emitter
+from open_webui.socket.main import emit_to_users, get_event_emitter
 from open_webui.tasks import has_active_tasks, stop_item_tasks
 from open_webui.utils.access_control import filter_allowed_access_grants, has_permission
 from open_webui.utils.access_control.folders import has_folder_access
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.chat_message_backfill import get_backfill_status
 from open_webui.utils.context_compaction import compact_chat_branch
-from open_webui.utils.misc import get_message_list
+from open_webui.utils.misc import get_message_list, iter_json_records
 from open_webui.utils.models import get_all_models
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 log = logging.getLogger(__name__)
@@ -111,7 +114,7 @@ def chat_config_updates(data: dict) -> dict:
     return {CHAT_CONFIG_KEYS[field]: value for field, value in data.items() if field in CHAT_CONFIG_KEYS}
 
 
-async def require_chat_import_permission(request: Request, user, db: AsyncSession):
+async def require_chat_import_permission(request: Request, user, db: AsyncSession | None = None):
     if user.role != 'admin' and not await has_permission(
         user.id, 'chat.import', await Config.get('user.permissions'), db=db
     ):
@@ -133,14 +136,15 @@ async def require_chat_import_permission(request: Request, user, db: AsyncSessio
 async def get_session_user_chat_list(
     user=Depends(get_verified_user),
     page: int | None = None,
+    cursor: str | None = None,
     include_pinned: bool | None = False,
     include_folders: bool | None = False,
     db: AsyncSession = Depends(get_async_session),
 ):
     try:
-        if page is not None:
+        if page is not None or cursor is not None:
             limit = 60
-            skip = (page - 1) * limit
+            skip = ((page or 1) - 1) * limit
 
             return await Chats.get_chat_title_id_list_by_user_id(
                 user.id,
@@ -148,6 +152,7 @@ async def get_session_user_chat_list(
                 include_pinned=include_pinned,
                 skip=skip,
                 limit=limit,
+                cursor=cursor,
                 db=db,
             )
         else:
@@ -444,7 +449,7 @@ async def generate_chat_stats_jsonl_generator(user_id, filter):
     2. Holding a session open for the entire streaming duration blocks other requests
     3. Short-lived sessions release locks between batches, allowing other operations
     """
-    skip = 0
+    cursor = None
     limit = CHAT_EXPORT_PAGE_ITEM_COUNT
 
     while True:
@@ -452,8 +457,8 @@ async def generate_chat_stats_jsonl_generator(user_id, filter):
         result = await Chats.get_chats_by_user_id(
             user_id,
             filter=filter,
-            skip=skip,
             limit=limit,
+            cursor=cursor,
             db=None,  # Let get_async_db_context create a fresh session per batch
         )
         if not result.items:
@@ -467,7 +472,8 @@ async def generate_chat_stats_jsonl_generator(user_id, filter):
             except Exception as e:
                 log.exception(f'Error processing chat {chat.id}: {e}')
 
-        skip += limit
+        last = result.items[-1]
+        cursor = encode_chat_cursor(last.updated_at, last.id)
 
 
 @router.get('/stats/export', response_model=ChatStatsExportList)
@@ -601,6 +607,7 @@ async def delete_all_user_chats(
 async def get_user_chat_list_by_user_id(
     user_id: str,
     page: int | None = None,
+    cursor: str | None = None,
     query: str | None = None,
     order_by: str | None = None,
     direction: str | None = None,
@@ -623,9 +630,12 @@ async def get_user_chat_list_by_user_id(
     if direction:
         filter['direction'] = direction
 
-    return await Chats.get_chat_list_by_user_id(
-        user_id, include_archived=True, filter=filter, skip=skip, limit=limit, db=db
-    )
+    try:
+        return await Chats.get_chat_list_by_user_id(
+            user_id, include_archived=True, filter=filter, skip=skip, limit=limit, cursor=cursor, db=db
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ERROR_MESSAGES.DEFAULT())
 
 
 ############################
@@ -699,6 +709,80 @@ async def import_chats(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ERROR_MESSAGES.DEFAULT())
 
 
+CHAT_IMPORT_BATCH_SIZE = 100
+
+
+@router.post('/import/stream')
+async def import_chats_stream(
+    request: Request,
+    user=Depends(get_verified_user),
+):
+    """
+    Import a large export (NDJSON, or a JSON array of chats) without holding it in memory.
+
+    The body is parsed incrementally and chats are inserted in batches of
+    CHAT_IMPORT_BATCH_SIZE (``chat`` rows plus a bulk insert of their
+    ``chat_message`` rows), each in its own short-lived session; no session is
+    held open while the upload streams in. Progress is emitted to the user's
+    sockets as ``chat:import`` events.
+    """
+    await require_chat_import_permission(request, user)
+
+    total_bytes = int(request.headers.get('content-length') or 0)
+    received_bytes = 0
+    chat_ids = []
+    failed = 0
+    batch = []
+
+    async def body():
+        nonlocal received_bytes
+        async for chunk in request.stream():
+            received_bytes += len(chunk)
+            yield chunk
+
+    async def flush():
+        nonlocal batch
+        if not batch:
+            return
+        chats = await Chats.import_chats(user.id, batch)
+        batch = []
+        chat_ids.extend(chat.id for chat in chats)
+        await publish_event(
+            request,
+            EVENTS.CHAT_IMPORTED,
+            actor=user,
+            subject_type='chat.import',
+            data={'count': len(chats), 'chat_ids': [chat.id for chat in chats]},
+        )
+        await emit_to_users(
+            'chat:import',
+            {'imported': len(chat_ids), 'failed': failed, 'bytes': received_bytes, 'total_bytes': total_bytes},
+            [user.id],
+        )
+
+    try:
+        async for record in iter_json_records(body()):
+            try:
+                batch.append(ChatImportForm.model_validate(record))
+            except ValidationError:
+                failed += 1
+                continue
+            if len(batch) >= CHAT_IMPORT_BATCH_SIZE:
+                await flush()
+        await flush()
+    except json.JSONDecodeError as e:
+        log.warning(f'Chat import stopped at invalid JSON after {len(chat_ids)} chats: {e}')
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Invalid JSON after {len(chat_ids)} imported chats: {e}',
+        )
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ERROR_MESSAGES.DEFAULT())
+
+    return {'imported': len(chat_ids), 'failed': failed, 'chat_ids': chat_ids}
+
+
 ############################
 # ChatConfig
 ############################
@@ -723,6 +807,16 @@ async def set_chat_config(form_data: ChatConfigForm, user=Depends(get_admin_user
     return await get_chat_config_values()
 
 
+############################
+# ChatMessageBackfill
+############################
+
+
+@router.get('/backfill/status')
+async def get_chat_message_backfill_status(user=Depends(get_admin_user)):
+    return await get_backfill_status()
+
+
 ############################
 # GetChats
 ############################
@@ -732,6 +826,7 @@ async def set_chat_config(form_data: ChatConfigForm, user=Depends(get_admin_user
 async def search_user_chats(
     text: str,
     page: int | None = None,
+    cursor: str | None = None,
     user=Depends(get_verified_user),
     db: AsyncSession = Depends(get_async_session),
 ):
@@ -742,9 +837,17 @@ async def search_user_chats(
     skip = (page - 1) * limit
 
     search_text = chat_search_content_text(text)
-    chat_list = []
-    for chat in await Chats.get_chats_by_user_id_and_search_text(user.id, text, skip=skip, limit=limit, db=db):
-        chat_list.append(ChatTitleIdResponse(**chat.model_dump(), snippet=chat_search_snippet(chat.chat, search_text)))
+    try:
+        chat_list = await Chats.get_chats_by_user_id_and_search_text(
+            user.id, text, skip=skip, limit=limit, cursor=cursor, db=db
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ERROR_MESSAGES.DEFAULT())
+
+    # Snippets read only the matching chats' message rows, not their histories.
+    snippet_messages = await Chats.get_search_snippet_messages([chat.id for chat in chat_list], search_text, db=db)
+    for chat in chat_list:
+        chat.snippet = chat_search_snippet({'messages': snippet_messages.get(chat.id, [])}, search_text)
 
     # Delete tag if no chat is found
     words = text.strip().split(' ')
@@ -772,16 +875,17 @@ async def get_chats_by_folder_id(
     if children_folders:
         folder_ids.extend([folder.id for folder in children_folders])
 
-    return [
-        ChatResponse(**chat.model_dump())
-        for chat in await Chats.get_chats_by_folder_ids_and_user_id(folder_ids, user.id, db=db)
-    ]
+    chats = Chats.iter_chats(
+        user_id=user.id, archived=False, folder_ids=folder_ids, batch_size=CHAT_EXPORT_BATCH_SIZE
+    )
+    return StreamingResponse(generate_chat_export_json_array(chats), media_type='application/json')
 
 
 @router.get('/folder/{folder_id}/list')
 async def get_chat_list_by_folder_id(
     folder_id: str,
     page: int | None = 1,
+    cursor: str | None = None,
     user=Depends(get_verified_user),
     db: AsyncSession = Depends(get_async_session),
 ):
@@ -789,7 +893,9 @@ async def get_chat_list_by_folder_id(
         limit = 10
         skip = (page - 1) * limit
 
-        chats = await Chats.get_chats_by_folder_id_and_user_id(folder_id, user.id, skip=skip, limit=limit, db=db)
+        chats = await Chats.get_chats_by_folder_id_and_user_id(
+            folder_id, user.id, skip=skip, limit=limit, cursor=cursor, db=db
+        )
         return [
             {'title': chat.title, 'id': chat.id, 'updated_at': chat.updated_at, 'last_read_at': chat.last_read_at}
             for chat in chats
@@ -815,43 +921,56 @@ async def get_user_pinned_chats(user=Depends(get_verified_user), db: AsyncSessio
 ############################
 
 CHAT_EXPORT_BATCH_SIZE = 100
+# Serialized chats are flushed to the client in chunks of about this size.
+CHAT_EXPORT_CHUNK_SIZE = 64 * 1024
 
 
-async def generate_chat_export_ndjson(user_id: str):
+async def generate_chat_export_ndjson(chats: AsyncIterator[ChatModel]):
     """
-    Async generator that streams all user chats as NDJSON (one JSON object per line).
+    Async generator that streams chats as NDJSON (one JSON object per line).
 
-    Uses short-lived DB sessions per batch to avoid holding locks for the
-    entire duration, which is critical for SQLite environments.
+    ``chats`` is typically ``Chats.iter_chats``, which walks the table in
+    keyset batches through a server-side cursor with short-lived DB sessions,
+    so neither the result set nor a lock is held for the entire duration
+    (critical for SQLite environments). Output is sent with chunked transfer.
     """
-    skip = 0
+    chunk = []
+    size = 0
+
+    async for chat in chats:
+        try:
+            line = ChatResponse(**chat.model_dump()).model_dump_json() + '\n'
+        except Exception as e:
+            log.exception(f'Error serializing chat {chat.id}: {e}')
+            continue
 
-    while True:
-        result = await Chats.get_chats_by_user_id(
-            user_id,
-            skip=skip,
-            limit=CHAT_EXPORT_BATCH_SIZE,
-            db=None,
-        )
-        if not result.items:
-            break
+        chunk.append(line)
+        size += len(line)
+        if size >= CHAT_EXPORT_CHUNK_SIZE:
+            yield ''.join(chunk)
+            chunk, size = [], 0
 
-        for chat in result.items:
-            try:
-                yield ChatResponse(**chat.model_dump()).model_dump_json() + '\n'
-            except Exception as e:
-                log.exception(f'Error serializing chat {chat.id}: {e}')
+    if chunk:
+        yield ''.join(chunk)
 
-        if len(result.items) < CHAT_EXPORT_BATCH_SIZE:
-            break
 
-        skip += CHAT_EXPORT_BATCH_SIZE
+async def generate_chat_export_json_array(chats: AsyncIterator[ChatModel]):
+    """
+    Async generator that streams chats as a JSON array, for clients that
+    expect one JSON document (see ``generate_chat_export_ndjson``).
+    """
+    separator = '['
+    async for lines in generate_chat_export_ndjson(chats):
+        items = lines.rstrip('\n').split('\n')
+        yield separator + ','.join(items)
+        separator = ','
+    yield '[]' if separator == '[' else ']'
 
 
 @router.get('/all')
 async def get_user_chats(user=Depends(get_verified_user)):
     return StreamingResponse(
-        generate_chat_export_ndjson(user.id),
+        generate_chat_export_ndjson(Chats.iter_chats(user_id=user.id, batch_size=CHAT_EXPORT_BATCH_SIZE)),
         media_type='application/x-ndjson',
     )
 
@@ -862,8 +981,9 @@ async def get_user_chats(user=Depends(get_verified_user)):
 
 
 @router.get('/all/archived', response_model=list[ChatResponse])
-async def get_user_archived_chats(user=Depends(get_verified_user), db: AsyncSession = Depends(get_async_session)):
-    return [ChatResponse(**chat.model_dump()) for chat in await Chats.get_archived_chats_by_user_id(user.id, db=db)]
+async def get_user_archived_chats(user=Depends(get_verified_user)):
+    chats = Chats.iter_chats(user_id=user.id, archived=True, batch_size=CHAT_EXPORT_BATCH_SIZE)
+    return StreamingResponse(generate_chat_export_json_array(chats), media_type='application/json')
 
 
 ############################
@@ -887,10 +1007,14 @@ async def get_all_user_tags(user=Depends(get_verified_user), db: AsyncSession =
 
 
 @router.get('/all/db', response_model=list[ChatResponse])
-async def get_all_user_chats_in_db(user=Depends(get_admin_user), db: AsyncSession = Depends(get_async_session)):
+async def get_all_user_chats_in_db(format: str = 'json', user=Depends(get_admin_user)):
     if not ENABLE_ADMIN_EXPORT:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, detail=ERROR_MESSAGES.ACCESS_PROHIBITED)
-    return [ChatResponse(**chat.model_dump()) for chat in await Chats.get_chats(db=db)]
+
+    chats = Chats.iter_chats(batch_size=CHAT_EXPORT_BATCH_SIZE)
+    if format == 'ndjson':
+        return StreamingResponse(generate_chat_export_ndjson(chats), media_type='application/x-ndjson')
+    return StreamingResponse(generate_chat_export_json_array(chats), media_type='application/json')
 
 
 ############################
@@ -901,6 +1025,7 @@ async def get_all_user_chats_in_db(user=Depends(get_admin_user), db: AsyncSessio
 @router.get('/archived', response_model=list[ChatTitleIdResponse])
 async def get_archived_session_user_chat_list(
     page: int | None = None,
+    cursor: str | None = None,
     query: str | None = None,
     order_by: str | None = None,
     direction: str | None = None,
@@ -921,13 +1046,17 @@ async def get_archived_session_user_chat_list(
     if direction:
         filter['direction'] = direction
 
-    return await Chats.get_archived_chat_list_by_user_id(
-        user.id,
-        filter=filter,
-        skip=skip,
-        limit=limit,
-        db=db,
-    )
+    try:
+        return await Chats.get_archived_chat_list_by_user_id(
+            user.id,
+            filter=filter,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            db=db,
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ERROR_MESSAGES.DEFAULT())
 
 
 ############################
@@ -4,6 +4,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.concurrency import run_in_threadpool
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import INSTANCE_ID
 from open_webui.events import EVENTS, publish_event
 from open_webui.internal.db import get_async_session
 from open_webui.models.config import Config
@@ -17,6 +18,8 @@ from open_webui.models.feedbacks import (
     ModelHistoryEntry,
     ModelHistoryResponse,
 )
+from open_webui.models.job_states import JobStates
+from open_webui.models.leaderboard import Leaderboard, LeaderboardRatingModel
 from open_webui.models.users import UserModel, Users
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from pydantic import BaseModel
@@ -60,10 +63,25 @@ async def get_config_values(key_map: dict[str, str]) -> dict:
 #    4. Feedbacks about unrelated topics (e.g., "cooking") contribute less
 #    This gives topic-specific leaderboards without needing separate data.
 
+import asyncio
 import os
+import time
 
 EMBEDDING_MODEL_NAME = os.environ.get('AUXILIARY_EMBEDDING_MODEL', 'TaylorAI/bge-micro-v2')
+# Seconds between full leaderboard recomputations. Feedback creation updates the
+# materialized ratings incrementally; edits and deletes trigger an early recompute.
+LEADERBOARD_RECOMPUTE_INTERVAL = int(os.environ.get('LEADERBOARD_RECOMPUTE_INTERVAL', '3600'))
+LEADERBOARD_RECOMPUTE_DEBOUNCE = 5
+# How often instances check for recomputes requested elsewhere, and how long a recompute may hold the lease.
+LEADERBOARD_RECOMPUTE_POLL_INTERVAL = 30
+LEADERBOARD_RECOMPUTE_LEASE = 900
+LEADERBOARD_JOB = 'leaderboard.recompute'
+
+K_FACTOR = 32  # Standard Elo K-factor for rating volatility
+
 _embedding_model = None
+_tag_embedding_cache: dict = {}
+_leaderboard_recompute_event: Optional[asyncio.Event] = None
 
 
 def _get_embedding_model():
@@ -78,6 +96,42 @@ def _get_embedding_model():
     return _embedding_model
 
 
+def _apply_elo(model_stats: dict, data: dict, weight: float = 1.0) -> None:
+    """
+    Apply a single feedback to ``model_stats`` in place.
+
+    Ratings only ever move forward, so appending a new feedback to the
+    materialized leaderboard gives the same result as replaying the full
+    history with that feedback last.
+    """
+    winner_id = data.get('model_id')
+    rating_value = str(data.get('rating', ''))
+    if not winner_id or rating_value not in ('1', '-1'):
+        return
+
+    won = rating_value == '1'
+
+    def get_or_create_stats(model_id):
+        if model_id not in model_stats:
+            model_stats[model_id] = {'rating': 1000.0, 'won': 0, 'lost': 0}
+        return model_stats[model_id]
+
+    for opponent_id in data.get('sibling_model_ids') or []:
+        winner = get_or_create_stats(winner_id)
+        opponent = get_or_create_stats(opponent_id)
+        expected = 1 / (1 + 10 ** ((opponent['rating'] - winner['rating']) / 400))
+
+        winner['rating'] += K_FACTOR * ((1 if won else 0) - expected) * weight
+        opponent['rating'] += K_FACTOR * ((0 if won else 1) - (1 - expected)) * weight
+
+        if won:
+            winner['won'] += 1
+            opponent['lost'] += 1
+        else:
+            winner['lost'] += 1
+            opponent['won'] += 1
+
+
 def _calculate_elo(feedbacks: list[LeaderboardFeedbackData], similarities: dict = None) -> dict:
     """
     Calculate Elo ratings for models based on user feedback.
@@ -92,51 +146,24 @@ def _calculate_elo(feedbacks: list[LeaderboardFeedbackData], similarities: dict
 
     Returns: {model_id: {"rating": float, "won": int, "lost": int}}
     """
-    K_FACTOR = 32  # Standard Elo K-factor for rating volatility
     model_stats = {}
 
-    def get_or_create_stats(model_id):
-        if model_id not in model_stats:
-            model_stats[model_id] = {'rating': 1000.0, 'won': 0, 'lost': 0}
-        return model_stats[model_id]
-
     for feedback in feedbacks:
-        data = feedback.data or {}
-        winner_id = data.get('model_id')
-        rating_value = str(data.get('rating', ''))
-        if not winner_id or rating_value not in ('1', '-1'):
-            continue
-
-        won = rating_value == '1'
         weight = similarities.get(feedback.id, 1.0) if similarities else 1.0
-
-        for opponent_id in data.get('sibling_model_ids') or []:
-            winner = get_or_create_stats(winner_id)
-            opponent = get_or_create_stats(opponent_id)
-            expected = 1 / (1 + 10 ** ((opponent['rating'] - winner['rating']) / 400))
-
-            winner['rating'] += K_FACTOR * ((1 if won else 0) - expected) * weight
-            opponent['rating'] += K_FACTOR * ((0 if won else 1) - (1 - expected)) * weight
-
-            if won:
-                winner['won'] += 1
-                opponent['lost'] += 1
-            else:
-                winner['lost'] += 1
-                opponent['won'] += 1
+        _apply_elo(model_stats, feedback.data or {}, weight)
 
     return model_stats
 
 
-def _get_top_tags(feedbacks: list[LeaderboardFeedbackData], limit: int = 5) -> dict:
+def _count_tags(feedbacks: list[LeaderboardFeedbackData]) -> dict:
     """
-    Count tag occurrences per model and return the most frequent ones.
+    Count tag occurrences per model.
 
     Each feedback can have tags describing the conversation topic.
     This aggregates those tags per model to show what topics each model
     is commonly used for.
 
-    Returns: {model_id: [{"tag": str, "count": int}, ...]}
+    Returns: {model_id: {tag: count}}
     """
     from collections import defaultdict
 
@@ -149,13 +176,46 @@ def _get_top_tags(feedbacks: list[LeaderboardFeedbackData], limit: int = 5) -> d
             for tag in data.get('tags', []):
                 tag_counts[model_id][tag] += 1
 
-    return {
-        model_id: [{'tag': tag, 'count': count} for tag, count in sorted(tags.items(), key=lambda x: -x[1])[:limit]]
-        for model_id, tags in tag_counts.items()
-    }
+    return {model_id: dict(tags) for model_id, tags in tag_counts.items()}
+
+
+def _top_tags(tags: Optional[dict], limit: int = 5) -> list[dict]:
+    return [{'tag': tag, 'count': count} for tag, count in sorted((tags or {}).items(), key=lambda x: -x[1])[:limit]]
+
+
+async def _get_tag_embeddings(tags: list[str]):
+    """
+    Return a (len(tags), dim) float32 matrix of tag embeddings.
+
+    Embeddings are looked up in-process first, then in the persisted
+    `leaderboard_tag_embedding` table; only never-seen tags are encoded.
+    """
+    import numpy as np
+
+    missing = [tag for tag in tags if tag not in _tag_embedding_cache]
+    if missing:
+        stored = await Leaderboard.get_tag_embeddings(EMBEDDING_MODEL_NAME, missing)
+        for tag, blob in stored.items():
+            _tag_embedding_cache[tag] = np.frombuffer(blob, dtype=np.float32)
+        missing = [tag for tag in missing if tag not in _tag_embedding_cache]
+
+    if missing:
+        embedding_model = await run_in_threadpool(_get_embedding_model)
+        if not embedding_model:
+            return None
 
+        encoded = await run_in_threadpool(embedding_model.encode, missing)
+        new_embeddings = {}
+        for tag, embedding in zip(missing, encoded):
+            vector = np.asarray(embedding, dtype=np.float32)
+            _tag_embedding_cache[tag] = vector
+            new_embeddings[tag] = vector.tobytes()
+        await Leaderboard.insert_tag_embeddings(EMBEDDING_MODEL_NAME, new_embeddings)
 
-def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str) -> dict:
+    return np.stack([_tag_embedding_cache[tag] for tag in tags])
+
+
+async def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str) -> dict:
     """
     Compute how relevant each feedback is to a search query.
 
@@ -170,17 +230,16 @@ def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str)
     """
     import numpy as np
 
-    embedding_model = _get_embedding_model()
-    if not embedding_model:
-        return {}
-
     all_tags = list({tag for feedback in feedbacks if feedback.data for tag in feedback.data.get('tags', [])})
     if not all_tags:
         return {}
 
     try:
-        tag_embeddings = embedding_model.encode(all_tags)
-        query_embedding = embedding_model.encode([query])[0]
+        tag_embeddings = await _get_tag_embeddings(all_tags)
+        if tag_embeddings is None:
+            return {}
+        embedding_model = await run_in_threadpool(_get_embedding_model)
+        query_embedding = (await run_in_threadpool(embedding_model.encode, [query]))[0]
     except Exception as e:
         log.error(f'Embedding error: {e}')
         return {}
@@ -189,15 +248,132 @@ def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str)
     tag_norms = np.linalg.norm(tag_embeddings, axis=1)
     query_norm = np.linalg.norm(query_embedding)
     similarities = np.dot(tag_embeddings, query_embedding) / (tag_norms * query_norm + 1e-9)
-    tag_similarity_map = dict(zip(all_tags, similarities.tolist()))
 
-    return {
-        feedback.id: max(
-            (tag_similarity_map.get(tag, 0) for tag in (feedback.data or {}).get('tags', [])),
-            default=0,
+    # Vectorized per-feedback max over its tags
+    tag_index = {tag: idx for idx, tag in enumerate(all_tags)}
+    feedback_idx = []
+    tag_idx = []
+    for idx, feedback in enumerate(feedbacks):
+        for tag in (feedback.data or {}).get('tags', []):
+            feedback_idx.append(idx)
+            tag_idx.append(tag_index[tag])
+
+    scores = np.full(len(feedbacks), -np.inf)
+    np.maximum.at(scores, np.asarray(feedback_idx, dtype=np.int64), similarities[np.asarray(tag_idx, dtype=np.int64)])
+    scores[np.isneginf(scores)] = 0
+
+    return {feedback.id: float(score) for feedback, score in zip(feedbacks, scores)}
+
+
+async def recompute_leaderboard() -> list[LeaderboardRatingModel]:
+    """Replay the full feedback history and replace the materialized leaderboard."""
+    feedbacks = await Feedbacks.get_feedbacks_for_leaderboard()
+    elo_stats, tag_counts = await run_in_threadpool(lambda: (_calculate_elo(feedbacks), _count_tags(feedbacks)))
+
+    ratings = [
+        LeaderboardRatingModel(
+            model_id=model_id,
+            rating=elo_stats.get(model_id, {}).get('rating', 1000.0),
+            won=elo_stats.get(model_id, {}).get('won', 0),
+            lost=elo_stats.get(model_id, {}).get('lost', 0),
+            tags=tag_counts.get(model_id),
         )
-        for feedback in feedbacks
-    }
+        for model_id in elo_stats.keys() | tag_counts.keys()
+    ]
+    await Leaderboard.replace_ratings(ratings)
+    return ratings
+
+
+async def _apply_feedback_to_leaderboard(feedback: FeedbackModel) -> None:
+    """Incrementally fold a newly created feedback into the materialized leaderboard."""
+    data = feedback.data or {}
+    winner_id = data.get('model_id')
+    if not winner_id:
+        return
+
+    def update(model_stats: dict) -> None:
+        _apply_elo(model_stats, data)
+        tags = model_stats[winner_id]['tags']
+        for tag in data.get('tags', []):
+            tags[tag] = tags.get(tag, 0) + 1
+
+    try:
+        await Leaderboard.update_ratings([winner_id, *(data.get('sibling_model_ids') or [])], update)
+
+        # A replay in progress may have read the feedback table before this
+        # feedback was saved, and its swap would drop this update; run it again.
+        state = await JobStates.get(LEADERBOARD_JOB)
+        if state and state.lease_owner and (state.lease_until or 0) > time.time():
+            await _schedule_leaderboard_recompute()
+    except Exception as e:
+        log.warning(f'Incremental leaderboard update failed, scheduling recompute: {e}')
+        await _schedule_leaderboard_recompute()
+
+
+def _get_leaderboard_recompute_event() -> asyncio.Event:
+    global _leaderboard_recompute_event
+    if _leaderboard_recompute_event is None:
+        _leaderboard_recompute_event = asyncio.Event()
+    return _leaderboard_recompute_event
+
+
+async def _schedule_leaderboard_recompute() -> None:
+    """Ask for a recompute; it is recorded in ``job_state`` so whichever instance holds the lease runs it."""
+    try:
+        await JobStates.request_run(LEADERBOARD_JOB)
+    except Exception as e:
+        log.warning(f'Failed to request a leaderboard recompute: {e}')
+    _get_leaderboard_recompute_event().set()
+
+
+async def _recompute_leaderboard_if_due() -> None:
+    state = await JobStates.get(LEADERBOARD_JOB)
+    computed_at = state.data.get('computed_at', 0) if state else 0
+    requested_at = (state.requested_at or 0) if state else 0
+    if requested_at < computed_at and computed_at + LEADERBOARD_RECOMPUTE_INTERVAL > time.time():
+        return
+    await _recompute_leaderboard_with_lease()
+
+
+async def _recompute_leaderboard_with_lease() -> Optional[list[LeaderboardRatingModel]]:
+    """Replay the leaderboard under the job lease; ``None`` if another instance holds it."""
+    if not await JobStates.acquire_lease(LEADERBOARD_JOB, INSTANCE_ID, LEADERBOARD_RECOMPUTE_LEASE):
+        return None
+
+    try:
+        # Recorded as the start time, so a request made while the replay runs keeps it due.
+        started = int(time.time())
+        ratings = await recompute_leaderboard()
+        await JobStates.set_data(LEADERBOARD_JOB, {'computed_at': started})
+        return ratings
+    finally:
+        await JobStates.release_lease(LEADERBOARD_JOB, INSTANCE_ID)
+
+
+async def leaderboard_recompute_loop() -> None:
+    """
+    Keep the materialized leaderboard consistent with the feedback table.
+
+    Elo updates cannot be undone exactly, so edits and deletes request a
+    (debounced) full replay. A periodic replay also heals incremental updates
+    that failed. Requests and the last replay are recorded in ``job_state``,
+    and a lease there lets one instance at a time replay, whichever instance
+    the request came from.
+    """
+    event = _get_leaderboard_recompute_event()
+    while True:
+        try:
+            await _recompute_leaderboard_if_due()
+        except Exception as e:
+            log.exception(f'Leaderboard recompute failed: {e}')
+
+        try:
+            await asyncio.wait_for(event.wait(), timeout=LEADERBOARD_RECOMPUTE_POLL_INTERVAL)
+            # Coalesce bursts of edits into a single replay.
+            await asyncio.sleep(LEADERBOARD_RECOMPUTE_DEBOUNCE)
+        except asyncio.TimeoutError:
+            pass
+        event.clear()
 
 
 class LeaderboardEntry(BaseModel):
@@ -220,14 +396,23 @@ async def get_leaderboard(
     db: AsyncSession = Depends(get_async_session),
 ):
     """Get model leaderboard with Elo ratings. Query filters by tag similarity."""
-    feedbacks = await Feedbacks.get_feedbacks_for_leaderboard(db=db)
+    ratings = await Leaderboard.get_ratings(db=db)
+    if not ratings:
+        # Another instance holding the lease is already filling the table.
+        ratings = await _recompute_leaderboard_with_lease() or []
 
-    similarities = None
     if query and query.strip():
-        similarities = await run_in_threadpool(_compute_similarities, feedbacks, query.strip())
+        # Query weights depend on every feedback, so those ratings are replayed;
+        # tag counts still come from the materialized table.
+        feedbacks = await Feedbacks.get_feedbacks_for_leaderboard(db=db)
+        similarities = await _compute_similarities(feedbacks, query.strip())
+        elo_stats = await run_in_threadpool(_calculate_elo, feedbacks, similarities)
+    else:
+        elo_stats = {
+            rating.model_id: {'rating': rating.rating, 'won': rating.won, 'lost': rating.lost} for rating in ratings
+        }
 
-    elo_stats = _calculate_elo(feedbacks, similarities)
-    tags_by_model = _get_top_tags(feedbacks)
+    tags_by_model = {rating.model_id: rating.tags for rating in ratings}
 
     entries = sorted(
         [
@@ -237,9 +422,10 @@ async def get_leaderboard(
                 won=s['won'],
                 lost=s['lost'],
                 count=s['won'] + s['lost'],
-                top_tags=tags_by_model.get(mid, []),
+                top_tags=_top_tags(tags_by_model.get(mid)),
             )
             for mid, s in elo_stats.items()
+            if s['won'] + s['lost'] > 0
         ],
         key=lambda e: e.rating,
         reverse=True,
@@ -325,6 +511,7 @@ async def delete_all_feedbacks(
 ):
     success = await Feedbacks.delete_all_feedbacks(db=db)
     if success:
+        await Leaderboard.delete_all_ratings(db=db)
         await publish_event(
             request,
             EVENTS.FEEDBACK_DELETED_ALL,
@@ -369,6 +556,7 @@ async def delete_feedbacks(
 ):
     success = await Feedbacks.delete_feedbacks_by_user_id(user.id, db=db)
     if success:
+        await _schedule_leaderboard_recompute()
         await publish_event(
             request,
             EVENTS.FEEDBACK_DELETED_ALL,
@@ -419,6 +607,8 @@ async def create_feedback(
             detail=ERROR_MESSAGES.DEFAULT(),
         )
 
+    await _apply_feedback_to_leaderboard(feedback)
+
     await publish_event(
         request,
         EVENTS.FEEDBACK_CREATED,
@@ -458,6 +648,8 @@ async def update_feedback_by_id(
     if not feedback:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND)
 
+    await _schedule_leaderboard_recompute()
+
     await publish_event(
         request,
         EVENTS.FEEDBACK_UPDATED,
@@ -483,6 +675,8 @@ async def delete_feedback_by_id(
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND)
 
+    await _schedule_leaderboard_recompute()
+
     await publish_event(
         request,
         EVENTS.FEEDBACK_DELETED,
@@ -4,7 +4,9 @@ import hashlib
 import json
 import logging
 import os
+import time
 import uuid
+from contextlib import aclosing
 from pathlib import Path
 from typing import Optional
 from urllib.parse import quote
@@ -30,6 +32,7 @@ from open_webui.models.access_grants import AccessGrants
 from open_webui.models.channels import Channels
 from open_webui.models.config import Config
 from open_webui.models.chats import Chats
+from open_webui.models.file_jobs import FileJobs
 from open_webui.models.files import (
     FileForm,
     FileListResponse,
@@ -45,7 +48,10 @@ from open_webui.routers.audio import transcribe
 from open_webui.routers.retrieval import ProcessFileForm, process_file
 from open_webui.storage.provider import Storage
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.file_jobs import ENABLE_FILE_JOB_QUEUE, enqueue_file_job, file_job_status
+from open_webui.utils.file_status import FILE_STATUS_NOTIFIER, SSE_HEARTBEAT, file_status_keys
 from open_webui.utils.misc import strict_match_mime_type
+from open_webui.utils.vector_deletions import enqueue_collection_drops, enqueue_vector_deletion
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -110,17 +116,18 @@ def _cleanup_local_cache(file_path: str) -> None:
 
 async def process_uploaded_file(
     request,
-    file,
+    content_type,
     file_path,
     file_item,
     file_metadata,
     user,
     db: Optional[AsyncSession] = None,
+    raise_errors: bool = False,
 ):
+    # raise_errors: leave failures to the caller (the file job worker retries them).
     async def _process_handler(db_session):
+        nonlocal content_type
         try:
-            content_type = file.content_type
-
             # Detect mis-labeled text files (e.g. .ts → video/mp2t)
             if content_type and content_type.startswith(('image/', 'video/')):
                 if _is_text_file(file_path):
@@ -167,7 +174,7 @@ async def process_uploaded_file(
             else:
                 # Documents, or any file when an external engine is configured
                 if not content_type:
-                    log.info(f'File type {file.content_type} is not provided, but trying to process anyway')
+                    log.info(f'File type {content_type} is not provided, but trying to process anyway')
                 await process_file(
                     request,
                     ProcessFileForm(file_id=file_item.id),
@@ -219,6 +226,8 @@ async def process_uploaded_file(
 
         except Exception as e:
             log.error(f'Error processing file: {file_item.id}')
+            if raise_errors:
+                raise
             await Files.update_file_data_by_id(
                 file_item.id,
                 {
@@ -394,11 +403,20 @@ async def upload_file_handler(
                 await Channels.add_file_to_channel_by_id(channel.id, file_item.id, user.id, db=db)
 
         if process:
-            if background_tasks and process_in_background:
+            if background_tasks and process_in_background and ENABLE_FILE_JOB_QUEUE:
+                await enqueue_file_job(
+                    request,
+                    file_item.id,
+                    user.id,
+                    file_item.meta.get('content_type'),
+                    file_metadata,
+                )
+                return {'status': True, **file_item.model_dump()}
+            elif background_tasks and process_in_background:
                 background_tasks.add_task(
                     process_uploaded_file,
                     request,
-                    file,
+                    file.content_type,
                     file_path,
                     file_item,
                     file_metadata,
@@ -408,7 +426,7 @@ async def upload_file_handler(
             else:
                 await process_uploaded_file(
                     request,
-                    file,
+                    file.content_type,
                     file_path,
                     file_item,
                     file_metadata,
@@ -599,37 +617,56 @@ async def get_file_process_status(
 
             async def event_stream(file_id):
                 # NOTE: We intentionally do NOT capture the request's db session here.
-                # Each poll creates its own short-lived session to avoid holding a
-                # connection for hours. A WebSocket push would be more efficient.
-                for _ in range(MAX_FILE_PROCESSING_DURATION):
-                    file_item = await Files.get_file_by_id(file_id)  # Creates own session
-                    if file_item:
-                        data = file_item.model_dump().get('data', {})
-                        status = data.get('status')
-
-                        if status:
-                            event = {'status': status}
-                            if status == 'failed':
-                                event['error'] = data.get('error')
-
-                            yield f'data: {json.dumps(event)}\n\n'
-                            if status in ('completed', 'failed'):
+                # Each read creates its own short-lived session to avoid holding a
+                # connection for hours; reads only happen when the status changes.
+                deadline = time.monotonic() + MAX_FILE_PROCESSING_DURATION
+                last_event = None
+                async with aclosing(FILE_STATUS_NOTIFIER.watch(*file_status_keys(file_id))) as reads:
+                    async for read in reads:
+                        if time.monotonic() > deadline:
+                            break
+                        if not read:
+                            yield SSE_HEARTBEAT
+                            continue
+
+                        file_item = await Files.get_file_by_id(file_id)  # Creates own session
+                        if file_item:
+                            data = file_item.model_dump().get('data', {})
+                            file_status = data.get('status')
+                            # A queued or running job, including one about to retry a failure, keeps the file pending.
+                            job = await FileJobs.get_by_file_id(file_id) if file_status in ('pending', 'failed') else None
+                            if job:
+                                file_status = 'pending'
+
+                            if file_status:
+                                event = {'status': file_status}
+                                if job:
+                                    event['job'] = file_job_status(job)
+                                elif file_status == 'failed':
+                                    event['error'] = data.get('error')
+
+                                if event != last_event:
+                                    yield f'data: {json.dumps(event)}\n\n'
+                                    last_event = event
+                                if file_status in ('completed', 'failed'):
+                                    break
+                            else:
+                                # Legacy
                                 break
                         else:
-                            # Legacy
+                            yield f'data: {json.dumps({"status": "not_found"})}\n\n'
                             break
-                    else:
-                        yield f'data: {json.dumps({"status": "not_found"})}\n\n'
-                        break
-
-                    await asyncio.sleep(1)
 
             return StreamingResponse(
                 event_stream(file.id),
                 media_type='text/event-stream',
             )
         else:
-            return {'status': file.data.get('status', 'pending')}
+            file_status = file.data.get('status', 'pending')
+            job = await FileJobs.get_by_file_id(file.id, db=db) if file_status in ('pending', 'failed') else None
+            if job:
+                return {'status': 'pending', 'job': file_job_status(job)}
+            return {'status': file_status}
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -985,19 +1022,15 @@ async def delete_file_by_id(
         for knowledge in knowledges:
             # Remove KB-file relationship
             await Knowledges.remove_file_from_knowledge_by_id(knowledge.id, id, db=db)
-            # Clean KB embeddings (same logic as /knowledge/{id}/file/remove)
-            try:
-                await ASYNC_VECTOR_DB_CLIENT.delete(collection_name=knowledge.id, filter={'file_id': id})
-                if file.hash:
-                    await ASYNC_VECTOR_DB_CLIENT.delete(collection_name=knowledge.id, filter={'hash': file.hash})
-            except Exception as e:
-                log.debug(f'KB embedding cleanup for {knowledge.id}: {e}')
+            # Hide the KB embeddings now; they are deleted in the background
+            # (same logic as /knowledge/{id}/file/remove)
+            await enqueue_vector_deletion(knowledge.id, {id: file.hash})
 
         result = await Files.delete_file_by_id(id, db=db)
         if result:
             try:
                 await asyncio.to_thread(Storage.delete_file, file.path)
-                await ASYNC_VECTOR_DB_CLIENT.delete(collection_name=f'file-{id}')
+                await enqueue_collection_drops([f'file-{id}'])
             except Exception as e:
                 log.exception(e)
                 log.error('Error deleting files')
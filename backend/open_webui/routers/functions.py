@@ -11,7 +11,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from open_webui.config import CACHE_DIR
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import AIOHTTP_CLIENT_SESSION_SSL, AIOHTTP_CLIENT_TIMEOUT
-from open_webui.events import EVENTS, publish_event
+from open_webui.events import EVENTS, invalidate_event_sink_cache, publish_event
 from open_webui.internal.db import get_async_session
 from open_webui.models.functions import (
     FunctionForm,
@@ -216,6 +216,7 @@ async def create_new_function(
             FUNCTIONS[form_data.id] = function_module
 
             function = await Functions.insert_new_function(user.id, function_type, form_data, db=db)
+            invalidate_event_sink_cache()
 
             function_cache_dir = CACHE_DIR / 'functions' / form_data.id
             function_cache_dir.mkdir(parents=True, exist_ok=True)
@@ -285,6 +286,7 @@ async def toggle_function_by_id(
     function = await Functions.get_function_by_id(id, db=db)
     if function:
         function = await Functions.update_function_by_id(id, {'is_active': not function.is_active}, db=db)
+        invalidate_event_sink_cache()
 
         if function:
             await publish_event(
@@ -370,6 +372,7 @@ async def update_function_by_id(
         log.debug(updated)
 
         function = await Functions.update_function_by_id(id, updated, db=db)
+        invalidate_event_sink_cache()
 
         if function_type == 'filter' and getattr(function_module, 'toggle', None):
             await Functions.update_function_metadata_by_id(id, {'toggle': True}, db=db)
@@ -411,6 +414,7 @@ async def delete_function_by_id(
     db: AsyncSession = Depends(get_async_session),
 ):
     result = await Functions.delete_function_by_id(id, db=db)
+    invalidate_event_sink_cache()
 
     if result:
         FUNCTIONS = get_functions_cache(request)
@@ -507,6 +511,7 @@ async def update_function_valves_by_id(
 
                 valves_dict = valves.model_dump(exclude_unset=True)
                 await Functions.update_function_valves_by_id(id, valves_dict, db=db)
+                invalidate_event_sink_cache()
                 await publish_event(
                     request,
                     EVENTS.FUNCTION_VALVES_UPDATED,
@@ -7,6 +7,7 @@ import logging
 import time
 import uuid
 import zipfile
+from contextlib import aclosing
 from typing import List, Optional
 from urllib.parse import quote
 
@@ -30,6 +31,7 @@ from open_webui.models.knowledge import (
     KnowledgeUserResponse,
 )
 from open_webui.models.models import ModelForm, Models
+from open_webui.models.vector_tombstones import VectorTombstones
 from open_webui.retrieval.vector.async_client import ASYNC_VECTOR_DB_CLIENT
 from open_webui.retrieval.external import retrieve_external_knowledge, retrieve_external_knowledge_for_connection
 from open_webui.routers.retrieval import (
@@ -42,6 +44,8 @@ from open_webui.storage.provider import Storage
 from open_webui.utils.access_control import filter_allowed_access_grants, has_permission
 from open_webui.utils.access_control.files import has_access_to_file
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.file_status import FILE_STATUS_NOTIFIER, SSE_HEARTBEAT, knowledge_status_key
+from open_webui.utils.vector_deletions import enqueue_collection_drops, enqueue_vector_deletion
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -1236,8 +1240,9 @@ async def get_pending_knowledge_files(
     list endpoint.  This endpoint exposes those in-flight files so the frontend
     can show them with a processing indicator even after a page reload.
 
-    When ``stream=true``, returns an SSE stream that polls every 3 seconds
-    and emits the current pending file list.  Closes when no files remain.
+    When ``stream=true``, returns an SSE stream that emits the current pending
+    file list, and again whenever a file's processing status changes.  Closes
+    when no files remain.
     """
     knowledge = await Knowledges.get_knowledge_by_id(id=id, db=db)
     if not knowledge:
@@ -1266,14 +1271,24 @@ async def get_pending_knowledge_files(
         return await Files.get_pending_files_for_knowledge(id, db=db)
 
     async def event_stream(knowledge_id: str):
-        MAX_POLL_DURATION = 3600  # 1 hour max
-        for _ in range(MAX_POLL_DURATION // 3):
-            pending = await Files.get_pending_files_for_knowledge(knowledge_id)
-            data = [f.model_dump() for f in pending]
-            yield f'data: {json.dumps(data)}\n\n'
-            if len(pending) == 0:
-                break
-            await asyncio.sleep(3)
+        MAX_STREAM_DURATION = 3600  # 1 hour max
+        deadline = time.monotonic() + MAX_STREAM_DURATION
+        last_data = None
+        async with aclosing(FILE_STATUS_NOTIFIER.watch(knowledge_status_key(knowledge_id))) as reads:
+            async for read in reads:
+                if time.monotonic() > deadline:
+                    break
+                if not read:
+                    yield SSE_HEARTBEAT
+                    continue
+
+                pending = await Files.get_pending_files_for_knowledge(knowledge_id)
+                data = [f.model_dump() for f in pending]
+                if data != last_data:
+                    yield f'data: {json.dumps(data)}\n\n'
+                    last_data = data
+                if len(pending) == 0:
+                    break
 
     return StreamingResponse(
         event_stream(id),
@@ -1596,31 +1611,14 @@ async def remove_file_from_knowledge_by_id(
 
     await Knowledges.remove_file_from_knowledge_by_id(knowledge_id=id, file_id=form_data.file_id, db=db)
 
-    # Remove content from the vector database
-    try:
-        await ASYNC_VECTOR_DB_CLIENT.delete(
-            collection_name=knowledge.id, filter={'file_id': form_data.file_id}
-        )  # Remove by file_id first
-
-        await ASYNC_VECTOR_DB_CLIENT.delete(
-            collection_name=knowledge.id, filter={'hash': file.hash}
-        )  # Remove by hash as well in case of duplicates
-    except Exception as e:
-        log.debug('This was most likely caused by bypassing embedding processing')
-        log.debug(e)
-        pass
+    # Hide the file's content (by file_id, and by hash in case of duplicates) from
+    # retrieval now; the vector DB deletes it in the background.
+    await enqueue_vector_deletion(knowledge.id, {form_data.file_id: file.hash})
 
     # Anyone with write permission or higher can delete files
     if delete_file and (file.user_id == user.id or user.role == 'admin'):
-        try:
-            # Remove the file's collection from vector database
-            file_collection = f'file-{form_data.file_id}'
-            if await ASYNC_VECTOR_DB_CLIENT.has_collection(collection_name=file_collection):
-                await ASYNC_VECTOR_DB_CLIENT.delete_collection(collection_name=file_collection)
-        except Exception as e:
-            log.debug('This was most likely caused by bypassing embedding processing')
-            log.debug(e)
-            pass
+        # Drop the file's own collection as well
+        await enqueue_collection_drops([f'file-{form_data.file_id}'])
 
         # Delete file from database
         await Files.delete_file_by_id(form_data.file_id, db=db)
@@ -1931,28 +1929,17 @@ async def sync_knowledge_cleanup(
     await _verify_knowledge_write_access(id, user, db)
 
     # ── Remove deleted files ──
-    for file_id in form_data.file_ids:
-        file = await Files.get_file_by_id(file_id, db=db)
-        if not file:
-            continue
+    files = await Files.get_files_by_ids(form_data.file_ids, db=db)
+    for file in files:
+        await Knowledges.remove_file_from_knowledge_by_id(id, file.id, db=db)
 
-        await Knowledges.remove_file_from_knowledge_by_id(id, file_id, db=db)
-
-        try:
-            await ASYNC_VECTOR_DB_CLIENT.delete(collection_name=id, filter={'file_id': file_id})
-            await ASYNC_VECTOR_DB_CLIENT.delete(collection_name=id, filter={'hash': file.hash})
-        except Exception:
-            pass
-
-        try:
-            collection_name = f'file-{file_id}'
-            if await ASYNC_VECTOR_DB_CLIENT.has_collection(collection_name):
-                await ASYNC_VECTOR_DB_CLIENT.delete_collection(collection_name)
-        except Exception:
-            pass
+    # Their vectors are hidden from retrieval now and deleted in batches in the background.
+    await enqueue_vector_deletion(id, {file.id: file.hash for file in files})
+    await enqueue_collection_drops([f'file-{file.id}' for file in files])
 
+    for file in files:
         if file.user_id == user.id or user.role == 'admin':
-            await Files.delete_file_by_id(file_id, db=db)
+            await Files.delete_file_by_id(file.id, db=db)
             try:
                 await asyncio.to_thread(Storage.delete_file, file.path)
             except Exception:
@@ -1965,6 +1952,25 @@ async def sync_knowledge_cleanup(
     return {'status': True}
 
 
+############################
+# GetKnowledgeFileDeletions
+############################
+
+
+@router.get('/{id}/files/deleting')
+async def get_knowledge_file_deletions(
+    id: str,
+    user=Depends(get_verified_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Progress of removed files' vectors being deleted in the background: the
+    number of files still waiting (they are already hidden from retrieval).
+    """
+    await _verify_knowledge_write_access(id, user, db)
+    return {'pending': await VectorTombstones.count_by_collection_name(id, db=db)}
+
+
 ############################
 # AddFilesToKnowledge
 ############################
@@ -20,9 +20,9 @@ from open_webui.utils.memory import (
     list_memory_path_groups,
     memory_vector_text,
     read_memory_path_rows,
-    search_memory_rows,
     validate_memory_operations,
 )
+from open_webui.utils.memory_index import get_memory_index
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -280,8 +280,8 @@ async def query_memory(
     # which makes external embedding API calls (1-5+ seconds).
     await check_memories_permission(user)
 
-    memories = await Memories.get_memories_by_user_id(user.id)
-    if not memories:
+    index = await get_memory_index(user.id)
+    if not index.memories:
         raise HTTPException(status_code=404, detail='No memories found for user')
 
     vector = await request.app.state.EMBEDDING_FUNCTION(form_data.content, RAG_EMBEDDING_QUERY_PREFIX, user=user)
@@ -334,9 +334,8 @@ async def search_memories(
 ):
     await check_memories_permission(user)
 
-    memories = await Memories.get_memories_by_user_id(user.id)
-    return search_memory_rows(
-        memories,
+    index = await get_memory_index(user.id)
+    return index.search(
         query=form_data.query,
         path=form_data.path,
         memory_id=form_data.memory_id,
@@ -61,8 +61,16 @@ from open_webui.internal.db import get_async_db, get_async_session
 from open_webui.models.files import FileModel, Files, FileUpdateForm
 from open_webui.models.knowledge import Knowledges
 from open_webui.models.config import Config
+from open_webui.retrieval.batching import get_batcher_stats
+from open_webui.retrieval.model_server import (
+    RAG_MODEL_SERVER,
+    ModelServerCrossEncoder,
+    ModelServerSentenceTransformer,
+)
+from open_webui.retrieval.rerank_cache import RERANK_SCORE_CACHE
 
 # Document loaders
+from open_webui.retrieval.loaders.cache import EXTRACTION_CACHE, aload_with_cache
 from open_webui.retrieval.loaders.youtube import YoutubeLoader
 from open_webui.retrieval.utils import (
     build_loader_from_config,
@@ -79,10 +87,13 @@ from open_webui.retrieval.utils import (
 )
 from open_webui.retrieval.vector.async_client import ASYNC_VECTOR_DB_CLIENT
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.ephemeral import EPHEMERAL_INDEX_AVAILABLE, EPHEMERAL_VECTOR_DB
+from open_webui.retrieval.vector.main import VectorDBBase
 from open_webui.retrieval.vector.utils import filter_metadata
 from open_webui.retrieval.web.azure import search_azure
 from open_webui.retrieval.web.bing import search_bing
 from open_webui.retrieval.web.bocha import search_bocha
+from open_webui.retrieval.web.cache import WEB_SEARCH_CACHE
 from open_webui.retrieval.web.brave import search_brave
 from open_webui.retrieval.web.brave_llm_context import search_brave_llm_context
 from open_webui.retrieval.web.duckduckgo import search_duckduckgo
@@ -119,9 +130,15 @@ from open_webui.utils.access_control import has_permission
 from open_webui.utils.access_control.files import has_access_to_file
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.misc import (
+    calculate_sha256,
     calculate_sha256_string,
     sanitize_text_for_db,
 )
+from open_webui.utils.vector_deletions import (
+    apply_vector_tombstones,
+    discard_vector_tombstones,
+    load_vector_tombstones,
+)
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -142,7 +159,12 @@ def get_ef(
     auto_update: bool = RAG_EMBEDDING_MODEL_AUTO_UPDATE,
 ):
     ef = None
-    if embedding_model and engine == '':
+    if embedding_model and engine == '' and RAG_MODEL_SERVER:
+        try:
+            ef = ModelServerSentenceTransformer(embedding_model, auto_update)
+        except Exception as e:
+            log.error(f'Error loading SentenceTransformer in the model server: {e}')
+    elif embedding_model and engine == '':
         from sentence_transformers import SentenceTransformer
 
         try:
@@ -197,6 +219,12 @@ def get_rf(
                 except Exception as e:
                     log.error(f'ExternalReranking: {e}')
                     raise Exception(ERROR_MESSAGES.DEFAULT(e, 'Error loading reranking model'))
+            elif RAG_MODEL_SERVER:
+                try:
+                    rf = ModelServerCrossEncoder(reranking_model, auto_update)
+                except Exception as e:
+                    log.error(f'CrossEncoder: {e}')
+                    raise Exception(ERROR_MESSAGES.DEFAULT(e, 'CrossEncoder error'))
             else:
                 import sentence_transformers
                 import torch
@@ -285,11 +313,13 @@ RETRIEVAL_CONFIG_KEYS = {
     'ENABLE_GOOGLE_DRIVE_INTEGRATION': 'google_drive.enable',
     'ENABLE_MARKDOWN_HEADER_TEXT_SPLITTER': 'rag.enable_markdown_header_text_splitter',
     'ENABLE_ONEDRIVE_INTEGRATION': 'onedrive.enable',
+    'ENABLE_RAG_EXTRACTION_CACHE': 'rag.extraction_cache.enable',
     'ENABLE_RAG_HYBRID_SEARCH': 'rag.enable_hybrid_search',
     'ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS': 'rag.enable_hybrid_search_enriched_texts',
     'ENABLE_WEB_LOADER_SSL_VERIFICATION': 'web.loader.ssl_verification',
     'ENABLE_WEB_SEARCH': 'web.search.enable',
     'ENABLE_WEB_SEARCH_CONFIRMATION': 'web.search.confirmation.enable',
+    'ENABLE_WEB_SEARCH_EPHEMERAL_INDEX': 'web.search.ephemeral_index.enable',
     'WEB_SEARCH_CONFIRMATION_CONTENT': 'web.search.confirmation.content',
     'EXA_API_KEY': 'web.search.exa_api_key',
     'EXTERNAL_DOCUMENT_LOADER_API_KEY': 'rag.external_document_loader_api_key',
@@ -349,6 +379,7 @@ RETRIEVAL_CONFIG_KEYS = {
     'RAG_EXTERNAL_RERANKER_API_KEY': 'rag.external_reranker_api_key',
     'RAG_EXTERNAL_RERANKER_TIMEOUT': 'rag.external_reranker_timeout',
     'RAG_EXTERNAL_RERANKER_URL': 'rag.external_reranker_url',
+    'RAG_EXTRACTION_CACHE_MAX_SIZE': 'rag.extraction_cache.max_size',
     'RAG_FULL_CONTEXT': 'rag.full_context',
     'RAG_OLLAMA_API_KEY': 'rag.ollama.api_key',
     'RAG_OLLAMA_BASE_URL': 'rag.ollama.base_url',
@@ -388,6 +419,7 @@ RETRIEVAL_CONFIG_KEYS = {
     'WEB_LOADER_TIMEOUT': 'web.loader.timeout',
     'WEB_SEARCH_CONCURRENT_REQUESTS': 'web.search.concurrent_requests',
     'WEB_SEARCH_DOMAIN_FILTER_LIST': 'web.search.domain.filter_list',
+    'WEB_SEARCH_EPHEMERAL_INDEX_TTL': 'web.search.ephemeral_index.ttl',
     'WEB_SEARCH_ENGINE': 'web.search.engine',
     'WEB_SEARCH_RESULT_COUNT': 'web.search.result_count',
     'WEB_SEARCH_TRUST_ENV': 'web.search.trust_env',
@@ -628,6 +660,8 @@ async def get_rag_config(request: Request, user=Depends(get_admin_user)):
         'CONTENT_EXTRACTION_ENGINE': config.CONTENT_EXTRACTION_ENGINE,
         'PDF_EXTRACT_IMAGES': config.PDF_EXTRACT_IMAGES,
         'PDF_LOADER_MODE': config.PDF_LOADER_MODE,
+        'ENABLE_RAG_EXTRACTION_CACHE': config.ENABLE_RAG_EXTRACTION_CACHE,
+        'RAG_EXTRACTION_CACHE_MAX_SIZE': config.RAG_EXTRACTION_CACHE_MAX_SIZE,
         'DATALAB_MARKER_API_KEY': config.DATALAB_MARKER_API_KEY,
         'DATALAB_MARKER_API_BASE_URL': config.DATALAB_MARKER_API_BASE_URL,
         'DATALAB_MARKER_ADDITIONAL_CONFIG': config.DATALAB_MARKER_ADDITIONAL_CONFIG,
@@ -698,6 +732,8 @@ async def get_rag_config(request: Request, user=Depends(get_admin_user)):
             'WEB_SEARCH_DOMAIN_FILTER_LIST': config.WEB_SEARCH_DOMAIN_FILTER_LIST,
             'BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL': config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL,
             'BYPASS_WEB_SEARCH_WEB_LOADER': config.BYPASS_WEB_SEARCH_WEB_LOADER,
+            'ENABLE_WEB_SEARCH_EPHEMERAL_INDEX': config.ENABLE_WEB_SEARCH_EPHEMERAL_INDEX,
+            'WEB_SEARCH_EPHEMERAL_INDEX_TTL': config.WEB_SEARCH_EPHEMERAL_INDEX_TTL,
             'OLLAMA_CLOUD_WEB_SEARCH_API_KEY': config.OLLAMA_CLOUD_WEB_SEARCH_API_KEY,
             'SEARXNG_QUERY_URL': config.SEARXNG_QUERY_URL,
             'SEARXNG_LANGUAGE': config.SEARXNG_LANGUAGE,
@@ -776,6 +812,8 @@ class WebConfig(BaseModel):
     WEB_LOADER_CONCURRENT_REQUESTS: int | None = None
     BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL: bool | None = None
     BYPASS_WEB_SEARCH_WEB_LOADER: bool | None = None
+    ENABLE_WEB_SEARCH_EPHEMERAL_INDEX: bool | None = None
+    WEB_SEARCH_EPHEMERAL_INDEX_TTL: int | None = None
     OLLAMA_CLOUD_WEB_SEARCH_API_KEY: str | None = None
     SEARXNG_QUERY_URL: str | None = None
     SEARXNG_LANGUAGE: str | None = None
@@ -857,6 +895,8 @@ class ConfigForm(BaseModel):
     CONTENT_EXTRACTION_ENGINE: str | None = None
     PDF_EXTRACT_IMAGES: bool | None = None
     PDF_LOADER_MODE: str | None = None
+    ENABLE_RAG_EXTRACTION_CACHE: bool | None = None
+    RAG_EXTRACTION_CACHE_MAX_SIZE: int | None = None
 
     DATALAB_MARKER_API_KEY: str | None = None
     DATALAB_MARKER_API_BASE_URL: str | None = None
@@ -973,6 +1013,16 @@ async def update_rag_config(request: Request, form_data: ConfigForm, user=Depend
     config.PDF_LOADER_MODE = (
         form_data.PDF_LOADER_MODE if form_data.PDF_LOADER_MODE is not None else config.PDF_LOADER_MODE
     )
+    config.ENABLE_RAG_EXTRACTION_CACHE = (
+        form_data.ENABLE_RAG_EXTRACTION_CACHE
+        if form_data.ENABLE_RAG_EXTRACTION_CACHE is not None
+        else config.ENABLE_RAG_EXTRACTION_CACHE
+    )
+    config.RAG_EXTRACTION_CACHE_MAX_SIZE = (
+        form_data.RAG_EXTRACTION_CACHE_MAX_SIZE
+        if form_data.RAG_EXTRACTION_CACHE_MAX_SIZE is not None
+        else config.RAG_EXTRACTION_CACHE_MAX_SIZE
+    )
     config.DATALAB_MARKER_API_KEY = (
         form_data.DATALAB_MARKER_API_KEY
         if form_data.DATALAB_MARKER_API_KEY is not None
@@ -1244,6 +1294,16 @@ async def update_rag_config(request: Request, form_data: ConfigForm, user=Depend
         config.WEB_SEARCH_DOMAIN_FILTER_LIST = form_data.web.WEB_SEARCH_DOMAIN_FILTER_LIST
         config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL = form_data.web.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL
         config.BYPASS_WEB_SEARCH_WEB_LOADER = form_data.web.BYPASS_WEB_SEARCH_WEB_LOADER
+        config.ENABLE_WEB_SEARCH_EPHEMERAL_INDEX = (
+            form_data.web.ENABLE_WEB_SEARCH_EPHEMERAL_INDEX
+            if form_data.web.ENABLE_WEB_SEARCH_EPHEMERAL_INDEX is not None
+            else config.ENABLE_WEB_SEARCH_EPHEMERAL_INDEX
+        )
+        config.WEB_SEARCH_EPHEMERAL_INDEX_TTL = (
+            form_data.web.WEB_SEARCH_EPHEMERAL_INDEX_TTL
+            if form_data.web.WEB_SEARCH_EPHEMERAL_INDEX_TTL is not None
+            else config.WEB_SEARCH_EPHEMERAL_INDEX_TTL
+        )
         config.OLLAMA_CLOUD_WEB_SEARCH_API_KEY = form_data.web.OLLAMA_CLOUD_WEB_SEARCH_API_KEY
         config.SEARXNG_QUERY_URL = form_data.web.SEARXNG_QUERY_URL
         config.SEARXNG_LANGUAGE = form_data.web.SEARXNG_LANGUAGE
@@ -1328,6 +1388,8 @@ async def update_rag_config(request: Request, form_data: ConfigForm, user=Depend
         'CONTENT_EXTRACTION_ENGINE': config.CONTENT_EXTRACTION_ENGINE,
         'PDF_EXTRACT_IMAGES': config.PDF_EXTRACT_IMAGES,
         'PDF_LOADER_MODE': config.PDF_LOADER_MODE,
+        'ENABLE_RAG_EXTRACTION_CACHE': config.ENABLE_RAG_EXTRACTION_CACHE,
+        'RAG_EXTRACTION_CACHE_MAX_SIZE': config.RAG_EXTRACTION_CACHE_MAX_SIZE,
         'DATALAB_MARKER_API_KEY': config.DATALAB_MARKER_API_KEY,
         'DATALAB_MARKER_API_BASE_URL': config.DATALAB_MARKER_API_BASE_URL,
         'DATALAB_MARKER_ADDITIONAL_CONFIG': config.DATALAB_MARKER_ADDITIONAL_CONFIG,
@@ -1395,6 +1457,8 @@ async def update_rag_config(request: Request, form_data: ConfigForm, user=Depend
             'WEB_SEARCH_DOMAIN_FILTER_LIST': config.WEB_SEARCH_DOMAIN_FILTER_LIST,
             'BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL': config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL,
             'BYPASS_WEB_SEARCH_WEB_LOADER': config.BYPASS_WEB_SEARCH_WEB_LOADER,
+            'ENABLE_WEB_SEARCH_EPHEMERAL_INDEX': config.ENABLE_WEB_SEARCH_EPHEMERAL_INDEX,
+            'WEB_SEARCH_EPHEMERAL_INDEX_TTL': config.WEB_SEARCH_EPHEMERAL_INDEX_TTL,
             'OLLAMA_CLOUD_WEB_SEARCH_API_KEY': config.OLLAMA_CLOUD_WEB_SEARCH_API_KEY,
             'SEARXNG_QUERY_URL': config.SEARXNG_QUERY_URL,
             'SEARXNG_LANGUAGE': config.SEARXNG_LANGUAGE,
@@ -1601,6 +1665,7 @@ def save_docs_to_vector_db(
     split: bool = True,
     add: bool = False,
     user=None,
+    vector_db_client: VectorDBBase | None = None,
 ) -> bool:
     def _get_docs_info(docs: list[Document]) -> str:
         docs_info = set()
@@ -1620,12 +1685,22 @@ def save_docs_to_vector_db(
 
     log.debug(f'save_docs_to_vector_db: document {_get_docs_info(docs)} {collection_name}')
 
+    if vector_db_client is None:
+        vector_db_client = VECTOR_DB_CLIENT
+
     # Check if entries with the same hash (metadata.hash) already exist
     if metadata and 'hash' in metadata:
-        result = VECTOR_DB_CLIENT.query(
+        result = vector_db_client.query(
             collection_name=collection_name,
             filter={'hash': metadata['hash']},
         )
+        if result is not None:
+            # Chunks of removed files wait for deletion under a tombstone; they are not duplicates.
+            tombstones = asyncio.run_coroutine_threadsafe(
+                load_vector_tombstones([collection_name]),
+                request.app.state.main_loop,
+            ).result()
+            result = apply_vector_tombstones(collection_name, result, tombstones)
 
         if result is not None and result.ids and len(result.ids) > 0:
             existing_doc_ids = result.ids[0]
@@ -1721,11 +1796,11 @@ def save_docs_to_vector_db(
     ]
 
     try:
-        if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+        if vector_db_client.has_collection(collection_name=collection_name):
             log.info(f'collection {collection_name} already exists')
 
             if overwrite:
-                VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                vector_db_client.delete_collection(collection_name=collection_name)
                 log.info(f'deleting existing collection {collection_name}')
             elif add is False:
                 log.info(f'collection {collection_name} already exists, overwrite is False and add is False')
@@ -1788,10 +1863,17 @@ def save_docs_to_vector_db(
         ]
 
         log.info(f'adding to collection {collection_name}')
-        VECTOR_DB_CLIENT.insert(
-            collection_name=collection_name,
-            items=items,
-        )
+        if vector_db_client is VECTOR_DB_CLIENT and ASYNC_VECTOR_DB_CLIENT.has_native_async:
+            # Native async backends (pgvector) bulk-load on their own pool from the main loop
+            asyncio.run_coroutine_threadsafe(
+                ASYNC_VECTOR_DB_CLIENT.insert(collection_name=collection_name, items=items),
+                request.app.state.main_loop,
+            ).result()
+        else:
+            vector_db_client.insert(
+                collection_name=collection_name,
+                items=items,
+            )
 
         log.info(f'added {len(items)} items to collection {collection_name}')
         return True
@@ -1904,7 +1986,16 @@ async def process_file(
                         'file_name': file.filename,
                         'file_content_type': file.meta.get('content_type'),
                     }
-                    docs = await loader.aload(file.filename, file.meta.get('content_type'), file_path)
+                    if loader_config.get('extraction_cache_enabled'):
+                        docs = await aload_with_cache(
+                            loader,
+                            file.filename,
+                            file.meta.get('content_type'),
+                            file_path,
+                            max_size=(loader_config.get('extraction_cache_max_size') or 0) * 1024 * 1024,
+                        )
+                    else:
+                        docs = await loader.aload(file.filename, file.meta.get('content_type'), file_path)
 
                     docs = [
                         Document(
@@ -1965,6 +2056,10 @@ async def process_file(
                     # Note: file is already a Pydantic model (not ORM), so no expunge needed.
                     await db.commit()
 
+                    # A file removed from this collection earlier may still have vectors
+                    # waiting for deletion; delete them now so the new ones are kept.
+                    await discard_vector_tombstones(collection_name, file.id, hash)
+
                     # External embedding API takes time (5-60s+).
                     # Subsequent updates use fresh async sessions.
                     # NOTE: save_docs_to_vector_db is a sync function that
@@ -2166,6 +2261,27 @@ async def process_web(
 
 
 async def search_web(request: Request, engine: str, query: str, user=None) -> list[SearchResult]:
+    """Return results for ``query`` from ``engine``, reusing recent results for identical searches."""
+    config = await get_retrieval_config()
+    key = WEB_SEARCH_CACHE.make_key(
+        engine,
+        query,
+        config.WEB_SEARCH_RESULT_COUNT,
+        config.WEB_SEARCH_DOMAIN_FILTER_LIST,
+    )
+
+    results = WEB_SEARCH_CACHE.get(key)
+    if results is not None:
+        log.debug(f'search_web: cache hit for {engine} query {query!r}')
+        return list(results)
+
+    results = await _search_web(request, engine, query, user)
+    if results:
+        WEB_SEARCH_CACHE.set(key, list(results))
+    return results
+
+
+async def _search_web(request: Request, engine: str, query: str, user=None) -> list[SearchResult]:
     """Dispatch a web search query to the configured engine and return results.
 
     Providers that have been migrated to async (aiohttp) are awaited natively.
@@ -2638,6 +2754,16 @@ async def process_web_search(request: Request, form_data: SearchForm, user=Depen
             # Create a single collection for all documents
             collection_name = f'web-search-{calculate_sha256_string("-".join(form_data.queries))}'[:63]
 
+            # Web results only matter for the current turn, so when enabled they are
+            # indexed in-process (expiring after the TTL) rather than in the vector DB.
+            # The index is per process, so it is skipped when another worker may retrieve.
+            vector_db_client = None
+            if config.ENABLE_WEB_SEARCH_EPHEMERAL_INDEX:
+                if EPHEMERAL_INDEX_AVAILABLE:
+                    vector_db_client = EPHEMERAL_VECTOR_DB.with_ttl(config.WEB_SEARCH_EPHEMERAL_INDEX_TTL)
+                else:
+                    log.debug('Ephemeral web search index skipped: several workers or replicas may retrieve')
+
             try:
                 await run_in_threadpool(
                     save_docs_to_vector_db,
@@ -2647,6 +2773,7 @@ async def process_web_search(request: Request, form_data: SearchForm, user=Depen
                     config,
                     overwrite=True,
                     user=user,
+                    vector_db_client=vector_db_client,
                 )
             except Exception as e:
                 log.debug(f'error saving docs: {e}')
@@ -2935,6 +3062,50 @@ async def reset_upload_dir(request: Request, user=Depends(get_admin_user)) -> bo
     return True
 
 
+@router.get('/extraction/cache')
+async def get_extraction_cache_stats(user=Depends(get_admin_user)):
+    return await asyncio.to_thread(EXTRACTION_CACHE.stats)
+
+
+@router.get('/inference/stats')
+async def get_inference_batching_stats(user=Depends(get_admin_user)):
+    return get_batcher_stats()
+
+
+@router.get('/rerank/cache')
+async def get_rerank_cache_stats(user=Depends(get_admin_user)):
+    return RERANK_SCORE_CACHE.stats()
+
+
+@router.post('/rerank/cache/reset')
+async def reset_rerank_cache(user=Depends(get_admin_user)):
+    return {'status': True, 'removed': await asyncio.to_thread(RERANK_SCORE_CACHE.clear)}
+
+
+class ExtractionCacheResetForm(BaseModel):
+    file_id: str | None = None
+
+
+@router.post('/extraction/cache/reset')
+async def reset_extraction_cache(
+    form_data: ExtractionCacheResetForm,
+    user=Depends(get_admin_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    if form_data.file_id:
+        file = await Files.get_file_by_id(form_data.file_id, db=db)
+        if not file or not file.path:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND)
+
+        file_path = await asyncio.to_thread(Storage.get_file, file.path)
+        file_hash = await asyncio.to_thread(calculate_sha256, file_path, 1024 * 1024)
+        removed = await asyncio.to_thread(EXTRACTION_CACHE.invalidate, file_hash)
+    else:
+        removed = await asyncio.to_thread(EXTRACTION_CACHE.clear)
+
+    return {'status': True, 'removed': removed}
+
+
 if ENV == 'dev':
 
     @router.get('/ef/{text}')
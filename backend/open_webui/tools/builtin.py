@@ -1236,6 +1236,9 @@ async def search_chats(
             limit=count * 3,  # Fetch more for filtering
         )
 
+        # Snippets read only the matching chats' message rows, not their histories.
+        snippet_messages = await Chats.get_search_snippet_messages([chat.id for chat in chats], query.lower())
+
         results = []
         for chat in chats:
             # Skip the current chat to avoid showing it in search results
@@ -1250,10 +1253,10 @@ async def search_chats(
 
             # Find a matching message snippet
             snippet = ''
-            messages = (getattr(chat, 'chat', None) or {}).get('history', {}).get('messages', {})
+            messages = snippet_messages.get(chat.id, [])
             lower_query = query.lower()
 
-            for msg_id, msg in messages.items():
+            for msg in messages:
                 content = msg.get('content', '')
                 if isinstance(content, str) and lower_query in content.lower():
                     idx = content.lower().find(lower_query)
@@ -5,12 +5,23 @@ RRULE helpers, scheduler worker loop, and execution logic.
 Follows the utils/<feature>.py pattern (cf. utils/channels.py, utils/task.py).
 
 The scheduler_worker_loop handles all time-based background work:
-  - Automation execution (claim_due → execute)
+  - Automation execution (claim_due → bounded worker pool)
   - Calendar event alerts (upcoming events → socket + webhook notifications)
 
+Rather than polling, the scheduler sleeps until the earliest next_run_at and
+is woken early whenever an automation is created, updated or toggled (via
+Redis pub/sub when several instances share the database).  Claimed runs are
+executed by a bounded pool with per-user and per-model concurrency limits,
+so a burst of top-of-hour automations neither waits for several poll cycles
+nor fans out unbounded against the model backends.
+
 Environment:
-    SCHEDULER_POLL_INTERVAL             – seconds between polls (default: 10)
-    CALENDAR_ALERT_LOOKAHEAD_MINUTES   – default alert window (default: 5)
+    SCHEDULER_POLL_INTERVAL              – calendar alert interval (default: 10)
+    SCHEDULER_MAX_SLEEP                  – longest idle sleep between DB checks (default: 60)
+    CALENDAR_ALERT_LOOKAHEAD_MINUTES     – default alert window (default: 5)
+    AUTOMATION_MAX_CONCURRENCY           – automations running at once per instance (default: 8)
+    AUTOMATION_MAX_CONCURRENCY_PER_USER  – concurrent runs per owner (default: 2)
+    AUTOMATION_MAX_CONCURRENCY_PER_MODEL – concurrent runs per model (default: 4)
 """
 
 import asyncio
@@ -18,6 +29,7 @@ import logging
 import os
 import random
 import time
+from collections import Counter, deque
 from datetime import datetime, timedelta
 from typing import Optional
 from uuid import uuid4
@@ -27,6 +39,7 @@ from dateutil.rrule import rrulestr
 from fastapi import Request
 from fastapi.security import HTTPAuthorizationCredentials
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import REDIS_KEY_PREFIX
 from open_webui.events import EVENTS, publish_event
 from open_webui.internal.db import get_async_db
 from open_webui.models.automations import AutomationModel, AutomationRuns, Automations
@@ -35,6 +48,7 @@ from open_webui.models.config import Config
 from open_webui.models.users import Users
 from open_webui.utils.auth import create_token
 from open_webui.utils.misc import parse_duration
+from open_webui.utils.redis import listen_forever
 from open_webui.utils.task import prompt_template
 from starlette.datastructures import Headers
 
@@ -42,6 +56,13 @@ log = logging.getLogger(__name__)
 
 SCHEDULER_POLL_INTERVAL = int(os.getenv('SCHEDULER_POLL_INTERVAL', os.getenv('AUTOMATION_POLL_INTERVAL', '10')))
 CALENDAR_ALERT_LOOKAHEAD_MINUTES = int(os.getenv('CALENDAR_ALERT_LOOKAHEAD_MINUTES', '10'))
+SCHEDULER_MAX_SLEEP = max(int(os.getenv('SCHEDULER_MAX_SLEEP', '60')), 1)
+
+AUTOMATION_MAX_CONCURRENCY = max(int(os.getenv('AUTOMATION_MAX_CONCURRENCY', '8')), 1)
+AUTOMATION_MAX_CONCURRENCY_PER_USER = max(int(os.getenv('AUTOMATION_MAX_CONCURRENCY_PER_USER', '2')), 1)
+AUTOMATION_MAX_CONCURRENCY_PER_MODEL = max(int(os.getenv('AUTOMATION_MAX_CONCURRENCY_PER_MODEL', '4')), 1)
+
+SCHEDULER_WAKE_CHANNEL = f'{REDIS_KEY_PREFIX}:scheduler:wake'
 
 
 ####################
@@ -163,6 +184,158 @@ async def automation_worker_loop(app) -> None:
     await scheduler_worker_loop(app)
 
 
+class AutomationScheduler:
+    """Claims due automations and runs them on a bounded, fair worker pool.
+
+    Claimed automations wait in a local queue until a slot is free globally,
+    for their owner and for their model.  New claims are limited to the free
+    capacity, so rows this instance cannot run soon stay due in the database
+    for other instances to pick up.  Rows waiting only on their owner's or
+    model's slots do not use up capacity, so one user's backlog cannot keep
+    this instance from claiming other users' automations.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = AUTOMATION_MAX_CONCURRENCY,
+        max_per_user: int = AUTOMATION_MAX_CONCURRENCY_PER_USER,
+        max_per_model: int = AUTOMATION_MAX_CONCURRENCY_PER_MODEL,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_per_user = max_per_user
+        self.max_per_model = max_per_model
+
+        self.app = None
+        self._wake: Optional[asyncio.Event] = None
+        self._pending: deque = deque()  # (automation, scheduled_ns)
+        self._running: set[asyncio.Task] = set()
+        self._running_by_user: Counter = Counter()
+        self._running_by_model: Counter = Counter()
+
+        self.next_run_at: Optional[int] = None
+        self.claimed = 0
+        self.completed = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    @property
+    def wake_event(self) -> asyncio.Event:
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        return self._wake
+
+    def wake(self) -> None:
+        self.wake_event.set()
+
+    @property
+    def capacity(self) -> int:
+        # Allow one pool's worth of claimed work to queue behind the running set.
+        by_user = Counter(self._running_by_user)
+        by_model = Counter(self._running_by_model)
+        runnable = 0
+        for automation, _ in self._pending:
+            model_id = automation.data.get('model_id')
+            if by_user[automation.user_id] < self.max_per_user and by_model[model_id] < self.max_per_model:
+                runnable += 1
+            by_user[automation.user_id] += 1
+            by_model[model_id] += 1
+        return 2 * self.max_concurrency - len(self._running) - runnable
+
+    async def claim(self, now_ns: int) -> int:
+        claimed = 0
+        while self.capacity > 0:
+            limit = self.capacity
+            async with get_async_db() as db:
+                batch = await Automations.claim_due_with_schedule(now_ns, limit=limit, db=db)
+            self._pending.extend(batch)
+            claimed += len(batch)
+            if len(batch) < limit:
+                break
+        if claimed:
+            self.claimed += claimed
+            log.info(f'Claimed {claimed} due automation(s)')
+        return claimed
+
+    def dispatch(self) -> None:
+        """Start every pending automation whose global, user and model slots are free."""
+        deferred = deque()
+        while self._pending and len(self._running) < self.max_concurrency:
+            automation, scheduled_ns = self._pending.popleft()
+            model_id = automation.data.get('model_id')
+            if (
+                self._running_by_user[automation.user_id] >= self.max_per_user
+                or self._running_by_model[model_id] >= self.max_per_model
+            ):
+                deferred.append((automation, scheduled_ns))
+                continue
+
+            lag = max(0.0, (time.time_ns() - (scheduled_ns or time.time_ns())) / 1_000_000_000)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag > SCHEDULER_MAX_SLEEP:
+                log.warning(f'Automation {automation.id} started {lag:.1f}s late')
+
+            self._running_by_user[automation.user_id] += 1
+            self._running_by_model[model_id] += 1
+            task = asyncio.create_task(self._run(automation, model_id))
+            self._running.add(task)
+
+        # Keep the original order for automations that are still waiting on a slot.
+        deferred.extend(self._pending)
+        self._pending = deferred
+
+    async def _run(self, automation: AutomationModel, model_id: Optional[str]) -> None:
+        try:
+            await execute_automation(self.app, automation)
+        finally:
+            self._running.discard(asyncio.current_task())
+            self._running_by_user[automation.user_id] -= 1
+            if self._running_by_user[automation.user_id] <= 0:
+                del self._running_by_user[automation.user_id]
+            self._running_by_model[model_id] -= 1
+            if self._running_by_model[model_id] <= 0:
+                del self._running_by_model[model_id]
+            self.completed += 1
+            self.wake()
+
+    def stats(self) -> dict:
+        return {
+            'running': len(self._running),
+            'queued': len(self._pending),
+            'max_concurrency': self.max_concurrency,
+            'next_run_at': self.next_run_at,
+            'claimed': self.claimed,
+            'completed': self.completed,
+            'last_lag_seconds': round(self.last_lag, 3),
+            'max_lag_seconds': round(self.max_lag, 3),
+        }
+
+
+AUTOMATION_SCHEDULER = AutomationScheduler()
+
+
+async def notify_scheduler() -> None:
+    """Wake the scheduler on this instance and, via Redis, on every other one."""
+    AUTOMATION_SCHEDULER.wake()
+
+    app = AUTOMATION_SCHEDULER.app
+    redis = getattr(getattr(app, 'state', None), 'redis', None) if app is not None else None
+    if redis is None:
+        return
+    try:
+        if hasattr(redis, 'nodes_manager'):
+            await redis.execute_command('PUBLISH', SCHEDULER_WAKE_CHANNEL, 'wake')
+        else:
+            await redis.publish(SCHEDULER_WAKE_CHANNEL, 'wake')
+    except Exception:
+        log.debug('Failed to publish scheduler wake-up', exc_info=True)
+
+
+async def scheduler_wake_listener(app) -> None:
+    """Relay wake-ups published by other instances to the local scheduler."""
+    await listen_forever(app.state.redis, SCHEDULER_WAKE_CHANNEL, lambda _: AUTOMATION_SCHEDULER.wake())
+
+
 async def scheduler_worker_loop(app) -> None:
     """Unified background scheduler for all time-based work.
 
@@ -170,36 +343,57 @@ async def scheduler_worker_loop(app) -> None:
       1. Automation execution  (ENABLE_AUTOMATIONS)
       2. Calendar event alerts (ENABLE_CALENDAR)
 
-    Runs on every instance. Poll interval is configurable via
-    SCHEDULER_POLL_INTERVAL env var (default: 10 seconds).
+    Runs on every instance. Sleeps until the earliest next_run_at (at most
+    SCHEDULER_MAX_SLEEP seconds) unless woken by notify_scheduler; calendar
+    alerts are checked every SCHEDULER_POLL_INTERVAL seconds.
     """
-    log.info(f'Scheduler worker started (poll interval: {SCHEDULER_POLL_INTERVAL}s)')
+    scheduler = AUTOMATION_SCHEDULER
+    scheduler.app = app
+    if getattr(app.state, 'redis', None) is not None:
+        asyncio.create_task(scheduler_wake_listener(app))
+
+    log.info(
+        f'Scheduler worker started (max concurrency: {scheduler.max_concurrency}, '
+        f'calendar interval: {SCHEDULER_POLL_INTERVAL}s)'
+    )
+    next_calendar_check = 0.0
     while True:
+        scheduler.wake_event.clear()
+        timeout = SCHEDULER_MAX_SLEEP
         try:
             # ── Automations ──
             if await Config.get('automations.enable'):
                 try:
-                    async with get_async_db() as db:
-                        batch = await Automations.claim_due(int(time.time_ns()), limit=10, db=db)
-                    if batch:
-                        log.info(f'Claimed {len(batch)} due automation(s)')
-                    for automation in batch:
-                        asyncio.create_task(execute_automation(app, automation))
+                    claimed = await scheduler.claim(int(time.time_ns()))
+                    scheduler.dispatch()
+
+                    scheduler.next_run_at = await Automations.get_next_run_at()
+                    if scheduler.next_run_at is not None and scheduler.capacity > 0:
+                        delay = (scheduler.next_run_at - int(time.time_ns())) / 1_000_000_000
+                        # Rows still due after a claim are locked by another instance; back off briefly.
+                        timeout = min(timeout, delay if delay > 0 or claimed else 1.0)
                 except Exception:
                     log.exception('Scheduler: automation error')
 
             # ── Calendar Alerts ──
             if await Config.get('calendar.enable'):
-                try:
-                    await _check_calendar_alerts(app)
-                except Exception:
-                    log.exception('Scheduler: calendar alert error')
+                if time.monotonic() >= next_calendar_check:
+                    next_calendar_check = time.monotonic() + SCHEDULER_POLL_INTERVAL
+                    try:
+                        await _check_calendar_alerts(app)
+                    except Exception:
+                        log.exception('Scheduler: calendar alert error')
+                timeout = min(timeout, next_calendar_check - time.monotonic())
 
         except Exception:
             log.exception('Scheduler worker error')
 
-        # Jitter to spread load across instances
-        await asyncio.sleep(SCHEDULER_POLL_INTERVAL + random.uniform(0, 2))
+        # Small jitter spreads simultaneous claims across instances.
+        timeout = max(timeout, 0) + random.uniform(0, 0.5)
+        try:
+            await asyncio.wait_for(scheduler.wake_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
 
 
 ##########################
@@ -4,15 +4,134 @@ Calendar utilities.
 RRULE expansion reusing the automation infra.
 """
 
+import bisect
 import logging
+import os
+import threading
+import weakref
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from itertools import chain, islice, takewhile
+from typing import Iterator, Optional
 from zoneinfo import ZoneInfo
 
+from dateutil.rrule import rrulestr
 from open_webui.utils.automations import _parse_rule
 
 log = logging.getLogger(__name__)
 
+CALENDAR_RRULE_CACHE_SIZE = int(os.getenv('CALENDAR_RRULE_CACHE_SIZE', '1024'))
+
+# Upper bound on occurrences kept in one rule's index; windows with more are
+# generated lazily instead, so callers with a limit stop early.
+MAX_INDEXED_OCCURRENCES = 20000
+# Upper bound on occurrences indexed across every cached rule, so a full cache
+# of dense rules stays in the tens of megabytes.
+CALENDAR_MAX_INDEXED_OCCURRENCES = int(os.getenv('CALENDAR_MAX_INDEXED_OCCURRENCES', '200000'))
+
+
+class _IndexBudget:
+    """Occurrences indexed by all live ``CompiledRule`` objects, against a shared limit."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def charge(self, held: list[int], count: int) -> bool:
+        """Resize a rule's share (``held[0]``) to ``count``; False if growing it would exceed the limit."""
+        with self._lock:
+            if count > held[0] and self.used - held[0] + count > self.limit:
+                return False
+            self.used += count - held[0]
+            held[0] = count
+            return True
+
+    def release(self, held: list[int]) -> None:
+        self.charge(held, 0)
+
+
+_INDEX_BUDGET = _IndexBudget(CALENDAR_MAX_INDEXED_OCCURRENCES)
+
+
+class CompiledRule:
+    """A parsed RRULE anchored at its DTSTART, with an index of known occurrences.
+
+    ``rrule.after`` restarts iteration from DTSTART on every call, so walking
+    a month of a daily event that began years ago cost thousands of
+    iterations per occurrence.  Occurrences are generated instead with one
+    pass over the requested window, and kept sorted (as naive local datetimes
+    plus epoch ns in ``tz``) so later lookups inside the covered window are a
+    bisect.  Windows holding more than ``MAX_INDEXED_OCCURRENCES`` (e.g. a
+    minutely rule over a year) are not indexed but iterated lazily, as are
+    windows that would push the total over ``CALENDAR_MAX_INDEXED_OCCURRENCES``
+    until rules evicted from the ``compile_rule`` cache give back their share.
+    """
+
+    def __init__(self, rule, tz: Optional[str] = None):
+        self.rule = rule
+        self.zone = None
+        if tz:
+            try:
+                self.zone = ZoneInfo(tz)
+            except Exception:
+                log.warning('Unknown timezone %r — falling back to server time', tz)
+
+        self._lock = threading.Lock()
+        self._window: Optional[tuple[datetime, datetime]] = None
+        self._dts: list[datetime] = []
+        self._ns: list[int] = []
+        # Narrowest window span found to hold too many occurrences to index.
+        self._dense_span: Optional[timedelta] = None
+        # This rule's share of _INDEX_BUDGET, in a list the finalizer can still read.
+        self._indexed = [0]
+        weakref.finalize(self, _INDEX_BUDGET.release, self._indexed)
+
+    def _to_ns(self, dt: datetime) -> int:
+        if self.zone is not None:
+            dt = dt.replace(tzinfo=self.zone)
+        return int(dt.timestamp() * 1_000_000_000)
+
+    def _iter(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        return takewhile(lambda dt: dt < end, self.rule.xafter(start, inc=True))
+
+    def occurrences(self, start: datetime, end: datetime) -> Iterator[tuple[datetime, int]]:
+        """Occurrences with ``start <= dt < end`` as (naive datetime, epoch ns) pairs, in order."""
+        with self._lock:
+            window = self._window
+            if window is None or start < window[0] or end > window[1]:
+                # Grow the indexed window when the request overlaps it, else replace it.
+                if window is not None and start <= window[1] and end >= window[0]:
+                    start_, end_ = min(start, window[0]), max(end, window[1])
+                else:
+                    start_, end_ = start, end
+                if self._dense_span is not None and end_ - start_ >= self._dense_span:
+                    return ((dt, self._to_ns(dt)) for dt in self._iter(start, end))
+                pending = self._iter(start_, end_)
+                dts = list(islice(pending, MAX_INDEXED_OCCURRENCES + 1))
+                if len(dts) > MAX_INDEXED_OCCURRENCES:
+                    self._dense_span = min(self._dense_span or end_ - start_, end_ - start_)
+                    # Too many to index: continue lazily from what was generated when possible.
+                    if start_ == start:
+                        lazy = takewhile(lambda dt: dt < end, chain(dts, pending))
+                    else:
+                        lazy = self._iter(start, end)
+                    return ((dt, self._to_ns(dt)) for dt in lazy)
+                if not _INDEX_BUDGET.charge(self._indexed, len(dts)):
+                    return ((dt, self._to_ns(dt)) for dt in dts if start <= dt < end)
+                self._window, self._dts, self._ns = (start_, end_), dts, [self._to_ns(dt) for dt in dts]
+
+            lo, hi = bisect.bisect_left(self._dts, start), bisect.bisect_left(self._dts, end)
+            return zip(self._dts[lo:hi], self._ns[lo:hi])
+
+
+@lru_cache(maxsize=CALENDAR_RRULE_CACHE_SIZE)
+def compile_rule(rrule_str: str, dtstart_ns: int, tz: Optional[str] = None) -> CompiledRule:
+    """Parse and cache an RRULE anchored at ``dtstart_ns``; raises on malformed rules."""
+    dtstart = datetime.fromtimestamp(dtstart_ns / 1_000_000_000)
+    # No rrule cache: it would keep every generated occurrence alive for as long as the rule stays in this cache.
+    return CompiledRule(rrulestr(rrule_str, dtstart=dtstart, ignoretz=True), tz=tz)
+
 
 def expand_recurring_event(
     event_dict: dict,
@@ -26,8 +145,6 @@ def expand_recurring_event(
     Takes an event dict (from CalendarEventModel.model_dump()) and produces
     one dict per occurrence, with adjusted start_at / end_at.
     """
-    from dateutil.rrule import rrulestr
-
     rrule_str = event_dict.get('rrule')
     if not rrule_str:
         return [event_dict]
@@ -37,11 +154,9 @@ def expand_recurring_event(
     scan_start = range_start_dt - timedelta(days=1)
 
     original_start_ns = event_dict['start_at']
-    original_start_dt = datetime.fromtimestamp(original_start_ns / 1_000_000_000)
 
     try:
-        # Anchor to the event's real start so day-of-week / day-of-month are correct
-        rule = rrulestr(rrule_str, dtstart=original_start_dt, ignoretz=True)
+        rule = compile_rule(rrule_str, original_start_ns, tz)
     except Exception:
         log.warning(f'Failed to parse RRULE for event {event_dict.get("id")}: {rrule_str}')
         return [event_dict]
@@ -50,18 +165,9 @@ def expand_recurring_event(
     duration_ns = (original_end_ns - original_start_ns) if original_end_ns else None
 
     instances = []
-    dt = rule.after(scan_start, inc=True)
-
-    while dt and dt < range_end_dt and len(instances) < max_instances:
-        if tz:
-            try:
-                dt_tz = dt.replace(tzinfo=ZoneInfo(tz))
-                instance_start_ns = int(dt_tz.timestamp() * 1_000_000_000)
-            except Exception:
-                instance_start_ns = int(dt.timestamp() * 1_000_000_000)
-        else:
-            instance_start_ns = int(dt.timestamp() * 1_000_000_000)
-
+    for _, instance_start_ns in rule.occurrences(scan_start, range_end_dt):
+        if len(instances) >= max_instances:
+            break
         if instance_start_ns >= range_start_ns:
             instance = {
                 **event_dict,
@@ -71,8 +177,6 @@ def expand_recurring_event(
             }
             instances.append(instance)
 
-        dt = rule.after(dt)
-
     return instances
 
 
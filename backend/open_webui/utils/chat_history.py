@@ -0,0 +1,85 @@
+"""
+Request-scoped chat history.
+
+A single chat turn used to load a chat's whole message map and walk it with
+``get_message_list`` several times: once to build the prompt
+(``load_messages_from_db``) and again in the outlet filters and background
+tasks after the response.  ``ChatHistory`` loads each branch once per request,
+preferring ``Chats.get_message_branch`` (a recursive query over
+``chat_message.parent_id`` that skips sibling branches) and reusing the full
+map when a caller already needed it.
+
+Cached results are dropped whenever the chat's ``chat_message`` rows change
+(see ``ChatMessageTable.bump_version``), so the handlers that run after the
+response still see the saved assistant message and outlet edits.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from open_webui.models.chat_messages import ChatMessages
+from open_webui.models.chats import Chats
+from open_webui.utils.misc import get_message_list
+
+
+class ChatHistory:
+    def __init__(self, chat_id: str):
+        self.chat_id = chat_id
+        self._version: Optional[tuple] = None
+        self._messages_map: Optional[dict] = None
+        self._branches: dict[str, list[dict]] = {}
+        self._message_count: Optional[int] = None
+
+    def _refresh(self) -> None:
+        # Read the version before any load so a write that lands while the
+        # load is awaited invalidates the result on the next access.
+        version = ChatMessages.get_version(self.chat_id)
+        if version != self._version:
+            self._version = version
+            self._messages_map = None
+            self._branches.clear()
+            self._message_count = None
+
+    async def get_messages_map(self) -> dict:
+        """Full message map; empty if the chat has no messages (or no longer exists)."""
+        self._refresh()
+        if self._messages_map is None:
+            self._messages_map = await Chats.get_messages_map_by_chat_id(self.chat_id) or {}
+        return self._messages_map
+
+    async def get_branch(self, message_id: str) -> list[dict]:
+        """Messages from the root to ``message_id``, as ``get_message_list`` returns them."""
+        self._refresh()
+        branch = self._branches.get(message_id)
+        if branch is None:
+            if self._messages_map is not None:
+                branch = get_message_list(self._messages_map, message_id)
+            else:
+                branch = await Chats.get_message_branch(self.chat_id, message_id)
+            self._branches[message_id] = branch
+        return list(branch)
+
+    async def get_message_count(self) -> int:
+        self._refresh()
+        if self._message_count is None:
+            if self._messages_map is not None:
+                self._message_count = len(self._messages_map)
+            else:
+                self._message_count = await ChatMessages.count_messages_by_chat_id(self.chat_id)
+        return self._message_count
+
+
+def get_chat_history(request, chat_id: str) -> ChatHistory:
+    """The ``ChatHistory`` for ``chat_id``, shared by everything handling ``request``."""
+    state = getattr(request, 'state', None)
+    histories = getattr(state, 'chat_histories', None) if state is not None else None
+    if histories is None:
+        histories = {}
+        if state is not None:
+            state.chat_histories = histories
+
+    history = histories.get(chat_id)
+    if history is None:
+        history = histories[chat_id] = ChatHistory(chat_id)
+    return history
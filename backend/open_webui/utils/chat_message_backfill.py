@@ -0,0 +1,249 @@
+"""
+Bulk backfill of ``chat_message`` rows from the legacy ``chat.chat`` JSON.
+
+``ChatTable.get_messages_map_by_chat_id`` copies a chat's embedded history
+into ``chat_message`` the first time the chat is read, one upsert (and commit)
+per message.  After an upgrade every old chat pays that on first open, and
+chats nobody opens stay on the JSON path forever.  This worker walks the chat
+table by ascending id in keyset batches and, per batch:
+
+  - reads ``(id, user_id, history messages)`` for the next chats,
+  - reads the message ids that already have rows, in one query,
+  - bulk-inserts the missing messages with one multi-row INSERT.
+
+Progress (including the watermark, the last chat id done) is stored in the
+``job_state`` table after every batch, so a restarted worker resumes where it
+stopped.  Batches are throttled by ``CHAT_MESSAGE_BACKFILL_INTERVAL``.  New
+chats and messages are dual-written by the write path, so once a run
+completes (``complete`` in the stored state) every chat has its rows and the
+read path no longer needs its JSON fallback.
+
+It runs online from the app lifespan or offline with ``open-webui
+backfill-chat-messages``; either way a lease on the ``job_state`` row lets
+only one worker run at a time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Any, Optional
+
+from open_webui.models.chat_messages import ChatMessages
+from open_webui.models.chats import Chats
+from open_webui.models.job_states import JobStates
+
+log = logging.getLogger(__name__)
+
+CHAT_MESSAGE_BACKFILL_ENABLED = os.getenv('CHAT_MESSAGE_BACKFILL_ENABLED', 'True').lower() == 'true'
+CHAT_MESSAGE_BACKFILL_BATCH_SIZE = int(os.getenv('CHAT_MESSAGE_BACKFILL_BATCH_SIZE', '200'))
+# Pause between batches (seconds) so the backfill never saturates the database.
+CHAT_MESSAGE_BACKFILL_INTERVAL = float(os.getenv('CHAT_MESSAGE_BACKFILL_INTERVAL', '1'))
+CHAT_MESSAGE_BACKFILL_START_DELAY = float(os.getenv('CHAT_MESSAGE_BACKFILL_START_DELAY', '60'))
+CHAT_MESSAGE_BACKFILL_LOCK_TIMEOUT = int(os.getenv('CHAT_MESSAGE_BACKFILL_LOCK_TIMEOUT', '300'))
+
+BACKFILL_STATE_KEY = 'chat_message.backfill'
+PROGRESS_LOG_INTERVAL = 30
+
+# Progress of the run in this process, served by GET /api/v1/chats/backfill/status.
+BACKFILL_STATUS: dict[str, Any] = {'state': 'idle'}
+
+
+async def get_backfill_state() -> dict:
+    """The persisted progress: watermark, totals, and whether a run completed."""
+    return await JobStates.get_data(BACKFILL_STATE_KEY)
+
+
+async def get_backfill_status() -> dict:
+    state = await get_backfill_state()
+    return {**state, **BACKFILL_STATUS, 'complete': bool(state.get('complete'))}
+
+
+def _missing_messages(messages: dict, existing_ids: set[str]) -> dict[str, dict]:
+    return {
+        message_id: message
+        for message_id, message in messages.items()
+        if message_id not in existing_ids and isinstance(message, dict) and message.get('role')
+    }
+
+
+async def _insert_chat_messages(chat_id: str, user_id: str, messages: dict) -> int:
+    """Per-chat retry after a failed batch insert, re-reading the rows written meanwhile."""
+    existing = await ChatMessages.get_message_ids_by_chat_ids([chat_id])
+    missing = _missing_messages(messages, existing.get(chat_id, set()))
+    if not missing:
+        return 0
+    return await ChatMessages.insert_messages({chat_id: (user_id, missing)})
+
+
+async def backfill_batch(after_id: Optional[str], batch_size: int) -> tuple[Optional[str], int, int, int]:
+    """Backfill the next ``batch_size`` chats after ``after_id``.
+
+    Returns ``(last chat id, chats scanned, messages inserted, chats failed)``;
+    the last id is None once there are no chats left.
+    """
+    histories = await Chats.get_chat_histories_after_id(after_id, limit=batch_size)
+    if not histories:
+        return None, 0, 0, 0
+
+    existing = await ChatMessages.get_message_ids_by_chat_ids([chat_id for chat_id, _, _ in histories])
+    missing = {}
+    for chat_id, user_id, messages in histories:
+        chat_missing = _missing_messages(messages, existing.get(chat_id, set()))
+        if chat_missing:
+            missing[chat_id] = (user_id, chat_missing)
+
+    failed = 0
+    try:
+        inserted = await ChatMessages.insert_messages(missing)
+    except Exception as e:
+        # A request dual-wrote one of these messages, or a chat was deleted,
+        # between the two reads; retry chat by chat so one conflict does not
+        # hold back the batch.
+        log.debug(f'Batch backfill insert failed, retrying per chat: {e}')
+        inserted = 0
+        for chat_id, (user_id, messages) in missing.items():
+            try:
+                inserted += await _insert_chat_messages(chat_id, user_id, messages)
+            except Exception as e:
+                failed += 1
+                log.warning(f'Backfill failed for chat {chat_id}: {e}')
+
+    return histories[-1][0], len(histories), inserted, failed
+
+
+async def run_chat_message_backfill(
+    batch_size: Optional[int] = None,
+    interval: Optional[float] = None,
+    reset: bool = False,
+    renew_lock=None,
+) -> dict:
+    """Backfill every chat from the stored watermark on; returns the final status.
+
+    ``renew_lock`` is awaited after each batch and stops the run when it
+    returns False (another worker took over the lock).
+    """
+    batch_size = max(1, batch_size or CHAT_MESSAGE_BACKFILL_BATCH_SIZE)
+    interval = CHAT_MESSAGE_BACKFILL_INTERVAL if interval is None else max(0.0, interval)
+
+    state = {} if reset else await get_backfill_state()
+    watermark = state.get('watermark')
+    now = int(time.time())
+    state = {
+        'watermark': watermark,
+        'complete': False,
+        'chats': state.get('chats', 0),
+        'messages': state.get('messages', 0),
+        'failed': state.get('failed', 0),
+        'started_at': state.get('started_at') or now,
+        'updated_at': now,
+        'completed_at': None,
+    }
+
+    total = await Chats.count_chats()
+    remaining = await Chats.count_chats(after_id=watermark)
+    BACKFILL_STATUS.clear()
+    BACKFILL_STATUS.update(state='running', total_chats=total, remaining_chats=remaining, chats_per_second=0.0)
+    log.info(f'chat_message backfill: {remaining} of {total} chats to go (batch size {batch_size})')
+
+    run_started = time.monotonic()
+    run_chats = 0
+    last_log = run_started
+    try:
+        while True:
+            last_id, chats, messages, failed = await backfill_batch(watermark, batch_size)
+            if last_id is None:
+                break
+
+            watermark = last_id
+            run_chats += chats
+            remaining = max(0, remaining - chats)
+            state.update(
+                watermark=watermark,
+                chats=state['chats'] + chats,
+                messages=state['messages'] + messages,
+                failed=state['failed'] + failed,
+                updated_at=int(time.time()),
+            )
+            await JobStates.set_data(BACKFILL_STATE_KEY, state)
+
+            elapsed = time.monotonic() - run_started
+            BACKFILL_STATUS.update(
+                remaining_chats=remaining,
+                chats_per_second=round(run_chats / elapsed, 1) if elapsed else 0.0,
+            )
+            if time.monotonic() - last_log >= PROGRESS_LOG_INTERVAL:
+                last_log = time.monotonic()
+                log.info(
+                    f'chat_message backfill: {state["chats"]} chats, {state["messages"]} messages, '
+                    f'{remaining} chats remaining ({BACKFILL_STATUS["chats_per_second"]} chats/s)'
+                )
+
+            if chats < batch_size:
+                break
+            if renew_lock is not None and not await renew_lock():
+                log.info('chat_message backfill: lock lost, stopping')
+                BACKFILL_STATUS['state'] = 'idle'
+                return {**state, **BACKFILL_STATUS}
+            if interval:
+                await asyncio.sleep(interval)
+    except asyncio.CancelledError:
+        BACKFILL_STATUS['state'] = 'idle'
+        raise
+    except Exception:
+        BACKFILL_STATUS['state'] = 'failed'
+        raise
+
+    state.update(complete=True, completed_at=int(time.time()), updated_at=int(time.time()))
+    await JobStates.set_data(BACKFILL_STATE_KEY, state)
+    BACKFILL_STATUS.update(state='complete', remaining_chats=0)
+    log.info(
+        f'chat_message backfill complete: {state["chats"]} chats, {state["messages"]} messages, '
+        f'{state["failed"]} failed'
+    )
+    return {**state, **BACKFILL_STATUS}
+
+
+async def run_chat_message_backfill_with_lease(**kwargs) -> Optional[dict]:
+    """Run the backfill while holding its lease; None if another worker holds it.
+
+    The lease expires if its holder dies, and the next worker resumes from the
+    persisted watermark.
+    """
+    owner = str(uuid.uuid4())
+    if not await JobStates.acquire_lease(BACKFILL_STATE_KEY, owner, CHAT_MESSAGE_BACKFILL_LOCK_TIMEOUT):
+        return None
+
+    async def renew_lock() -> bool:
+        return await JobStates.acquire_lease(BACKFILL_STATE_KEY, owner, CHAT_MESSAGE_BACKFILL_LOCK_TIMEOUT)
+
+    try:
+        return await run_chat_message_backfill(renew_lock=renew_lock, **kwargs)
+    finally:
+        await JobStates.release_lease(BACKFILL_STATE_KEY, owner)
+
+
+async def chat_message_backfill_loop(app: Any) -> None:
+    """Run the backfill in the background until it completes."""
+    if not CHAT_MESSAGE_BACKFILL_ENABLED:
+        return
+
+    # Let startup (and the first requests) finish before scanning.
+    await asyncio.sleep(CHAT_MESSAGE_BACKFILL_START_DELAY)
+
+    while True:
+        try:
+            if (await get_backfill_state()).get('complete'):
+                BACKFILL_STATUS['state'] = 'complete'
+                return
+
+            await run_chat_message_backfill_with_lease()
+        except asyncio.CancelledError:
+            break
+        except Exception:
+            log.exception('chat_message backfill failed')
+
+        await asyncio.sleep(CHAT_MESSAGE_BACKFILL_LOCK_TIMEOUT)
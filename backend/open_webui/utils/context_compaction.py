@@ -16,6 +16,7 @@ from open_webui.utils.task import (
     replace_messages_variable,
     replace_prompt_variable,
 )
+from open_webui.utils.token_accounting import count_messages_tokens, count_tokens, get_tokenizer
 
 log = logging.getLogger(__name__)
 
@@ -54,7 +55,15 @@ async def compact_messages_for_request(
 
     messages, previous_summary = _apply_latest_summary_checkpoint(messages)
     token_threshold = _resolve_token_threshold(config['token_threshold'], metadata)
-    if not _exceeds_token_threshold(messages, system_prompt, previous_summary, token_threshold) or len(messages) <= 3:
+    if len(messages) <= 3 or not await _exceeds_token_threshold(
+        request,
+        messages,
+        system_prompt,
+        previous_summary,
+        token_threshold,
+        models.get(model_id),
+        metadata.get('chat_id'),
+    ):
         return messages, previous_summary, False
 
     boundary = _find_compaction_boundary(messages)
@@ -225,18 +234,31 @@ def _apply_latest_summary_checkpoint(messages: list[dict]) -> tuple[list[dict],
     return messages[summary_idx:], summary
 
 
-def _exceeds_token_threshold(messages: list[dict], system_prompt: str, summary: str | None, threshold: int) -> bool:
+async def _exceeds_token_threshold(
+    request,
+    messages: list[dict],
+    system_prompt: str,
+    summary: str | None,
+    threshold: int,
+    model: dict | None = None,
+    chat_id: str | None = None,
+) -> bool:
     if threshold <= 0:
         return False
 
+    tokenizer = await get_tokenizer(model, request)
     for idx in range(len(messages) - 1, -1, -1):
         usage = messages[idx].get('usage') or (messages[idx].get('info') or {}).get('usage')
         if isinstance(usage, dict) and usage.get('input_tokens'):
             total = int(usage.get('input_tokens') or 0) + int(usage.get('output_tokens') or 0)
-            return total + _estimate_messages_tokens(messages[idx + 1 :]) > threshold
+            return total + await count_messages_tokens(messages[idx + 1 :], tokenizer, chat_id) > threshold
 
-    estimated = _estimate_tokens(system_prompt) + _estimate_tokens(summary or '') + _estimate_messages_tokens(messages)
-    return estimated > threshold
+    total = (
+        count_tokens(system_prompt, tokenizer)
+        + count_tokens(summary or '', tokenizer)
+        + await count_messages_tokens(messages, tokenizer, chat_id)
+    )
+    return total > threshold
 
 
 def _find_compaction_boundary(messages: list[dict]) -> int:
@@ -339,41 +361,3 @@ def _response_text(response: Any) -> str:
             if isinstance(content, dict):
                 parts.append(content.get('text') or content.get('content') or '')
     return '\n'.join(part for part in parts if part)
-
-
-def _estimate_messages_tokens(messages: list[dict]) -> int:
-    total = 0
-    for message in messages:
-        total += 4
-        content = message.get('content')
-        if isinstance(content, list):
-            for item in content:
-                if not isinstance(item, dict):
-                    total += _estimate_tokens(item)
-                elif item.get('type') in {'image', 'image_url'}:
-                    total += 1000
-                else:
-                    total += _estimate_tokens(item.get('text') or item.get('content') or item)
-        else:
-            total += _estimate_tokens(content)
-
-        total += _estimate_tokens(message.get('output'))
-        total += _estimate_tokens(message.get('tool_calls'))
-        total += _estimate_tokens(message.get('files'))
-    return total
-
-
-def _estimate_tokens(value: Any) -> int:
-    if value is None:
-        return 0
-
-    if not isinstance(value, str):
-        try:
-            value = json.dumps(value, ensure_ascii=False)
-        except Exception:
-            value = str(value)
-
-    if not value:
-        return 0
-
-    return max(1, len(value) // 4)
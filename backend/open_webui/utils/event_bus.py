@@ -0,0 +1,163 @@
+"""
+Bounded, batched dispatch for ``publish_event``.
+
+``publish_event`` used to spawn a task per sink per event.  A bulk import or
+SCIM sync emitting thousands of events therefore created thousands of tasks
+at once, each reloading event functions and webhooks from the database.
+
+``EventBus`` puts events on a bounded queue drained by a fixed pool of
+workers.  Each worker takes up to ``EVENT_BUS_BATCH_SIZE`` events and hands
+the whole batch to every sink at once, so sink resolution and webhook grouping
+happen once per batch.  Sinks run event functions and webhook deliveries
+concurrently, each bounded by ``EVENT_BUS_HANDLER_TIMEOUT``, so one slow
+handler does not hold up the others.  When the queue is full, publishers wait briefly and
+then drop the event (counted in ``stats()``) rather than grow memory without
+bound.  Failed webhook deliveries go to the ``event_outbox`` table and are
+retried by ``event_outbox_loop`` with exponential backoff.
+"""
+
+import asyncio
+import logging
+from typing import Any
+
+from open_webui.env import (
+    EVENT_BUS_BATCH_SIZE,
+    EVENT_BUS_QUEUE_SIZE,
+    EVENT_BUS_WORKERS,
+    EVENT_OUTBOX_POLL_INTERVAL,
+)
+
+log = logging.getLogger(__name__)
+
+# How long a publisher waits for room in a full queue before dropping the event.
+PUBLISH_TIMEOUT = 1.0
+
+
+class EventBus:
+    def __init__(
+        self,
+        max_size: int = EVENT_BUS_QUEUE_SIZE,
+        workers: int = EVENT_BUS_WORKERS,
+        batch_size: int = EVENT_BUS_BATCH_SIZE,
+    ):
+        self.max_size = max_size
+        self.workers = workers
+        self.batch_size = batch_size
+
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        self.published = 0
+        self.dispatched = 0
+        self.dropped = 0
+        self.batches = 0
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        return self._queue
+
+    async def publish(self, app: Any, event: Any, request: Any | None = None) -> bool:
+        queue = self._ensure_started()
+        item = (app, event, request)
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(queue.put(item), timeout=PUBLISH_TIMEOUT)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                log.warning('Event bus queue full, dropping %s', getattr(event, 'event', event))
+                return False
+        self.published += 1
+        return True
+
+    async def _next_batch(self, queue: asyncio.Queue) -> list:
+        batch = [await queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            batch = await self._next_batch(queue)
+            try:
+                await self._dispatch(batch)
+            except Exception:
+                log.exception('Event bus batch dispatch failed')
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _dispatch(self, batch: list) -> None:
+        from open_webui.events import EVENT_SINKS
+
+        # Batches are per app; in practice every item shares the one app.
+        by_app: dict[int, tuple[Any, list]] = {}
+        for app, event, request in batch:
+            by_app.setdefault(id(app), (app, []))[1].append((event, request))
+
+        async def handle(sink, app: Any, items: list) -> None:
+            try:
+                if hasattr(sink, 'handle_batch'):
+                    await sink.handle_batch(app, items)
+                else:
+                    for event, request in items:
+                        await sink.handle_event(app, event, request=request)
+            except Exception:
+                log.exception('Event sink %s failed', type(sink).__name__)
+
+        await asyncio.gather(*(handle(sink, app, items) for app, items in by_app.values() for sink in EVENT_SINKS))
+
+        self.batches += 1
+        self.dispatched += len(batch)
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Give queued events a chance to be delivered, then stop the workers."""
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            log.warning('Event bus stopped with %d undelivered events', self._queue.qsize())
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._queue = None
+
+    def stats(self) -> dict:
+        return {
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'queue_size': self.max_size,
+            'workers': len(self._tasks),
+            'published': self.published,
+            'dispatched': self.dispatched,
+            'dropped': self.dropped,
+            'batches': self.batches,
+        }
+
+
+EVENT_BUS = EventBus()
+
+
+async def event_outbox_loop(app: Any) -> None:
+    """Periodically retry failed webhook deliveries from the outbox."""
+    from open_webui.events import retry_event_outbox
+
+    while True:
+        try:
+            await asyncio.sleep(EVENT_OUTBOX_POLL_INTERVAL)
+            while await retry_event_outbox(app) > 0:
+                pass
+        except asyncio.CancelledError:
+            break
+        except Exception:
+            log.exception('Event outbox retry failed')
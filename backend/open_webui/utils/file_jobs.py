@@ -0,0 +1,373 @@
+"""Durable queue for processing uploaded files.
+
+Uploads used to be extracted, embedded and indexed by a ``BackgroundTasks``
+callback in whichever web worker received them: a bulk import of thousands of
+files competed with chat traffic for that worker, and a restart lost every job
+in flight.  With ``ENABLE_FILE_JOB_QUEUE`` the upload handler records a
+``file_job`` row instead and returns, and workers claim jobs from the table:
+
+  - two lanes.  ``interactive`` (chat uploads) is always claimed first;
+    ``bulk`` (uploads into a knowledge base) may use at most
+    ``FILE_JOB_BULK_CONCURRENCY`` of a worker's ``FILE_JOB_CONCURRENCY``
+    slots, so a large import never starves chat uploads.
+  - a claimed job is leased for ``FILE_JOB_LEASE`` seconds and the lease is
+    renewed while it runs.  Jobs of a worker that died or restarted become
+    claimable again once their lease runs out; a worker that loses a lease (or
+    cannot renew it before it runs out) cancels the job rather than process
+    the file alongside its new owner.
+  - failures are retried with exponential backoff up to
+    ``FILE_JOB_MAX_ATTEMPTS`` times; in between the file stays ``pending``.
+  - ``get_file_process_status`` reports the job's state (queued or running,
+    lane, attempt) alongside the file status.
+
+Every process runs a worker.  To keep extraction and embedding away from
+chat traffic entirely, set ``FILE_JOB_CONCURRENCY=0`` on the web workers and
+run dedicated workers with ``python -m open_webui.utils.file_jobs``, which start
+only the database, vector DB client and worker, not the application.  New jobs
+wake the workers of every instance through Redis when it is configured, and
+otherwise within ``FILE_JOB_POLL_INTERVAL`` seconds.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import signal
+import time
+from typing import Optional
+
+from fastapi import Request
+from open_webui.config import VECTOR_DB
+from open_webui.env import REDIS_KEY_PREFIX
+from open_webui.models.file_jobs import FileJobModel, FileJobs
+from open_webui.models.files import Files
+from open_webui.models.users import Users
+from open_webui.utils.file_status import FILE_STATUS_NOTIFIER, notify_file_status
+from open_webui.utils.redis import listen_forever
+from starlette.datastructures import Headers
+
+log = logging.getLogger(__name__)
+
+ENABLE_FILE_JOB_QUEUE = os.getenv('ENABLE_FILE_JOB_QUEUE', 'True').lower() == 'true'
+FILE_JOB_CONCURRENCY = max(int(os.getenv('FILE_JOB_CONCURRENCY', '4')), 0)
+FILE_JOB_BULK_CONCURRENCY = max(int(os.getenv('FILE_JOB_BULK_CONCURRENCY', str(max(FILE_JOB_CONCURRENCY - 1, 1)))), 1)
+FILE_JOB_MAX_ATTEMPTS = max(int(os.getenv('FILE_JOB_MAX_ATTEMPTS', '3')), 1)
+FILE_JOB_LEASE = max(int(os.getenv('FILE_JOB_LEASE', '300')), 30)
+FILE_JOB_POLL_INTERVAL = max(float(os.getenv('FILE_JOB_POLL_INTERVAL', '5')), 1)
+
+FILE_JOB_WAKE_CHANNEL = f'{REDIS_KEY_PREFIX}:file_jobs:wake'
+
+LANE_INTERACTIVE = 'interactive'
+LANE_BULK = 'bulk'
+# Claim order.
+LANES = (LANE_INTERACTIVE, LANE_BULK)
+
+
+def file_job_lane(file_metadata: dict) -> str:
+    return LANE_BULK if file_metadata.get('knowledge_id') else LANE_INTERACTIVE
+
+
+def file_job_backoff(attempts: int) -> int:
+    """Seconds before retry number ``attempts + 1``: 15s, 30s, 60s, ... capped at ten minutes."""
+    return min(15 * 2 ** (attempts - 1), 600)
+
+
+def file_job_status(job: FileJobModel) -> dict:
+    """The job fields reported by ``get_file_process_status``."""
+    return {'state': job.status, 'lane': job.lane, 'attempts': job.attempts}
+
+
+async def enqueue_file_job(
+    request: Request,
+    file_id: str,
+    user_id: str,
+    content_type: Optional[str],
+    file_metadata: dict,
+) -> FileJobModel:
+    job = await FileJobs.insert(
+        file_id=file_id,
+        user_id=user_id,
+        lane=file_job_lane(file_metadata),
+        payload={'content_type': content_type, 'metadata': file_metadata},
+    )
+    await notify_file_job_workers(getattr(request.app.state, 'redis', None))
+    return job
+
+
+async def notify_file_job_workers(redis=None) -> None:
+    """Wake the worker on this instance and, via Redis, on every other one."""
+    FILE_JOB_WORKER.wake()
+    if redis is None:
+        return
+    try:
+        if hasattr(redis, 'nodes_manager'):
+            await redis.execute_command('PUBLISH', FILE_JOB_WAKE_CHANNEL, 'wake')
+        else:
+            await redis.publish(FILE_JOB_WAKE_CHANNEL, 'wake')
+    except Exception:
+        log.debug('Failed to publish file job wake-up', exc_info=True)
+
+
+def _build_request(app) -> Request:
+    """Minimal ASGI Request for ``process_uploaded_file``, as in the automations scheduler."""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0', 'spec_version': '2.0'},
+        'method': 'POST',
+        'path': '/api/v1/files/internal',
+        'query_string': b'',
+        'headers': Headers({}).raw,
+        'client': ('127.0.0.1', 0),
+        'server': ('127.0.0.1', 80),
+        'scheme': 'http',
+        'app': app,
+    }
+    request = Request(scope)
+    request.state.token = None
+    request.state.enable_api_keys = False
+    return request
+
+
+class FileJobWorker:
+    """Claims file jobs lane by lane and runs them on a bounded pool of tasks."""
+
+    def __init__(self, concurrency: int = FILE_JOB_CONCURRENCY, bulk_concurrency: int = FILE_JOB_BULK_CONCURRENCY):
+        self.concurrency = concurrency
+        self.bulk_concurrency = bulk_concurrency
+
+        self.app = None
+        self._wake: Optional[asyncio.Event] = None
+        self._running: dict[asyncio.Task, FileJobModel] = {}
+
+        self.claimed = 0
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    @property
+    def wake_event(self) -> asyncio.Event:
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        return self._wake
+
+    def wake(self) -> None:
+        self.wake_event.set()
+
+    def free_slots(self, lane: str) -> int:
+        free = self.concurrency - len(self._running)
+        if lane == LANE_BULK:
+            running_bulk = sum(1 for job in self._running.values() if job.lane == LANE_BULK)
+            free = min(free, self.bulk_concurrency - running_bulk)
+        return max(free, 0)
+
+    async def claim(self) -> int:
+        claimed = 0
+        for lane in LANES:
+            limit = self.free_slots(lane)
+            if limit <= 0:
+                continue
+            for job in await FileJobs.claim(lane, limit, FILE_JOB_LEASE):
+                self._running[asyncio.create_task(self._run(job))] = job
+                claimed += 1
+        self.claimed += claimed
+        return claimed
+
+    async def _renew(self, job: FileJobModel, task: asyncio.Task) -> None:
+        """Keep the lease alive; cancel ``task`` once it is lost, as another worker may claim the job."""
+        renewed_at = time.monotonic()
+        while True:
+            await asyncio.sleep(FILE_JOB_LEASE / 3)
+            try:
+                if not await FileJobs.renew(job.id, job.lease_id, FILE_JOB_LEASE):
+                    log.warning(f'Lost the lease on file job {job.id} (file {job.file_id}), cancelling it')
+                    task.cancel()
+                    return
+                renewed_at = time.monotonic()
+            except Exception:
+                log.debug(f'Failed to renew the lease on file job {job.id}', exc_info=True)
+                # Stop one renewal interval short of expiry, before another worker can claim it.
+                if time.monotonic() - renewed_at >= FILE_JOB_LEASE * 2 / 3:
+                    log.warning(f'Could not renew the lease on file job {job.id} (file {job.file_id}), cancelling it')
+                    task.cancel()
+                    return
+
+    async def _run(self, job: FileJobModel) -> None:
+        renew = asyncio.create_task(self._renew(job, asyncio.current_task()))
+        try:
+            await self.process(job)
+        except Exception:
+            log.exception(f'File job {job.id} failed unexpectedly')
+        finally:
+            renew.cancel()
+            self._running.pop(asyncio.current_task(), None)
+            self.wake()
+
+    async def process(self, job: FileJobModel) -> None:
+        from open_webui.routers.files import process_uploaded_file
+
+        file = await Files.get_file_by_id(job.file_id)
+        if file is None:
+            # Deleted while queued.
+            await FileJobs.delete_by_id(job.id, job.lease_id)
+            return
+
+        # Status streams report the job as running.
+        await notify_file_status(file.id)
+
+        user = await Users.get_user_by_id(job.user_id)
+        try:
+            if user is None:
+                raise Exception('The user who uploaded the file no longer exists')
+            await process_uploaded_file(
+                _build_request(self.app),
+                job.payload.get('content_type'),
+                file.path,
+                file,
+                job.payload.get('metadata') or {},
+                user,
+                raise_errors=True,
+            )
+        except Exception as e:
+            error = str(e.detail) if hasattr(e, 'detail') else str(e)
+            if user is not None and job.attempts < FILE_JOB_MAX_ATTEMPTS:
+                delay = file_job_backoff(job.attempts)
+                log.warning(
+                    f'Processing file {file.id} failed (attempt {job.attempts}/{FILE_JOB_MAX_ATTEMPTS}), '
+                    f'retrying in {delay}s: {error}'
+                )
+                # process_file marks the file failed; it is pending again until the retry.
+                await Files.update_file_data_by_id(file.id, {'status': 'pending'})
+                await FileJobs.reschedule(job.id, job.lease_id, int(time.time()) + delay, last_error=error)
+                self.retried += 1
+            else:
+                log.error(f'Processing file {file.id} failed after {job.attempts} attempt(s): {error}')
+                await Files.update_file_data_by_id(file.id, {'status': 'failed', 'error': error})
+                await FileJobs.delete_by_id(job.id, job.lease_id)
+                self.failed += 1
+            return
+
+        await FileJobs.delete_by_id(job.id, job.lease_id)
+        self.completed += 1
+
+    async def stop(self) -> None:
+        """Cancel the running jobs and return them to the queue for the next worker."""
+        running = list(self._running.items())
+        for task, _ in running:
+            task.cancel()
+        await asyncio.gather(*(task for task, _ in running), return_exceptions=True)
+        for _, job in running:
+            try:
+                await FileJobs.release(job.id, job.lease_id)
+            except Exception:
+                log.debug(f'Failed to release file job {job.id}', exc_info=True)
+
+    def stats(self) -> dict:
+        return {
+            'running': len(self._running),
+            'concurrency': self.concurrency,
+            'bulk_concurrency': self.bulk_concurrency,
+            'claimed': self.claimed,
+            'completed': self.completed,
+            'retried': self.retried,
+            'failed': self.failed,
+        }
+
+
+FILE_JOB_WORKER = FileJobWorker()
+
+
+async def file_job_wake_listener(app) -> None:
+    """Relay wake-ups published by other instances to the local worker."""
+    await listen_forever(app.state.redis, FILE_JOB_WAKE_CHANNEL, lambda _: FILE_JOB_WORKER.wake())
+
+
+async def file_job_worker_loop(app) -> None:
+    """Claim jobs until cancelled; the caller then runs ``FILE_JOB_WORKER.stop()`` to hand back running jobs."""
+    worker = FILE_JOB_WORKER
+    worker.app = app
+    if not ENABLE_FILE_JOB_QUEUE or worker.concurrency <= 0:
+        return
+
+    listener = None
+    if getattr(app.state, 'redis', None) is not None:
+        listener = asyncio.create_task(file_job_wake_listener(app))
+
+    log.info(
+        f'File job worker started (concurrency: {worker.concurrency}, bulk concurrency: {worker.bulk_concurrency})'
+    )
+    try:
+        while True:
+            worker.wake_event.clear()
+            try:
+                await worker.claim()
+            except Exception:
+                log.exception('File job worker error')
+
+            # Small jitter spreads simultaneous claims across instances.
+            try:
+                await asyncio.wait_for(
+                    worker.wake_event.wait(), timeout=FILE_JOB_POLL_INTERVAL + random.uniform(0, 0.5)
+                )
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        if listener is not None:
+            listener.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Open WebUI file processing worker')
+    parser.add_argument('--concurrency', type=int, help='jobs run at once (default: FILE_JOB_CONCURRENCY)')
+    args = parser.parse_args()
+
+    # The worker was built from the environment at import; the flag overrides it.
+    worker = FILE_JOB_WORKER
+    if args.concurrency is not None:
+        worker.concurrency = max(args.concurrency, 0)
+        if 'FILE_JOB_BULK_CONCURRENCY' not in os.environ:
+            worker.bulk_concurrency = max(worker.concurrency - 1, 1)
+    if worker.concurrency <= 0:
+        parser.error('FILE_JOB_CONCURRENCY is 0; pass --concurrency')
+
+    if VECTOR_DB == 'embedded':
+        # The web process holds the embedded store's directory lock.
+        parser.error('VECTOR_DB=embedded is only usable by a single process; use a server-based VECTOR_DB')
+
+    # The app is imported for its state (config, vector DB client); its lifespan, which also starts
+    # the scheduler, event bus and other background loops, is not run.
+    from open_webui.env import INSTANCE_ID
+    from open_webui.main import app, initialize_retrieval_functions
+    from open_webui.retrieval.loaders.executor import EXTRACTION_EXECUTOR
+    from open_webui.utils.redis import get_redis_client
+
+    async def run() -> None:
+        app.state.main_loop = asyncio.get_running_loop()
+        app.state.instance_id = INSTANCE_ID
+        app.state.redis = get_redis_client(async_mode=True)
+        # Status changes made here are published to the web workers' streams through the app's Redis.
+        FILE_STATUS_NOTIFIER.app = app
+        await initialize_retrieval_functions(app)
+
+        stopping = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            app.state.main_loop.add_signal_handler(sig, stopping.set)
+
+        loop = asyncio.create_task(file_job_worker_loop(app))
+        await stopping.wait()
+
+        log.info('Stopping the file job worker')
+        loop.cancel()
+        await asyncio.gather(loop, return_exceptions=True)
+        await worker.stop()
+        await asyncio.to_thread(EXTRACTION_EXECUTOR.shutdown)
+
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    # ``python -m`` runs this file as ``__main__``, a second copy of the module; run the worker of the
+    # copy everything else imports, so its wake-ups and the status notifier reach the same objects.
+    from open_webui.utils.file_jobs import main as file_jobs_main
+
+    file_jobs_main()
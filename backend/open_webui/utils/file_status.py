@@ -0,0 +1,152 @@
+"""Push notifications for file-processing status changes.
+
+The status streams of ``GET /files/{id}/process/status`` and
+``GET /knowledge/{id}/files/pending`` used to re-read the database every one
+to three seconds for as long as a browser tab watched an upload.  Instead,
+``Files`` calls ``notify_file_status`` whenever a file's status changes, and
+each stream follows ``FILE_STATUS_NOTIFIER.watch`` for the file or
+knowledge base it watches, reading the database again only when woken:
+
+  - subscribers on this process are woken directly; with Redis configured
+    the change is also published on ``FILE_STATUS_CHANNEL`` and relayed to
+    the subscribers of every other instance (including dedicated file job
+    workers, which process files outside the web workers).
+  - streams send an SSE comment every ``FILE_STATUS_HEARTBEAT_INTERVAL``
+    seconds so proxies keep idle connections open.
+  - streams also re-read every ``FILE_STATUS_RESYNC_INTERVAL`` seconds.
+    Without Redis a change made by another process is only seen this way;
+    with it, the resync covers notifications lost while the relay was down.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from contextlib import contextmanager
+from typing import AsyncIterator, Iterator, Optional
+
+from open_webui.env import REDIS_KEY_PREFIX
+from open_webui.utils.redis import listen_forever
+
+log = logging.getLogger(__name__)
+
+FILE_STATUS_HEARTBEAT_INTERVAL = max(float(os.getenv('FILE_STATUS_HEARTBEAT_INTERVAL', '15')), 1)
+FILE_STATUS_RESYNC_INTERVAL = max(float(os.getenv('FILE_STATUS_RESYNC_INTERVAL', '30')), 1)
+
+FILE_STATUS_CHANNEL = f'{REDIS_KEY_PREFIX}:file_status'
+
+SSE_HEARTBEAT = ': heartbeat\n\n'
+
+
+def knowledge_status_key(knowledge_id: str) -> str:
+    """Subscription key for the pending files of a knowledge base."""
+    return f'knowledge:{knowledge_id}'
+
+
+def file_status_keys(file_id: str, knowledge_id: Optional[str] = None) -> list[str]:
+    """Subscription keys a status change of ``file_id`` wakes."""
+    keys = [f'file:{file_id}']
+    if knowledge_id:
+        keys.append(knowledge_status_key(knowledge_id))
+    return keys
+
+
+class FileStatusNotifier:
+    """Wakes the status streams subscribed to a file or knowledge base."""
+
+    def __init__(self):
+        self.app = None
+        # Published messages carry it so the relay skips this instance's own.
+        self.instance_id = uuid.uuid4().hex
+        self._subscribers: dict[str, set[asyncio.Event]] = {}
+
+    @property
+    def redis(self):
+        return getattr(getattr(self.app, 'state', None), 'redis', None)
+
+    @contextmanager
+    def subscribe(self, *keys: str) -> Iterator[asyncio.Event]:
+        """An event set on every change to ``keys`` until the block exits."""
+        event = asyncio.Event()
+        for key in keys:
+            self._subscribers.setdefault(key, set()).add(event)
+        try:
+            yield event
+        finally:
+            for key in keys:
+                subscribers = self._subscribers.get(key)
+                if subscribers is not None:
+                    subscribers.discard(event)
+                    if not subscribers:
+                        del self._subscribers[key]
+
+    def dispatch(self, keys: list[str]) -> None:
+        for key in keys:
+            for event in self._subscribers.get(key, ()):
+                event.set()
+
+    async def publish(self, keys: list[str]) -> None:
+        self.dispatch(keys)
+
+        redis = self.redis
+        if redis is None:
+            return
+        message = json.dumps({'origin': self.instance_id, 'keys': keys})
+        try:
+            if hasattr(redis, 'nodes_manager'):
+                await redis.execute_command('PUBLISH', FILE_STATUS_CHANNEL, message)
+            else:
+                await redis.publish(FILE_STATUS_CHANNEL, message)
+        except Exception:
+            log.debug('Failed to publish file status change', exc_info=True)
+
+    async def watch(self, *keys: str) -> AsyncIterator[bool]:
+        """
+        Yield True whenever a stream watching ``keys`` should read the status:
+        once right away, then after every change and every resync interval.
+        Yield False when a heartbeat is due instead.
+        """
+        loop = asyncio.get_running_loop()
+        # Subscribed before the first read, so no change can slip in between.
+        with self.subscribe(*keys) as changed:
+            yield True
+            last_read = loop.time()
+            while True:
+                timeout = min(
+                    FILE_STATUS_HEARTBEAT_INTERVAL, max(last_read + FILE_STATUS_RESYNC_INTERVAL - loop.time(), 0)
+                )
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=timeout)
+                    read = True
+                except asyncio.TimeoutError:
+                    read = loop.time() >= last_read + FILE_STATUS_RESYNC_INTERVAL
+                if read:
+                    changed.clear()
+                    last_read = loop.time()
+                yield read
+
+
+FILE_STATUS_NOTIFIER = FileStatusNotifier()
+
+
+async def notify_file_status(file_id: str, knowledge_id: Optional[str] = None) -> None:
+    """Wake the streams watching ``file_id`` (and its knowledge base) on every instance."""
+    await FILE_STATUS_NOTIFIER.publish(file_status_keys(file_id, knowledge_id))
+
+
+async def file_status_listener(app) -> None:
+    """Relay status changes published by other instances to local subscribers."""
+    FILE_STATUS_NOTIFIER.app = app
+    if getattr(app.state, 'redis', None) is None:
+        return
+
+    def on_message(raw) -> None:
+        try:
+            data = json.loads(raw)
+        except (TypeError, ValueError):
+            return
+        if data.get('origin') != FILE_STATUS_NOTIFIER.instance_id:
+            FILE_STATUS_NOTIFIER.dispatch(data.get('keys') or [])
+
+    await listen_forever(app.state.redis, FILE_STATUS_CHANNEL, on_message)
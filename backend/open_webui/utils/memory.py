@@ -307,27 +307,28 @@ async def add_memory_context(request, form_data: dict, user, model: dict | None
     if not query:
         return form_data
 
-    all_memories = await Memories.get_memories_by_user_id(user.id)
-    results = None
-    try:
-        from open_webui.routers.memories import QueryMemoryForm, query_memory
+    from open_webui.utils.memory_index import get_memory_index
+
+    async def vector_query():
+        try:
+            from open_webui.routers.memories import QueryMemoryForm, query_memory
+
+            return await query_memory(request, QueryMemoryForm(content=query, k=8), user)
+        except Exception as e:
+            log.debug(e)
+            return None
 
-        results = await query_memory(request, QueryMemoryForm(content=query, k=8), user)
-    except Exception as e:
-        log.debug(e)
+    # The embedding + vector search and the (usually cached) index lookup are independent.
+    index, results = await asyncio.gather(get_memory_index(user.id), vector_query())
 
     sections = {'user': [], 'neighborhood': [], 'context': []}
     seen_ids = set()
-    for memory in sorted(
-        [memory for memory in (all_memories or []) if memory.type == 'user'],
-        key=lambda item: (item.path or '', item.updated_at),
-    ):
+    for memory in index.user_memories:
         seen_ids.add(memory.id)
         sections['user'].append(memory_label(memory))
 
-    for hint in memory_path_hints(query, all_memories):
-        for memory in search_memory_rows(
-            all_memories,
+    for hint in index.path_hints(query):
+        for memory in index.search(
             path=hint,
             memory_type='context',
             limit=4,
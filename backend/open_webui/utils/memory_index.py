@@ -0,0 +1,259 @@
+"""
+Cached per-user memory index for ``add_memory_context``.
+
+Every chat turn with memory enabled used to load all of a user's memories and
+scan them linearly, lower-casing and substring-matching each memory's content
+and path, to build the path neighborhood.  ``MemoryIndex`` is built once per
+user and reused until a memory write bumps the user's version (see
+``MemoriesTable.bump_version``) or the row fingerprint changes because another
+worker wrote.  It keeps:
+
+  - a path trie, for exact / descendant / ancestor / sibling lookups,
+  - a path-part index, for paths that share a segment with the lookup path,
+  - a trigram index over lower-cased ``path\\ncontent``, which narrows substring
+    queries to candidate memories before the exact match is checked.
+
+Lookups return the same rows, in the same order, as ``search_memory_rows`` and
+``memory_path_hints`` in utils/memory.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+
+from open_webui.models.memories import Memories
+from open_webui.utils.memory import _memory_matches_query, _path_parts, _path_rank, clean_memory_path
+
+log = logging.getLogger(__name__)
+
+MEMORY_INDEX_CACHE_SIZE = int(os.getenv('MEMORY_INDEX_CACHE_SIZE', '256'))
+
+NGRAM = 3
+
+
+def _ngrams(value: str) -> set[str]:
+    return {value[i : i + NGRAM] for i in range(len(value) - NGRAM + 1)}
+
+
+class _TrieNode:
+    __slots__ = ('children', 'path')
+
+    def __init__(self):
+        self.children: dict[str, _TrieNode] = {}
+        self.path: str | None = None  # set when memories exist at exactly this node
+
+
+class MemoryIndex:
+    def __init__(self, memories: list, version: tuple):
+        self.version = version
+        self.memories = list(memories or [])
+        self.by_id = {memory.id: memory for memory in self.memories}
+        self._position = {memory.id: idx for idx, memory in enumerate(self.memories)}
+
+        self.user_memories = sorted(
+            [memory for memory in self.memories if memory.type == 'user'],
+            key=lambda item: (item.path or '', item.updated_at),
+        )
+
+        # Distinct paths in first-seen order, mirroring a scan over the rows.
+        self.paths: dict[str, list] = {}
+        self._root = _TrieNode()
+        self._part_paths: dict[str, set[str]] = {}
+        self._haystacks: list[str] = []
+        self._grams: dict[str, set[int]] = {}
+
+        for idx, memory in enumerate(self.memories):
+            if memory.path:
+                if memory.path not in self.paths:
+                    self.paths[memory.path] = []
+                    self._add_path(memory.path)
+                self.paths[memory.path].append(memory)
+
+            haystack = f'{memory.path or ""}\n{memory.content or ""}'.lower()
+            self._haystacks.append(haystack)
+            for gram in _ngrams(haystack):
+                self._grams.setdefault(gram, set()).add(idx)
+
+    def _add_path(self, path: str) -> None:
+        node = self._root
+        for part in _path_parts(path):
+            node = node.children.setdefault(part, _TrieNode())
+            self._part_paths.setdefault(part, set()).add(path)
+        node.path = path
+
+    def _node(self, parts: list[str]) -> _TrieNode | None:
+        node = self._root
+        for part in parts:
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def _subtree_paths(self, node: _TrieNode) -> list[str]:
+        paths, stack = [], [node]
+        while stack:
+            node = stack.pop()
+            if node.path:
+                paths.append(node.path)
+            stack.extend(node.children.values())
+        return paths
+
+    def related_paths(self, lookup_path: str) -> set[str]:
+        """Every indexed path that ``_path_rank`` places in the neighborhood of ``lookup_path``."""
+        parts = _path_parts(lookup_path)
+        paths: set[str] = set()
+
+        node = self._node(parts)
+        if node is not None:
+            paths.update(self._subtree_paths(node))  # exact match and descendants
+
+        node = self._root
+        for part in parts[:-1]:  # ancestors
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.path:
+                paths.add(node.path)
+
+        if len(parts) > 1:  # siblings
+            parent = self._node(parts[:-1])
+            if parent is not None:
+                paths.update(child.path for child in parent.children.values() if child.path)
+
+        for part in set(parts):  # any shared segment
+            paths.update(self._part_paths.get(part, ()))
+
+        return paths
+
+    def _substring_candidates(self, needle: str) -> set[int] | None:
+        """Positions whose haystack may contain ``needle``; None when it is too short to narrow."""
+        grams = _ngrams(needle)
+        if not grams:
+            return None
+        postings = sorted((self._grams.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        return candidates
+
+    def search(
+        self,
+        *,
+        query: str | None = None,
+        path: str | None = None,
+        memory_id: str | None = None,
+        memory_type: str = 'all',
+        limit: int = 20,
+    ) -> list:
+        """Indexed equivalent of ``search_memory_rows``."""
+        candidates: set[int] | None = None
+
+        def narrow(positions) -> None:
+            nonlocal candidates
+            positions = set(positions)
+            candidates = positions if candidates is None else candidates & positions
+
+        if memory_id:
+            narrow([self._position[memory_id]] if memory_id in self._position else [])
+
+        query = (query or '').strip()
+        lookup_path = clean_memory_path(path)
+        if lookup_path:
+            basename = _path_parts(lookup_path)[-1] if _path_parts(lookup_path) else lookup_path
+            related = {
+                self._position[memory.id] for p in self.related_paths(lookup_path) for memory in self.paths.get(p, [])
+            }
+            for needle in (lookup_path.lower(), basename.lower()):
+                matches = self._substring_candidates(needle)
+                if matches is None:
+                    matches = range(len(self.memories))
+                related.update(idx for idx in matches if needle in self._haystacks[idx])
+            narrow(related)
+
+        if query:
+            matches = self._substring_candidates(query.lower())
+            if matches is not None:
+                narrow(matches)
+
+        positions = sorted(candidates) if candidates is not None else range(len(self.memories))
+        rows = []
+        for idx in positions:
+            memory = self.memories[idx]
+            if memory_type != 'all' and memory.type != memory_type:
+                continue
+            if query and not _memory_matches_query(memory, query):
+                continue
+            rows.append(memory)
+
+        ranks: dict[str | None, tuple] = {}
+
+        def sort_key(memory):
+            # Rank once per distinct path rather than once per memory.
+            if memory.path not in ranks:
+                rank = _path_rank(memory.path, lookup_path) if lookup_path else None
+                ranks[memory.path] = rank if rank is not None else (9, 0)
+            return ranks[memory.path], -(memory.updated_at or 0)
+
+        return sorted(rows, key=sort_key)[: max(1, min(limit or 20, 100))]
+
+    def path_hints(self, query: str, limit: int = 6) -> list[str]:
+        """Indexed equivalent of ``memory_path_hints``: scans distinct paths, not memories."""
+        lowered = (query or '').lower()
+        if not lowered:
+            return []
+
+        hints: list[str] = []
+        for path in self.paths:
+            parts = _path_parts(path)
+            last = parts[-1] if parts else path
+            if path.lower() in lowered or last.lower() in lowered:
+                hints.append(path)
+            elif any(len(part) >= 3 and part.lower() in lowered for part in parts):
+                hints.append(path)
+            if len(hints) >= limit:
+                break
+        return hints
+
+
+_indexes: OrderedDict[str, MemoryIndex] = OrderedDict()
+_building: dict[str, tuple[tuple, asyncio.Task]] = {}
+
+
+async def _build_memory_index(user_id: str, version: tuple) -> MemoryIndex:
+    memories = await Memories.get_memories_by_user_id(user_id)
+    # Build off the event loop; users with thousands of memories index many trigrams.
+    index = await asyncio.to_thread(MemoryIndex, memories or [], version)
+
+    _indexes[user_id] = index
+    _indexes.move_to_end(user_id)
+    while len(_indexes) > MEMORY_INDEX_CACHE_SIZE:
+        _indexes.popitem(last=False)
+    return index
+
+
+async def get_memory_index(user_id: str) -> MemoryIndex:
+    """Return the user's memory index, rebuilding it if any memory changed since it was built."""
+    version = (*Memories.get_version(user_id), *await Memories.get_memory_fingerprint(user_id))
+
+    index = _indexes.get(user_id)
+    if index is not None and index.version == version:
+        _indexes.move_to_end(user_id)
+        return index
+
+    # Concurrent callers (e.g. the vector query and the context builder) share one build.
+    building = _building.get(user_id)
+    if building is not None and building[0] == version and not building[1].done():
+        return await building[1]
+
+    task = asyncio.create_task(_build_memory_index(user_id, version))
+    _building[user_id] = (version, task)
+    try:
+        return await task
+    finally:
+        if _building.get(user_id, (None, None))[1] is task:
+            _building.pop(user_id, None)
@@ -12,6 +12,7 @@ import sys
 import textwrap
 import time
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from typing import Any, Optional
 from uuid import uuid4
 
@@ -36,6 +37,7 @@ from open_webui.env import (
     ENABLE_QUERIES_CACHE,
     ENABLE_REALTIME_CHAT_SAVE,
     ENABLE_RESPONSES_API_STATEFUL,
+    ENABLE_RETRIEVAL_PROFILE,
     GLOBAL_LOG_LEVEL,
     RAG_SYSTEM_CONTEXT,
 )
@@ -75,6 +77,7 @@ from open_webui.socket.main import (
 from open_webui.utils.access_control import has_connection_access, has_permission
 from open_webui.utils.access_control.files import get_accessible_folder_files
 from open_webui.utils.chat import generate_chat_completion
+from open_webui.utils.chat_history import get_chat_history
 from open_webui.utils.code_interpreter import execute_code_jupyter
 from open_webui.utils.context_compaction import compact_messages_for_request
 from open_webui.utils.files import (
@@ -114,6 +117,7 @@ from open_webui.utils.payload import apply_system_prompt_to_body, resolve_system
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.response import merge_usage, normalize_usage
 from open_webui.utils.sanitize import sanitize_code
+from open_webui.utils.telemetry.retrieval import retrieval_profile, retrieval_stage
 from open_webui.utils.task import (
     get_task_model_id,
     rag_template,
@@ -1764,40 +1768,43 @@ async def chat_completion_files_handler(
     __event_emitter__ = extra_params['__event_emitter__']
     sources = []
 
+    # Stages are recorded into the retrieval profile process_chat_payload keeps open.
     if files := body.get('metadata', {}).get('files', None):
         # Check if all files are in full context mode
         all_full_context = all(item.get('context') == 'full' for item in files)
 
         queries = []
         if not all_full_context:
-            try:
-                queries_response = await generate_queries(
-                    request,
-                    {
-                        'model': body['model'],
-                        'messages': body['messages'],
-                        'type': 'retrieval',
-                        'chat_id': body.get('metadata', {}).get('chat_id'),
-                    },
-                    user,
-                )
-                queries_response = queries_response['choices'][0]['message']['content']
-
+            with retrieval_stage('query_generation') as stage:
                 try:
-                    bracket_start = queries_response.rfind('{')
-                    bracket_end = queries_response.rfind('}') + 1
+                    queries_response = await generate_queries(
+                        request,
+                        {
+                            'model': body['model'],
+                            'messages': body['messages'],
+                            'type': 'retrieval',
+                            'chat_id': body.get('metadata', {}).get('chat_id'),
+                        },
+                        user,
+                    )
+                    queries_response = queries_response['choices'][0]['message']['content']
 
-                    if bracket_start == -1 or bracket_end == -1:
-                        raise Exception('No JSON object found in the response')
+                    try:
+                        bracket_start = queries_response.rfind('{')
+                        bracket_end = queries_response.rfind('}') + 1
 
-                    queries_response = queries_response[bracket_start:bracket_end]
-                    queries_response = json.loads(queries_response)
-                except Exception as e:
-                    queries_response = {'queries': [queries_response]}
+                        if bracket_start == -1 or bracket_end == -1:
+                            raise Exception('No JSON object found in the response')
 
-                queries = queries_response.get('queries', [])
-            except Exception:
-                pass
+                        queries_response = queries_response[bracket_start:bracket_end]
+                        queries_response = json.loads(queries_response)
+                    except Exception as e:
+                        queries_response = {'queries': [queries_response]}
+
+                    queries = queries_response.get('queries', [])
+                except Exception:
+                    pass
+                stage.set_candidates(len(queries))
 
             await __event_emitter__(
                 {
@@ -1961,21 +1968,24 @@ async def convert_url_images_to_base64(form_data, user=None):
     return form_data
 
 
-async def load_messages_from_db(chat_id: str, message_id: str) -> Optional[list[dict]]:
+async def load_messages_from_db(
+    chat_id: str, message_id: str, request: Optional[Request] = None
+) -> Optional[list[dict]]:
     """
     Load the message chain from DB up to message_id,
     keeping only LLM-relevant fields (role, content, output).
     """
-    messages_map = await Chats.get_messages_map_by_chat_id(chat_id)
-    if not messages_map:
-        return None
-
-    db_messages = get_message_list(messages_map, message_id)
+    db_messages = await get_chat_history(request, chat_id).get_branch(message_id)
     if not db_messages:
         return None
 
+    # id and tokenCounts let context compaction reuse and persist per-message
+    # token counts; both are removed again by strip_compaction_fields.
     return [
-        {k: v for k, v in msg.items() if k in ('role', 'content', 'output', 'files', 'contextSummary')}
+        {
+            **{k: v for k, v in msg.items() if k in ('id', 'role', 'content', 'output', 'files', 'contextSummary')},
+            'tokenCounts': msg.get('tokenCounts') or {},
+        }
         for msg in db_messages
     ]
 
@@ -2034,6 +2044,9 @@ def strip_compaction_fields(messages: list[dict]) -> list[dict]:
         clean = dict(message)
         clean.pop('contextSummary', None)
         clean.pop('context_summary', None)
+        # Messages loaded by load_messages_from_db carry their DB id only for token accounting.
+        if clean.pop('tokenCounts', None) is not None:
+            clean.pop('id', None)
         stripped.append(clean)
     return stripped
 
@@ -2210,7 +2223,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     user_message_id = metadata.get('user_message_id')
 
     if chat_id and user_message_id and not chat_id.startswith('local:') and not chat_id.startswith('channel:'):
-        db_messages = await load_messages_from_db(chat_id, user_message_id)
+        db_messages = await load_messages_from_db(chat_id, user_message_id, request)
         if db_messages:
             # Continue: frontend sends assistant_message_id when continuing
             # an existing response. Load its content so the LLM sees prior output.
@@ -2780,32 +2793,39 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     # Check if file context extraction is enabled for this model (default True)
     file_context_enabled = (model.get('info', {}).get('meta', {}).get('capabilities') or {}).get('file_context', True)
 
-    if file_context_enabled:
-        try:
-            form_data, flags = await chat_completion_files_handler(request, form_data, extra_params, user)
-            sources.extend(flags.get('sources', []))
-        except Exception as e:
-            log.exception(e)
-
-    # Save the pre-RAG message state so the native tool call loop can
-    # restore to the true original (before file-source injection) rather
-    # than a snapshot that already has the RAG template baked in.
-    system_message = get_system_message(form_data['messages'])
-    system_content = get_content_from_message(system_message) if system_message else ''
-    model_system_prompt = await resolve_system_prompt(
-        (form_data.get('params') or {}).get('system'),
-        metadata,
-        user,
-    )
-    if model_system_prompt:
-        system_content = f'{model_system_prompt}\n{system_content}' if system_content else model_system_prompt
-    metadata['system_prompt'] = system_content or None
-    metadata['user_prompt'] = get_last_user_message(form_data['messages'])
-    metadata['sources'] = sources[:] if sources else []
+    # The profile covers file retrieval through context assembly; requests without files get none.
+    files = (form_data.get('metadata') or {}).get('files') if file_context_enabled else None
+    with retrieval_profile() if files else nullcontext() as profile:
+        if file_context_enabled:
+            try:
+                form_data, flags = await chat_completion_files_handler(request, form_data, extra_params, user)
+                sources.extend(flags.get('sources', []))
+            except Exception as e:
+                log.exception(e)
 
-    # If context is not empty, insert it into the messages
-    if sources and prompt:
-        form_data['messages'] = await apply_source_context_to_messages(request, form_data['messages'], sources, prompt)
+        # Save the pre-RAG message state so the native tool call loop can
+        # restore to the true original (before file-source injection) rather
+        # than a snapshot that already has the RAG template baked in.
+        system_message = get_system_message(form_data['messages'])
+        system_content = get_content_from_message(system_message) if system_message else ''
+        model_system_prompt = await resolve_system_prompt(
+            (form_data.get('params') or {}).get('system'),
+            metadata,
+            user,
+        )
+        if model_system_prompt:
+            system_content = f'{model_system_prompt}\n{system_content}' if system_content else model_system_prompt
+        metadata['system_prompt'] = system_content or None
+        metadata['user_prompt'] = get_last_user_message(form_data['messages'])
+        metadata['sources'] = sources[:] if sources else []
+
+        # If context is not empty, insert it into the messages
+        if sources and prompt:
+            with retrieval_stage('context_assembly') as stage:
+                form_data['messages'] = await apply_source_context_to_messages(
+                    request, form_data['messages'], sources, prompt
+                )
+                stage.set_candidates(len(sources))
 
     # If there are citations, add them to the data_items
     sources = [
@@ -2817,6 +2837,10 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     if len(sources) > 0:
         events.append({'sources': sources})
 
+    if ENABLE_RETRIEVAL_PROFILE and profile is not None:
+        # Debug output for the client only: unlike the sources event, it is not saved to the message.
+        await event_emitter({'type': 'chat:retrieval_profile', 'data': profile.to_dict()})
+
     if model_knowledge:
         await event_emitter(
             {
@@ -3061,17 +3085,16 @@ async def background_tasks_handler(ctx):
         and not metadata.get('chat_id', '').startswith('local:')
         and not metadata.get('chat_id', '').startswith('channel:')
     ):
-        messages_map = await Chats.get_messages_map_by_chat_id(metadata['chat_id'])
-        if not messages_map:
-            # Chat was deleted while the response was streaming — skip background tasks
+        history = get_chat_history(request, metadata['chat_id'])
+        message_list = await history.get_branch(metadata['message_id'])
+        if not message_list:
+            # Chat (or message) was deleted while the response was streaming — skip background tasks
             return
-        message = messages_map.get(metadata['message_id'])
-
-        message_list = get_message_list(messages_map, metadata['message_id'])
+        message = message_list[-1]
 
         # Remove details tags and files from the messages.
-        # as get_message_list creates a new list, it does not affect
-        # the original messages outside of this handler
+        # get_branch returns a new list, and each message is copied below,
+        # so this does not affect the cached history
 
         messages = []
         for message in message_list:
@@ -3210,7 +3233,7 @@ async def background_tasks_handler(ctx):
                                 }
                             )
 
-                    if title == None and len(messages) == 2 and (not messages_map or len(messages_map) <= 2):
+                    if title == None and len(messages) == 2 and await history.get_message_count() <= 2:
                         title = messages[0].get('content', user_message)
 
                         await Chats.update_chat_title_by_id(metadata['chat_id'], title)
@@ -3323,13 +3346,10 @@ async def outlet_filter_handler(ctx):
             if not message_list:
                 return
         else:
-            messages_map = await Chats.get_messages_map_by_chat_id(chat_id)
-            if not messages_map:
-                return
-
-            message_list = get_message_list(messages_map, message_id)
+            message_list = await get_chat_history(request, chat_id).get_branch(message_id)
             if not message_list:
                 return
+            messages_map = {m['id']: m for m in message_list}
 
         model_id = model.get('id') if isinstance(model, dict) else model
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import codecs
 import collections.abc
 import hashlib
 import json
@@ -10,7 +11,7 @@ import time
 import uuid
 from datetime import timedelta
 from pathlib import Path
-from typing import Callable, Optional, Sequence, Union
+from typing import AsyncIterator, Callable, Optional, Sequence, Union
 
 import aiohttp
 import mimeparse
@@ -1142,3 +1143,72 @@ def stream_chunks_handler(stream: aiohttp.StreamReader):
             yield buffer + b'\n'
 
     return yield_safe_stream_chunks()
+
+
+async def iter_json_records(chunks: AsyncIterator[bytes], min_retry_size: int = 64 * 1024) -> AsyncIterator:
+    """
+    Incrementally parse a byte stream holding a JSON array or NDJSON, yielding top-level items.
+
+    Only the unparsed tail is buffered, so memory is bounded by the largest
+    single item rather than the whole payload.  An item cut off by a chunk
+    boundary is retried once the pending text has doubled in size (at least
+    ``min_retry_size`` more), keeping large items linear to parse.
+    Raises ``json.JSONDecodeError`` on malformed input.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    in_array = None
+    retry_at = 0
+
+    def parse(final: bool) -> list:
+        nonlocal buffer, in_array, retry_at
+        items = []
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buffer):
+                break
+
+            if in_array is None:
+                in_array = buffer[pos] == '['
+                if in_array:
+                    pos += 1
+                    continue
+            if in_array and buffer[pos] == ']':
+                pos += 1
+                continue
+
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                # An error well before the end of the buffer (other than a
+                # string still being received) is malformed input; near the
+                # end it may be a literal, number or escape cut off mid-way.
+                if final or (e.pos < len(buffer) - 16 and not e.msg.startswith('Unterminated string')):
+                    raise
+                pending = len(buffer) - pos
+                retry_at = pending + max(pending, min_retry_size)
+                break
+
+            # A bare number may continue in the next chunk.
+            if end == len(buffer) and not final and not isinstance(item, (dict, list, str)):
+                break
+            items.append(item)
+            pos = end
+
+        buffer = buffer[pos:]
+        return items
+
+    async for chunk in chunks:
+        buffer += utf8.decode(chunk)
+        if len(buffer) < retry_at:
+            continue
+        retry_at = 0
+        for item in parse(final=False):
+            yield item
+
+    buffer += utf8.decode(b'', final=True)
+    for item in parse(final=True):
+        yield item
@@ -325,3 +325,33 @@ def get_redis_connection(
 
     _CONNECTION_POOL[cache_key] = connection
     return connection
+
+
+async def listen_forever(redis: Any, channel: str, on_message, max_delay: float = 30.0) -> None:
+    """
+    Call ``on_message(data)`` for every message published on ``channel``.
+
+    A bare ``pubsub.listen()`` loop ends for good on the first connection
+    error; this one resubscribes with a capped exponential backoff until it
+    is cancelled.
+    """
+    delay = 1.0
+    while True:
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(channel)
+            delay = 1.0
+            async for message in pubsub.listen():
+                if message['type'] == 'message':
+                    on_message(message['data'])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning(f'Redis subscription to {channel} failed, retrying in {delay:.0f}s: {e}')
+        finally:
+            try:
+                await (getattr(pubsub, 'aclose', None) or pubsub.close)()
+            except Exception:
+                pass
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
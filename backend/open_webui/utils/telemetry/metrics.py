@@ -138,6 +138,14 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
         View(
             instrument_name='webui.users.active.today',
         ),
+        View(
+            instrument_name='webui.retrieval.stage.duration',
+            attribute_keys=['stage'],
+        ),
+        View(
+            instrument_name='webui.retrieval.stage.candidates',
+            attribute_keys=['stage'],
+        ),
     ]
 
     provider = MeterProvider(
@@ -222,6 +230,59 @@ def setup_metrics(app: FastAPI, resource: Resource, db_engine: Engine) -> None:
         callbacks=[observe_users_active_today],
     )
 
+    def observe_event_queue_depth(
+        options: metrics.CallbackOptions,
+    ) -> Iterable[metrics.Observation]:
+        try:
+            from open_webui.utils.event_bus import EVENT_BUS
+
+            yield metrics.Observation(value=EVENT_BUS.stats()['queue_depth'])
+        except Exception:
+            logger.debug('Failed to observe event queue depth', exc_info=True)
+
+    meter.create_observable_gauge(
+        name='webui.events.queue.depth',
+        description='Number of published events waiting to be dispatched',
+        unit='events',
+        callbacks=[observe_event_queue_depth],
+    )
+
+    def observe_automation_queue_depth(
+        options: metrics.CallbackOptions,
+    ) -> Iterable[metrics.Observation]:
+        try:
+            from open_webui.utils.automations import AUTOMATION_SCHEDULER
+
+            stats = AUTOMATION_SCHEDULER.stats()
+            yield metrics.Observation(value=stats['running'], attributes={'state': 'running'})
+            yield metrics.Observation(value=stats['queued'], attributes={'state': 'queued'})
+        except Exception:
+            logger.debug('Failed to observe automation queue depth', exc_info=True)
+
+    def observe_automation_lag(
+        options: metrics.CallbackOptions,
+    ) -> Iterable[metrics.Observation]:
+        try:
+            from open_webui.utils.automations import AUTOMATION_SCHEDULER
+
+            yield metrics.Observation(value=AUTOMATION_SCHEDULER.stats()['last_lag_seconds'])
+        except Exception:
+            logger.debug('Failed to observe automation lag', exc_info=True)
+
+    meter.create_observable_gauge(
+        name='webui.automations.queue.depth',
+        description='Automations running or claimed and waiting for a worker slot',
+        unit='automations',
+        callbacks=[observe_automation_queue_depth],
+    )
+
+    meter.create_observable_gauge(
+        name='webui.automations.lag',
+        description='Delay between the scheduled and actual start of the latest automation run',
+        unit='s',
+        callbacks=[observe_automation_lag],
+    )
+
     # FastAPI middleware
     @app.middleware('http')
     async def _metrics_middleware(request: Request, call_next):
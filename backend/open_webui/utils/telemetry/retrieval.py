@@ -0,0 +1,138 @@
+"""Stage-level timing for the retrieval (RAG) pipeline.
+
+Every stage of a retrieval (query generation, embedding, vector search, BM25,
+reranking, context assembly) runs inside ``retrieval_stage``, which
+
+  - opens an OTel span ``retrieval.<stage>`` under the current span, so traces
+    show where a slow chat request spent its retrieval time;
+  - records ``webui.retrieval.stage.duration`` (ms) and, when the stage reports
+    them, ``webui.retrieval.stage.candidates`` histograms with a ``stage``
+    attribute.  The OTLP collector exposes them to Prometheus;
+  - appends the timing to the active ``RetrievalProfile``, if any.
+
+``process_chat_payload`` keeps a profile open from file retrieval through
+context assembly for chat requests with files.  With
+``ENABLE_RETRIEVAL_PROFILE`` set, the profile (stage timings and candidate
+counts per query) is sent to the client as a ``chat:retrieval_profile``
+event, which is not saved with the message.
+
+Spans and instruments are no-ops unless OTel traces / metrics are enabled.
+Query text only goes into the profile, never into spans or metric attributes.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from opentelemetry import metrics, trace
+
+tracer = trace.get_tracer(__name__)
+meter = metrics.get_meter(__name__)
+
+stage_duration_histogram = meter.create_histogram(
+    name='webui.retrieval.stage.duration',
+    description='Duration of a retrieval pipeline stage',
+    unit='ms',
+)
+stage_candidates_histogram = meter.create_histogram(
+    name='webui.retrieval.stage.candidates',
+    description='Candidates (queries, chunks or documents) produced by a retrieval pipeline stage',
+    unit='1',
+)
+
+
+class RetrievalProfile:
+    """Stage timings of one retrieval, in the order the stages finished."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.stages: list[dict] = []
+
+    def record(self, stage: str, duration_ms: float, **details) -> None:
+        # Stages of concurrent queries append from worker threads too; list.append is atomic.
+        self.stages.append(
+            {
+                'stage': stage,
+                'duration_ms': round(duration_ms, 2),
+                **{key: value for key, value in details.items() if value is not None},
+            }
+        )
+
+    def finish(self) -> None:
+        self.duration_ms = (time.perf_counter() - self.started) * 1000.0
+
+    def to_dict(self) -> dict:
+        duration_ms = self.duration_ms
+        if duration_ms is None:
+            duration_ms = (time.perf_counter() - self.started) * 1000.0
+        return {'duration_ms': round(duration_ms, 2), 'stages': list(self.stages)}
+
+
+_current_profile: ContextVar[Optional[RetrievalProfile]] = ContextVar('retrieval_profile', default=None)
+
+
+class RetrievalStage:
+    """Handle for the body of a ``retrieval_stage`` block to report what it produced."""
+
+    def __init__(self, span):
+        self.span = span
+        self.candidates: Optional[int] = None
+
+    def set_candidates(self, candidates: int) -> None:
+        self.candidates = candidates
+        self.span.set_attribute('retrieval.candidates', candidates)
+
+
+@contextmanager
+def retrieval_profile() -> Iterator[RetrievalProfile]:
+    """Collect the stages that run in this block (and the tasks and threads it spawns) into a profile."""
+    profile = RetrievalProfile()
+    token = _current_profile.set(profile)
+    try:
+        with tracer.start_as_current_span('retrieval'):
+            yield profile
+    finally:
+        _current_profile.reset(token)
+        profile.finish()
+
+
+@contextmanager
+def retrieval_stage(
+    stage: str,
+    query: Optional[str] = None,
+    collection: Optional[str] = None,
+) -> Iterator[RetrievalStage]:
+    """Time one retrieval stage.  ``query`` and ``collection`` label it in the profile."""
+    attributes = {'retrieval.stage': stage}
+    if collection:
+        attributes['retrieval.collection'] = collection
+
+    with tracer.start_as_current_span(f'retrieval.{stage}', attributes=attributes) as span:
+        handle = RetrievalStage(span)
+        started = time.perf_counter()
+        error = None
+        try:
+            yield handle
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000.0
+            stage_duration_histogram.record(duration_ms, {'stage': stage})
+            if handle.candidates is not None:
+                stage_candidates_histogram.record(handle.candidates, {'stage': stage})
+
+            profile = _current_profile.get()
+            if profile is not None:
+                profile.record(
+                    stage,
+                    duration_ms,
+                    query=query,
+                    collection=collection,
+                    candidates=handle.candidates,
+                    error=error,
+                )
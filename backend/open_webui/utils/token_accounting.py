@@ -0,0 +1,230 @@
+"""
+Token accounting for chat context management.
+
+Context compaction used to estimate tokens as ``len(json.dumps(value)) // 4``
+for every message on every request, which is both inaccurate for non-English
+text and code and repeated work for long chats.  This module counts with the
+model's actual tokenizer where one is known, and caches per-message counts on
+the ``chat_message`` row (``token_counts``, keyed by tokenizer name) so a
+request only tokenizes messages it has not seen before.
+
+Tokenizers are resolved per model family:
+
+  - an explicit ``info.params.tokenizer`` on the model (``tiktoken:<encoding>``,
+    ``hf:<repo or path>``, ``rag`` for the RAG tokenizer from
+    ``get_transformers_tokenizer``, or ``estimate``),
+  - otherwise the first matching entry of ``MODEL_TOKENIZERS`` by model id,
+  - otherwise ``DEFAULT_TOKENIZER``.
+
+Additional families can be plugged in with ``register_tokenizer``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import re
+from typing import Any, Callable, Optional
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TOKENIZER = os.getenv('CONTEXT_TOKENIZER', 'tiktoken:o200k_base')
+
+# Model-id patterns (matched against the base model id) → tokenizer name.
+MODEL_TOKENIZERS: list[tuple[re.Pattern, str]] = [
+    (re.compile(r'(^|/)(gpt-4o|gpt-4\.1|gpt-4\.5|gpt-5|o1|o3|o4|chatgpt-4o)', re.I), 'tiktoken:o200k_base'),
+    (re.compile(r'(^|/)(gpt-4|gpt-3\.5|text-embedding-3|text-embedding-ada)', re.I), 'tiktoken:cl100k_base'),
+]
+
+# Fixed costs mirrored from the previous estimator.
+MESSAGE_OVERHEAD_TOKENS = 4
+IMAGE_TOKENS = 1000
+
+
+class Tokenizer:
+    def __init__(self, name: str, count: Callable[[str], int]):
+        self.name = name
+        self._count = count
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        try:
+            return self._count(text)
+        except Exception:
+            log.debug(f'Tokenizer {self.name} failed, falling back to estimate', exc_info=True)
+            return _estimate(text)
+
+
+def _estimate(text: str) -> int:
+    return max(1, len(text) // 4) if text else 0
+
+
+def _tiktoken_factory(encoding_name: str) -> Callable[[str], int]:
+    import tiktoken
+
+    encoding = tiktoken.get_encoding(encoding_name)
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def _hf_factory(model: str) -> Callable[[str], int]:
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(
+        model,
+        cache_dir=os.getenv('SENTENCE_TRANSFORMERS_HOME') or os.getenv('HF_HUB_CACHE'),
+    )
+    return lambda text: len(tokenizer.encode(text, add_special_tokens=False))
+
+
+def _estimate_factory(_: str) -> Callable[[str], int]:
+    return _estimate
+
+
+TOKENIZER_FACTORIES: dict[str, Callable[[str], Callable[[str], int]]] = {
+    'tiktoken': _tiktoken_factory,
+    'hf': _hf_factory,
+    'estimate': _estimate_factory,
+}
+
+_tokenizers: dict[str, Tokenizer] = {}
+
+
+def register_tokenizer(kind: str, factory: Callable[[str], Callable[[str], int]]) -> None:
+    """Register a tokenizer family; ``factory(arg)`` returns a text → token-count callable."""
+    TOKENIZER_FACTORIES[kind] = factory
+    _tokenizers.clear()
+
+
+def _load_tokenizer(name: str) -> Tokenizer:
+    kind, _, arg = name.partition(':')
+    factory = TOKENIZER_FACTORIES.get(kind)
+    if factory is None:
+        log.warning(f'Unknown tokenizer {name!r}, falling back to estimate')
+        return Tokenizer('estimate', _estimate)
+    try:
+        return Tokenizer(name, factory(arg))
+    except Exception as e:
+        log.warning(f'Failed to load tokenizer {name!r} ({e}), falling back to estimate')
+        return Tokenizer('estimate', _estimate)
+
+
+async def _load_rag_tokenizer(request) -> Tokenizer:
+    from open_webui.routers.retrieval import get_retrieval_config, get_transformers_tokenizer
+
+    try:
+        config = await get_retrieval_config()
+        tokenizer = await asyncio.to_thread(get_transformers_tokenizer, request, config)
+        return Tokenizer('rag', lambda text: len(tokenizer.encode(text)))
+    except Exception as e:
+        log.warning(f'Failed to load RAG tokenizer ({e}), falling back to estimate')
+        return Tokenizer('estimate', _estimate)
+
+
+def resolve_tokenizer_name(model: Optional[dict]) -> str:
+    model = model or {}
+    info = model.get('info') or {}
+    configured = (info.get('params') or {}).get('tokenizer')
+    if isinstance(configured, str) and configured.strip():
+        return configured.strip()
+
+    model_id = info.get('base_model_id') or model.get('id') or ''
+    for pattern, name in MODEL_TOKENIZERS:
+        if pattern.search(model_id):
+            return name
+    return DEFAULT_TOKENIZER
+
+
+async def get_tokenizer(model: Optional[dict], request=None) -> Tokenizer:
+    """Tokenizer for ``model``'s family, loaded once per process (off the event loop)."""
+    name = resolve_tokenizer_name(model)
+    tokenizer = _tokenizers.get(name)
+    if tokenizer is None:
+        if name == 'rag':
+            tokenizer = await _load_rag_tokenizer(request)
+        else:
+            tokenizer = await asyncio.to_thread(_load_tokenizer, name)
+        _tokenizers[name] = tokenizer
+    return tokenizer
+
+
+def _value_text(value: Any) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value
+    try:
+        return json.dumps(value, ensure_ascii=False)
+    except Exception:
+        return str(value)
+
+
+def count_tokens(value: Any, tokenizer: Tokenizer) -> int:
+    return tokenizer.count(_value_text(value))
+
+
+def count_message_tokens(message: dict, tokenizer: Tokenizer) -> int:
+    total = MESSAGE_OVERHEAD_TOKENS
+    content = message.get('content')
+    if isinstance(content, list):
+        for item in content:
+            if not isinstance(item, dict):
+                total += count_tokens(item, tokenizer)
+            elif item.get('type') in {'image', 'image_url'}:
+                total += IMAGE_TOKENS
+            else:
+                total += count_tokens(item.get('text') or item.get('content') or item, tokenizer)
+    else:
+        total += count_tokens(content, tokenizer)
+
+    total += count_tokens(message.get('output'), tokenizer)
+    total += count_tokens(message.get('tool_calls'), tokenizer)
+    total += count_tokens(message.get('files'), tokenizer)
+    return total
+
+
+def cached_message_tokens(message: dict, tokenizer: Tokenizer) -> Optional[int]:
+    counts = message.get('tokenCounts') or message.get('token_counts')
+    if isinstance(counts, dict):
+        value = counts.get(tokenizer.name)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+async def count_messages_tokens(
+    messages: list[dict], tokenizer: Tokenizer, chat_id: Optional[str] = None
+) -> int:
+    """Sum per-message token counts, tokenizing (off the event loop) only uncached messages.
+
+    Newly computed counts for persisted messages (those carrying an ``id``) are
+    written back to their ``chat_message`` rows when ``chat_id`` is given.
+    """
+    total = 0
+    pending = []
+    for message in messages:
+        cached = cached_message_tokens(message, tokenizer)
+        if cached is None:
+            pending.append(message)
+        else:
+            total += cached
+
+    if not pending:
+        return total
+
+    counts = await asyncio.to_thread(lambda: [count_message_tokens(message, tokenizer) for message in pending])
+    total += sum(counts)
+
+    updates = {message['id']: {tokenizer.name: count} for message, count in zip(pending, counts) if message.get('id')}
+
+    if chat_id and updates and tokenizer.name != 'estimate':
+        try:
+            from open_webui.models.chat_messages import ChatMessages
+
+            await ChatMessages.update_token_counts(chat_id, updates)
+        except Exception:
+            log.debug('Failed to store message token counts', exc_info=True)
+
+    return total
@@ -0,0 +1,289 @@
+"""Batched, asynchronous deletion of file vectors.
+
+Removing files from a knowledge base used to delete their vectors in the
+request, file by file: a ``file_id`` delete, a ``hash`` delete and a drop of
+the ``file-<id>`` collection each.  Removing 5,000 files meant well over
+10,000 blocking vector DB calls before the response.  Now the request records
+``vector_tombstone`` rows and returns:
+
+  - retrieval hides tombstoned vectors immediately (``apply_vector_tombstones``).
+  - a worker on every instance claims due tombstones in batches of
+    ``VECTOR_DELETE_BATCH_SIZE``, groups them by collection and deletes each
+    group with one ``$in`` filter per metadata key when the backend supports it
+    (``supports_in_filter_delete``), one value at a time otherwise.  Whole
+    collections are dropped.  Failed batches are retried with backoff and stay
+    hidden meanwhile.
+  - re-adding a file (or the same content under a new file) to a collection
+    first deletes its tombstoned vectors there (``discard_vector_tombstones``),
+    waiting for any worker already deleting them, so the pending delete cannot
+    remove the new chunks and retrieval does not hide them.  The duplicate
+    content check of ``save_docs_to_vector_db`` ignores tombstoned chunks.
+  - ``GET /knowledge/{id}/files/deleting`` reports how many remain.
+
+New tombstones wake the workers of every instance through Redis when it is
+configured, and otherwise within ``VECTOR_DELETE_POLL_INTERVAL`` seconds.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Optional
+
+from open_webui.env import REDIS_KEY_PREFIX
+from open_webui.models.vector_tombstones import VectorTombstoneModel, VectorTombstones
+from open_webui.retrieval.vector.async_client import ASYNC_VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.main import GetResult
+from open_webui.utils.redis import listen_forever
+
+log = logging.getLogger(__name__)
+
+VECTOR_DELETE_BATCH_SIZE = max(int(os.getenv('VECTOR_DELETE_BATCH_SIZE', '500')), 1)
+VECTOR_DELETE_LEASE = max(int(os.getenv('VECTOR_DELETE_LEASE', '300')), 30)
+VECTOR_DELETE_POLL_INTERVAL = max(float(os.getenv('VECTOR_DELETE_POLL_INTERVAL', '10')), 1)
+# How often a re-added file re-checks tombstones a worker is still deleting.
+VECTOR_DELETE_DISCARD_WAIT = 0.5
+
+VECTOR_DELETE_WAKE_CHANNEL = f'{REDIS_KEY_PREFIX}:vector_deletions:wake'
+
+
+def vector_delete_backoff(attempts: int) -> int:
+    """Seconds before retry number ``attempts + 1``: 15s, 30s, 60s, ... capped at ten minutes."""
+    return min(15 * 2**attempts, 600)
+
+
+####################
+# Tombstones
+####################
+
+
+async def enqueue_vector_deletion(collection_name: str, files: dict[str, Optional[str]]) -> int:
+    """Hide and schedule the deletion of ``files`` (file id -> content hash) from a collection."""
+    if not files:
+        return 0
+    count = await VectorTombstones.insert_many(collection_name, files)
+    await notify_vector_deletion_workers()
+    return count
+
+
+async def enqueue_collection_drops(collection_names: list[str]) -> int:
+    """Hide and schedule the drop of whole collections, e.g. the ``file-<id>`` collections of deleted files."""
+    if not collection_names:
+        return 0
+    count = await VectorTombstones.insert_drops(collection_names)
+    await notify_vector_deletion_workers()
+    return count
+
+
+async def load_vector_tombstones(collection_names) -> dict[str, dict]:
+    """
+    Tombstones of ``collection_names``, per collection: ``dropped`` (hide
+    everything), and the ``file_ids`` and ``hashes`` to hide.
+    """
+    try:
+        rows = await VectorTombstones.get_by_collection_names(list(collection_names))
+    except Exception:
+        log.exception('Failed to load vector tombstones')
+        return {}
+
+    tombstones: dict[str, dict] = {}
+    for row in rows:
+        entry = tombstones.setdefault(row.collection_name, {'dropped': False, 'file_ids': set(), 'hashes': set()})
+        if row.drop_collection:
+            entry['dropped'] = True
+        if row.file_id:
+            entry['file_ids'].add(row.file_id)
+        if row.hash:
+            entry['hashes'].add(row.hash)
+    return tombstones
+
+
+def _is_tombstoned(entry: dict, metadata) -> bool:
+    if entry['dropped']:
+        return True
+    metadata = metadata or {}
+    return metadata.get('file_id') in entry['file_ids'] or metadata.get('hash') in entry['hashes']
+
+
+def apply_vector_tombstones(collection_name: str, result, tombstones: dict[str, dict]):
+    """
+    ``result`` (a ``GetResult``/``SearchResult`` or a query result dict)
+    without the vectors tombstoned in ``collection_name``.
+    """
+    entry = tombstones.get(collection_name)
+    if not entry or result is None:
+        return result
+
+    is_model = isinstance(result, GetResult)
+    data = result.model_dump() if is_model else dict(result)
+    metadatas = data['metadatas'][0] if data.get('metadatas') else []
+    keep = [i for i, metadata in enumerate(metadatas) if not _is_tombstoned(entry, metadata)]
+    if len(keep) == len(metadatas):
+        return result
+
+    for key in ('ids', 'documents', 'metadatas', 'distances'):
+        if data.get(key):
+            data[key] = [[data[key][0][i] for i in keep]] + data[key][1:]
+    return type(result)(**data) if is_model else data
+
+
+def _is_leased(tombstone: VectorTombstoneModel, now: int) -> bool:
+    return tombstone.lease_id is not None and tombstone.next_attempt_at > now
+
+
+async def discard_vector_tombstones(collection_name: str, file_id: str, hash: Optional[str] = None) -> None:
+    """
+    Delete the tombstoned vectors of ``file_id`` (or with content ``hash``) in
+    ``collection_name`` now and drop their tombstones, before the file's new
+    vectors are written there.
+
+    Tombstones a worker holds a lease on are waited for instead: the worker may
+    still be deleting by ``file_id``/``hash`` and would remove the new vectors.
+    """
+    while True:
+        tombstones = await VectorTombstones.get_by_collection_name_and_file(collection_name, file_id, hash)
+        if not tombstones:
+            return
+
+        now = int(time.time())
+        unleased = [tombstone for tombstone in tombstones if not _is_leased(tombstone, now)]
+        if unleased:
+            await delete_collection_vectors(
+                collection_name,
+                file_ids=sorted({tombstone.file_id for tombstone in unleased if tombstone.file_id}),
+                hashes=sorted({tombstone.hash for tombstone in unleased if tombstone.hash}),
+            )
+            # A worker may claim some of them meanwhile; those stay and are waited for on the next pass.
+            await VectorTombstones.delete_unleased_by_ids([tombstone.id for tombstone in unleased])
+
+        if len(unleased) < len(tombstones):
+            await asyncio.sleep(VECTOR_DELETE_DISCARD_WAIT)
+
+
+####################
+# Deletion
+####################
+
+
+async def delete_collection_vectors(collection_name: str, file_ids: list[str], hashes: list[str]) -> None:
+    """Delete the chunks of ``file_ids`` and with content ``hashes`` from a collection."""
+    if not await ASYNC_VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+        return
+    for key, values in (('file_id', file_ids), ('hash', hashes)):
+        if not values:
+            continue
+        if ASYNC_VECTOR_DB_CLIENT.supports_in_filter_delete:
+            await ASYNC_VECTOR_DB_CLIENT.delete(collection_name=collection_name, filter={key: {'$in': values}})
+        else:
+            for value in values:
+                await ASYNC_VECTOR_DB_CLIENT.delete(collection_name=collection_name, filter={key: value})
+
+
+async def notify_vector_deletion_workers() -> None:
+    """Wake the worker on this instance and, via Redis, on every other one."""
+    VECTOR_DELETION_WORKER.wake()
+
+    app = VECTOR_DELETION_WORKER.app
+    redis = getattr(getattr(app, 'state', None), 'redis', None) if app is not None else None
+    if redis is None:
+        return
+    try:
+        if hasattr(redis, 'nodes_manager'):
+            await redis.execute_command('PUBLISH', VECTOR_DELETE_WAKE_CHANNEL, 'wake')
+        else:
+            await redis.publish(VECTOR_DELETE_WAKE_CHANNEL, 'wake')
+    except Exception:
+        log.debug('Failed to publish vector deletion wake-up', exc_info=True)
+
+
+class VectorDeletionWorker:
+    """Claims tombstones in batches and deletes their vectors collection by collection."""
+
+    def __init__(self, batch_size: int = VECTOR_DELETE_BATCH_SIZE):
+        self.batch_size = batch_size
+
+        self.app = None
+        self._wake: Optional[asyncio.Event] = None
+
+        self.deleted = 0
+        self.failed = 0
+
+    @property
+    def wake_event(self) -> asyncio.Event:
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        return self._wake
+
+    def wake(self) -> None:
+        self.wake_event.set()
+
+    async def run_once(self) -> int:
+        """Claim and process one batch; returns the number of tombstones claimed."""
+        tombstones = await VectorTombstones.claim(self.batch_size, VECTOR_DELETE_LEASE)
+
+        groups: dict[str, list[VectorTombstoneModel]] = {}
+        for tombstone in tombstones:
+            groups.setdefault(tombstone.collection_name, []).append(tombstone)
+
+        for collection_name, group in groups.items():
+            ids = [tombstone.id for tombstone in group]
+            lease_id = group[0].lease_id
+            try:
+                if any(tombstone.drop_collection for tombstone in group):
+                    if await ASYNC_VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+                        await ASYNC_VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                else:
+                    await delete_collection_vectors(
+                        collection_name,
+                        file_ids=sorted({tombstone.file_id for tombstone in group if tombstone.file_id}),
+                        hashes=sorted({tombstone.hash for tombstone in group if tombstone.hash}),
+                    )
+                await VectorTombstones.delete_by_ids(ids, lease_id)
+                self.deleted += len(group)
+                log.info(f'Deleted the vectors of {len(group)} tombstone(s) from {collection_name}')
+            except Exception as e:
+                attempts = max(tombstone.attempts for tombstone in group)
+                delay = vector_delete_backoff(attempts)
+                log.warning(f'Deleting vectors from {collection_name} failed, retrying in {delay}s: {e}')
+                await VectorTombstones.reschedule(ids, lease_id, int(time.time()) + delay, last_error=str(e))
+                self.failed += len(group)
+
+        return len(tombstones)
+
+    def stats(self) -> dict:
+        return {'batch_size': self.batch_size, 'deleted': self.deleted, 'failed': self.failed}
+
+
+VECTOR_DELETION_WORKER = VectorDeletionWorker()
+
+
+async def vector_deletion_wake_listener(app) -> None:
+    """Relay wake-ups published by other instances to the local worker."""
+    await listen_forever(app.state.redis, VECTOR_DELETE_WAKE_CHANNEL, lambda _: VECTOR_DELETION_WORKER.wake())
+
+
+async def vector_deletion_loop(app) -> None:
+    worker = VECTOR_DELETION_WORKER
+    worker.app = app
+    if getattr(app.state, 'redis', None) is not None:
+        asyncio.create_task(vector_deletion_wake_listener(app))
+
+    while True:
+        worker.wake_event.clear()
+        try:
+            # A full batch means more are probably due; keep going without waiting.
+            if await worker.run_once() >= worker.batch_size:
+                continue
+        except asyncio.CancelledError:
+            break
+        except Exception:
+            log.exception('Vector deletion worker error')
+
+        # Small jitter spreads simultaneous claims across instances.
+        try:
+            await asyncio.wait_for(
+                worker.wake_event.wait(), timeout=VECTOR_DELETE_POLL_INTERVAL + random.uniform(0, 0.5)
+            )
+        except asyncio.TimeoutError:
+            pass
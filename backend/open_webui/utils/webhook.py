@@ -1,6 +1,9 @@
 import asyncio
 import json
 import logging
+from contextlib import nullcontext
+
+import aiohttp
 
 from open_webui.config import WEBUI_FAVICON_URL
 from open_webui.env import (
@@ -27,7 +30,15 @@ def _event_text(message: str, description: str | None = None, event_data: dict |
     return '\n'.join(lines)
 
 
-async def post_webhook(name: str, url: str, message: str, event_data: dict, description: str | None = None) -> bool:
+async def post_webhook(
+    name: str,
+    url: str,
+    message: str,
+    event_data: dict,
+    description: str | None = None,
+    session: aiohttp.ClientSession | None = None,
+) -> bool:
+    """Post ``event_data`` to ``url``; pass ``session`` to reuse connections across deliveries."""
     try:
         log.debug(f'post_webhook: {url}, {message}, {event_data}')
         # Block private-IP / loopback / cloud-metadata targets — the URL is
@@ -77,7 +88,7 @@ async def post_webhook(name: str, url: str, message: str, event_data: dict, desc
             payload = event_data
 
         log.debug(f'payload: {payload}')
-        async with get_ssrf_safe_session() as session:
+        async with nullcontext(session) if session else get_ssrf_safe_session() as session:
             async with session.post(
                 url,
                 json=payload,
@@ -0,0 +1,233 @@
+"""
+Benchmark the chat list endpoints on a large chat table.
+
+Seeds a throwaway SQLite database with 100,000 chats (one user, long
+histories; some pinned, archived or in folders, with matching ``chat_message``
+rows) and measures latency and peak Python memory for each list query in
+``ChatTable``, comparing:
+
+  - the blob-free projections with the previous ``select(Chat)`` full-row loads,
+  - keyset (``cursor``) pagination with OFFSET pagination at a deep page.
+
+Run from the backend directory:
+
+    cd backend && python ../scripts/benchmark_chat_lists.py [--chats N] [--messages N]
+
+Seeding 100,000 chats with 20 messages each writes roughly 1 GB; use
+``--chats`` / ``--messages`` for a quicker run, and ``--db`` to reuse a
+seeded database between runs.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument('--chats', type=int, default=100_000)
+parser.add_argument('--messages', type=int, default=20, help='messages per chat history')
+parser.add_argument('--message-size', type=int, default=400, help='characters per message')
+parser.add_argument('--runs', type=int, default=5)
+parser.add_argument('--db', help='SQLite file to seed (or reuse if already seeded)')
+args = parser.parse_args()
+
+DB_PATH = args.db or os.path.join(tempfile.mkdtemp(), 'benchmark.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+
+from open_webui.internal.db import Base, engine, get_async_db  # noqa: E402
+from open_webui.models.chat_messages import ChatMessage  # noqa: E402
+from open_webui.models.chats import Chat, Chats, encode_chat_cursor  # noqa: E402
+from open_webui.models.folders import Folder  # noqa: E402
+from sqlalchemy import func, insert, or_, select  # noqa: E402
+
+USER_ID = 'benchmark-user'
+FOLDER_IDS = [f'benchmark-folder-{i}' for i in range(5)]
+SEARCH_WORD = 'quasar'
+WORDS = 'lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt labore'.split()
+PAGE_SIZE = 60
+BATCH_SIZE = 1000
+
+
+def make_history(rng: random.Random, now: int, with_match: bool) -> tuple[dict, list[dict]]:
+    messages = {}
+    parent_id = None
+    for i in range(args.messages):
+        message_id = str(uuid.uuid4())
+        words = [rng.choice(WORDS) for _ in range(args.message_size // 6)]
+        if with_match and i == args.messages // 2:
+            words[len(words) // 2] = SEARCH_WORD
+        messages[message_id] = {
+            'id': message_id,
+            'parentId': parent_id,
+            'childrenIds': [],
+            'role': 'user' if i % 2 == 0 else 'assistant',
+            'content': ' '.join(words),
+            'timestamp': now + i,
+        }
+        if parent_id:
+            messages[parent_id]['childrenIds'].append(message_id)
+        parent_id = message_id
+    history = {'messages': messages, 'currentId': parent_id}
+    return {'title': 'benchmark', 'history': history, 'messages': list(messages.values())}, list(messages.values())
+
+
+def seed() -> None:
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        if conn.execute(select(func.count(Chat.id))).scalar():
+            return
+
+    print(f'seeding {args.chats} chats into {DB_PATH} ...')
+    rng = random.Random(0)
+    now = int(time.time())
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Folder),
+            [
+                {'id': folder_id, 'user_id': USER_ID, 'name': folder_id, 'created_at': now, 'updated_at': now}
+                for folder_id in FOLDER_IDS
+            ],
+        )
+
+    for start in range(0, args.chats, BATCH_SIZE):
+        chats, messages = [], []
+        for i in range(start, min(start + BATCH_SIZE, args.chats)):
+            chat_id = str(uuid.uuid4())
+            updated_at = now - rng.randint(0, 365 * 86400)
+            chat, history = make_history(rng, updated_at, with_match=(i % 500 == 0))
+            chats.append(
+                {
+                    'id': chat_id,
+                    'user_id': USER_ID,
+                    'title': f'Chat {i}',
+                    'chat': chat,
+                    'created_at': updated_at,
+                    'updated_at': updated_at,
+                    'archived': i % 10 == 0,
+                    'pinned': i % 20 == 1,
+                    'meta': {},
+                    'folder_id': FOLDER_IDS[i % len(FOLDER_IDS)] if i % 5 == 2 else None,
+                }
+            )
+            messages.extend(
+                {
+                    'id': f'{chat_id}-{message["id"]}',
+                    'chat_id': chat_id,
+                    'user_id': USER_ID,
+                    'role': message['role'],
+                    'parent_id': message['parentId'],
+                    'content': message['content'],
+                    'created_at': message['timestamp'],
+                    'updated_at': message['timestamp'],
+                }
+                for message in history
+            )
+        with engine.begin() as conn:
+            conn.execute(insert(Chat), chats)
+            conn.execute(insert(ChatMessage), messages)
+
+
+async def measure(label: str, fn) -> None:
+    await fn()  # warm the page cache and connection pool
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        result = await fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    await fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median_ms = statistics.median(timings) * 1000
+    print(f'{label:<48} {median_ms:>9.1f} ms {peak / 1024 / 1024:>9.1f} MiB  ({len(result)} rows)')
+
+
+async def full_rows(stmt) -> list:
+    """The previous behavior: load whole Chat rows, including the history blob."""
+    async with get_async_db() as session:
+        result = await session.execute(stmt)
+        return result.scalars().all()
+
+
+async def main() -> None:
+    seed()
+
+    deep_skip = (args.chats // 2 // PAGE_SIZE) * PAGE_SIZE
+    deep_page = await Chats.get_chat_title_id_list_by_user_id(USER_ID, skip=deep_skip - 1, limit=1)
+    deep_cursor = encode_chat_cursor(deep_page[0].updated_at, deep_page[0].id) if deep_page else None
+    first_page_ids = [chat.id for chat in await Chats.get_chat_title_id_list_by_user_id(USER_ID, limit=PAGE_SIZE)]
+
+    print(f'\n{"query":<48} {"median":>12} {"peak mem":>12}')
+    await measure(
+        'chat list, page 1',
+        lambda: Chats.get_chat_title_id_list_by_user_id(USER_ID, skip=0, limit=PAGE_SIZE),
+    )
+    await measure(
+        f'chat list, OFFSET {deep_skip}',
+        lambda: Chats.get_chat_title_id_list_by_user_id(USER_ID, skip=deep_skip, limit=PAGE_SIZE),
+    )
+    await measure(
+        'chat list, cursor at the same page',
+        lambda: Chats.get_chat_title_id_list_by_user_id(USER_ID, cursor=deep_cursor, limit=PAGE_SIZE),
+    )
+    await measure('pinned chats', lambda: Chats.get_pinned_chats_by_user_id(USER_ID))
+    await measure(
+        'archived list, page 1',
+        lambda: Chats.get_archived_chat_list_by_user_id(USER_ID, skip=0, limit=PAGE_SIZE),
+    )
+    await measure(
+        'archived chats, full rows (previous)',
+        lambda: full_rows(select(Chat).filter_by(user_id=USER_ID, archived=True).order_by(Chat.updated_at.desc())),
+    )
+    await measure(
+        'folder list, page 1',
+        lambda: Chats.get_chats_by_folder_id_and_user_id(FOLDER_IDS[0], USER_ID, skip=0, limit=PAGE_SIZE),
+    )
+    await measure(
+        'folder chats, full rows (previous)',
+        lambda: full_rows(
+            select(Chat)
+            .filter(Chat.folder_id.in_(FOLDER_IDS), Chat.user_id == USER_ID)
+            .filter(or_(Chat.pinned == False, Chat.pinned == None))
+            .filter_by(archived=False)
+            .order_by(Chat.updated_at.desc())
+        ),
+    )
+    await measure(
+        'chats by id, projection',
+        lambda: Chats.get_chat_list_by_chat_ids(first_page_ids, limit=PAGE_SIZE),
+    )
+    await measure(
+        'chats by id, full rows (previous)',
+        lambda: full_rows(select(Chat).filter(Chat.id.in_(first_page_ids)).order_by(Chat.updated_at.desc())),
+    )
+
+    async def search():
+        chats = await Chats.get_chats_by_user_id_and_search_text(USER_ID, SEARCH_WORD, limit=PAGE_SIZE)
+        await Chats.get_search_snippet_messages([chat.id for chat in chats], SEARCH_WORD)
+        return chats
+
+    await measure('search + snippets', search)
+    await measure(
+        'search, full rows (previous)',
+        lambda: full_rows(
+            select(Chat)
+            .filter(Chat.user_id == USER_ID, Chat.archived == False)
+            .filter(or_(Chat.title.ilike(f'%{SEARCH_WORD}%'), func.lower(Chat.chat).contains(SEARCH_WORD)))
+            .order_by(Chat.updated_at.desc(), Chat.id)
+            .limit(PAGE_SIZE)
+        ),
+    )
+    print(f'\ndatabase: {DB_PATH} ({os.path.getsize(DB_PATH) / 1024 / 1024:.0f} MiB)')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,188 @@
+"""
+Benchmark the embedded vector DB against Chroma.
+
+Ingests the same synthetic corpus (1,000,000 chunks by default, clustered so
+that approximate search is meaningful) into ``VECTOR_DB=embedded`` and
+``VECTOR_DB=chroma`` through their ``VectorDBBase`` clients, one file's worth
+of chunks per insert, and reports for each:
+
+  - ingest throughput, and for the embedded DB the time its background
+    maintenance needs to compact the segments and build the HNSW index,
+  - cold open time (first search after a restart),
+  - median search latency for one and ``--queries`` query vectors, without a
+    filter and filtered to one file,
+  - recall@k of unfiltered search against exact search,
+  - size on disk and peak RSS.
+
+Each backend runs in its own process, in a temporary data directory.  Run
+from the backend directory, with chromadb and hnswlib installed:
+
+    cd backend && python ../scripts/benchmark_embedded_vector_db.py [--chunks N] [--dim N] [--backends embedded chroma]
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument('--chunks', type=int, default=1_000_000)
+parser.add_argument('--dim', type=int, default=384)
+parser.add_argument('--file-size', type=int, default=2000, help='chunks per insert (one file)')
+parser.add_argument('--clusters', type=int, default=2000)
+parser.add_argument('--queries', type=int, default=4, help='query vectors per multi-vector search')
+parser.add_argument('--searches', type=int, default=100)
+parser.add_argument('--k', type=int, default=10)
+parser.add_argument('--backends', nargs='*', default=['embedded', 'chroma'])
+parser.add_argument('--run', help=argparse.SUPPRESS)
+args = parser.parse_args()
+
+COLLECTION = 'benchmark'
+
+
+def corpus_batches():
+    """``(file_index, vectors)`` per file, regenerated identically in every process."""
+    centers = np.random.default_rng(0).standard_normal((args.clusters, args.dim), dtype=np.float32)
+    for file_index, start in enumerate(range(0, args.chunks, args.file_size)):
+        rng = np.random.default_rng(file_index + 1)
+        count = min(args.file_size, args.chunks - start)
+        assignment = rng.integers(0, args.clusters, count)
+        vectors = centers[assignment] + 0.5 * rng.standard_normal((count, args.dim), dtype=np.float32)
+        yield file_index, vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def query_vectors(count: int, seed: int) -> np.ndarray:
+    centers = np.random.default_rng(0).standard_normal((args.clusters, args.dim), dtype=np.float32)
+    rng = np.random.default_rng(10_000_000 + seed)
+    vectors = centers[rng.integers(0, args.clusters, count)] + 0.5 * rng.standard_normal((count, args.dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def exact_top_k(queries: np.ndarray) -> list[set[str]]:
+    best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+    best_ids = np.empty((len(queries), 0), dtype=object)
+    for file_index, vectors in corpus_batches():
+        ids = np.array([f'{file_index}-{i}' for i in range(len(vectors))], dtype=object)
+        scores = np.hstack([best_scores, queries @ vectors.T])
+        candidates = np.hstack([best_ids, np.broadcast_to(ids, (len(queries), len(ids)))])
+        top = np.argpartition(-scores, args.k - 1, axis=1)[:, : args.k]
+        best_scores = np.take_along_axis(scores, top, axis=1)
+        best_ids = np.take_along_axis(candidates, top, axis=1)
+    return [set(row) for row in best_ids.tolist()]
+
+
+def directory_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def timed(fn, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def make_client(backend: str):
+    if backend == 'embedded':
+        from open_webui.retrieval.vector.dbs.embedded import EmbeddedClient
+
+        return EmbeddedClient()
+    from open_webui.retrieval.vector.dbs.chroma import ChromaClient
+
+    return ChromaClient()
+
+
+def run(backend: str) -> dict:
+    data_dir = tempfile.mkdtemp(prefix=f'benchmark-{backend}-')
+    os.environ['DATA_DIR'] = data_dir
+    os.environ['VECTOR_DB'] = backend
+    os.environ['EMBEDDED_VECTOR_DB_PATH'] = os.path.join(data_dir, 'embedded')
+    # Maintenance is driven explicitly below so that it is measured separately.
+    os.environ['EMBEDDED_VECTOR_DB_MAINTENANCE_INTERVAL'] = '86400'
+
+    client = make_client(backend)
+    result = {'backend': backend}
+
+    start = time.perf_counter()
+    for file_index, vectors in corpus_batches():
+        client.insert(
+            COLLECTION,
+            [
+                {
+                    'id': f'{file_index}-{i}',
+                    'text': f'chunk {i} of file {file_index}',
+                    'vector': vector,
+                    'metadata': {'file_id': f'file-{file_index}', 'source': f'file-{file_index}.txt', 'start_index': i},
+                }
+                for i, vector in enumerate(vectors.tolist())
+            ],
+        )
+    result['ingest_s'] = time.perf_counter() - start
+
+    if backend == 'embedded':
+        start = time.perf_counter()
+        client._get_collection(COLLECTION).maintain(force_save=True)
+        result['maintenance_s'] = time.perf_counter() - start
+        client.close()
+
+    # A fresh client reads the collection back from disk, as after a restart.
+    client = make_client(backend)
+    queries = query_vectors(args.searches, 0)
+    start = time.perf_counter()
+    client.search(COLLECTION, queries[:1].tolist(), limit=args.k)
+    result['cold_open_s'] = time.perf_counter() - start
+
+    batch = query_vectors(args.queries, 1).tolist()
+    file_filter = {'file_id': 'file-7'}
+    result['search_1_ms'] = 1000 * timed(lambda: client.search(COLLECTION, queries[:1].tolist(), limit=args.k), 20)
+    result[f'search_{args.queries}_ms'] = 1000 * timed(lambda: client.search(COLLECTION, batch, limit=args.k), 20)
+    client.search(COLLECTION, batch, filter=file_filter, limit=args.k)  # builds the embedded DB's postings
+    result[f'search_{args.queries}_filtered_ms'] = 1000 * timed(
+        lambda: client.search(COLLECTION, batch, filter=file_filter, limit=args.k), 20
+    )
+
+    found = []
+    for query in queries:
+        found.append(set(client.search(COLLECTION, [query.tolist()], limit=args.k).ids[0]))
+    expected = exact_top_k(queries)
+    result[f'recall@{args.k}'] = statistics.mean(len(f & e) / args.k for f, e in zip(found, expected))
+
+    result['disk_mb'] = directory_size(data_dir) / 2**20
+    result['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+def main() -> None:
+    if args.run:
+        print(json.dumps(run(args.run)))
+        return
+
+    results = []
+    for backend in args.backends:
+        print(f'Running {backend} ...', file=sys.stderr)
+        output = subprocess.run(
+            [sys.executable, __file__, *sys.argv[1:], '--run', backend], check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f'\n{args.chunks} chunks, {args.dim} dimensions, {args.file_size} chunks per insert')
+    keys = [key for key in results[0] if key != 'backend']
+    for result in results[1:]:
+        keys += [key for key in result if key not in keys and key != 'backend']
+    print(f'{"":<24}' + ''.join(f'{result["backend"]:>14}' for result in results))
+    for key in keys:
+        values = [result.get(key) for result in results]
+        print(f'{key:<24}' + ''.join(f'{value:>14.3f}' if value is not None else f'{"-":>14}' for value in values))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark recurring calendar event expansion.
+
+Expands 1,000 recurring events (daily, weekly, monthly; started up to five
+years ago) over a one-year view, both as twelve month views and as a single
+year query, and compares the legacy ``rule.after()`` walk with
+``expand_recurring_event``.
+
+Run from the backend directory:
+
+    cd backend && python ../scripts/benchmark_recurring_events.py [--skip-legacy]
+
+The legacy walk takes several minutes at 1,000 events; ``--skip-legacy``
+times only the new path (results are still checked against the legacy
+expansion for a sample of events).
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from dateutil.rrule import rrulestr
+from open_webui.utils.calendar import compile_rule, expand_recurring_event
+
+NS = 1_000_000_000
+
+RULES = [
+    'FREQ=DAILY',
+    'FREQ=DAILY;INTERVAL=2',
+    'FREQ=WEEKLY;BYDAY=MO,WE,FR',
+    'FREQ=WEEKLY;BYDAY=TU',
+    'FREQ=MONTHLY;BYMONTHDAY=15',
+    'FREQ=MONTHLY;BYDAY=1MO',
+]
+
+
+def legacy_expand(event: dict, range_start_ns: int, range_end_ns: int) -> list[int]:
+    """The previous implementation: one ``after()`` call (a walk from DTSTART) per occurrence."""
+    range_start_dt = datetime.fromtimestamp(range_start_ns / NS)
+    range_end_dt = datetime.fromtimestamp(range_end_ns / NS)
+    rule = rrulestr(event['rrule'], dtstart=datetime.fromtimestamp(event['start_at'] / NS), ignoretz=True)
+
+    starts = []
+    dt = rule.after(range_start_dt - timedelta(days=1), inc=True)
+    while dt and dt < range_end_dt:
+        start_ns = int(dt.timestamp() * NS)
+        if start_ns >= range_start_ns:
+            starts.append(start_ns)
+        dt = rule.after(dt)
+    return starts
+
+
+def make_events(now: datetime, count: int) -> list[dict]:
+    rng = random.Random(0)
+    events = []
+    for i in range(count):
+        start = now - timedelta(days=rng.randint(30, 5 * 365), hours=rng.randint(0, 23))
+        start_ns = int(start.timestamp() * NS)
+        events.append(
+            {
+                'id': f'event_{i}',
+                'rrule': rng.choice(RULES),
+                'start_at': start_ns,
+                'end_at': start_ns + 3600 * NS,
+            }
+        )
+    return events
+
+
+def month_ranges(year_start: datetime) -> list[tuple[int, int]]:
+    ranges = []
+    for month in range(12):
+        start = year_start.replace(month=month + 1)
+        end = start.replace(year=start.year + 1, month=1) if month == 11 else start.replace(month=month + 2)
+        ranges.append((int(start.timestamp() * NS), int(end.timestamp() * NS)))
+    return ranges
+
+
+def timed(label: str, fn) -> float:
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<40} {elapsed * 1000:>10.1f} ms  ({count} instances)')
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=1000)
+    parser.add_argument('--skip-legacy', action='store_true')
+    args = parser.parse_args()
+
+    now = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    year_start = now.replace(month=1, day=1)
+    year = (int(year_start.timestamp() * NS), int(year_start.replace(year=year_start.year + 1).timestamp() * NS))
+    months = month_ranges(year_start)
+    events = make_events(now, args.events)
+
+    for event in events[:100]:
+        expected = legacy_expand(event, *year)
+        actual = [instance['start_at'] for instance in expand_recurring_event(event, *year)]
+        assert actual == expected, f'Mismatch for {event["id"]} ({event["rrule"]})'
+    compile_rule.cache_clear()
+
+    print(f'{len(events)} recurring events, one-year view\n')
+    cold = timed(
+        'compiled, 12 month views (cold)',
+        lambda: sum(len(expand_recurring_event(e, *r)) for r in months for e in events),
+    )
+    warm = timed(
+        'compiled, 12 month views (warm)',
+        lambda: sum(len(expand_recurring_event(e, *r)) for r in months for e in events),
+    )
+    compile_rule.cache_clear()
+    timed('compiled, single year query (cold)', lambda: sum(len(expand_recurring_event(e, *year)) for e in events))
+
+    if not args.skip_legacy:
+        legacy = timed(
+            'legacy, 12 month views', lambda: sum(len(legacy_expand(e, *r)) for r in months for e in events)
+        )
+        timed('legacy, single year query', lambda: sum(len(legacy_expand(e, *year)) for e in events))
+        print(f'\nspeedup: {legacy / cold:.1f}x cold, {legacy / warm:.1f}x warm')
+
+
+if __name__ == '__main__':
+    main()
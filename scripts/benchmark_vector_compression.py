@@ -0,0 +1,135 @@
+"""
+Benchmark recall and latency of compact vector storage modes.
+
+Compares exact float32 search with each ``RAG_VECTOR_DIMENSIONS`` /
+``RAG_VECTOR_QUANTIZATION`` mode on the same corpus, using brute-force numpy
+search so that only the encoding differs:
+
+  - Matryoshka truncation to each ``--dims`` value (re-normalized),
+  - float16 and int8 scalar quantization,
+  - binary quantization by Hamming distance, alone and rescored at full
+    precision with ``--oversampling`` times the requested candidates.
+
+Reports recall@k against the float32 results, median query latency and bytes
+per stored vector.  Recall depends on the embedding model; pass real
+embeddings with ``--embeddings vectors.npy`` (one row per chunk) or embed a
+text file with ``--model`` and ``--texts``.  The default synthetic corpus
+only approximates a Matryoshka model's spectrum.
+
+Run from the backend directory:
+
+    cd backend && python ../scripts/benchmark_vector_compression.py [--chunks N] [--dims 256 512]
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+from open_webui.retrieval.vector.compression import (
+    dequantize_int8,
+    hamming_distances,
+    quantize_binary,
+    quantize_float16,
+    quantize_int8,
+    truncate_embeddings,
+)
+
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument('--chunks', type=int, default=100_000, help='synthetic corpus size')
+parser.add_argument('--dim', type=int, default=768, help='synthetic embedding dimension')
+parser.add_argument('--embeddings', help='.npy file of corpus embeddings (overrides the synthetic corpus)')
+parser.add_argument('--model', help='SentenceTransformer model to embed --texts with')
+parser.add_argument('--texts', help='text file, one chunk per line (with --model)')
+parser.add_argument('--queries', type=int, default=200, help='queries, sampled from the corpus and perturbed')
+parser.add_argument('--k', type=int, default=10)
+parser.add_argument('--dims', type=int, nargs='*', default=[512, 256, 128], help='Matryoshka truncation sizes')
+parser.add_argument('--oversampling', type=float, default=4.0)
+args = parser.parse_args()
+
+
+def load_corpus(rng: np.random.Generator) -> np.ndarray:
+    if args.embeddings:
+        return np.load(args.embeddings).astype(np.float32)
+    if args.model:
+        from sentence_transformers import SentenceTransformer
+
+        with open(args.texts) as f:
+            texts = [line.strip() for line in f if line.strip()]
+        return SentenceTransformer(args.model).encode(texts, batch_size=64, show_progress_bar=True)
+
+    # Leading dimensions carry most of the variance, as in Matryoshka-trained models.
+    scale = 1 / np.sqrt(1 + np.arange(args.dim) / 32)
+    return rng.standard_normal((args.chunks, args.dim), dtype=np.float32) * scale
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+def measure(label: str, search, bytes_per_vector: float, expected: list[np.ndarray], queries: np.ndarray) -> None:
+    timings, recalls = [], []
+    for query, truth in zip(queries, expected):
+        start = time.perf_counter()
+        found = search(query)
+        timings.append(time.perf_counter() - start)
+        recalls.append(len(np.intersect1d(found, truth)) / len(truth))
+    print(
+        f'{label:<36} {statistics.mean(recalls):>9.3f} {statistics.median(timings) * 1000:>10.2f} ms '
+        f'{bytes_per_vector:>9.0f} B'
+    )
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    corpus = normalize(np.asarray(load_corpus(rng), dtype=np.float32))
+    count, dim = corpus.shape
+    sample = corpus[rng.choice(count, size=min(args.queries, count), replace=False)]
+    queries = normalize(sample + rng.standard_normal(sample.shape, dtype=np.float32) * 0.5 / np.sqrt(dim))
+    k = args.k
+    expected = [top_k(corpus @ query, k) for query in queries]
+    candidates = max(k, int(np.ceil(k * args.oversampling)))
+
+    print(f'\n{count} vectors, {dim} dimensions, {len(queries)} queries, recall@{k}')
+    print(f'{"mode":<36} {"recall":>9} {"median":>13} {"size":>11}')
+    measure('float32', lambda q: top_k(corpus @ q, k), dim * 4, expected, queries)
+
+    for dims in sorted((d for d in args.dims if d < dim), reverse=True):
+        truncated = np.asarray(truncate_embeddings(corpus, dims), dtype=np.float32)
+        truncated_queries = np.asarray(truncate_embeddings(queries, dims), dtype=np.float32)
+        measure(
+            f'truncate to {dims}',
+            lambda q, t=truncated: top_k(t @ q, k),
+            dims * 4,
+            expected,
+            truncated_queries,
+        )
+
+    half = quantize_float16(corpus)
+    measure('float16', lambda q: top_k((half @ q.astype(np.float16)).astype(np.float32), k), dim * 2, expected, queries)
+
+    codes, offset, scale = quantize_int8(corpus)
+    restored = dequantize_int8(codes, offset, scale)
+    measure('int8', lambda q: top_k(restored @ q, k), dim, expected, queries)
+
+    bits = quantize_binary(corpus)
+
+    def binary(query: np.ndarray) -> np.ndarray:
+        return top_k(-hamming_distances(quantize_binary(query), bits).astype(np.float32), k)
+
+    def binary_rescored(query: np.ndarray) -> np.ndarray:
+        nearest = top_k(-hamming_distances(quantize_binary(query), bits).astype(np.float32), candidates)
+        return nearest[top_k(corpus[nearest] @ query, k)]
+
+    measure('binary', binary, dim / 8, expected, queries)
+    measure(f'binary, rescore {candidates} at float32', binary_rescored, dim / 8, expected, queries)
+
+
+if __name__ == '__main__':
+    main()
@@ -62,7 +62,8 @@ export const uploadFile = async (
 					let lines = value.split('\n');
 
 					for (const line of lines) {
-						if (line !== '') {
+						// Lines starting with ':' are SSE heartbeats.
+						if (line !== '' && !line.startsWith(':')) {
 							console.log(line);
 							if (line === 'data: [DONE]') {
 								console.log(line);